@@ -81,3 +81,51 @@ class Config(object):
 
     .. versionadded:: 0.8
     """
+
+    DEFAULT_IO_FRAME_CACHE_SIZE = 128 * 1024 * 1024
+    """Default size in bytes of the frame cache used to read multi-frame
+    images lazily.
+
+    It will have an influence on:
+
+    - :class:`silx.io.fabioh5.File`
+
+    .. versionadded:: 0.9
+    """
+
+    DEFAULT_IO_HEADER_WORKERS = 4
+    """Default number of threads used to read the headers of image file
+    series in background.
+
+    If 0, the headers are read synchronously when the file series is opened.
+
+    It will have an influence on:
+
+    - :class:`silx.io.fabioh5.File`
+
+    .. versionadded:: 0.9
+    """
+
+    DEFAULT_IO_MAX_OPEN_FILES = 16
+    """Default maximum number of files kept open by a
+    :class:`silx.io.utils.FilePool`, which closes the least recently used
+    file when opening a new one.
+
+    It will have an influence on:
+
+    - :func:`silx.io.utils.get_data_many`
+
+    .. versionadded:: 0.9
+    """
+
+    DEFAULT_IO_MAX_LOADED_SCANS = 256
+    """Default maximum number of scans of a SPEC file whose content is kept
+    in memory. The content of the least recently used scan is released
+    when another one is read.
+
+    It will have an influence on:
+
+    - :class:`silx.io.spech5.SpecH5`
+
+    .. versionadded:: 0.9
+    """
@@ -287,6 +287,20 @@ def main(argv):
         '--fletcher32',
         action="store_true",
         help='Adds a checksum to each chunk to detect data corruption.')
+    parser.add_argument(
+        '--resume',
+        action="store_true",
+        help='Continue an interrupted conversion into the existing output '
+             'file (the write mode is then "a"). Complete datasets are kept '
+             'and partially written image stacks are completed from the '
+             'last frames recorded in the file.')
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of processes reading the input files. The frames of '
+             'image files are decoded, and the SPEC files are parsed, in '
+             'parallel while the main process writes the output file. '
+             'The conversion throughput is displayed at the end.')
     parser.add_argument(
         '--debug',
         action="store_true",
@@ -308,11 +322,12 @@ def main(argv):
 
     try:
         import h5py
-        from silx.io.convert import write_to_h5
+        from silx.io.convert import write_to_h5, iter_read_files
     except ImportError:
         _logger.debug("Backtrace", exc_info=True)
         h5py = None
         write_to_h5 = None
+        iter_read_files = None
 
     if h5py is None:
         message = "Module 'h5py' is not installed but is mandatory."\
@@ -386,6 +401,9 @@ def main(argv):
             _logger.error("No file matching --file-pattern found.")
             return -1
 
+    if options.resume:
+        options.mode = "a"
+
     # Test that the output path is writeable
     if "::" in options.output_uri:
         output_name, hdf5_path = options.output_uri.split("::")
@@ -466,6 +484,13 @@ def main(argv):
     if options.fletcher32:
         create_dataset_args["fletcher32"] = True
 
+    if options.jobs is not None and options.jobs < 1:
+        _logger.error("--jobs argument must be a positive integer")
+        return -1
+
+    start_time = time.time()
+    frame_count, nbytes = 0, 0
+
     if (len(options.input_files) > 1 and
             not contains_specfile(options.input_files) and
             not options.add_root_group) or options.file_pattern is not None:
@@ -487,39 +512,60 @@ def main(argv):
             # we want to append only data and headers to an existing file
             input_group = input_group["/scan_0/instrument/detector_0"]
         with h5py.File(output_name, mode=options.mode) as h5f:
-            write_to_h5(input_group, h5f,
-                        h5path=hdf5_path,
-                        overwrite_data=options.overwrite_data,
-                        create_dataset_args=create_dataset_args,
-                        min_size=options.min_size)
+            frame_count, nbytes = write_to_h5(
+                input_group, h5f,
+                h5path=hdf5_path,
+                overwrite_data=options.overwrite_data,
+                create_dataset_args=create_dataset_args,
+                min_size=options.min_size,
+                jobs=options.jobs,
+                resume=options.resume)
 
     elif len(options.input_files) == 1 or \
             are_all_specfile(options.input_files) or\
             options.add_root_group:
         # single file, or spec files
-        h5paths_and_groups = []
+        h5paths = []
         for input_name in options.input_files:
             hdf5_path_for_file = hdf5_path
             if options.add_root_group:
                 hdf5_path_for_file = hdf5_path.rstrip("/") + "/" + os.path.basename(input_name)
-            try:
-                h5paths_and_groups.append((hdf5_path_for_file,
-                                           silx.io.open(input_name)))
-            except IOError:
-                _logger.error("Cannot read file %s. If this is a file format "
-                              "supported by the fabio library, you can try to"
-                              " install fabio (`pip install fabio`)."
-                              " Aborting conversion.",
-                              input_name)
-                return -1
+            h5paths.append(hdf5_path_for_file)
+
+        if len(options.input_files) > 1 and options.jobs is not None and options.jobs > 1:
+            # files are read in other processes while writing
+            input_groups = iter_read_files(options.input_files, options.jobs)
+        else:
+            input_groups = []
+            for input_name in options.input_files:
+                try:
+                    input_groups.append(silx.io.open(input_name))
+                except IOError:
+                    _logger.error("Cannot read file %s. If this is a file format "
+                                  "supported by the fabio library, you can try to"
+                                  " install fabio (`pip install fabio`)."
+                                  " Aborting conversion.",
+                                  input_name)
+                    return -1
 
         with h5py.File(output_name, mode=options.mode) as h5f:
-            for hdf5_path_for_file, input_group in h5paths_and_groups:
-                write_to_h5(input_group, h5f,
-                            h5path=hdf5_path_for_file,
-                            overwrite_data=options.overwrite_data,
-                            create_dataset_args=create_dataset_args,
-                            min_size=options.min_size)
+            try:
+                # input groups first, to exhaust the pool of processes
+                for input_group, hdf5_path_for_file in zip(input_groups, h5paths):
+                    frames, size = write_to_h5(
+                        input_group, h5f,
+                        h5path=hdf5_path_for_file,
+                        overwrite_data=options.overwrite_data,
+                        create_dataset_args=create_dataset_args,
+                        min_size=options.min_size,
+                        jobs=options.jobs,
+                        resume=options.resume)
+                    frame_count += frames
+                    nbytes += size
+            except IOError as e:
+                _logger.debug("Backtrace", exc_info=True)
+                _logger.error("%s. Aborting conversion.", e)
+                return -1
 
     else:
         # multiple file, SPEC and fabio images mixed
@@ -528,6 +574,12 @@ def main(argv):
                       "files, but not both.")
         return -1
 
+    duration = time.time() - start_time
+    print("Converted %d frames (%.1f MB) in %.2fs: %.1f frames/s, %.1f MB/s" % (
+        frame_count, nbytes / 1e6, duration,
+        frame_count / duration if duration > 0 else 0.,
+        nbytes / 1e6 / duration if duration > 0 else 0.))
+
     with h5py.File(output_name, mode="r+") as h5f:
         # append "silx convert" to the creator attribute, for NeXus files
         previous_creator = h5f.attrs.get("creator", u"")
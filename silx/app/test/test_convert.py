@@ -41,6 +41,13 @@ try:
 except ImportError:
     h5py = None
 
+try:
+    import fabio
+except ImportError:
+    fabio = None
+
+import numpy
+
 import silx
 from .. import convert
 from silx.utils import testutils
@@ -169,6 +176,153 @@ class TestConvertCommand(unittest.TestCase):
         os.unlink(h5name)
         os.rmdir(tempdir)
 
+    def _write_specfile(self, filename):
+        with io.open(filename, "wb") as fd:
+            fd.write(sftext.encode('ascii'))
+
+    @unittest.skipIf(h5py is None, "h5py is required to test convert")
+    def testSpecFilesJobs(self):
+        tempdir = tempfile.mkdtemp()
+        specnames = [os.path.join(tempdir, "input%d.dat" % i) for i in range(3)]
+        for specname in specnames:
+            self._write_specfile(specname)
+
+        h5name = os.path.join(tempdir, "output.h5")
+        command_list = ["convert", "--add-root-group", "--jobs", "2"]
+        command_list += specnames + ["-o", h5name]
+        with testutils.TestLogging(convert._logger, error=0):
+            result = convert.main(command_list)
+        self.assertEqual(result, 0)
+
+        with h5py.File(h5name, "r") as h5f:
+            self.assertEqual(sorted(h5f.keys()),
+                             ["input0.dat", "input1.dat", "input2.dat"])
+            for specname in specnames:
+                group = h5f[os.path.basename(specname)]
+                title = group["1.2/title"][()]
+                if not isinstance(title, str):
+                    title = title.decode("utf-8")
+                self.assertEqual(title, "aaaaaa")
+                numpy.testing.assert_allclose(
+                    group["1.1/measurement/3rd_col"][()],
+                    [8, 1.56, -3.14, 3.4], rtol=1e-6)
+                numpy.testing.assert_allclose(
+                    group["1.2/measurement/mca_0/data"][()],
+                    [[0, 1, 2], [3.1, 4, 5], [6, 7.7, 8]], rtol=1e-6)
+
+        gc.collect()  # necessary to free spec file on Windows
+        for specname in specnames:
+            os.unlink(specname)
+        os.unlink(h5name)
+        os.rmdir(tempdir)
+
+    @unittest.skipIf(h5py is None, "h5py is required to test convert")
+    @unittest.skipIf(fabio is None, "fabio is required to test convert")
+    def testFileSeriesJobs(self):
+        tempdir = tempfile.mkdtemp()
+        edfnames = []
+        for i in range(5):
+            edfname = os.path.join(tempdir, "image_%02d.edf" % i)
+            data = numpy.arange(12, dtype=numpy.uint16).reshape(3, 4) + i
+            fabio.edfimage.EdfImage(data=data).write(edfname)
+            edfnames.append(edfname)
+
+        h5name = os.path.join(tempdir, "output.h5")
+        command_list = ["convert", "--jobs", "2",
+                        "--file-pattern", os.path.join(tempdir, "image_%02d.edf"),
+                        "-o", h5name]
+        result = convert.main(command_list)
+        self.assertEqual(result, 0)
+
+        with h5py.File(h5name, "r") as h5f:
+            data = h5f["/scan_0/instrument/detector_0/data"][()]
+        expected = numpy.arange(12, dtype=numpy.uint16).reshape(3, 4)
+        expected = numpy.array([expected + i for i in range(5)])
+        numpy.testing.assert_array_equal(data, expected)
+
+        gc.collect()
+        for edfname in edfnames:
+            os.unlink(edfname)
+        os.unlink(h5name)
+        os.rmdir(tempdir)
+
+    @unittest.skipIf(h5py is None, "h5py is required to test convert")
+    @unittest.skipIf(fabio is None, "fabio is required to test convert")
+    def testFileSeriesChunks(self):
+        tempdir = tempfile.mkdtemp()
+        edfnames = []
+        expected = numpy.arange(7 * 5 * 6, dtype=numpy.int32).reshape(7, 5, 6)
+        for i, data in enumerate(expected):
+            edfname = os.path.join(tempdir, "image_%02d.edf" % i)
+            fabio.edfimage.EdfImage(data=data).write(edfname)
+            edfnames.append(edfname)
+
+        h5name = os.path.join(tempdir, "output.h5")
+        options = [
+            ["--chunks", "(2, 3, 4)", "--compression", "--jobs", "2"],
+            ["--chunks", "(3, 5, 6)", "--compression", "--shuffle"],
+            ["--chunks", "(2, 5, 6)", "--compression", "--fletcher32"],
+            ["--chunks", "(4, 2, 2)"],
+        ]
+        for option in options:
+            command_list = ["convert", "-m", "w"] + option + edfnames + ["-o", h5name]
+            result = convert.main(command_list)
+            self.assertEqual(result, 0)
+            with h5py.File(h5name, "r") as h5f:
+                dataset = h5f["/scan_0/instrument/detector_0/data"]
+                self.assertEqual(dataset.chunks, eval(option[1]))
+                numpy.testing.assert_array_equal(dataset[()], expected)
+
+        gc.collect()
+        for edfname in edfnames:
+            os.unlink(edfname)
+        os.unlink(h5name)
+        os.rmdir(tempdir)
+
+    @unittest.skipIf(h5py is None, "h5py is required to test convert")
+    @unittest.skipIf(fabio is None, "fabio is required to test convert")
+    def testFileSeriesResume(self):
+        from silx.io.convert import JOURNAL_ATTR
+        tempdir = tempfile.mkdtemp()
+        edfnames = []
+        expected = numpy.arange(40 * 3 * 4, dtype=numpy.int32).reshape(40, 3, 4)
+        for i, data in enumerate(expected):
+            edfname = os.path.join(tempdir, "image_%02d.edf" % i)
+            fabio.edfimage.EdfImage(data=data).write(edfname)
+            edfnames.append(edfname)
+
+        h5name = os.path.join(tempdir, "output.h5")
+        for chunks in [[], ["--chunks", "(4, 3, 4)", "--compression", "gzip"]]:
+            command_list = ["convert", "-m", "w"] + chunks + edfnames + ["-o", h5name]
+            self.assertEqual(convert.main(command_list), 0)
+
+            # simulate a conversion interrupted after 18 frames
+            with h5py.File(h5name, "r+") as h5f:
+                dataset = h5f["/scan_0/instrument/detector_0/data"]
+                self.assertNotIn(JOURNAL_ATTR, dataset.attrs)
+                dataset[18:] = 0
+                dataset.attrs[JOURNAL_ATTR] = 18
+                del h5f["/scan_0/instrument/detector_0/others"]
+
+            command_list = ["convert", "--resume"] + chunks + edfnames + ["-o", h5name]
+            self.assertEqual(convert.main(command_list), 0)
+
+            with h5py.File(h5name, "r") as h5f:
+                dataset = h5f["/scan_0/instrument/detector_0/data"]
+                self.assertNotIn(JOURNAL_ATTR, dataset.attrs)
+                numpy.testing.assert_array_equal(dataset[()], expected)
+                self.assertIn("/scan_0/instrument/detector_0/others", h5f)
+
+        gc.collect()
+        for edfname in edfnames:
+            os.unlink(edfname)
+        os.unlink(h5name)
+        os.rmdir(tempdir)
+
+    def testWrongJobs(self):
+        result = convert.main(["convert", "--jobs", "0", "foo.spec"])
+        self.assertNotEqual(result, 0)
+
 
 def suite():
     test_suite = unittest.TestSuite()
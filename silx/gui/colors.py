@@ -35,7 +35,7 @@ from silx.gui import qt
 import copy as copy_mdl
 import numpy
 import logging
-from silx.math.combo import min_max
+from silx.math.combo import min_max, percentile
 from silx.math.colormap import cmap as _cmap
 from silx.utils.exceptions import NotEditableError
 
@@ -173,6 +173,8 @@ class Colormap(qt.QObject):
         Lower bound of the colormap or None for autoscale (default)
     :param float vmax:
         Upper bounds of the colormap or None for autoscale (default)
+    :param str autoscaleMode: Autoscale mode: 'minmax' (default) or
+        'percentile_1_99'
     """
 
     LINEAR = 'linear'
@@ -184,12 +186,23 @@ class Colormap(qt.QObject):
     NORMALIZATIONS = (LINEAR, LOGARITHM)
     """Tuple of managed normalizations"""
 
+    MINMAX = 'minmax'
+    """constant for autoscale using the min/max of the data"""
+
+    PERCENTILE_1_99 = 'percentile_1_99'
+    """constant for autoscale using the 1st and 99th percentiles of the data"""
+
+    AUTOSCALE_MODES = (MINMAX, PERCENTILE_1_99)
+    """Tuple of managed autoscale modes"""
+
     sigChanged = qt.Signal()
     """Signal emitted when the colormap has changed."""
 
-    def __init__(self, name='gray', colors=None, normalization=LINEAR, vmin=None, vmax=None):
+    def __init__(self, name='gray', colors=None, normalization=LINEAR,
+                 vmin=None, vmax=None, autoscaleMode=MINMAX):
         qt.QObject.__init__(self)
         assert normalization in Colormap.NORMALIZATIONS
+        assert autoscaleMode in Colormap.AUTOSCALE_MODES
         assert not (name is None and colors is None)
         if normalization is Colormap.LOGARITHM:
             if (vmin is not None and vmin < 0) or (vmax is not None and vmax < 0):
@@ -205,6 +218,7 @@ class Colormap(qt.QObject):
         self._normalization = str(normalization)
         self._vmin = float(vmin) if vmin is not None else None
         self._vmax = float(vmax) if vmax is not None else None
+        self._autoscaleMode = str(autoscaleMode)
         self._editable = True
 
     def isAutoscale(self):
@@ -333,6 +347,29 @@ class Colormap(qt.QObject):
         self._normalization = str(norm)
         self.sigChanged.emit()
 
+    def getAutoscaleMode(self):
+        """Return the autoscale mode of the colormap
+        ('minmax' or 'percentile_1_99')
+
+        :rtype: str
+        """
+        return self._autoscaleMode
+
+    def setAutoscaleMode(self, mode):
+        """Set the autoscale mode ('minmax', 'percentile_1_99')
+
+        The 'percentile_1_99' mode uses approximate percentiles
+        (see :func:`silx.math.combo.percentile`) to ignore outliers.
+
+        :param str mode: the autoscale mode to set
+        """
+        if self.isEditable() is False:
+            raise NotEditableError('Colormap is not editable')
+        assert mode in self.AUTOSCALE_MODES
+        if mode != self._autoscaleMode:
+            self._autoscaleMode = str(mode)
+            self.sigChanged.emit()
+
     def getVMin(self):
         """Return the lower bound of the colormap
 
@@ -430,6 +467,16 @@ class Colormap(qt.QObject):
                 data = numpy.array(data, copy=False)
                 if data.size == 0:  # Fallback an array but no data
                     min_, max_ = self._getDefaultMin(), self._getDefaultMax()
+                elif self.getAutoscaleMode() == self.PERCENTILE_1_99:
+                    min_, max_ = percentile(
+                        data, (1, 99),
+                        positive=self.getNormalization() == self.LOGARITHM)
+
+                    # Handle fallback
+                    if not numpy.isfinite(min_):
+                        min_ = self._getDefaultMin()
+                    if not numpy.isfinite(max_):
+                        max_ = self._getDefaultMax()
                 else:
                     if self.getNormalization() == self.LOGARITHM:
                         result = min_max(data, min_positive=True, finite=True)
@@ -490,6 +537,8 @@ class Colormap(qt.QObject):
             return self.getVMax()
         elif item == 'colors':
             return self.getColormapLUT()
+        elif item == 'autoscaleMode':
+            return self.getAutoscaleMode()
         else:
             raise KeyError(item)
 
@@ -506,7 +555,8 @@ class Colormap(qt.QObject):
             'vmin': self._vmin,
             'vmax': self._vmax,
             'autoscale': self.isAutoscale(),
-            'normalization': self._normalization
+            'normalization': self._normalization,
+            'autoscaleMode': self._autoscaleMode
         }
 
     def _setFromDict(self, dic):
@@ -527,6 +577,7 @@ class Colormap(qt.QObject):
             warn += 'set by default to ' + Colormap.LINEAR
             _logger.warning(warn)
             normalization = Colormap.LINEAR
+        autoscaleMode = dic.get('autoscaleMode', Colormap.MINMAX)
 
         if name is None and colors is None:
             err = 'The colormap should have a name defined or a tuple of colors'
@@ -534,6 +585,9 @@ class Colormap(qt.QObject):
         if normalization not in Colormap.NORMALIZATIONS:
             err = 'Given normalization is not recoginized (%s)' % normalization
             raise ValueError(err)
+        if autoscaleMode not in Colormap.AUTOSCALE_MODES:
+            err = 'Given autoscale mode is not recognized (%s)' % autoscaleMode
+            raise ValueError(err)
 
         # If autoscale, then set boundaries to None
         if dic.get('autoscale', False):
@@ -545,6 +599,7 @@ class Colormap(qt.QObject):
         self._vmax = vmax
         self._autoscale = True if (vmin is None and vmax is None) else False
         self._normalization = normalization
+        self._autoscaleMode = autoscaleMode
 
         self.sigChanged.emit()
 
@@ -563,7 +618,8 @@ class Colormap(qt.QObject):
                         colors=copy_mdl.copy(self._colors),
                         vmin=self._vmin,
                         vmax=self._vmax,
-                        normalization=self._normalization)
+                        normalization=self._normalization,
+                        autoscaleMode=self._autoscaleMode)
 
     def applyToData(self, data):
         """Apply the colormap to the data
@@ -614,10 +670,11 @@ class Colormap(qt.QObject):
                 self.getNormalization() == other.getNormalization() and
                 self.getVMin() == other.getVMin() and
                 self.getVMax() == other.getVMax() and
+                self.getAutoscaleMode() == other.getAutoscaleMode() and
                 numpy.array_equal(self.getColormapLUT(), other.getColormapLUT())
                 )
 
-    _SERIAL_VERSION = 1
+    _SERIAL_VERSION = 2
 
     def restoreState(self, byteArray):
         """
@@ -637,7 +694,7 @@ class Colormap(qt.QObject):
             return False
 
         version = stream.readUInt32()
-        if version != self._SERIAL_VERSION:
+        if version not in (1, self._SERIAL_VERSION):
             _logger.warning("Serial version mismatch. Found %d." % version)
             return False
 
@@ -653,12 +710,17 @@ class Colormap(qt.QObject):
         else:
             vmax = None
         normalization = stream.readQString()
+        if version == 1:
+            autoscaleMode = Colormap.MINMAX
+        else:
+            autoscaleMode = stream.readQString()
 
         # emit change event only once
         old = self.blockSignals(True)
         try:
             self.setName(name)
             self.setNormalization(normalization)
+            self.setAutoscaleMode(autoscaleMode)
             self.setVRange(vmin, vmax)
         finally:
             self.blockSignals(old)
@@ -684,6 +746,7 @@ class Colormap(qt.QObject):
         if self.getVMax() is not None:
             stream.writeQVariant(self.getVMax())
         stream.writeQString(self.getNormalization())
+        stream.writeQString(self.getAutoscaleMode())
         return data
 
 
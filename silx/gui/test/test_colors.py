@@ -301,6 +301,41 @@ class TestObjectAPI(ParametricTestCase):
         self.assertEqual(cl4.getColormapRange(
             (float('nan'), float('inf'))), (1., 10.))
 
+    def testAutoscaleMode(self):
+        """Test getColormapRange with the percentile autoscale mode"""
+        data = numpy.arange(1001, dtype=numpy.float64)
+        data[0] = -1e6  # Outliers
+        data[-1] = 1e6
+        data[1] = float('nan')
+
+        colormap = Colormap(autoscaleMode=Colormap.PERCENTILE_1_99)
+        self.assertEqual(colormap.getAutoscaleMode(), Colormap.PERCENTILE_1_99)
+        vmin, vmax = colormap.getColormapRange(data)
+        expected = numpy.percentile(data[numpy.isfinite(data)], (1, 99))
+        self.assertTrue(numpy.allclose((vmin, vmax), expected, atol=1.))
+
+        colormap.setNormalization(Colormap.LOGARITHM)
+        vmin, vmax = colormap.getColormapRange(data)
+        expected = numpy.percentile(data[data > 0], (1, 99))
+        self.assertTrue(numpy.allclose((vmin, vmax), expected, atol=1.))
+        self.assertEqual(colormap.getColormapRange((-2., -1.)), (1., 10.))
+
+        colormap.setAutoscaleMode(Colormap.MINMAX)
+        self.assertEqual(colormap.getColormapRange(data), (2., 1e6))
+
+        # Copy, dict and state
+        colormap.setAutoscaleMode(Colormap.PERCENTILE_1_99)
+        self.assertEqual(colormap.copy().getAutoscaleMode(),
+                         Colormap.PERCENTILE_1_99)
+        self.assertFalse(colormap == Colormap(
+            normalization=Colormap.LOGARITHM))
+        self.assertEqual(Colormap._fromDict(colormap._toDict()), colormap)
+
+        colormap2 = Colormap()
+        self.assertTrue(colormap2.restoreState(colormap.saveState()))
+        self.assertEqual(colormap2.getAutoscaleMode(),
+                         Colormap.PERCENTILE_1_99)
+
     def testApplyToData(self):
         """Test applyToData on different datasets"""
         datasets = [
@@ -347,6 +382,8 @@ class TestObjectAPI(ParametricTestCase):
             colormap.setVMax(1.)
         with self.assertRaises(NotEditableError):
             colormap.setNormalization(Colormap.LOGARITHM)
+        with self.assertRaises(NotEditableError):
+            colormap.setAutoscaleMode(Colormap.PERCENTILE_1_99)
         with self.assertRaises(NotEditableError):
             colormap.setName('magma')
         with self.assertRaises(NotEditableError):
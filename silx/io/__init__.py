@@ -43,6 +43,7 @@ from .utils import is_group
 from .utils import is_softlink
 from .utils import supported_extensions
 from .utils import get_data
+from .utils import get_data_many
 
 # avoid to import open with "import *"
 __all = locals().keys()
@@ -153,6 +153,12 @@ class Node(object):
             self.__parent = weakref.ref(parent)
         else:
             self.__parent = None
+        self._forget_file()
+
+    def _forget_file(self):
+        """Forget the cached file node, after this node or one of its
+        ancestors was detached from the tree."""
+        self._file_ref = None
 
     @property
     def file(self):
@@ -160,10 +166,16 @@ class Node(object):
 
         :rtype: Node
         """
+        if self._file_ref is not None:
+            node = self._file_ref()
+            if node is not None:
+                return node
         node = self
         while node.parent is not None:
             node = node.parent
         if isinstance(node, File):
+            # reset by _forget_file if the node is detached
+            self._file_ref = weakref.ref(node)
             return node
         else:
             return None
@@ -577,6 +589,29 @@ class SoftLink(Node):
 
         # attr target defined for spech5 backward compatibility
         self.target = str(path)
+        self.__wrapper = None
+
+    def _get_wrapper(self, target):
+        """Returns a group or a dataset exposing the target of the link with
+        the name of the link.
+
+        The same object is returned as long as the target is the same.
+
+        :param Node target: Node pointed by the link
+        :rtype: Union[_LinkToGroup,_LinkToDataset]
+        """
+        if self.__wrapper is not None:
+            cached_target, wrapper = self.__wrapper
+            if cached_target is target:
+                return wrapper
+        if isinstance(target, Group):
+            wrapper = _LinkToGroup(name=self.basename, target=target, parent=self.parent)
+        elif isinstance(target, Dataset):
+            wrapper = _LinkToDataset(name=self.basename, target=target, parent=self.parent)
+        else:
+            raise TypeError("Unexpected target type %s" % type(target))
+        self.__wrapper = target, wrapper
+        return wrapper
 
     @property
     def h5_class(self):
@@ -606,14 +641,45 @@ class Group(Node):
         """
         return self.__items
 
+    def _forget_file(self):
+        Node._forget_file(self)
+        # called by the Node constructor before the items are created
+        items = getattr(self, "_Group__items", {})
+        for child in items.values():
+            child._forget_file()
+
     def add_node(self, node):
         """Add a child to this group.
 
         :param Node node: Child to add to this group
         """
-        self._get_items()[node.basename] = node
+        items = self._get_items()
+        if node.basename in items:
+            self._invalidate_paths()
+        items[node.basename] = node
         node._set_parent(self)
 
+    def remove_node(self, name):
+        """Remove a child from this group.
+
+        :param str name: Name of the child
+        :raises KeyError: If there is no such child
+        """
+        node = self._get_items().pop(name)
+        self._invalidate_paths()
+        node._set_parent(None)
+
+    def _invalidate_paths(self):
+        """Clear the cache of resolved paths of the file, after a change of
+        the existing nodes of the tree.
+
+        Adding a new child does not need to invalidate the cache, as only
+        paths to existing nodes are cached.
+        """
+        h5file = self.file
+        if h5file is not None:
+            h5file._path_cache.clear()
+
     @property
     def h5_class(self):
         """Returns the HDF5 class which is mimicked by this class.
@@ -625,7 +691,43 @@ class Group(Node):
     def _get(self, name, getlink):
         """If getlink is True and name points to an existing SoftLink, this
         SoftLink is returned. In all other situations, we try to return a
-        Group or Dataset, or we raise a KeyError if we fail."""
+        Group or Dataset, or we raise a KeyError if we fail.
+
+        Paths containing a ``/`` are resolved once, then cached by the file.
+        """
+        if "/" not in name:
+            result = self._get_items()[name]
+            if isinstance(result, SoftLink) and not getlink:
+                result = self._resolve_link(result)
+            return result
+
+        h5file = self.file
+        if h5file is None:
+            return self._resolve(name, getlink)
+        start = None if name.startswith("/") else self
+        key = start, name, getlink
+        result = h5file._path_cache.get(key)
+        if result is None:
+            result = self._resolve(name, getlink)
+            h5file._path_cache[key] = result
+        return result
+
+    def _resolve_link(self, link):
+        """Returns the group or the dataset targeted by a soft link.
+
+        :param SoftLink link: A link
+        :rtype: Node
+        :raises KeyError: If the link is broken
+        """
+        target = link.file.get(link.path)
+        if target is None:
+            msg = "Unable to open object (broken SoftLink %s -> %s)"
+            raise KeyError(msg % (link.name, link.path))
+        # Convert SoftLink into typed group/dataset
+        return link._get_wrapper(target)
+
+    def _resolve(self, name, getlink):
+        """Resolve a path without using the cache. See :meth:`_get`."""
         if "/" not in name:
             result = self._get_items()[name]
         elif name.startswith("/"):
@@ -654,18 +756,7 @@ class Group(Node):
                 result = result._get_items()[item_name]
 
         if isinstance(result, SoftLink) and not getlink:
-            link = result
-            target = result.file.get(link.path)
-            if result is None:
-                msg = "Unable to open object (broken SoftLink %s -> %s)"
-                raise KeyError(msg % (link.name, link.path))
-            # Convert SoftLink into typed group/dataset
-            if isinstance(target, Group):
-                result = _LinkToGroup(name=link.basename, target=target, parent=link.parent)
-            elif isinstance(target, Dataset):
-                result = _LinkToDataset(name=link.basename, target=target, parent=link.parent)
-            else:
-                raise TypeError("Unexpected target type %s" % type(target))
+            result = self._resolve_link(result)
 
         return result
 
@@ -779,6 +870,13 @@ class Group(Node):
         if "/" not in name:
             return name in self._get_items()
 
+        h5file = self.file
+        if h5file is not None:
+            start = None if name.startswith("/") else self
+            cache = h5file._path_cache
+            if (start, name, True) in cache or (start, name, False) in cache:
+                return True
+
         if name.startswith("/"):
             # h5py allows to access any valid full path from any group
             node = self.file
@@ -1010,6 +1108,19 @@ class LazyLoadableGroup(Group):
         """
         raise NotImplementedError()
 
+    def _unload(self):
+        """Release the children, which will be created again by
+        :meth:`_create_child` on next access.
+
+        Children previously retrieved from this group stay usable, but they
+        are not part of the tree anymore.
+        """
+        if not self.__is_initialized:
+            return
+        Group._get_items(self).clear()
+        self.__is_initialized = False
+        self._invalidate_paths()
+
 
 class File(Group):
     """This class is the special :class:`Group` that is the root node
@@ -1028,6 +1139,9 @@ class File(Group):
         :param dict attrs: Default attributes
         """
         Group.__init__(self, name="", parent=None, attrs=attrs)
+        self._path_cache = {}
+        """Nodes of the resolved paths, indexed by *(start group, path,
+        getlink)*. The start group is None for absolute paths."""
         self._file_name = name
         if mode is None:
             mode = "r"
@@ -51,11 +51,16 @@ Text strings are written to the HDF5 datasets as variable-length utf-8.
     to install it if you don't already have it.
 """
 
+import collections
+import itertools
 import logging
 import numpy
+import zlib
 
 import silx.io
 from silx.io import is_dataset, is_group, is_softlink
+from silx.io import commonh5
+from silx.third_party import concurrent_futures
 from silx.third_party import six
 try:
     from silx.io import fabioh5
@@ -108,6 +113,276 @@ def _create_link(h5f, link_name, target_name,
         raise ValueError("link_type  must be 'hard' or 'soft'")
 
 
+_FRAMES_PER_TASK = 16
+"""Maximum number of frames decoded by a worker process in a single task"""
+
+JOURNAL_ATTR = "silx_convert_committed_frames"
+"""Name of the attribute of a multi-frame dataset which is being written,
+storing the number of frames already written at the beginning of the
+dataset. The attribute is removed when the dataset is complete."""
+
+_JOURNAL_INTERVAL = 16
+"""Minimum number of frames written between two updates of the journal"""
+
+
+_worker_image = {}
+"""Image file last opened by :func:`_read_frames` in the current process,
+indexed by file name"""
+
+
+def _read_frames(file_name, frame_indices):
+    """Decode frames of an image file.
+
+    This is executed in worker processes. The file stays opened in the
+    process, so that the next tasks on the same multi-frame file do not
+    parse its headers again.
+
+    :param str file_name: Name of the image file
+    :param List[int] frame_indices: Indices of the frames in the file
+    :rtype: List[numpy.ndarray]
+    """
+    fabio_image = _worker_image.get(file_name)
+    if fabio_image is None:
+        import fabio
+        for previous_image in _worker_image.values():
+            previous_image.close()
+        _worker_image.clear()
+        fabio_image = fabio.open(file_name)
+        if fabio_image.nframes == 1:
+            # single frame files are not read again
+            try:
+                return [fabio_image.data]
+            finally:
+                fabio_image.close()
+        _worker_image[file_name] = fabio_image
+    return [fabio_image.getframe(i).data for i in frame_indices]
+
+
+def _iter_frame_tasks(frame_data, start=0):
+    """Group the consecutive frames of a :class:`fabioh5.FrameData` stored
+    in the same file.
+
+    :param int start: Index of the first frame
+    :rtype: Iterator[Tuple[str,List[int]]]
+    """
+    task_file, task_indices = None, []
+    for frame_id in range(start, len(frame_data)):
+        file_name, index = frame_data.get_frame_location(frame_id)
+        if task_indices and (file_name != task_file or
+                             len(task_indices) >= _FRAMES_PER_TASK):
+            yield task_file, task_indices
+            task_indices = []
+        task_file = file_name
+        task_indices.append(index)
+    if task_indices:
+        yield task_file, task_indices
+
+
+def _iter_in_pool(function, args_list, jobs, threads=False):
+    """Call a function in a pool of processes and yield the results in
+    order.
+
+    At most ``2 * jobs`` calls are pending at a time, which bounds the
+    memory used by the results waiting to be consumed.
+
+    :param callable function: Picklable function
+    :param args_list: Iterable of arguments of each call
+    :param int jobs: Number of processes
+    :param bool threads: If True, use a pool of threads instead of
+        processes. The function does not need to be picklable.
+    """
+    args_list = iter(args_list)
+    if threads:
+        executor_class = concurrent_futures.ThreadPoolExecutor
+    else:
+        executor_class = concurrent_futures.ProcessPoolExecutor
+    with executor_class(max_workers=jobs) as executor:
+        pending = collections.deque()
+        for args in itertools.islice(args_list, 2 * jobs):
+            pending.append(executor.submit(function, *args))
+        while pending:
+            result = pending.popleft().result()
+            for args in itertools.islice(args_list, 1):
+                pending.append(executor.submit(function, *args))
+            yield result
+
+
+def _iter_frames_in_pool(frame_data, jobs, start=0):
+    """Yield the frames of a :class:`fabioh5.FrameData` decoded in a pool of
+    processes, in order.
+
+    :param fabioh5.FrameData frame_data: Multi-frame dataset
+    :param int jobs: Number of processes
+    :param int start: Index of the first frame
+    :rtype: Iterator[numpy.ndarray]
+    """
+    tasks = _iter_frame_tasks(frame_data, start)
+    for frames in _iter_in_pool(_read_frames, tasks, jobs):
+        for frame in frames:
+            yield frame_data.normalize_frame(frame)
+
+
+def _iter_blocks(frames, depth):
+    """Group frames into blocks of ``depth`` frames.
+
+    The last block can be smaller.
+
+    :param Iterator[numpy.ndarray] frames: Frames of same shape
+    :param int depth: Number of frames of a block
+    :rtype: Iterator[numpy.ndarray]
+    """
+    block = []
+    for frame in frames:
+        block.append(frame)
+        if len(block) == depth:
+            yield numpy.array(block)
+            block = []
+    if block:
+        yield numpy.array(block)
+
+
+def _get_direct_chunk_filters(ds):
+    """Returns the settings of the filters of a dataset, if chunks of this
+    dataset can be compressed in Python and written directly to the file.
+
+    Only the deflate (gzip) filter, optionally preceded by the shuffle
+    filter, is supported.
+
+    :param h5py.Dataset ds: A chunked dataset
+    :returns: The deflate compression level and whether bytes are shuffled,
+        or None if the filters are not supported
+    :rtype: Union[Tuple[int,bool],None]
+    """
+    if not hasattr(ds.id, "write_direct_chunk"):
+        # h5py < 2.6
+        return None
+    plist = ds.id.get_create_plist()
+    filters = [plist.get_filter(i) for i in range(plist.get_nfilters())]
+    codes = [f[0] for f in filters]
+    if codes == [h5py.h5z.FILTER_DEFLATE]:
+        shuffle = False
+    elif codes == [h5py.h5z.FILTER_SHUFFLE, h5py.h5z.FILTER_DEFLATE]:
+        shuffle = True
+    else:
+        return None
+    options = filters[-1][2]
+    level = options[0] if len(options) > 0 else 4
+    return level, shuffle
+
+
+def _compress_chunk(offset, data, level, shuffle):
+    """Encode a chunk like the HDF5 shuffle and deflate filters.
+
+    This is executed in worker threads: zlib releases the GIL.
+
+    :param Tuple[int] offset: Offset of the chunk in the dataset
+    :param numpy.ndarray data: Content of the full chunk
+    :param int level: Deflate compression level
+    :param bool shuffle: True to shuffle the bytes of the items
+    :returns: The offset and the compressed chunk
+    """
+    data = numpy.ascontiguousarray(data)
+    if shuffle and data.dtype.itemsize > 1:
+        data = data.view(numpy.uint8).reshape(-1, data.dtype.itemsize)
+        data = numpy.ascontiguousarray(data.T)
+    return offset, zlib.compress(data.tobytes(), level)
+
+
+def _iter_chunks(block, start, chunk_shape, dtype):
+    """Split a block of frames into full chunks of a dataset.
+
+    Chunks on the edges of the dataset are padded with zeros, as HDF5
+    stores them at their full size.
+
+    :param numpy.ndarray block: Frames from ``start``
+    :param int start: Index of the first frame of the block in the dataset
+    :param Tuple[int] chunk_shape: Shape of the chunks of the dataset
+    :param numpy.dtype dtype: Type of the dataset
+    :rtype: Iterator[Tuple[Tuple[int],numpy.ndarray]]
+    """
+    ranges = [range(0, size, chunk_size)
+              for size, chunk_size in zip(block.shape[1:], chunk_shape[1:])]
+    for position in itertools.product(*ranges):
+        selection = (slice(None),) + tuple(
+            slice(pos, pos + size) for pos, size in zip(position, chunk_shape[1:]))
+        data = block[selection]
+        if data.shape != tuple(chunk_shape) or data.dtype != dtype:
+            chunk = numpy.zeros(chunk_shape, dtype=dtype)
+            chunk[tuple(slice(0, size) for size in data.shape)] = data
+            data = chunk
+        yield (start,) + position, data
+
+
+def _read_records(file_name):
+    """Read the whole content of a file supported by :func:`silx.io.open`
+    as picklable records.
+
+    This is executed in worker processes.
+
+    :param str file_name: Name of the file
+    :returns: Attributes of the root group, and a list of
+        *(name, kind, value, attributes)* tuples in visit order
+    """
+    records = []
+
+    def append_record(name, obj):
+        if is_softlink(obj):
+            records.append((name, "link", obj.path, None))
+        elif is_dataset(obj):
+            records.append((name, "dataset", obj[()], dict(obj.attrs)))
+        elif is_group(obj):
+            records.append((name, "group", None, dict(obj.attrs)))
+
+    with silx.io.open(file_name) as h5like:
+        if not _is_commonh5_group(h5like):
+            raise IOError("Cannot convert HDF5 file %s to HDF5" % file_name)
+        h5like.visititems(append_record, visit_links=True)
+        return dict(h5like.attrs), records
+
+
+def _records_to_commonh5(file_name, root_attrs, records):
+    """Build a :class:`commonh5.File` from records read by
+    :func:`_read_records`.
+
+    :rtype: commonh5.File
+    """
+    h5file = commonh5.File(file_name, attrs=root_attrs)
+    groups = {"": h5file}
+    for name, kind, value, attrs in records:
+        if "/" in name:
+            parent_name, basename = name.rsplit("/", 1)
+        else:
+            parent_name, basename = "", name
+        parent = groups[parent_name]
+        if kind == "link":
+            node = commonh5.SoftLink(basename, value)
+        elif kind == "dataset":
+            node = commonh5.Dataset(basename, value, attrs=attrs)
+        else:
+            node = commonh5.Group(basename, attrs=attrs)
+            groups[name] = node
+        parent.add_node(node)
+    return h5file
+
+
+def iter_read_files(file_names, jobs):
+    """Read files supported by :func:`silx.io.open` in a pool of processes.
+
+    The files are fully loaded in memory by the worker processes and the
+    resulting trees are yielded in the order of the file names. At most
+    ``2 * jobs`` files are read ahead.
+
+    :param List[str] file_names: Names of the files to read
+    :param int jobs: Number of processes
+    :rtype: Iterator[commonh5.File]
+    :raises IOError: If a file can't be read, or is a HDF5 file
+    """
+    tasks = ((file_name,) for file_name in file_names)
+    results = _iter_in_pool(_read_records, tasks, jobs)
+    for i, (root_attrs, records) in enumerate(results):
+        yield _records_to_commonh5(file_names[i], root_attrs, records)
+
+
 def _attr_utf8(attr_value):
     """If attr_value is bytes, make sure we output utf-8
 
@@ -133,7 +408,9 @@ class Hdf5Writer(object):
                  overwrite_data=False,
                  link_type="soft",
                  create_dataset_args=None,
-                 min_size=500):
+                 min_size=500,
+                 jobs=None,
+                 resume=False):
         """
 
         :param h5path: Target path where the scan groups will be written
@@ -146,6 +423,10 @@ class Hdf5Writer(object):
             See documentation of :func:`write_to_h5`
         :param int min_size:
             See documentation of :func:`write_to_h5`
+        :param int jobs:
+            See documentation of :func:`write_to_h5`
+        :param bool resume:
+            See documentation of :func:`write_to_h5`
         """
         self.h5path = h5path
         if not h5path.startswith("/"):
@@ -165,12 +446,23 @@ class Hdf5Writer(object):
 
         self.overwrite_data = overwrite_data   # boolean
 
+        self.resume = resume   # boolean
+
         self.link_type = link_type
         """'soft' or 'hard' """
 
         self._links = []
         """List of *(link_path, target_path)* tuples."""
 
+        self.jobs = jobs
+        """Number of processes decoding the frames of multi-frame datasets"""
+
+        self.frame_count = 0
+        """Number of frames of multi-frame datasets written"""
+
+        self.nbytes = 0
+        """Number of bytes of the datasets written"""
+
     def write(self, infile, h5f):
         """Do the conversion from :attr:`sfh5` (Spec file) to *h5f* (HDF5)
 
@@ -210,23 +502,42 @@ class Hdf5Writer(object):
             _logger.debug("Saving dataset: " + h5_name)
 
             member_initially_exists = h5_name in self._h5f
+            is_multiframe = fabioh5 is not None and \
+                isinstance(obj, fabioh5.FrameData) and \
+                len(obj.shape) > 2
+
+            committed = None
+            if self.resume and member_initially_exists:
+                committed = self._get_committed_frames(h5_name, obj)
+                if committed is None:
+                    _logger.debug("Keeping complete dataset: " + h5_name)
+                elif not is_multiframe or committed == 0:
+                    # incomplete dataset which can't be completed
+                    _logger.warning("Writing again incomplete dataset: " + h5_name)
+                    del self._h5f[h5_name]
+                    member_initially_exists = False
+                    committed = None
+
+            if committed is not None:
+                _logger.info("Resuming dataset %s from frame %d",
+                             h5_name, committed)
+                ds = self._h5f[h5_name]
+                self._write_multiframe(ds, obj, committed)
+            elif self.resume and member_initially_exists:
+                ds = self._h5f[h5_name]
+            elif self.overwrite_data or not member_initially_exists:
+                if self.overwrite_data and member_initially_exists:
+                    _logger.warning("Overwriting dataset: " + h5_name)
+                    del self._h5f[h5_name]
 
-            if self.overwrite_data and member_initially_exists:
-                _logger.warning("Overwriting dataset: " + h5_name)
-                del self._h5f[h5_name]
-
-            if self.overwrite_data or not member_initially_exists:
-                if fabioh5 is not None and \
-                        isinstance(obj, fabioh5.FrameData) and \
-                        len(obj.shape) > 2:
+                if is_multiframe:
                     # special case of multiframe data
                     # write frame by frame to save memory usage low
                     ds = self._h5f.create_dataset(h5_name,
                                                   shape=obj.shape,
                                                   dtype=obj.dtype,
                                                   **self.create_dataset_args)
-                    for i, frame in enumerate(obj):
-                        ds[i] = frame
+                    self._write_multiframe(ds, obj, 0)
                 else:
                     # fancy arguments don't apply to small dataset
                     if obj.size < self.min_size:
@@ -234,6 +545,7 @@ class Hdf5Writer(object):
                     else:
                         ds = self._h5f.create_dataset(h5_name, data=obj.value,
                                                       **self.create_dataset_args)
+                    self.nbytes += ds.dtype.itemsize * ds.size
             else:
                 ds = self._h5f[h5_name]
 
@@ -243,7 +555,7 @@ class Hdf5Writer(object):
                     ds.attrs.create(key,
                                     _attr_utf8(obj.attrs[key]))
 
-            if not self.overwrite_data and member_initially_exists:
+            if not self.overwrite_data and not self.resume and member_initially_exists:
                 _logger.warning("Not overwriting existing dataset: " + h5_name)
 
         elif is_group(obj):
@@ -260,6 +572,132 @@ class Hdf5Writer(object):
                                      _attr_utf8(obj.attrs[key]))
 
 
+    def _get_committed_frames(self, h5_name, obj):
+        """Returns the number of frames already written in an incomplete
+        dataset, from the journal stored in its attributes.
+
+        :param str h5_name: Name of an existing member of the output file
+        :param obj: Source dataset
+        :returns: None if the dataset is complete, else the number of
+            frames which can be kept (0 if the dataset does not match the
+            source dataset anymore)
+        :rtype: Union[int,None]
+        """
+        ds = self._h5f[h5_name]
+        if not isinstance(ds, h5py.Dataset) or JOURNAL_ATTR not in ds.attrs:
+            return None
+        if ds.shape != obj.shape or ds.dtype != obj.dtype:
+            return 0
+        committed = int(ds.attrs[JOURNAL_ATTR])
+        if ds.chunks is not None:
+            # frames are written by whole chunks
+            committed -= committed % ds.chunks[0]
+        return committed
+
+    def _write_multiframe(self, ds, frame_data, start):
+        """Write the frames of a multi-frame dataset from a given frame.
+
+        The number of frames written is journaled in the attribute
+        :data:`JOURNAL_ATTR` of the dataset while it is incomplete, which
+        allows to resume an interrupted conversion.
+
+        :param h5py.Dataset ds: Dataset to fill
+        :param fabioh5.FrameData frame_data: Source dataset
+        :param int start: Index of the first frame to write
+        """
+        self._commit_frames(ds, start)
+        if self._use_pool(frame_data):
+            # decode frames in other processes
+            frames = _iter_frames_in_pool(frame_data, self.jobs, start)
+        else:
+            frames = (frame_data[i] for i in range(start, len(frame_data)))
+        self._write_frames(ds, frames, start)
+        del ds.attrs[JOURNAL_ATTR]
+
+    def _commit_frames(self, ds, committed):
+        """Update the journal of a multi-frame dataset.
+
+        :param h5py.Dataset ds: Dataset being written
+        :param int committed: Number of frames written from the beginning
+        """
+        ds.attrs[JOURNAL_ATTR] = committed
+        self._h5f.flush()
+
+    def _write_frames(self, ds, frames, start=0):
+        """Write the frames of a multi-frame dataset.
+
+        For chunked datasets, frames are written by blocks of whole chunks,
+        to avoid reading back and compressing again partial chunks.
+        Chunks compressed with the deflate filter are compressed in a pool
+        of threads and written directly to the file.
+
+        :param h5py.Dataset ds: Dataset to fill
+        :param Iterator[numpy.ndarray] frames: Frames in order
+        :param int start: Index of the first frame, which must be the first
+            frame of a chunk
+        """
+        journaled = [start]
+
+        def commit(index):
+            # the frames before index are written
+            if index - journaled[0] >= _JOURNAL_INTERVAL:
+                self._commit_frames(ds, index)
+                journaled[0] = index
+
+        if ds.chunks is None:
+            for i, frame in enumerate(frames, start):
+                ds[i] = frame
+                self.frame_count += 1
+                self.nbytes += frame.nbytes
+                commit(i + 1)
+            return
+
+        depth = ds.chunks[0]
+        filters = _get_direct_chunk_filters(ds)
+        if filters is None:
+            for block in _iter_blocks(frames, depth):
+                ds[start:start + len(block)] = block
+                start += len(block)
+                self.frame_count += len(block)
+                self.nbytes += block.nbytes
+                commit(start)
+            return
+
+        level, shuffle = filters
+        chunks_per_block = 1
+        for size, chunk_size in zip(ds.shape[1:], ds.chunks[1:]):
+            chunks_per_block *= (size + chunk_size - 1) // chunk_size
+
+        def iter_chunk_tasks(start):
+            for block in _iter_blocks(frames, depth):
+                for offset, chunk in _iter_chunks(block, start, ds.chunks, ds.dtype):
+                    yield offset, chunk, level, shuffle
+                start += len(block)
+                self.frame_count += len(block)
+                self.nbytes += block.nbytes
+
+        workers = max(self.jobs or 1, 1)
+        tasks = iter_chunk_tasks(start)
+        results = _iter_in_pool(_compress_chunk, tasks, workers, threads=True)
+        for i, (offset, compressed) in enumerate(results, 1):
+            ds.id.write_direct_chunk(offset, compressed)
+            if i % chunks_per_block == 0:
+                commit(min(offset[0] + depth, ds.shape[0]))
+
+    def _use_pool(self, frame_data):
+        """Returns True if the frames of a multi-frame dataset have to be
+        decoded in a pool of processes.
+
+        :param fabioh5.FrameData frame_data: Multi-frame dataset
+        """
+        if self.jobs is None or self.jobs < 2:
+            return False
+        if len(frame_data) == 0:
+            return False
+        file_name, _ = frame_data.get_frame_location(0)
+        return file_name is not None
+
+
 def _is_commonh5_group(grp):
     """Return True if grp is a commonh5 group.
     (h5py.Group objects are not commonh5 groups)"""
@@ -268,7 +706,8 @@ def _is_commonh5_group(grp):
 
 def write_to_h5(infile, h5file, h5path='/', mode="a",
                 overwrite_data=False, link_type="soft",
-                create_dataset_args=None, min_size=500):
+                create_dataset_args=None, min_size=500, jobs=None,
+                resume=False):
     """Write content of a h5py-like object into a HDF5 file.
 
     :param infile: Path of input file, or :class:`commonh5.File` object
@@ -291,6 +730,19 @@ def write_to_h5(infile, h5file, h5path='/', mode="a",
         These arguments are only applied to datasets larger than 1MB.
     :param int min_size: Minimum number of elements in a dataset to apply
         chunking and compression. Default is 500.
+    :param int jobs: Number of processes decoding the frames of multi-frame
+        datasets read with fabio, while this process writes them in order.
+        If ``None`` (default) or less than 2, frames are decoded by this
+        process. This is also the number of threads compressing the chunks
+        of these datasets with the gzip filter.
+    :param bool resume: If ``True``, continue an interrupted conversion
+        into an existing file. Complete datasets are kept, and multi-frame
+        datasets which were being written are completed from the last
+        frames recorded in their attribute :data:`JOURNAL_ATTR`.
+        Other incomplete datasets are written again.
+    :returns: The number of frames of multi-frame datasets and the number
+        of bytes of the datasets written
+    :rtype: Tuple[int,int]
 
     The structure of the spec data in an HDF5 file is described in the
     documentation of :mod:`silx.io.spech5`.
@@ -299,7 +751,9 @@ def write_to_h5(infile, h5file, h5path='/', mode="a",
                         overwrite_data=overwrite_data,
                         link_type=link_type,
                         create_dataset_args=create_dataset_args,
-                        min_size=min_size)
+                        min_size=min_size,
+                        jobs=jobs,
+                        resume=resume)
 
     # both infile and h5file can be either file handle or a file name: 4 cases
     if not isinstance(h5file, h5py.File) and not is_group(infile):
@@ -323,6 +777,8 @@ def write_to_h5(infile, h5file, h5path='/', mode="a",
             raise IOError("Cannot convert HDF5 file %s to HDF5" % infile.file.name)
         writer.write(infile, h5file)
 
+    return writer.frame_count, writer.nbytes
+
 
 def convert(infile, h5file, mode="w-", create_dataset_args=None):
     """Convert a supported file into an HDF5 file, write scans into the
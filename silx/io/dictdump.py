@@ -26,6 +26,10 @@ by text strings to following file formats: `HDF5, INI, JSON`
 """
 
 from collections import OrderedDict
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # Python 2
+    from collections import MutableMapping
 import json
 import logging
 import numpy
@@ -272,7 +276,143 @@ def _name_contains_string_in_list(name, strlist):
     return False
 
 
-def h5todict(h5file, path="/", exclude_names=None):
+class _LazyLeaf(object):
+    """Dataset of a :class:`LazyH5Dict` which is not read yet"""
+
+    __slots__ = ["dataset"]
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+
+class LazyH5Dict(MutableMapping):
+    """Dictionary returned by :func:`h5todict` in lazy mode.
+
+    Groups are exposed as nested :class:`LazyH5Dict`, and datasets are read
+    on first access, then kept in the dictionary. Datasets with at least
+    ``proxy_min_size`` elements are never read: the h5py-like dataset is
+    returned instead, and can be sliced.
+
+    The file must stay opened while datasets are accessed. If it was opened
+    by :func:`h5todict`, it is closed by :meth:`close`, or at the exit of a
+    ``with`` block.
+    """
+
+    def __init__(self, proxy_min_size=None, h5file=None):
+        """
+
+        :param int proxy_min_size: Minimum number of elements of the
+            datasets exposed as dataset objects
+        :param h5file: File to close with :meth:`close`
+        """
+        self.__items = {}
+        self.__proxy_min_size = proxy_min_size
+        self.__h5file = h5file
+
+    def _set_lazy_dataset(self, key, dataset):
+        """Add a dataset which will be read on first access"""
+        self.__items[key] = _LazyLeaf(dataset)
+
+    def is_loaded(self, key):
+        """Returns True if the item is a group, or a dataset already read.
+
+        :param str key: Name of the item
+        :rtype: bool
+        """
+        return not isinstance(self.__items[key], _LazyLeaf)
+
+    def __getitem__(self, key):
+        value = self.__items[key]
+        if isinstance(value, _LazyLeaf):
+            dataset = value.dataset
+            if self.__proxy_min_size is not None and \
+                    dataset.size >= self.__proxy_min_size:
+                return dataset
+            value = dataset[...]
+            self.__items[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self.__items[key] = value
+
+    def __delitem__(self, key):
+        del self.__items[key]
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __repr__(self):
+        items = []
+        for key, value in self.__items.items():
+            if isinstance(value, _LazyLeaf):
+                value = "<not loaded: %s>" % value.dataset.name
+            items.append("%r: %r" % (key, value))
+        return "{%s}" % ", ".join(items)
+
+    def todict(self):
+        """Returns a nested dictionary with all the datasets read, except
+        the datasets exposed as dataset objects.
+
+        :rtype: dict
+        """
+        ddict = {}
+        for key in self:
+            value = self[key]
+            if isinstance(value, LazyH5Dict):
+                value = value.todict()
+            ddict[key] = value
+        return ddict
+
+    def close(self):
+        """Close the file, if it was opened by :func:`h5todict`.
+
+        Datasets not read yet can't be accessed anymore.
+        """
+        if self.__h5file is not None:
+            self.__h5file.close()
+            self.__h5file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _group_to_dict(group, exclude_names, lazy, proxy_min_size, h5file=None):
+    """Read a group recursively.
+
+    Children are reached from their parent group, without resolving the
+    full path from the root of the file for each member.
+
+    :param group: h5py-like group
+    :param h5file: In lazy mode, file owned by the returned dictionary
+    :rtype: Union[dict,LazyH5Dict]
+    """
+    if lazy:
+        ddict = LazyH5Dict(proxy_min_size, h5file)
+    else:
+        ddict = {}
+    for key in group:
+        if _name_contains_string_in_list(key, exclude_names):
+            continue
+        item = group[key]
+        if is_group(item):
+            ddict[key] = _group_to_dict(item, exclude_names, lazy,
+                                        proxy_min_size)
+        elif lazy:
+            ddict._set_lazy_dataset(key, item)
+        else:
+            # Convert HDF5 dataset to numpy array
+            ddict[key] = item[...]
+    return ddict
+
+
+def h5todict(h5file, path="/", exclude_names=None, lazy=False,
+             proxy_min_size=None):
     """Read a HDF5 file and return a nested dictionary with the complete file
     structure and all data.
 
@@ -291,6 +431,16 @@ def h5todict(h5file, path="/", exclude_names=None):
                                              "/94.1/measurement",
                                              exclude_names="mca_")
 
+    In lazy mode, only the structure of the file is read, and the datasets
+    are read on first access. This allows to extract metadata from large
+    files without reading the detector data::
+
+        with h5todict("data.h5", "/entry", lazy=True,
+                      proxy_min_size=10**6) as entry:
+            title = entry["title"]
+            # h5py dataset, only the first frame is read
+            frame = entry["instrument"]["detector"]["data"][0]
+
 
     .. note:: This function requires `h5py <http://www.h5py.org/>`_ to be
         installed.
@@ -308,23 +458,35 @@ def h5todict(h5file, path="/", exclude_names=None):
         to read only a sub-group in the file
     :param List[str] exclude_names: Groups and datasets whose name contains
         a string in this list will be ignored. Default is None (ignore nothing)
+    :param bool lazy: If True, returns a :class:`LazyH5Dict` reading the
+        datasets on first access. If ``h5file`` is a file name, the file
+        stays opened until :meth:`LazyH5Dict.close` is called.
+    :param int proxy_min_size: In lazy mode, datasets with at least this
+        number of elements are returned as h5py-like datasets instead of
+        being read. Default is None (all datasets are read).
     :return: Nested dictionary
     """
     if h5py_missing:
         raise h5py_import_error
 
+    if proxy_min_size is not None and not lazy:
+        raise ValueError("proxy_min_size is only supported in lazy mode")
+
+    if lazy:
+        if not is_h5_file_like(h5file):
+            h5f = h5open(h5file)
+            try:
+                # the root dictionary owns the file
+                return _group_to_dict(h5f[path], exclude_names, True,
+                                      proxy_min_size, h5file=h5f)
+            except Exception:
+                h5f.close()
+                raise
+        return _group_to_dict(h5file[path], exclude_names, True,
+                              proxy_min_size)
+
     with _SafeH5FileRead(h5file) as h5f:
-        ddict = {}
-        for key in h5f[path]:
-            if _name_contains_string_in_list(key, exclude_names):
-                continue
-            if is_group(h5f[path + "/" + key]):
-                ddict[key] = h5todict(h5f,
-                                      path + "/" + key,
-                                      exclude_names=exclude_names)
-            else:
-                # Convert HDF5 dataset to numpy array
-                ddict[key] = h5f[path + "/" + key][...]
+        ddict = _group_to_dict(h5f[path], exclude_names, False, None)
 
     return ddict
 
@@ -43,6 +43,7 @@ import numpy
 
 from . import commonh5
 from silx.third_party import six
+from silx.third_party import concurrent_futures
 from silx import version as silx_version
 import silx.utils.number
 
@@ -96,9 +97,157 @@ class _FileSeries(fabio.file_series.file_series):
         return self[self._current]
 
 
+def _read_header(file_name):
+    """Returns a fabio image containing the header of a file, without
+    decoding the pixels when the format allows it.
+
+    :param str file_name: Name of the image file
+    :rtype: fabio.fabioimage.FabioImage
+    """
+    try:
+        return fabio.openheader(file_name)
+    except Exception:
+        # Some formats do not provide a header only reader
+        _logger.debug("Backtrace", exc_info=True)
+        with fabio.open(file_name) as fabio_image:
+            return fabio_image
+
+
+def _get_raw_edf_layout(fabio_image, frame_id):
+    """Returns the location of the pixels of an EDF frame, if they are
+    stored uncompressed, in native byte order, in the file itself.
+
+    :param fabio.edfimage.EdfImage fabio_image: An EDF image
+    :param int frame_id: Index of the frame in the image
+    :returns: The offset in bytes of the frame in the file, its shape and
+        its type, or None if the frame can't be memory mapped
+    :rtype: Union[Tuple[int,Tuple[int],numpy.dtype],None]
+    """
+    if not isinstance(fabio_image, fabio.edfimage.EdfImage):
+        return None
+    frames = getattr(fabio_image, "_frames", None)
+    if not frames:
+        return None
+    frame = frames[frame_id]
+
+    if getattr(frame, "_data_compression", "unknown") is not None:
+        return None
+    if getattr(frame, "bfname", None) is not None:
+        # pixels stored in another file
+        return None
+    if not isinstance(getattr(frame, "file", None), fabio.fabioutils.File):
+        # compressed file (gzip, bz2) or file-like object
+        return None
+
+    dtype = getattr(frame, "_dtype", None)
+    if dtype is None:
+        # already decoded by fabio
+        data = getattr(frame, "_data", None)
+        if data is None:
+            return None
+        dtype = data.dtype
+    dtype = numpy.dtype(dtype)
+    if frame.swap_needed():
+        return None
+
+    start = getattr(frame, "start", None)
+    shape = tuple(frame.shape)
+    if start is None or frame.size != int(numpy.prod(shape)) * dtype.itemsize:
+        return None
+    if frame.size == 0:
+        return None
+    return start, shape, dtype
+
+
+class _FrameCache(object):
+    """Least recently used cache of frames, bounded by a size in bytes.
+
+    :param int max_size: Maximum number of bytes hold by the cache
+    """
+
+    def __init__(self, max_size):
+        self.__frames = collections.OrderedDict()
+        self.__size = 0
+        self.__max_size = max_size
+
+    def max_size(self):
+        """Returns the maximum number of bytes hold by the cache.
+
+        :rtype: int
+        """
+        return self.__max_size
+
+    def set_max_size(self, max_size):
+        """Set the maximum number of bytes hold by the cache.
+
+        Least recently used frames are dropped if needed.
+
+        :param int max_size: Maximum number of bytes
+        """
+        self.__max_size = max_size
+        self.__shrink(0)
+
+    def size(self):
+        """Returns the number of bytes currently hold by the cache.
+
+        :rtype: int
+        """
+        return self.__size
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def __contains__(self, key):
+        return key in self.__frames
+
+    def get(self, key):
+        """Returns a cached frame, else None.
+
+        :param key: Identifier of the frame
+        :rtype: Union[numpy.ndarray,None]
+        """
+        data = self.__frames.pop(key, None)
+        if data is not None:
+            # Mark it as the most recently used
+            self.__frames[key] = data
+        return data
+
+    def set(self, key, data):
+        """Store a frame into the cache.
+
+        Frames bigger than the cache are not stored.
+
+        :param key: Identifier of the frame
+        :param numpy.ndarray data: Frame to store
+        """
+        previous = self.__frames.pop(key, None)
+        if previous is not None:
+            self.__size -= previous.nbytes
+        if data.nbytes > self.__max_size:
+            return
+        self.__shrink(data.nbytes)
+        self.__frames[key] = data
+        self.__size += data.nbytes
+
+    def clear(self):
+        """Remove all the frames from the cache"""
+        self.__frames.clear()
+        self.__size = 0
+
+    def __shrink(self, nbytes):
+        """Drop least recently used frames until `nbytes` can be added."""
+        while len(self.__frames) > 0 and self.__size + nbytes > self.__max_size:
+            _key, data = self.__frames.popitem(last=False)
+            self.__size -= data.nbytes
+
+
 class FrameData(commonh5.LazyLoadableDataset):
     """Expose a cube of image from a Fabio file using `FabioReader` as
-    cache."""
+    cache.
+
+    Until the full data is requested, indexing a multi-frame file only reads
+    the selected frames, one by one, through the frame cache of the reader.
+    """
 
     def __init__(self, name, fabio_reader, parent=None):
         if fabio_reader.is_spectrum():
@@ -123,6 +272,18 @@ class FrameData(commonh5.LazyLoadableDataset):
             shape0 = self.__fabio_reader.frame_count()
             shape1, shape2 = first_image.data.shape
             self._shape = shape0, shape1, shape2
+        elif self.__fabio_reader.frame_count() > 1 and not self._is_initialized:
+            # Use the frame description to avoid decoding the data
+            dtypes = set([])
+            max_shape = []
+            for fabio_frame in self.__fabio_reader.iter_frames():
+                dtypes.add(numpy.dtype(fabio_frame.dtype))
+                shape = fabio_frame.shape
+                max_shape += [0] * (len(shape) - len(max_shape))
+                for dim, size in enumerate(shape):
+                    max_shape[dim] = max(max_shape[dim], size)
+            self._dtype = numpy.result_type(*dtypes)
+            self._shape = (self.__fabio_reader.frame_count(),) + tuple(max_shape)
         else:
             self._dtype = super(commonh5.LazyLoadableDataset, self).dtype
             self._shape = super(commonh5.LazyLoadableDataset, self).shape
@@ -139,20 +300,161 @@ class FrameData(commonh5.LazyLoadableDataset):
             self._update_cache()
         return self._shape
 
+    @property
+    def size(self):
+        return int(numpy.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0]
+
     def __iter__(self):
         for frame in self.__fabio_reader.iter_frames():
             yield frame.data
 
+    def _is_frame_accessible(self):
+        """Returns true if the data can be accessed frame by frame instead of
+        loading the full cube.
+
+        :rtype: bool
+        """
+        if self._is_initialized:
+            return False
+        if isinstance(self.__fabio_reader.fabio_file(),
+                      fabio.file_series.file_series):
+            return True
+        return self.__fabio_reader.frame_count() > 1
+
+    def _get_frame(self, frame_id):
+        """Returns a frame normalized to the shape and the type of the
+        dataset (see :meth:`normalize_frame`).
+
+        :param int frame_id: Index of the frame
+        :rtype: numpy.ndarray
+        """
+        data = self.__fabio_reader.get_frame_data(frame_id)
+        return self.normalize_frame(data)
+
+    def get_frame_location(self, frame_id):
+        """Returns the name of the file containing a frame and the index of
+        the frame in this file.
+
+        See :meth:`FabioReader.get_frame_location`.
+
+        :param int frame_id: Index of the frame
+        :rtype: Tuple[Union[str,None],int]
+        """
+        return self.__fabio_reader.get_frame_location(frame_id)
+
+    def normalize_frame(self, data):
+        """Returns a frame normalized to the shape and the type of the
+        dataset.
+
+        If the frame is smaller than expected, the empty space is set to 0.
+
+        :param numpy.ndarray data: Data of a frame
+        :rtype: numpy.ndarray
+        """
+        frame_shape = self.shape[1:]
+        if data.shape == frame_shape and data.dtype == self.dtype:
+            return data
+
+        normalized = numpy.zeros(frame_shape, dtype=self.dtype)
+        location = [slice(0, min(i, j)) for i, j in zip(data.shape, frame_shape)]
+        source = data[tuple(location)]
+        while len(location) < len(frame_shape):
+            location.append(0)
+        normalized[tuple(location)] = source
+        return normalized
+
+    def _split_frame_selection(self, item):
+        """Split a selection into the selection of the frames and the
+        selection applied to each of them.
+
+        :param item: Selection as provided to :meth:`__getitem__`
+        :returns: A tuple containing the frame selection and the frame
+            content selection, else None if the selection can't be applied
+            frame by frame.
+        """
+        if not isinstance(item, tuple):
+            item = (item,)
+        if any(i is None for i in item):
+            # numpy.newaxis
+            return None
+        if sum(1 for i in item if i is Ellipsis) > 1:
+            return None
+
+        if len(item) == 0:
+            frame_key, frame_item = slice(None), tuple()
+        elif item[0] is Ellipsis and len(item) - 1 < len(self.shape):
+            # The ellipsis covers the frame axis
+            frame_key, frame_item = slice(None), item
+        elif item[0] is Ellipsis:
+            frame_key, frame_item = item[1], item[2:]
+        else:
+            frame_key, frame_item = item[0], item[1:]
+
+        def is_basic(key):
+            return key is Ellipsis or isinstance(key, (slice, six.integer_types, numpy.integer))
+
+        if not is_basic(frame_key):
+            frame_key = numpy.asarray(frame_key)
+            if frame_key.dtype == numpy.bool_ and frame_key.ndim > 1:
+                # The mask selects values across frames
+                return None
+
+        advanced = [i for i in frame_item if not is_basic(i)]
+        if not isinstance(frame_key, (six.integer_types, numpy.integer)):
+            # Advanced indexes are broadcast together by numpy
+            if len(advanced) > 1 or (len(advanced) > 0 and not is_basic(frame_key)):
+                return None
+        return frame_key, frame_item
+
+    def _get_frames(self, item):
+        """Returns a selection of the data reading only the selected frames.
+
+        :param item: Selection as provided to :meth:`__getitem__`
+        :rtype: Union[numpy.ndarray,None]
+        :returns: The selected data, else None if the selection can't be
+            applied frame by frame
+        """
+        selection = self._split_frame_selection(item)
+        if selection is None:
+            return None
+        frame_key, frame_item = selection
+
+        try:
+            frame_ids = numpy.arange(self.shape[0])[frame_key]
+        except (IndexError, TypeError, ValueError):
+            # Not a selection of frames
+            return None
+        if frame_ids.ndim == 0:
+            data = self._get_frame(int(frame_ids))[frame_item]
+            if isinstance(data, numpy.ndarray):
+                # Do not expose the cached frame
+                data = data.copy()
+            return data
+        if frame_ids.ndim != 1:
+            return None
+
+        if len(frame_ids) == 0:
+            empty_frame = numpy.empty(self.shape[1:], dtype=self.dtype)
+            return numpy.empty((0,) + empty_frame[frame_item].shape, dtype=self.dtype)
+
+        result = None
+        for index, frame_id in enumerate(frame_ids):
+            data = self._get_frame(int(frame_id))[frame_item]
+            if result is None:
+                shape = (len(frame_ids),) + numpy.shape(data)
+                result = numpy.empty(shape, dtype=self.dtype)
+            result[index] = data
+        return result
+
     def __getitem__(self, item):
-        # optimization for fetching a single frame if data not already loaded
-        if not self._is_initialized:
-            if isinstance(item, six.integer_types) and \
-                    isinstance(self.__fabio_reader.fabio_file(),
-                               fabio.file_series.file_series):
-                if item < 0:
-                    # negative indexing
-                    item += len(self)
-                return self.__fabio_reader.fabio_file().jump_image(item).data
+        # optimization for fetching frames if data not already loaded
+        if self._is_frame_accessible():
+            data = self._get_frames(item)
+            if data is not None:
+                return data
         return super(FrameData, self).__getitem__(item)
 
 
@@ -326,7 +628,8 @@ class FabioReader(object):
     COUNTER = 1
     POSITIONER = 2
 
-    def __init__(self, file_name=None, fabio_image=None, file_series=None):
+    def __init__(self, file_name=None, fabio_image=None, file_series=None,
+                 header_workers=None, mmap=False):
         """
         Constructor
 
@@ -336,7 +639,13 @@ class FabioReader(object):
         :param Union[list[str],fabio.file_series.file_series] file_series: An
             list of file name or a :class:`fabio.file_series.file_series`
             instance
+        :param int header_workers: Number of threads used to read the headers
+            of a file series. If 0, headers are read synchronously. If None,
+            `silx.config.DEFAULT_IO_HEADER_WORKERS` is used.
+        :param bool mmap: If True, uncompressed EDF frames are returned as
+            read-only memory maps of the files instead of being decoded.
         """
+        self.__mmap = mmap
         self.__at_least_32bits = False
         self.__signed_type = False
 
@@ -346,6 +655,11 @@ class FabioReader(object):
         self.__measurements = {}
         self.__key_filters = set([])
         self.__data = None
+        self.__frame_cache = _FrameCache(silx.config.DEFAULT_IO_FRAME_CACHE_SIZE)
+        self.__pending_headers = None
+        if header_workers is None:
+            header_workers = silx.config.DEFAULT_IO_HEADER_WORKERS
+        self.__header_workers = header_workers
         self.__frame_count = self.frame_count()
         self._read()
 
@@ -387,10 +701,30 @@ class FabioReader(object):
             # self.__fabio_image.close()
             pass
         self.__fabio_image = None
+        self.__frame_cache.clear()
+        if self.__pending_headers is not None:
+            for future in self.__pending_headers:
+                future.cancel()
+            self.__pending_headers = None
 
     def fabio_file(self):
         return self.__fabio_file
 
+    def set_frame_cache_size(self, size):
+        """Set the maximum size of the cache used by :meth:`get_frame_data`.
+
+        :param int size: Size in bytes
+        """
+        self.__frame_cache.set_max_size(size)
+
+    def get_frame_cache_size(self):
+        """Returns the maximum size of the cache used by
+        :meth:`get_frame_data`.
+
+        :rtype: int
+        """
+        return self.__frame_cache.max_size()
+
     def frame_count(self):
         """Returns the number of frames available."""
         if isinstance(self.__fabio_file, fabio.file_series.file_series):
@@ -420,6 +754,116 @@ class FabioReader(object):
         else:
             raise TypeError("Unsupported type %s", self.__fabio_file.__class__)
 
+    def get_frame_data(self, frame_id):
+        """Returns the data of a single frame.
+
+        Decoded frames are stored in a least recently used cache bounded by
+        :meth:`get_frame_cache_size`.
+
+        :param int frame_id: Index of the frame
+        :rtype: numpy.ndarray
+        """
+        if frame_id < 0 or frame_id >= self.__frame_count:
+            raise IndexError("Frame %d out of range" % frame_id)
+        if self.__mmap:
+            data = self._map_frame(frame_id)
+            if data is not None:
+                return data
+        data = self.__frame_cache.get(frame_id)
+        if data is not None:
+            return data
+
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            with self.__fabio_file.jump_image(frame_id) as fabio_image:
+                data = fabio_image.data
+        elif isinstance(self.__fabio_file, fabio.fabioimage.FabioImage):
+            if self.__fabio_file.nframes == 1:
+                data = self.__fabio_file.data
+            else:
+                data = self.__fabio_file.getframe(frame_id).data
+        else:
+            raise TypeError("Unsupported type %s", self.__fabio_file.__class__)
+
+        self.__frame_cache.set(frame_id, data)
+        return data
+
+    def _map_frame(self, frame_id):
+        """Returns a read-only memory map of a frame, if it is stored
+        uncompressed in an EDF file, else None.
+
+        :param int frame_id: Index of the frame
+        :rtype: Union[numpy.memmap,None]
+        """
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            with self.__fabio_file.jump_image(frame_id) as fabio_image:
+                layout = _get_raw_edf_layout(fabio_image, 0)
+                file_name = fabio_image.filename
+        else:
+            fabio_image = self.__fabio_file
+            layout = _get_raw_edf_layout(fabio_image, frame_id)
+            file_name = fabio_image.filename
+        if layout is None:
+            return None
+        offset, shape, dtype = layout
+        return numpy.memmap(file_name, dtype=dtype, mode="r",
+                            offset=offset, shape=shape)
+
+    def _map_frames(self):
+        """Returns a read-only view of all the frames of a multi-frame EDF
+        file backed by a memory map, if the frames are stored uncompressed,
+        with the same shape and type, at a regular interval in the file.
+
+        :rtype: Union[numpy.ndarray,None]
+        """
+        if not isinstance(self.__fabio_file, fabio.edfimage.EdfImage):
+            return None
+        layouts = [_get_raw_edf_layout(self.__fabio_file, i)
+                   for i in range(self.__frame_count)]
+        if None in layouts:
+            return None
+        offsets = [layout[0] for layout in layouts]
+        if len(set([layout[1:] for layout in layouts])) != 1:
+            return None
+        _, shape, dtype = layouts[0]
+        frame_size = int(numpy.prod(shape)) * dtype.itemsize
+        if len(offsets) > 1:
+            stride = offsets[1] - offsets[0]
+            if stride < frame_size:
+                return None
+            if numpy.any(numpy.diff(offsets) != stride):
+                return None
+        else:
+            return numpy.memmap(self.__fabio_file.filename, dtype=dtype, mode="r",
+                                offset=offsets[0], shape=(1,) + shape)
+        data = numpy.memmap(self.__fabio_file.filename, dtype=numpy.uint8, mode="r")
+        # C-order strides of a frame
+        frame_strides = []
+        item_stride = dtype.itemsize
+        for length in reversed(shape):
+            frame_strides.insert(0, item_stride)
+            item_stride *= length
+        strides = (stride,) + tuple(frame_strides)
+        return numpy.ndarray(shape=(len(offsets),) + shape, dtype=dtype,
+                             buffer=data, offset=offsets[0], strides=strides)
+
+    def get_frame_location(self, frame_id):
+        """Returns the name of the file containing a frame and the index of
+        the frame in this file.
+
+        It allows to read the frame again from another process.
+
+        :param int frame_id: Index of the frame
+        :rtype: Tuple[Union[str,None],int]
+        """
+        if frame_id < 0 or frame_id >= self.__frame_count:
+            raise IndexError("Frame %d out of range" % frame_id)
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            return self.__fabio_file[frame_id], 0
+        elif isinstance(self.__fabio_file, fabio.fabioimage.FabioImage):
+            return self.__fabio_file.filename, frame_id
+        else:
+            raise TypeError("Unsupported type %s", self.__fabio_file.__class__)
+
     def _create_data(self):
         """Initialize hold data by merging all frames into a single cube.
 
@@ -428,6 +872,13 @@ class FabioReader(object):
 
         The computation is cached into the class, and only done ones.
         """
+        if self.__mmap:
+            data = self._map_frames()
+            if data is not None:
+                if len(data) == 1:
+                    return data[0]
+                return data
+
         images = []
         for fabio_frame in self.iter_frames():
             images.append(fabio_frame.data)
@@ -484,6 +935,7 @@ class FabioReader(object):
 
         :rtype: list
         """
+        self._read_pending_headers()
         return self.__get_dict(kind).keys()
 
     def get_value(self, kind, name):
@@ -491,6 +943,7 @@ class FabioReader(object):
 
         :rtype: numpy.ndarray
         """
+        self._read_pending_headers()
         value = self.__get_dict(kind)[name]
         if not isinstance(value, numpy.ndarray):
             if kind in [self.COUNTER, self.POSITIONER]:
@@ -531,16 +984,63 @@ class FabioReader(object):
 
     def _read(self):
         """Read all metadata from the fabio file and store it into this
-        object."""
+        object.
 
+        The headers of a file series are read without decoding the pixels.
+        If header workers are available, they are read in background, and
+        only harvested when a metadata is requested.
+        """
         file_series = isinstance(self.__fabio_file, fabio.file_series.file_series)
         if not file_series:
             self._enable_key_filters(self.__fabio_file)
+            for frame_id, fabio_frame in enumerate(self.iter_frames()):
+                self._read_frame(frame_id, fabio_frame.header)
+            return
+
+        if self.__header_workers <= 0:
+            for frame_id, file_name in enumerate(self.__fabio_file):
+                self._read_header_frame(frame_id, _read_header(file_name))
+            return
+
+        executor = concurrent_futures.ThreadPoolExecutor(
+            max_workers=self.__header_workers)
+        futures = [executor.submit(_read_header, file_name)
+                   for file_name in self.__fabio_file]
+        # Already submitted tasks are still processed
+        executor.shutdown(wait=False)
+        self.__pending_headers = futures
+
+    def _read_header_frame(self, frame_id, fabio_header):
+        """Read the metadata of a frame from a file series.
+
+        :param int frame_id: Index of the frame
+        :param fabio.fabioimage.FabioImage fabio_header: Image providing the
+            header of the frame
+        """
+        self._enable_key_filters(fabio_header)
+        self._read_frame(frame_id, fabio_header.header)
+
+    def _read_pending_headers(self):
+        """Wait for the headers read in background and store their metadata
+        into this object."""
+        if self.__pending_headers is None:
+            return
+        futures = self.__pending_headers
+        self.__pending_headers = None
+        for frame_id, future in enumerate(futures):
+            self._read_header_frame(frame_id, future.result())
+
+    def _get_first_header(self):
+        """Returns the header of the first frame, without decoding the
+        pixels when possible.
 
-        for frame_id, fabio_frame in enumerate(self.iter_frames()):
-            if file_series:
-                self._enable_key_filters(fabio_frame)
-            self._read_frame(frame_id, fabio_frame.header)
+        :rtype: dict
+        """
+        if isinstance(self.__fabio_file, fabio.file_series.file_series):
+            if self.__pending_headers is not None:
+                return self.__pending_headers[0].result().header
+            return _read_header(self.__fabio_file[0]).header
+        return self.__fabio_file.header
 
     def _is_filtered_key(self, key):
         """
@@ -746,8 +1246,10 @@ class EdfFabioReader(FabioReader):
     motor_mne are parsed using a special way.
     """
 
-    def __init__(self, file_name=None, fabio_image=None, file_series=None):
-        FabioReader.__init__(self, file_name, fabio_image, file_series)
+    def __init__(self, file_name=None, fabio_image=None, file_series=None,
+                 header_workers=None, mmap=False):
+        FabioReader.__init__(self, file_name, fabio_image, file_series,
+                             header_workers, mmap)
         self.__unit_cell_abc = None
         self.__unit_cell_alphabetagamma = None
         self.__ub_matrix = None
@@ -810,15 +1312,6 @@ class EdfFabioReader(FabioReader):
             else:
                 raise Exception("State unexpected (base_key: %s)" % base_key)
 
-    def _get_first_header(self):
-        """
-        ..note:: This function can be cached
-        """
-        fabio_file = self.fabio_file()
-        if isinstance(fabio_file, fabio.file_series.file_series):
-            return fabio_file.jump_image(0).header
-        return fabio_file.header
-
     def has_ub_matrix(self):
         """Returns true if a UB matrix is available.
 
@@ -903,7 +1396,8 @@ class File(commonh5.File):
     """Class which handle a fabio image as a mimick of a h5py.File.
     """
 
-    def __init__(self, file_name=None, fabio_image=None, file_series=None):
+    def __init__(self, file_name=None, fabio_image=None, file_series=None,
+                 frame_cache_size=None, header_workers=None, mmap=False):
         """
         Constructor
 
@@ -913,8 +1407,22 @@ class File(commonh5.File):
         :param Union[list[str],fabio.file_series.file_series] file_series: An
             list of file name or a :class:`fabio.file_series.file_series`
             instance
+        :param int frame_cache_size: Size in bytes of the cache used to read
+            frames one by one. If None, `silx.config.DEFAULT_IO_FRAME_CACHE_SIZE`
+            is used.
+        :param int header_workers: Number of threads used to read the headers
+            of a file series. If 0, headers are read synchronously. If None,
+            `silx.config.DEFAULT_IO_HEADER_WORKERS` is used.
+        :param bool mmap: If True, the frames stored uncompressed in EDF files
+            are exposed as read-only memory maps of the files, so only the
+            selected pixels are read from the disk. Frames of other formats
+            are decoded as usual.
         """
-        self.__fabio_reader = self.create_fabio_reader(file_name, fabio_image, file_series)
+        self.__fabio_reader = self.create_fabio_reader(
+            file_name, fabio_image, file_series, header_workers=header_workers,
+            mmap=mmap)
+        if frame_cache_size is not None:
+            self.__fabio_reader.set_frame_cache_size(frame_cache_size)
         if fabio_image is not None:
             file_name = fabio_image.filename
 
@@ -956,7 +1464,8 @@ class File(commonh5.File):
 
         return scan
 
-    def create_fabio_reader(self, file_name, fabio_image, file_series):
+    def create_fabio_reader(self, file_name, fabio_image, file_series,
+                            header_workers=None, mmap=False):
         """Factory to create fabio reader.
 
         :rtype: FabioReader"""
@@ -989,9 +1498,11 @@ class File(commonh5.File):
             assert(False)
 
         if use_edf_reader:
-            reader = EdfFabioReader(file_name, fabio_image, file_series)
+            reader = EdfFabioReader(file_name, fabio_image, file_series,
+                                    header_workers, mmap)
         else:
-            reader = FabioReader(file_name, fabio_image, file_series)
+            reader = FabioReader(file_name, fabio_image, file_series,
+                                 header_workers, mmap)
         return reader
 
     def close(self):
@@ -33,6 +33,11 @@ Following functions help you check the validity of a existing NXdata group:
  - :func:`is_NXentry_with_default_NXdata`
  - :func:`is_NXroot_with_default_NXdata`
 
+To check many groups at once, possibly in a pool of threads:
+ - :func:`get_nxdata_issues_many`
+ - :func:`is_valid_nxdata_many`
+ - :func:`get_default_many`
+
 To help you write a NXdata group, you can use :func:`save_NXdata`.
 
 .. currentmodule:: silx.io.nxdata
@@ -55,10 +60,17 @@ Functions
 
 .. autofunction:: is_NXroot_with_default_NXdata
 
+.. autofunction:: get_nxdata_issues_many
+
+.. autofunction:: is_valid_nxdata_many
+
+.. autofunction:: get_default_many
+
 .. autofunction:: save_NXdata
 
 """
 from .parse import NXdata, get_default, is_valid_nxdata, InvalidNXdataError, \
-    is_NXentry_with_default_NXdata, is_NXroot_with_default_NXdata
+    is_NXentry_with_default_NXdata, is_NXroot_with_default_NXdata, \
+    get_nxdata_issues_many, is_valid_nxdata_many, get_default_many
 from ._utils import get_attr_as_unicode, get_attr_as_string, nxdata_logger
 from .write import save_NXdata
@@ -38,10 +38,21 @@ Other public functions:
  - :func:`is_NXroot_with_default_NXdata`
  - :func:`is_NXentry_with_default_NXdata`
 
+To check many groups at once, for instance all the entries of a file, use:
+
+ - :func:`get_nxdata_issues_many`
+ - :func:`is_valid_nxdata_many`
+ - :func:`get_default_many`
+
 """
 
+import collections
+import os
+import threading
+
 import numpy
 from silx.io.utils import is_group, is_file, is_dataset
+from silx.third_party import concurrent_futures
 
 from ._utils import get_attr_as_unicode, INTERPDIM, nxdata_logger, \
     get_uncertainties_names, get_signal_name, \
@@ -54,6 +65,17 @@ __license__ = "MIT"
 __date__ = "17/04/2018"
 
 
+_ISSUES_CACHE_SIZE = 100000
+"""Maximum number of groups whose issues are cached by
+:func:`get_nxdata_issues_many`"""
+
+_issues_cache = collections.OrderedDict()
+"""Issues of the groups validated by :func:`get_nxdata_issues_many`, indexed
+by *(file name, group name, file modification time)*"""
+
+_issues_cache_lock = threading.Lock()
+
+
 class InvalidNXdataError(Exception):
     pass
 
@@ -147,105 +169,7 @@ class NXdata(object):
 
     def _validate(self):
         """Fill :attr:`issues` with error messages for each error found."""
-        if not is_group(self.group):
-            raise TypeError("group must be a h5py-like group")
-        if get_attr_as_unicode(self.group, "NX_class") != "NXdata":
-            self.issues.append("Group has no attribute @NX_class='NXdata'")
-
-        signal_name = get_signal_name(self.group)
-        if signal_name is None:
-            self.issues.append("No @signal attribute on the NXdata group, "
-                               "and no dataset with a @signal=1 attr found")
-            # very difficult to do more consistency tests without signal
-            return
-
-        elif signal_name not in self.group or not is_dataset(self.group[signal_name]):
-            self.issues.append("Cannot find signal dataset '%s'" % signal_name)
-            return
-
-        auxiliary_signals_names = get_auxiliary_signals_names(self.group)
-        self.issues += validate_auxiliary_signals(self.group,
-                                                  signal_name,
-                                                  auxiliary_signals_names)
-
-        if "axes" in self.group.attrs:
-            axes_names = get_attr_as_unicode(self.group, "axes")
-            if isinstance(axes_names, (six.text_type, six.binary_type)):
-                axes_names = [axes_names]
-
-            self.issues += validate_number_of_axes(self.group, signal_name,
-                                                   num_axes=len(axes_names))
-
-            # Test consistency of @uncertainties
-            uncertainties_names = get_uncertainties_names(self.group, signal_name)
-            if uncertainties_names is not None:
-                if len(uncertainties_names) != len(axes_names):
-                    self.issues.append("@uncertainties does not define the same " +
-                                       "number of fields than @axes")
-
-            # Test individual axes
-            is_scatter = True  # true if all axes have the same size as the signal
-            signal_size = 1
-            for dim in self.group[signal_name].shape:
-                signal_size *= dim
-            polynomial_axes_names = []
-            for i, axis_name in enumerate(axes_names):
-
-                if axis_name == ".":
-                    continue
-                if axis_name not in self.group or not is_dataset(self.group[axis_name]):
-                    self.issues.append("Could not find axis dataset '%s'" % axis_name)
-                    continue
-
-                axis_size = 1
-                for dim in self.group[axis_name].shape:
-                    axis_size *= dim
-
-                if len(self.group[axis_name].shape) != 1:
-                    # I don't know how to interpret n-D axes
-                    self.issues.append("Axis %s is not 1D" % axis_name)
-                    continue
-                else:
-                    # for a  1-d axis,
-                    fg_idx = self.group[axis_name].attrs.get("first_good", 0)
-                    lg_idx = self.group[axis_name].attrs.get("last_good", len(self.group[axis_name]) - 1)
-                    axis_len = lg_idx + 1 - fg_idx
-
-                if axis_len != signal_size:
-                    if axis_len not in self.group[signal_name].shape + (1, 2):
-                        self.issues.append(
-                                "Axis %s number of elements does not " % axis_name +
-                                "correspond to the length of any signal dimension,"
-                                " it does not appear to be a constant or a linear calibration," +
-                                " and this does not seem to be a scatter plot.")
-                        continue
-                    elif axis_len in (1, 2):
-                        polynomial_axes_names.append(axis_name)
-                    is_scatter = False
-                else:
-                    if not is_scatter:
-                        self.issues.append(
-                                "Axis %s number of elements is equal " % axis_name +
-                                "to the length of the signal, but this does not seem" +
-                                " to be a scatter (other axes have different sizes)")
-                        continue
-
-                # Test individual uncertainties
-                errors_name = axis_name + "_errors"
-                if errors_name not in self.group and uncertainties_names is not None:
-                    errors_name = uncertainties_names[i]
-                    if errors_name in self.group and axis_name not in polynomial_axes_names:
-                        if self.group[errors_name].shape != self.group[axis_name].shape:
-                            self.issues.append(
-                                    "Errors '%s' does not have the same " % errors_name +
-                                    "dimensions as axis '%s'." % axis_name)
-
-        # test dimensions of errors associated with signal
-        if "errors" in self.group and is_dataset(self.group["errors"]):
-            if self.group["errors"].shape != self.group[signal_name].shape:
-                self.issues.append(
-                        "Dataset containing standard deviations must " +
-                        "have the same dimensions as the signal.")
+        self.issues += _get_nxdata_issues(self.group)
 
     @property
     def signal_dataset_name(self):
@@ -738,6 +662,119 @@ class NXdata(object):
         return True
 
 
+def _get_nxdata_issues(group):
+    """Return a list of error messages for each error found in a NXdata
+    group.
+
+    Only the attributes and the shapes of the datasets are read.
+
+    :param group: h5py-like group
+    :rtype: List[str]
+    :raise TypeError: if group is not a h5py-like group
+    """
+    issues = []
+    if not is_group(group):
+        raise TypeError("group must be a h5py-like group")
+    if get_attr_as_unicode(group, "NX_class") != "NXdata":
+        issues.append("Group has no attribute @NX_class='NXdata'")
+
+    signal_name = get_signal_name(group)
+    if signal_name is None:
+        issues.append("No @signal attribute on the NXdata group, "
+                      "and no dataset with a @signal=1 attr found")
+        # very difficult to do more consistency tests without signal
+        return issues
+
+    elif signal_name not in group or not is_dataset(group[signal_name]):
+        issues.append("Cannot find signal dataset '%s'" % signal_name)
+        return issues
+
+    auxiliary_signals_names = get_auxiliary_signals_names(group)
+    issues += validate_auxiliary_signals(group,
+                                         signal_name,
+                                         auxiliary_signals_names)
+
+    if "axes" in group.attrs:
+        axes_names = get_attr_as_unicode(group, "axes")
+        if isinstance(axes_names, (six.text_type, six.binary_type)):
+            axes_names = [axes_names]
+
+        issues += validate_number_of_axes(group, signal_name,
+                                          num_axes=len(axes_names))
+
+        # Test consistency of @uncertainties
+        uncertainties_names = get_uncertainties_names(group, signal_name)
+        if uncertainties_names is not None:
+            if len(uncertainties_names) != len(axes_names):
+                issues.append("@uncertainties does not define the same " +
+                              "number of fields than @axes")
+
+        # Test individual axes
+        is_scatter = True  # true if all axes have the same size as the signal
+        signal_size = 1
+        for dim in group[signal_name].shape:
+            signal_size *= dim
+        polynomial_axes_names = []
+        for i, axis_name in enumerate(axes_names):
+
+            if axis_name == ".":
+                continue
+            if axis_name not in group or not is_dataset(group[axis_name]):
+                issues.append("Could not find axis dataset '%s'" % axis_name)
+                continue
+
+            axis_size = 1
+            for dim in group[axis_name].shape:
+                axis_size *= dim
+
+            if len(group[axis_name].shape) != 1:
+                # I don't know how to interpret n-D axes
+                issues.append("Axis %s is not 1D" % axis_name)
+                continue
+            else:
+                # for a  1-d axis,
+                fg_idx = group[axis_name].attrs.get("first_good", 0)
+                lg_idx = group[axis_name].attrs.get("last_good", len(group[axis_name]) - 1)
+                axis_len = lg_idx + 1 - fg_idx
+
+            if axis_len != signal_size:
+                if axis_len not in group[signal_name].shape + (1, 2):
+                    issues.append(
+                            "Axis %s number of elements does not " % axis_name +
+                            "correspond to the length of any signal dimension,"
+                            " it does not appear to be a constant or a linear calibration," +
+                            " and this does not seem to be a scatter plot.")
+                    continue
+                elif axis_len in (1, 2):
+                    polynomial_axes_names.append(axis_name)
+                is_scatter = False
+            else:
+                if not is_scatter:
+                    issues.append(
+                            "Axis %s number of elements is equal " % axis_name +
+                            "to the length of the signal, but this does not seem" +
+                            " to be a scatter (other axes have different sizes)")
+                    continue
+
+            # Test individual uncertainties
+            errors_name = axis_name + "_errors"
+            if errors_name not in group and uncertainties_names is not None:
+                errors_name = uncertainties_names[i]
+                if errors_name in group and axis_name not in polynomial_axes_names:
+                    if group[errors_name].shape != group[axis_name].shape:
+                        issues.append(
+                                "Errors '%s' does not have the same " % errors_name +
+                                "dimensions as axis '%s'." % axis_name)
+
+    # test dimensions of errors associated with signal
+    if "errors" in group and is_dataset(group["errors"]):
+        if group["errors"].shape != group[signal_name].shape:
+            issues.append(
+                    "Dataset containing standard deviations must " +
+                    "have the same dimensions as the signal.")
+    return issues
+
+
 def is_valid_nxdata(group):   # noqa
     """Check if a h5py group is a **valid** NX_data group.
 
@@ -839,3 +876,152 @@ def get_default(group, validate=True):
         return None
 
     return NXdata(default_data, validate=False)
+
+
+def _get_cache_key(group, mtimes):
+    """Returns the key identifying the issues of a group in the cache, or None
+    if the group does not belong to a file on disk.
+
+    :param group: h5py-like group
+    :param dict mtimes: Modification times of the files, by file name,
+        filled by this function
+    :rtype: Union[tuple,None]
+    """
+    filename = getattr(group.file, "filename", None)
+    if not filename:
+        return None
+    if filename not in mtimes:
+        try:
+            mtimes[filename] = os.path.getmtime(filename)
+        except (OSError, TypeError):
+            mtimes[filename] = None
+    if mtimes[filename] is None:
+        return None
+    return filename, group.name, mtimes[filename]
+
+
+def get_nxdata_issues_many(groups, workers=0, use_cache=True):
+    """Validate many NXdata groups at once.
+
+    Only the attributes and the shapes of the datasets are read. Issues
+    of groups belonging to files on disk are cached, as long as the
+    modification time of the file is unchanged.
+
+    :param groups: Iterable of h5py-like groups
+    :param int workers: Number of threads validating the groups. If 0,
+        groups are validated in the calling thread.
+    :param bool use_cache: Set this to False to validate all the groups
+        again, for instance if a file is modified while it is opened.
+    :return: List of error messages of each group. An empty list means
+        that the group is a valid NXdata.
+    :rtype: List[List[str]]
+    :raise TypeError: if a group is not a h5py-like group
+    """
+    groups = list(groups)
+    results = [None] * len(groups)
+    keys = [None] * len(groups)
+
+    if use_cache:
+        mtimes = {}
+        with _issues_cache_lock:
+            for i, group in enumerate(groups):
+                if not is_group(group):
+                    raise TypeError("group must be a h5py-like group")
+                keys[i] = _get_cache_key(group, mtimes)
+                if keys[i] is not None and keys[i] in _issues_cache:
+                    results[i] = list(_issues_cache[keys[i]])
+
+    missing = [i for i, issues in enumerate(results) if issues is None]
+    if workers <= 0:
+        issues_list = [_get_nxdata_issues(groups[i]) for i in missing]
+    else:
+        with concurrent_futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            issues_list = list(executor.map(
+                _get_nxdata_issues, [groups[i] for i in missing]))
+
+    with _issues_cache_lock:
+        for i, issues in zip(missing, issues_list):
+            results[i] = issues
+            if keys[i] is not None:
+                _issues_cache[keys[i]] = list(issues)
+        while len(_issues_cache) > _ISSUES_CACHE_SIZE:
+            _issues_cache.popitem(last=False)
+    return results
+
+
+def is_valid_nxdata_many(groups, workers=0, use_cache=True):
+    """Check if many h5py-like groups are **valid** NX_data groups.
+
+    See :func:`get_nxdata_issues_many` for the parameters.
+
+    :return: True for each valid NXdata group
+    :rtype: List[bool]
+    :raise TypeError: if a group is not a h5py-like group
+    """
+    return [not issues for issues in
+            get_nxdata_issues_many(groups, workers, use_cache)]
+
+
+def _get_default_candidates(group):
+    """Return the groups which can be the default NXdata of a group, without
+    validating them, in the order tested by :func:`get_default`.
+
+    :param group: h5py-like group
+    :rtype: list
+    """
+    candidates = []
+    if is_NXroot_with_default_NXdata(group, validate=False):
+        default_entry = group[group.attrs["default"]]
+        candidates.append(default_entry[default_entry.attrs["default"]])
+    if is_NXentry_with_default_NXdata(group, validate=False):
+        candidates.append(group[group.attrs["default"]])
+    candidates.append(group)
+    return candidates
+
+
+def get_default_many(groups, validate=True, workers=0, use_cache=True):
+    """Return the default :class:`NXdata` of many groups.
+
+    This is the same as calling :func:`get_default` on each group, but the
+    candidate NXdata groups are validated at once by
+    :func:`get_nxdata_issues_many`.
+
+    :param groups: Iterable of h5py-like groups following the Nexus
+        specification (NXdata, NXentry or NXroot).
+    :param bool validate: Set this to False if you are sure that the groups
+        are valid. Parameter provided for optimisation purposes.
+    :param int workers: Number of threads validating the groups. If 0,
+        groups are validated in the calling thread.
+    :param bool use_cache: Set this to False to validate all the groups
+        again.
+    :return: :class:`NXdata` object or None for each group
+    :rtype: List[Union[NXdata,None]]
+    :raise TypeError: if a group is not a h5py-like group
+    """
+    candidates_list = []
+    for group in groups:
+        if not is_group(group):
+            raise TypeError("Provided parameter is not a h5py-like group")
+        candidates_list.append(_get_default_candidates(group))
+
+    if not validate:
+        return [NXdata(candidates[0], validate=False)
+                for candidates in candidates_list]
+
+    # validate the next candidate of the groups without a valid one yet,
+    # as validating a NXroot or NXentry group can be costly
+    defaults = [None] * len(candidates_list)
+    remaining = list(range(len(candidates_list)))
+    depth = 0
+    while remaining:
+        remaining = [i for i in remaining if depth < len(candidates_list[i])]
+        candidates = [candidates_list[i][depth] for i in remaining]
+        validity = is_valid_nxdata_many(candidates, workers, use_cache)
+        for i, candidate, is_valid in zip(remaining, candidates, validity):
+            if is_valid:
+                defaults[i] = candidate
+        remaining = [i for i in remaining if defaults[i] is None]
+        depth += 1
+
+    return [None if default_data is None else NXdata(default_data, validate=False)
+            for default_data in defaults]
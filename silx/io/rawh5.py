@@ -26,6 +26,8 @@ This module contains wrapper from file format to h5py. The exposed layout is
 as close as possible to the original file format.
 """
 import numpy
+import struct
+import zipfile
 from . import commonh5
 import logging
 
@@ -50,18 +52,77 @@ class _FreeDataset(commonh5.Dataset):
             _logger.warning(msg)
 
 
+def _map_npz_members(name):
+    """Returns read-only memory maps of the arrays stored without
+    compression in a `npz` file.
+
+    Arrays compressed (created by `numpy.savez_compressed`), empty, or
+    containing Python objects are not mapped.
+
+    :param str name: Filename of the `npz` file
+    :rtype: Dict[str,numpy.memmap]
+    """
+    mapped = {}
+    with zipfile.ZipFile(name) as zip_file:
+        infos = zip_file.infolist()
+    with open(name, "rb") as f:
+        for info in infos:
+            if info.compress_type != zipfile.ZIP_STORED:
+                continue
+            if not info.filename.endswith(".npy"):
+                continue
+            # skip the local header of the member
+            f.seek(info.header_offset)
+            header = f.read(30)
+            if len(header) != 30 or header[:4] != b"PK\x03\x04":
+                continue
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = numpy.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(f)
+            else:
+                continue
+            if dtype.hasobject or numpy.prod(shape) == 0:
+                continue
+            order = "F" if fortran_order else "C"
+            key = info.filename[:-len(".npy")]
+            mapped[key] = numpy.memmap(name, dtype=dtype, mode="r",
+                                       offset=f.tell(), shape=shape,
+                                       order=order)
+    return mapped
+
+
 class NumpyFile(commonh5.File):
     """
     Expose a numpy file `npy`, or `npz` as an h5py.File-like.
 
     :param str name: Filename to load
+    :param bool mmap: If True, the datasets are backed by read-only memory
+        maps of the file instead of being loaded into memory. This applies
+        to `npy` files and to the arrays stored without compression in `npz`
+        files (created by `numpy.savez`). Arrays containing Python objects
+        are always loaded.
     """
-    def __init__(self, name=None):
+    def __init__(self, name=None, mmap=False):
         commonh5.File.__init__(self, name=name, mode="w")
-        np_file = numpy.load(name)
+        try:
+            np_file = numpy.load(name, mmap_mode="r" if mmap else None)
+        except ValueError:
+            if not mmap:
+                raise
+            # Python objects can't be mapped
+            np_file = numpy.load(name)
         if hasattr(np_file, "close"):
             # For npz (created using  by numpy.savez, numpy.savez_compressed)
-            for key, value in np_file.items():
+            mapped = _map_npz_members(name) if mmap else {}
+            for key in np_file.files:
+                value = mapped.get(key)
+                if value is None:
+                    value = np_file[key]
                 self[key] = _FreeDataset(None, data=value)
             np_file.close()
         else:
@@ -218,6 +218,7 @@ class MCA(object):
     """
     def __init__(self, scan):
         self._scan = scan
+        self._offsets = None
 
         # Header dict
         self._header = scan.mca_header_dict
@@ -297,6 +298,43 @@ class MCA(object):
         return self._scan._specfile.get_mca(self._scan.index,
                                             mca_index)
 
+    def _get_offsets(self):
+        """Returns the positions of the spectra in the scan, located once.
+
+        :rtype: 1D numpy array
+        """
+        if self._offsets is None:
+            self._offsets = self._scan._specfile.mca_offsets(self._scan.index)
+        return self._offsets
+
+    def get_spectra(self, mca_indices, channels=None):
+        """Return several MCA spectra as a 2D array.
+
+        Only the requested spectra are parsed: the position of each spectrum
+        in the scan is located on the first call.
+
+        :param mca_indices: 0-based indices of MCA within Scan. Negative
+            indices are allowed, like for lists.
+        :type mca_indices: 1D array of int
+        :param channels: Number of channels of the returned spectra. Longer
+            spectra are truncated and shorter spectra are completed with
+            zeros. If None, the length of the first spectrum is used.
+        :type channels: int
+
+        :return: MCA spectra, one per row
+        :rtype: 2D numpy array
+        """
+        offsets = self._get_offsets()
+        mca_indices = numpy.asarray(mca_indices, dtype=numpy.intp)
+        try:
+            selected = offsets[mca_indices]
+        except IndexError:
+            msg = "MCA index must be in range 0-%d" % (len(offsets) - 1)
+            raise IndexError(msg)
+        return self._scan._specfile.get_mca_many(self._scan.index,
+                                                 selected,
+                                                 channels)
+
     def __iter__(self):
         """Return the next MCA data line each time this method is called.
 
@@ -576,6 +614,11 @@ class Scan(object):
         :return: Line data as a 1D array of doubles
         :rtype: numpy.ndarray
         """
+        if label in self._labels:
+            column = self._labels.index(label)
+            if column < self.data.shape[0]:
+                # Use the data of all columns read in a single pass
+                return numpy.array(self.data[column])
         try:
             ret = self._specfile.data_column_by_name(self._index, label)
         except SfErrLineNotFound:
@@ -626,10 +669,26 @@ def is_specfile(filename):
     return False
 
 
+INDEX_FILE_SUFFIX = ".sfI"
+"""Suffix appended to the name of a SpecFile to get the default name of its
+index file (see :class:`SpecFile`)"""
+
+
 cdef class SpecFile(object):
     """
 
     :param filename: Path of the SpecFile to read
+    :param index_cache: Persistent index of the scans. If ``True``, the
+        index is stored next to the SpecFile, in a file named after it with
+        a ``.sfI`` suffix. If it is a path, the index is stored in this file.
+        If ``None`` or ``False`` (default), the whole file is scanned at
+        opening.
+
+        The index is reused if the SpecFile was not modified since it was
+        written (same size and modification time). If the SpecFile only
+        grew, only the appended bytes are parsed and the index is updated.
+        In other cases the whole file is scanned again. Index files are
+        platform dependent.
 
     This class wraps the main data and header access functions of the C
     SpecFile library.
@@ -639,13 +698,21 @@ cdef class SpecFile(object):
         specfile_wrapper.SpecFileHandle *handle
         str filename
 
-    def __cinit__(self, filename):
+    def __cinit__(self, filename, index_cache=None):
         cdef int error = 0
         self.handle = NULL
 
         if is_specfile(filename):
             filename = _string_to_char_star(filename)
-            self.handle = specfile_wrapper.SfOpen(filename, &error)
+            if index_cache is True:
+                index_cache = filename + _string_to_char_star(INDEX_FILE_SUFFIX)
+            if index_cache:
+                index_cache = _string_to_char_star(index_cache)
+                self.handle = specfile_wrapper.SfOpenIndexed(filename,
+                                                             index_cache,
+                                                             &error)
+            else:
+                self.handle = specfile_wrapper.SfOpen(filename, &error)
             if error:
                 self._handle_error(error)
         else:
@@ -653,7 +720,7 @@ cdef class SpecFile(object):
             # this causes the destructor to be called
             self._handle_error(SF_ERR_FILE_OPEN)
 
-    def __init__(self, filename):
+    def __init__(self, filename, index_cache=None):
         if not isinstance(filename, str):
             # encode unicode to str in python 2
             if sys.version_info[0] < 3:
@@ -681,6 +748,31 @@ cdef class SpecFile(object):
         """
         return specfile_wrapper.SfScanNo(self.handle)
 
+    def refresh(self):
+        """Parse the bytes appended to the file since it was opened or last
+        refreshed.
+
+        This allows to follow a SpecFile which is still being written. Only
+        the last known scan, which may still be running, is parsed again,
+        followed by the new scans. If the file shrank, it is parsed again
+        from the start. The persistent index, if any, is updated.
+
+        Previously created :class:`Scan` objects are not updated.
+
+        :return: 0-based indices of the scans which were modified or added
+            (an empty list if nothing changed)
+        :rtype: list of int
+        """
+        cdef:
+            long first
+            int error = SF_ERR_NO_ERRORS
+
+        first = specfile_wrapper.SfRefresh(self.handle, &error)
+        self._handle_error(error)
+        if first <= 0:
+            return []
+        return list(range(first - 1, len(self)))
+
     def __iter__(self):
         """Return the next :class:`Scan` in a SpecFile each time this method
         is called.
@@ -860,54 +952,52 @@ cdef class SpecFile(object):
         # representation of the list
         return self._list()
 
-    def data(self, scan_index):
+    def data(self, scan_index, dtype=numpy.float64):
         """Returns data for the specified scan index.
 
+        Data lines are parsed in a single pass, independently of the locale,
+        directly into the returned array.
+
         :param scan_index: Unique scan index between ``0`` and
             ``len(self)-1``.
         :type scan_index: int
+        :param dtype: Type of the returned array, ``numpy.float64``
+            (default) or ``numpy.float32``
 
-        :return: Complete scan data as a 2D array of doubles
+        :return: Complete scan data as a 2D array of doubles (or floats)
         :rtype: numpy.ndarray
         """
         cdef:
-            double** mydata
-            long* data_info
-            int i, j
+            long nlines, ncolumns
             int error = SF_ERR_NO_ERRORS
-            long nlines, ncolumns, regular
-            double[:, :] ret_array
+            double[:, ::1] double_array
+            float[:, ::1] float_array
 
-        sfdata_error = specfile_wrapper.SfData(self.handle,
-                                               scan_index + 1,
-                                               &mydata,
-                                               &data_info,
-                                               &error)
-        if sfdata_error == -1 and not error:
-            # this has happened in some situations with empty scans (#1759)
-            _logger.warning("SfData returned -1 without an error."
-                            " Assuming aborted scan.")
+        dtype = numpy.dtype(dtype)
+        if dtype not in (numpy.float64, numpy.float32):
+            raise ValueError("Unsupported data type: %s" % dtype)
 
+        nlines = specfile_wrapper.SfDataShape(self.handle,
+                                              scan_index + 1,
+                                              &ncolumns,
+                                              &error)
         self._handle_error(error)
-
-        if <long>data_info != 0:
-            nlines = data_info[0]
-            ncolumns = data_info[1]
-            regular = data_info[2]
+        if nlines <= 0 or ncolumns <= 0:
+            return numpy.empty((0, 0), dtype=dtype)
+
+        ret_array = numpy.empty((nlines, ncolumns), dtype=dtype)
+        if dtype == numpy.float64:
+            double_array = ret_array
+            specfile_wrapper.SfDataFill(self.handle, scan_index + 1,
+                                        &double_array[0, 0], NULL,
+                                        nlines, ncolumns, &error)
         else:
-            nlines = 0
-            ncolumns = 0
-            regular = 0
-
-        ret_array = numpy.empty((nlines, ncolumns), dtype=numpy.double)
-
-        for i in range(nlines):
-            for j in range(ncolumns):
-                ret_array[i, j] = mydata[i][j]
-
-        specfile_wrapper.freeArrNZ(<void ***>&mydata, nlines)
-        free(data_info)
-        return numpy.asarray(ret_array)
+            float_array = ret_array
+            specfile_wrapper.SfDataFill(self.handle, scan_index + 1,
+                                        NULL, &float_array[0, 0],
+                                        nlines, ncolumns, &error)
+        self._handle_error(error)
+        return ret_array
 
     def data_column_by_name(self, scan_index, label):
         """Returns data column for the specified scan index and column label.
@@ -1270,3 +1360,88 @@ cdef class SpecFile(object):
 
         free(mca_data)
         return numpy.asarray(ret_array)
+
+    def mca_offsets(self, scan_index):
+        """Return the positions of the MCA spectra in a scan.
+
+        The spectra are located in a single pass, without being parsed.
+        The result is meant to be given to :meth:`get_mca_many`.
+
+        :param scan_index: Unique scan index between ``0`` and ``len(self)-1``.
+        :type scan_index: int
+
+        :return: Offset of each MCA spectrum in the scan
+        :rtype: 1D numpy array
+        """
+        cdef:
+            int error = SF_ERR_NO_ERRORS
+            long* offsets
+            long nspectra
+            long[::1] ret_array
+
+        nspectra = specfile_wrapper.SfMcaOffsets(self.handle,
+                                                 scan_index + 1,
+                                                 &offsets,
+                                                 &error)
+        if nspectra < 0:
+            self._handle_error(error)
+
+        ret_array = numpy.empty((max(nspectra, 0),), dtype="l")
+        for i in range(nspectra):
+            ret_array[i] = offsets[i]
+
+        free(offsets)
+        return numpy.asarray(ret_array)
+
+    def get_mca_many(self, scan_index, offsets, channels=None):
+        """Return several MCA spectra of a scan, parsed in a single pass
+        directly into a 2D array.
+
+        Only the requested spectra are parsed.
+
+        :param scan_index: Unique scan index between ``0`` and ``len(self)-1``.
+        :type scan_index: int
+        :param offsets: Positions of the spectra, as returned by
+            :meth:`mca_offsets`
+        :type offsets: 1D array of int
+        :param channels: Number of channels of the returned spectra. Longer
+            spectra are truncated and shorter spectra are completed with
+            zeros. If None, the length of the first spectrum is used.
+        :type channels: int
+
+        :return: MCA spectra
+        :rtype: 2D numpy array
+        """
+        cdef:
+            int error = SF_ERR_NO_ERRORS
+            long nspectra
+            long[::1] c_offsets
+            double[:, ::1] ret_array
+
+        c_offsets = numpy.ascontiguousarray(offsets, dtype="l")
+        nspectra = c_offsets.shape[0]
+        if nspectra == 0:
+            return numpy.empty((0, channels or 0), dtype=numpy.double)
+
+        if channels is None:
+            channels = specfile_wrapper.SfMcaFill(self.handle,
+                                                  scan_index + 1,
+                                                  &c_offsets[0],
+                                                  nspectra,
+                                                  NULL,
+                                                  0,
+                                                  &error)
+            self._handle_error(error)
+
+        result = numpy.zeros((nspectra, channels), dtype=numpy.double)
+        if channels > 0:
+            ret_array = result
+            specfile_wrapper.SfMcaFill(self.handle,
+                                       scan_index + 1,
+                                       &c_offsets[0],
+                                       nspectra,
+                                       &ret_array[0, 0],
+                                       channels,
+                                       &error)
+            self._handle_error(error)
+        return result
@@ -138,6 +138,7 @@ typedef struct _SpecFile{
   long           *data_info;
   SfCursor        cursor;
   short           updating;
+  char           *idxname;
 } SpecFile;
 
 typedef struct _SpecFileOut{
@@ -171,7 +172,10 @@ typedef struct _SpecScan {
  * init
  */
 DllExport extern    SpecFile  *SfOpen        ( char *name, int *error );
+DllExport extern    SpecFile  *SfOpenIndexed ( char *name, char *idxname,
+                                                int *error );
 DllExport extern    short      SfUpdate      ( SpecFile *sf,int *error );
+DllExport extern    long       SfRefresh     ( SpecFile *sf,int *error );
 DllExport extern    int        SfClose       ( SpecFile *sf );
 
 /*
@@ -245,6 +249,11 @@ DllExport extern  long  SfDataCol       ( SpecFile *sf, long index, long col,
                                              double **data_col, int *error );
 DllExport extern  long  SfDataColByName ( SpecFile *sf, long index,
                                   char *label, double **data_col, int *error );
+DllExport extern  long  SfDataShape     ( SpecFile *sf, long index,
+                                         long *cols, int *error );
+DllExport extern  long  SfDataFill      ( SpecFile *sf, long index,
+                                         double *dbuffer, float *fbuffer,
+                                         long rows, long cols, int *error );
 
   /*
    * MCA functions
@@ -254,6 +263,11 @@ DllExport extern int  SfGetMca  ( SpecFile *sf, long index, long mcano,
                                           double **retdata, int *error );
 DllExport extern long SfMcaCalib ( SpecFile *sf, long index, double **calib,
                                           int *error );
+DllExport extern long SfMcaOffsets ( SpecFile *sf, long index, long **offsets,
+                                          int *error );
+DllExport extern long SfMcaFill ( SpecFile *sf, long index, long *offsets,
+                                          long nspectra, double *buffer,
+                                          long channels, int *error );
 
   /*
    * Write and write related functions
@@ -75,5 +75,6 @@ extern void        freeAllData     ( SpecFile *sf );
 extern long        mulstrtod       ( char *str, double **arr, int *error );
 extern int         sfGetHeaderLine ( SpecFile *sf, int from, char character,
                                              char **buf,int *error);
+extern double      sfAtof          ( const char *str );
 
 #endif  /*  SPECFILE_P_H  */
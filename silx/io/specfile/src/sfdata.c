@@ -82,6 +82,11 @@
  * Define macro
  */
 #define isnumber(this) ( isdigit(this) || this == '-' || this == '+' || this == '.' || this == 'E' || this == 'e')
+/*
+ * Locale independent versions used by the fast data parser
+ */
+#define sfisdigit(this) ( (this) >= '0' && (this) <= '9' )
+#define sfisnumber(this) ( sfisdigit(this) || this == '-' || this == '+' || this == '.' || this == 'E' || this == 'e')
 
 /*
  * Mca continuation character
@@ -103,6 +108,14 @@ DllExport long SfDataCol      ( SpecFile *sf, long index, long col,
                                           double **data_col, int *error );
 DllExport long SfDataColByName( SpecFile *sf, long index,
                                   char *label, double **data_col, int *error );
+DllExport long SfDataShape    ( SpecFile *sf, long index, long *cols,
+                                          int *error );
+DllExport long SfDataFill     ( SpecFile *sf, long index, double *dbuffer,
+                                  float *fbuffer, long rows, long cols,
+                                  int *error );
+
+static long   sfParseData     ( SpecFile *sf, double *dbuffer,
+                                  float *fbuffer, long maxrows, long *cols );
 
 
 /*********************************************************************
@@ -475,6 +488,269 @@ if(0){
      return( 0 );
 }
 
+/*********************************************************************
+ *   Function:        long SfDataShape(sf, index, cols, error)
+ *
+ *   Description:    Gets the shape of the data of a scan, as read
+ *                   by SfDataFill.
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *        Output:
+ *            (3) Number of columns
+ *            (4) error number
+ *   Returns:
+ *            Number of data lines
+ *                ( -1 ) => errors occured
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *            SF_ERR_FILE_READ
+ *            SF_ERR_SCAN_NOT_FOUND
+ *
+ *********************************************************************/
+DllExport long
+SfDataShape( SpecFile *sf, long index, long *cols, int *error )
+{
+     *cols = 0;
+     if (index <= 0 ){
+        *error = SF_ERR_SCAN_NOT_FOUND;
+        return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     return(sfParseData(sf,(double *)NULL,(float *)NULL,0,cols));
+}
+
+
+/*********************************************************************
+ *   Function:        long SfDataFill(sf, index, dbuffer, fbuffer,
+ *                                    rows, cols, error)
+ *
+ *   Description:    Parses the data of a scan directly into a
+ *                   preallocated C-contiguous array of rows x cols
+ *                   elements, as given by SfDataShape.
+ *                   Values are parsed independently of the locale.
+ *                   Comment and MCA lines are skipped, as well as
+ *                   lines whose number of values differs from the
+ *                   first data line and a last line which is not
+ *                   terminated (the scan may still be running).
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *            (3) Array of doubles, or NULL
+ *            (4) Array of floats, used if (3) is NULL
+ *            (5) Number of rows of the array
+ *            (6) Number of columns of the array
+ *        Output:
+ *            (7) error number
+ *   Returns:
+ *            Number of data lines written
+ *                ( -1 ) => errors occured
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *            SF_ERR_FILE_READ
+ *            SF_ERR_SCAN_NOT_FOUND
+ *
+ *********************************************************************/
+DllExport long
+SfDataFill( SpecFile *sf, long index, double *dbuffer, float *fbuffer,
+            long rows, long cols, int *error )
+{
+     long     ncols = cols;
+
+     if (index <= 0 ){
+        *error = SF_ERR_SCAN_NOT_FOUND;
+        return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     if (rows <= 0 || cols <= 0 ||
+             (dbuffer == (double *)NULL && fbuffer == (float *)NULL))
+             return(0);
+
+     return(sfParseData(sf,dbuffer,fbuffer,rows,&ncols));
+}
+
+
+/*
+ * Parses the data lines of the current scan. If no buffer is provided,
+ * only the number of lines and columns is computed, otherwise at most
+ * maxrows lines of *cols values are written in the buffer.
+ * Tokens are read as in SfData: they are separated by spaces or
+ * tabulations and only the characters which can be part of a number
+ * are kept.
+ */
+static long
+sfParseData( SpecFile *sf, double *dbuffer, float *fbuffer,
+             long maxrows, long *cols )
+{
+     SpecScan *scan = (SpecScan *)sf->current->contents;
+     char     *ptr,
+              *to,
+              *end;
+     char      strval[100];
+     double    val;
+     long      rows = 0,
+               ncols = 0,
+               linecols,
+               offset;
+     int       i;
+     int       fill = (dbuffer != (double *)NULL || fbuffer != (float *)NULL);
+
+     if (fill) ncols = *cols;
+
+     if (scan->data_offset == -1) {
+          if (!fill) *cols = 0;
+          return(0);
+     }
+
+     ptr = sf->scanbuffer + (scan->data_offset - scan->offset);
+     to  = sf->scanbuffer + sf->scansize;
+
+     while (ptr < to) {
+        end = (char *)memchr(ptr, '\n', to - ptr);
+        if (end == (char *)NULL) {
+            /* only complete lines are read */
+            break;
+        }
+        if (*ptr == '#') {
+            ptr = end + 1;
+            continue;
+        }
+        if (*ptr == '@') {
+            /* the mca block goes on while a newline is preceded by a slash */
+            while (end != (char *)NULL && *(end-1) == MCA_CONT && end + 1 < to)
+                end = (char *)memchr(end + 1, '\n', to - end - 1);
+            if (end == (char *)NULL || *(end-1) == MCA_CONT) break;
+            ptr = end + 1;
+            continue;
+        }
+        while (*ptr == ' ' && ptr < end) ptr++;
+
+        linecols = 0;
+        i = 0;
+        offset = rows * ncols;
+        for ( ; ptr < end; ptr++) {
+            if (*ptr == ' ' || *ptr == '\t') {
+                if (fill && rows < maxrows && linecols < ncols) {
+                    strval[i] = '\0';
+                    val = sfAtof(strval);
+                    if (dbuffer != (double *)NULL) {
+                        dbuffer[offset + linecols] = val;
+                    } else {
+                        fbuffer[offset + linecols] = (float) val;
+                    }
+                }
+                i = 0;
+                linecols++;
+                while (ptr + 1 < end && (*(ptr+1) == ' ' || *(ptr+1) == '\t'))
+                    ptr++;
+            } else if (sfisnumber(*ptr)) {
+                if (i < (int) sizeof(strval) - 1) strval[i++] = *ptr;
+            }
+        }
+        if (i != 0) {
+            if (fill && rows < maxrows && linecols < ncols) {
+                strval[i] = '\0';
+                val = sfAtof(strval);
+                if (dbuffer != (double *)NULL) {
+                    dbuffer[offset + linecols] = val;
+                } else {
+                    fbuffer[offset + linecols] = (float) val;
+                }
+            }
+            linecols++;
+        }
+        ptr = end + 1;
+
+        if (linecols == 0) continue;
+        if (ncols == 0) ncols = linecols;
+        if (linecols != ncols) {
+            /* irregular line is ignored, as in SfData */
+            continue;
+        }
+        rows++;
+        if (fill && rows >= maxrows) break;
+     }
+
+     if (!fill) *cols = ncols;
+     return(rows);
+}
+
+
+/*
+ * Locale independent conversion of a string to a double.
+ * Numbers with at most 15 significant digits and a small exponent are
+ * converted exactly with a single floating point operation, others go
+ * through PyMcaAtof.
+ */
+double
+sfAtof( const char *str )
+{
+     static const double pow10[] = {
+          1e0,  1e1,  1e2,  1e3,  1e4,  1e5,  1e6,  1e7,
+          1e8,  1e9,  1e10, 1e11, 1e12, 1e13, 1e14, 1e15,
+          1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22 };
+     const char *ptr = str;
+     double mantissa = 0.;
+     int    negative = 0,
+            ndigits = 0,
+            significant = 0,
+            exponent = 0,
+            expnegative = 0,
+            expvalue = 0;
+
+     if (*ptr == '-') {
+          negative = 1;
+          ptr++;
+     } else if (*ptr == '+') {
+          ptr++;
+     }
+     for ( ; sfisdigit(*ptr); ptr++, ndigits++) {
+          if (significant || *ptr != '0') significant++;
+          mantissa = mantissa * 10. + (*ptr - '0');
+     }
+     if (*ptr == '.') {
+          for (ptr++; sfisdigit(*ptr); ptr++, ndigits++) {
+               if (significant || *ptr != '0') significant++;
+               mantissa = mantissa * 10. + (*ptr - '0');
+               exponent--;
+          }
+     }
+     if (ndigits == 0 || significant > 15) return(PyMcaAtof(str));
+
+     if (*ptr == 'e' || *ptr == 'E') {
+          ptr++;
+          if (*ptr == '-') {
+               expnegative = 1;
+               ptr++;
+          } else if (*ptr == '+') {
+               ptr++;
+          }
+          if (!sfisdigit(*ptr)) return(PyMcaAtof(str));
+          for ( ; sfisdigit(*ptr); ptr++) {
+               expvalue = expvalue * 10 + (*ptr - '0');
+               if (expvalue > 1000) return(PyMcaAtof(str));
+          }
+          exponent += expnegative ? -expvalue : expvalue;
+     }
+     if (*ptr != '\0') return(PyMcaAtof(str));
+
+     if (mantissa != 0.) {
+          if (exponent < -22 || exponent > 22) return(PyMcaAtof(str));
+          if (exponent >= 0) {
+               mantissa *= pow10[exponent];
+          } else {
+               mantissa /= pow10[-exponent];
+          }
+     }
+     return(negative ? -mantissa : mantissa);
+}
+
 
 DllExport long
 SfDataCol ( SpecFile *sf, long index, long col, double **retdata, int *error )
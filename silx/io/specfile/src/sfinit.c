@@ -135,15 +135,23 @@
 
 DllExport SpecFile * SfOpen   ( char *name,int *error);
 DllExport SpecFile * SfOpen2  ( int fd, char *name,int *error);
+DllExport SpecFile * SfOpenIndexed ( char *name, char *idxname, int *error);
 DllExport int        SfClose  ( SpecFile *sf);
 DllExport short      SfUpdate ( SpecFile *sf, int *error);
+DllExport long       SfRefresh ( SpecFile *sf, int *error);
 DllExport char     * SfError  ( int error);
 
 
 #ifdef linux
-char SF_SIGNATURE[] =  "Linux 2ruru Sf2.0";
+char SF_SIGNATURE[] =  "Linux 2ruru Sf2.1";
 #else
-char SF_SIGNATURE[] =  "2ruru Sf2.0";
+char SF_SIGNATURE[] =  "2ruru Sf2.1";
+#endif
+
+#ifdef WIN32
+#define SF_IDXWRITEFLAG  O_CREAT | O_WRONLY | O_BINARY
+#else
+#define SF_IDXWRITEFLAG  O_CREAT | O_WRONLY
 #endif
 
 /*
@@ -155,14 +163,16 @@ static void  sfNewLine     ( SpecFile *sf, SfCursor *cursor, char c0,char c1,int
 static void  sfHeaderLine  ( SpecFile *sf, SfCursor *cursor, char c,int *error);
 static void  sfNewBlock    ( SpecFile *sf, SfCursor *cursor, short how,int *error);
 static void  sfSaveScan    ( SpecFile *sf, SfCursor *cursor, int *error);
-static void  sfAssignScanNumbers (SpecFile *sf);
+static void  sfAssignScanNumbers (SpecFile *sf, long from);
+static ObjectList *sfFindScanFrom (SpecFile *sf, long from);
+static void  sfInitCursor  ( SfCursor *cursor);
+static SpecFile *sfOpenFd  ( int fd, char *name, char *idxname, int *error);
 static void  sfReadFile    ( SpecFile *sf, SfCursor *cursor, int *error);
 static void  sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error);
-#ifdef SPECFILE_USE_INDEX_FILE
 static short sfOpenIndex   ( SpecFile *sf, SfCursor *cursor, int *error);
 static short sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error);
-static void  sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, int *error);
-#endif
+static void  sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, long from, int *error);
+static void  sfFreeScans   ( SpecFile *sf);
 
 /*
  * errors
@@ -252,10 +262,66 @@ SfOpen(char *name, int *error) {
 
 DllExport SpecFile *
 SfOpen2(int fd, char *name,int *error) {
+#ifdef SPECFILE_USE_INDEX_FILE
+   SpecFile   *sf;
+   char       *idxname;
+
+   idxname = (char *)malloc(sizeof(char) * (strlen(name) + strlen(SF_ISFX) + 1));
+   if ( idxname == (char *)NULL ) {
+      *error = SF_ERR_MEMORY_ALLOC;
+      return( (SpecFile *) NULL );
+   }
+   sprintf(idxname,"%s%s",name,SF_ISFX);
+   sf = sfOpenFd(fd, name, idxname, error);
+   free(idxname);
+   return(sf);
+#else
+   return(sfOpenFd(fd, name, (char *)NULL, error));
+#endif
+}
+
+
+/*********************************************************************
+ *   Function:          SpecFile *SfOpenIndexed( name, idxname, error)
+ *
+ *   Description:       Opens connection to Spec data file.
+ *                      The index list is read from the index file if
+ *                      it is up to date. If the data file was appended,
+ *                      only the new bytes are parsed. The index file is
+ *                      then created or updated.
+ *
+ *   Parameters:
+ *              Input :
+ *                      (1) Filename
+ *                      (2) Index filename
+ *              Output:
+ *                      (3) error number
+ *   Returns:
+ *                      SpecFile pointer.
+ *                      NULL if not successful.
+ *
+ *   Possible errors:
+ *                      SF_ERR_FILE_OPEN
+ *                      SF_ERR_MEMORY_ALLOC
+ *
+ *********************************************************************/
+
+DllExport SpecFile *
+SfOpenIndexed(char *name, char *idxname, int *error) {
+
+   int         fd;
+   fd   = open(name,SF_OPENFLAG);
+   return (sfOpenFd(fd, name, idxname, error));
+}
+
+
+static SpecFile *
+sfOpenFd(int fd, char *name, char *idxname, int *error) {
    SpecFile   *sf;
    short       idxret;
    SfCursor      cursor;
    struct stat mystat;
+   long        from = 1;
 
    if ( fd == -1 ) {
       *error = SF_ERR_FILE_OPEN;
@@ -277,6 +343,11 @@ SfOpen2(int fd, char *name,int *error) {
    sf->fd     = fd;
    sf->m_time = mystat.st_mtime;
    sf->sfname = (char *)strdup(name);
+   if (idxname != (char *)NULL) {
+      sf->idxname = (char *)strdup(idxname);
+   } else {
+      sf->idxname = (char *)NULL;
+   }
 
    sf->list.first      = (ObjectList *)NULL;
    sf->list.last       = (ObjectList *)NULL;
@@ -300,34 +371,30 @@ SfOpen2(int fd, char *name,int *error) {
   /*
    * Init cursor
    */
-   cursor.bytecnt      = 0;
-   cursor.cursor       = 0;
-   cursor.scanno       = 0;
-   cursor.hdafoffset   = -1;
-   cursor.dataoffset   = -1;
-   cursor.mcaspectra   = 0;
-   cursor.what         = 0;
-   cursor.data         = 0;
-   cursor.file_header  = 0;
-
+   sfInitCursor(&cursor);
 
-#ifdef SPECFILE_USE_INDEX_FILE
   /*
    * Check if index file
    *   open it and continue from there
    */
-   idxret = sfOpenIndex(sf,&cursor,error);
-#else
-   idxret = SF_INIT;
-#endif
+   if (sf->idxname != (char *)NULL) {
+      idxret = sfOpenIndex(sf,&cursor,error);
+   } else {
+      idxret = SF_INIT;
+   }
 
    switch(idxret) {
       case SF_MODIFIED:
+          /*
+           * The last indexed scan is parsed again
+           */
+          from = cursor.scanno;
           sfResumeRead(sf,&cursor,error);
           sfReadFile(sf,&cursor,error);
           break;
 
       case SF_INIT:
+          lseek(sf->fd,0,SEEK_SET);
           sfReadFile(sf,&cursor,error);
           break;
 
@@ -340,20 +407,34 @@ SfOpen2(int fd, char *name,int *error) {
 
    sf->cursor = cursor;
 
-  /*
-   * Once is all done assign scan numbers and orders
-   */
-   sfAssignScanNumbers(sf);
+   if (idxret != SF_READY) {
+     /*
+      * Once is all done assign scan numbers and orders
+      */
+      sfAssignScanNumbers(sf, from);
 
-#ifdef SPECFILE_USE_INDEX_FILE
-   if (idxret != SF_READY) sfWriteIndex(sf,&cursor,error);
-#endif
+      if (sf->idxname != (char *)NULL) sfWriteIndex(sf,&cursor,from,error);
+   }
    return(sf);
 }
 
 
+static void
+sfInitCursor(SfCursor *cursor) {
+   cursor->bytecnt      = 0;
+   cursor->cursor       = 0;
+   cursor->scanno       = 0;
+   cursor->hdafoffset   = -1;
+   cursor->dataoffset   = -1;
+   cursor->mcaspectra   = 0;
+   cursor->what         = 0;
+   cursor->data         = 0;
+   cursor->file_header  = 0;
+}
+
+
+
 
-
 /*********************************************************************
  *
  *   Function:		int SfClose( sf )
@@ -383,6 +464,8 @@ SfClose( SpecFile *sf )
      }
 
      free ((char *)sf->sfname);
+     if (sf->idxname != NULL)
+        free ((char *)sf->idxname);
      if (sf->scanbuffer != NULL)
         free ((char *)sf->scanbuffer);
 
@@ -423,31 +506,91 @@ SfClose( SpecFile *sf )
  *********************************************************************/
 DllExport short
 SfUpdate ( SpecFile *sf, int *error )
+{
+    return(SfRefresh(sf,error) != 0);
+}
+
+
+/*********************************************************************
+ *
+ *   Function:          long SfRefresh( sf, error )
+ *
+ *   Description:       Parses the bytes appended to the data file since
+ *                      the last parsing. Only the last known scan (which
+ *                      may still be running) is parsed again, new scans
+ *                      are appended to the index list in memory.
+ *                      If the file shrank, it is parsed again from the
+ *                      start.
+ *
+ *   Parameters:
+ *              Input :
+ *                      (1) sf (pointer to the index list in memory)
+ *              Output:
+ *                      (2) error number
+ *   Returns:
+ *                      ( 0 ) => Nothing changed.
+ *                      ( n ) => Index of the first scan which changed
+ *                               or was added.
+ *
+ *   Possible errors:
+ *                      SF_ERR_MEMORY_ALLOC
+ *
+ *********************************************************************/
+DllExport long
+SfRefresh ( SpecFile *sf, int *error )
 {
     struct stat mystat;
     long   mtime;
-   /*printf("In SfUpdate\n");
-   __asm("int3");*/
-    stat(sf->sfname,&mystat);
+    long   from;
+    long   lastsize = -1;
+    SpecScan *last = (SpecScan *)NULL;
 
-    mtime = mystat.st_mtime;
+    if (fstat(sf->fd,&mystat) != 0) return(0);
 
-    if (sf->m_time != mtime)  {
-       sfResumeRead (sf,&(sf->cursor),error);
-       sfReadFile   (sf,&(sf->cursor),error);
+    mtime = mystat.st_mtime;
 
-       sf->m_time = mtime;
-       sfAssignScanNumbers(sf);
-#ifdef SPECFILE_USE_INDEX_FILE
-       sfWriteIndex (sf,&(sf->cursor),error);
-#endif
-       return(1);
-    }else{
+    if (sf->m_time == mtime && (long)mystat.st_size == sf->cursor.bytecnt)
        return(0);
+
+    if ((long)mystat.st_size < sf->cursor.bytecnt) {
+       /*
+        * File was truncated or rewritten
+        */
+       sfFreeScans(sf);
+    }
+
+    if (sf->no_scans > 0) {
+       from     = sf->cursor.scanno;
+       last     = (SpecScan *)(sf->list.last->contents);
+       lastsize = last->size;
+       sfResumeRead (sf,&(sf->cursor),error);
+    } else {
+       from = 1;
+       sfInitCursor(&(sf->cursor));
+       lseek(sf->fd,0,SEEK_SET);
     }
+    sfReadFile   (sf,&(sf->cursor),error);
+
+    sf->m_time = mtime;
+    sfAssignScanNumbers(sf, from);
+    if (sf->idxname != (char *)NULL)
+       sfWriteIndex (sf,&(sf->cursor),from,error);
+
+   /*
+    * Data cached for the current scan may be outdated
+    */
+    freeAllData(sf);
+    sf->current = (ObjectList *)NULL;
+
+   /*
+    * The last known scan is updated in place
+    */
+    if (last != (SpecScan *)NULL && last->size == lastsize) from++;
+    if (from > sf->no_scans) return(0);
+    return(from);
 }
 
-
+
 /*********************************************************************
  *
  *   Function:		char *SfError( code )
@@ -521,9 +664,9 @@ sfReadFile(SpecFile *sf,SfCursor *cursor,int *error) {
   free(buffer);
 
   sf->no_scans = cursor->scanno;
-  if (sf->no_scans > 0) {
+  if (cursor->what == SCAN) {
      /*
-      * Save last
+      * Save last, unless the file ends with a file header block
       */
       sfSaveScan(sf,cursor,error);
   }
@@ -534,73 +677,112 @@ sfReadFile(SpecFile *sf,SfCursor *cursor,int *error) {
 
 static void
 sfResumeRead  ( SpecFile *sf, SfCursor *cursor, int *error) {
-    cursor->bytecnt      = cursor->cursor;
+    SpecScan *last = (SpecScan *)(sf->list.last->contents);
+
+   /*
+    * Resume from the start of the last scan, which may be followed by
+    * the header block of a new file
+    */
+    cursor->bytecnt      = last->offset;
+    cursor->file_header  = last->file_header;
+    cursor->scanno       = last->index - 1;
     cursor->what         = 0;
     cursor->hdafoffset   = -1;
     cursor->dataoffset   = -1;
     cursor->mcaspectra   = 0;
     cursor->data         = 0;
-    cursor->scanno--;
     sf->updating = 1;
     lseek(sf->fd,cursor->bytecnt,SEEK_SET);
     return;
 }
 
 
-#ifdef SPECFILE_USE_INDEX_FILE
+/*****************************************************************************
+ *
+ *    Index file layout:  signature, modification time of the data file,
+ *                        cursor at the end of the parsing (its byte count
+ *                        is the size of the parsed data file), then one
+ *                        SpecScan structure per scan.
+ *
+ *****************************************************************************/
 static short
 sfOpenIndex ( SpecFile *sf, SfCursor *cursor, int *error) {
-    char *idxname;
-    short namelength;
     int   sfi;
+    short ret;
 
-    namelength = strlen(sf->sfname) + strlen(SF_ISFX) + 1;
-
-    idxname = (char *)malloc(sizeof(char) * namelength);
-
-    sprintf(idxname,"%s%s",sf->sfname,SF_ISFX);
-
-    if ((sfi = open(idxname,SF_OPENFLAG)) == -1) {
-        free(idxname);
+    if ((sfi = open(sf->idxname,SF_OPENFLAG)) == -1) {
         return(SF_INIT);
     } else {
-        free(idxname);
-        return(sfReadIndex(sfi,sf,cursor,error));
+        ret = sfReadIndex(sfi,sf,cursor,error);
+        close(sfi);
+        return(ret);
     }
 }
 
-
+
 static short
 sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error) {
     SfCursor   filecurs;
-    char       buffer[200];
-    long       bytesread,i=0;
+    char       buffer[sizeof(SF_SIGNATURE)];
+    char       scanstart[2];
+    long       i=0;
     SpecScan   scan;
     short      modif = 0;
     long       mtime;
+    struct stat mystat;
 
    /*
     * read signature
     */
-    bytesread = read(sfi,buffer,sizeof(SF_SIGNATURE));
-    if (strcmp(buffer,SF_SIGNATURE) || bytesread == 0 ) {
+    if (read(sfi,buffer,sizeof(SF_SIGNATURE)) != sizeof(SF_SIGNATURE) ||
+            memcmp(buffer,SF_SIGNATURE,sizeof(SF_SIGNATURE))) {
         return(SF_INIT);
     }
 
    /*
     * read cursor and specfile structure
     */
-    if ( read(sfi,&mtime,   sizeof(long)) == 0)   return(SF_INIT);
-    if ( read(sfi,&filecurs, sizeof(SfCursor)) == 0) return(SF_INIT);
+    if ( read(sfi,&mtime,   sizeof(long)) != sizeof(long))   return(SF_INIT);
+    if ( read(sfi,&filecurs, sizeof(SfCursor)) != sizeof(SfCursor)) return(SF_INIT);
 
-    if (sf->m_time != mtime)  modif = 1;
+   /*
+    * The data file is only expected to grow
+    */
+    if (fstat(sf->fd,&mystat) || mystat.st_size < filecurs.bytecnt) return(SF_INIT);
+    if (filecurs.scanno <= 0) return(SF_INIT);
+
+    if (sf->m_time != mtime || mystat.st_size != filecurs.bytecnt)  modif = 1;
 
-    while(read(sfi,&scan, sizeof(SpecScan))) {
-        addToList(&(sf->list), (void *)&scan, (long)sizeof(SpecScan));
+    while(read(sfi,&scan, sizeof(SpecScan)) == sizeof(SpecScan)) {
+        if (addToList(&(sf->list), (void *)&scan, (long)sizeof(SpecScan))) {
+            sfFreeScans(sf);
+            *error = SF_ERR_MEMORY_ALLOC;
+            return(SF_INIT);
+        }
         i++;
     }
+
+    if (i != filecurs.scanno) {
+       /*
+        * Truncated index file
+        */
+        sfFreeScans(sf);
+        return(SF_INIT);
+    }
     sf->no_scans = i;
 
+    if (modif) {
+       /*
+        * Check that the last indexed scan was not overwritten
+        */
+        if (lseek(sf->fd,((SpecScan *)sf->list.last->contents)->offset,SEEK_SET) == -1 ||
+                read(sf->fd,scanstart,2) != 2 ||
+                scanstart[0] != '#' || scanstart[1] != 'S') {
+            sfFreeScans(sf);
+            return(SF_INIT);
+        }
+    }
+
     memcpy(cursor,&filecurs,sizeof(SfCursor));
 
     if (modif) return(SF_MODIFIED);
@@ -608,45 +790,65 @@ sfReadIndex   ( int sfi, SpecFile *sf, SfCursor *cursor, int *error) {
     return(SF_READY);
 }
 
-
+
 static void
-sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, int *error) {
+sfWriteIndex  ( SpecFile *sf, SfCursor *cursor, long from, int *error) {
 
     int         fdi;
-    char       *idxname;
-    short       namelength;
+    int         flags;
     ObjectList *obj;
     long        mtime;
+    long        headersize;
 
-    namelength = strlen(sf->sfname) + strlen(SF_ISFX) + 1;
-
-    idxname = (char *)malloc(sizeof(char) * namelength);
+    flags = SF_IDXWRITEFLAG;
+    if (from <= 1) flags |= O_TRUNC;
 
-    sprintf(idxname,"%s%s",sf->sfname,SF_ISFX);
-
-    /* if ((fdi = open(idxname,SF_WRITEFLAG,SF_UMASK)) == -1) { */
-    if ((fdi = open(idxname,O_CREAT | O_WRONLY,SF_UMASK)) == -1) {
-        printf("    - cannot open. Error: (%d)\n",errno);
-        free(idxname);
+    if ((fdi = open(sf->idxname,flags,SF_UMASK)) == -1) {
         return;
+    }
+
+   /*
+    * Scans before 'from' are already stored
+    */
+    headersize = sizeof(SF_SIGNATURE) + sizeof(long) + sizeof(SfCursor);
+    if (from > 1) {
+        lseek(fdi, headersize + (from - 1) * sizeof(SpecScan), SEEK_SET);
     } else {
-        mtime = sf->m_time;
-        write(fdi,SF_SIGNATURE,sizeof(SF_SIGNATURE));
- /*
-  * Swap bytes for linux
-  */
-        write(fdi, (void *) &mtime, sizeof(long));
-        write(fdi, (void *) cursor, sizeof(SfCursor));
-        for( obj = sf->list.first; obj ; obj = obj->next)
-           write(fdi,(void *) obj->contents, sizeof(SpecScan));
-        close(fdi);
-        free(idxname);
-        return;
+        lseek(fdi, headersize, SEEK_SET);
+    }
+    for( obj = sfFindScanFrom(sf, from); obj ; obj = obj->next)
+        write(fdi,(void *) obj->contents, sizeof(SpecScan));
+
+   /*
+    * The header is written last, a partial update is detected as a
+    * truncated index file
+    */
+    mtime = sf->m_time;
+    lseek(fdi, 0, SEEK_SET);
+    write(fdi,SF_SIGNATURE,sizeof(SF_SIGNATURE));
+    write(fdi, (void *) &mtime, sizeof(long));
+    write(fdi, (void *) cursor, sizeof(SfCursor));
+    close(fdi);
+    return;
+}
+
+
+static void
+sfFreeScans ( SpecFile *sf) {
+    register ObjectList  *ptr;
+    register ObjectList  *prevptr;
+
+    for( ptr=sf->list.last ; ptr ; ptr=prevptr ) {
+        free( (SpecScan *)ptr->contents );
+        prevptr = ptr->prev;
+        free( (ObjectList *)ptr );
     }
+    sf->list.first = (ObjectList *)NULL;
+    sf->list.last  = (ObjectList *)NULL;
+    sf->no_scans   = 0;
 }
-#endif
 
-
+
 /*****************************************************************************
  *
  *    Function:   static void sfStartBuffer()
@@ -788,8 +990,31 @@ sfSaveScan(SpecFile *sf, SfCursor *cursor,int *error) {
 }
 
 
+/*****************************************************************************
+ *
+ *    Function:   static ObjectList *sfFindScanFrom()
+ *
+ *    Description:  returns the list element of the scan with index 'from',
+ *                  searching from the end of the list as it is used for
+ *                  appended scans
+ *
+ *****************************************************************************/
+static ObjectList *
+sfFindScanFrom(SpecFile *sf, long from) {
+  register   ObjectList *object;
+
+  object = (sf->list).last;
+  if (object == (ObjectList *)NULL) return(object);
+  while (object->prev && ((SpecScan *) object->prev->contents)->index >= from) {
+      object = object->prev;
+  }
+  if (((SpecScan *) object->contents)->index < from) return((ObjectList *)NULL);
+  return(object);
+}
+
+
 static void
-sfAssignScanNumbers(SpecFile *sf) {
+sfAssignScanNumbers(SpecFile *sf, long from) {
 
   int i;
   char *ptr;
@@ -801,7 +1026,7 @@ sfAssignScanNumbers(SpecFile *sf) {
   SpecScan              *scan,
                         *scan2;
 
-  for ( object = (sf->list).first; object; object=object->next) {
+  for ( object = sfFindScanFrom(sf, from); object; object=object->next) {
         scan = (SpecScan *) object->contents;
 
         lseek(sf->fd,scan->offset,SEEK_SET);
@@ -65,10 +65,15 @@
 
 #include <ctype.h>
 #include <stdlib.h>
+#include <string.h>
 /*
  * Define macro
  */
 #define isnumber(this) ( isdigit(this) || this == '-' || this == '+'  || this =='e' || this == 'E' || this == '.' )
+/*
+ * Locale independent version used by the fast mca parser
+ */
+#define sfisnumber(this) ( ((this) >= '0' && (this) <= '9') || this == '-' || this == '+' || this == 'e' || this == 'E' || this == '.' )
 
 /*
  * Mca continuation character
@@ -84,6 +89,14 @@ DllExport int  SfGetMca   ( SpecFile *sf, long index, long mcano,
                                           double **retdata, int *error );
 DllExport long SfMcaCalib ( SpecFile *sf, long index, double **calib,
                                           int *error );
+DllExport long SfMcaOffsets ( SpecFile *sf, long index, long **offsets,
+                                          int *error );
+DllExport long SfMcaFill  ( SpecFile *sf, long index, long *offsets,
+                                          long nspectra, double *buffer,
+                                          long channels, int *error );
+
+static long    sfParseMca ( char *ptr, char *to, double *buffer,
+                                          long channels );
 
 
 /*********************************************************************
@@ -339,3 +352,199 @@ SfMcaCalib ( SpecFile *sf, long index, double **calib, int *error )
      *calib = retdata;
      return(0);
 }
+
+
+/*********************************************************************
+ *   Function:        long SfMcaOffsets( sf, index, offsets, error )
+ *
+ *   Description:    Gets the position of each mca spectrum of a scan,
+ *                   to be given to SfMcaFill.
+ *                   Spectra are found as in SfGetMca: the n-th spectrum
+ *                   follows the n-th '@' of the data part of the scan.
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *        Output:
+ *            (3) Array of offsets of the spectra in the scan
+ *            (4) error number
+ *   Returns:
+ *            Number of spectra
+ *                ( -1 ) => errors occured
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *            SF_ERR_FILE_READ
+ *            SF_ERR_SCAN_NOT_FOUND
+ *
+ *   Remark:  The memory allocated should be freed by the application
+ *
+ *********************************************************************/
+DllExport long
+SfMcaOffsets( SpecFile *sf, long index, long **offsets, int *error )
+{
+     SpecScan *scan;
+     char     *ptr,
+              *to;
+     long     *ret;
+     long      nspectra = 0,
+               size = 1024;
+
+     *offsets = (long *)NULL;
+     if (index <= 0 ){
+        *error = SF_ERR_SCAN_NOT_FOUND;
+        return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     scan = (SpecScan *)sf->current->contents;
+     if ((ret = (long *)malloc(sizeof(long) * size)) == (long *)NULL) {
+         *error = SF_ERR_MEMORY_ALLOC;
+          return(-1);
+     }
+     *offsets = ret;
+     if (scan->data_offset == -1)
+          return(0);
+
+     ptr = sf->scanbuffer + (scan->data_offset - scan->offset);
+     to  = sf->scanbuffer + sf->scansize;
+
+     while (ptr < to) {
+        ptr = (char *)memchr(ptr, '@', to - ptr);
+        if (ptr == (char *)NULL) break;
+        if (nspectra == size) {
+            size *= 2;
+            if ((ret = (long *)realloc(*offsets, sizeof(long) * size))
+                        == (long *)NULL) {
+                free(*offsets);
+                *offsets = (long *)NULL;
+                *error = SF_ERR_MEMORY_ALLOC;
+                return(-1);
+            }
+            *offsets = ret;
+        }
+        /* the character following '@' is the analyser letter */
+        (*offsets)[nspectra] = (ptr - sf->scanbuffer) + 2;
+        if ((*offsets)[nspectra] > sf->scansize)
+            (*offsets)[nspectra] = sf->scansize;
+        nspectra++;
+        ptr++;
+     }
+
+     return(nspectra);
+}
+
+
+/*********************************************************************
+ *   Function:        long SfMcaFill( sf, index, offsets, nspectra,
+ *                                    buffer, channels, error )
+ *
+ *   Description:    Parses the spectra at the given offsets, as given
+ *                   by SfMcaOffsets, directly into a preallocated
+ *                   C-contiguous array of nspectra x channels doubles.
+ *                   Values are parsed independently of the locale.
+ *                   Longer spectra are truncated and shorter spectra
+ *                   are completed with zeros.
+ *   Parameters:
+ *        Input :    (1) File pointer
+ *            (2) Index
+ *            (3) Offsets of the spectra to parse
+ *            (4) Number of spectra to parse
+ *            (5) Array of doubles, or NULL
+ *            (6) Number of channels of the array
+ *        Output:
+ *            (7) error number
+ *   Returns:
+ *            Number of values of the first spectrum if the array
+ *            is NULL, else number of spectra written.
+ *                ( -1 ) => errors occured
+ *   Possible errors:
+ *            SF_ERR_MEMORY_ALLOC
+ *            SF_ERR_FILE_READ
+ *            SF_ERR_SCAN_NOT_FOUND
+ *            SF_ERR_MCA_NOT_FOUND
+ *
+ *********************************************************************/
+DllExport long
+SfMcaFill( SpecFile *sf, long index, long *offsets, long nspectra,
+           double *buffer, long channels, int *error )
+{
+     char     *to;
+     long      i,
+               nvals;
+
+     if (index <= 0 ){
+        *error = SF_ERR_SCAN_NOT_FOUND;
+        return(-1);
+     }
+
+     if (sfSetCurrent(sf,index,error) == -1 )
+             return(-1);
+
+     to = sf->scanbuffer + sf->scansize;
+     for (i = 0; i < nspectra; i++) {
+        if (offsets[i] < 0 || offsets[i] > sf->scansize) {
+            *error = SF_ERR_MCA_NOT_FOUND;
+            return(-1);
+        }
+     }
+
+     if (buffer == (double *)NULL) {
+        if (nspectra <= 0) return(0);
+        return(sfParseMca(sf->scanbuffer + offsets[0], to, NULL, 0));
+     }
+     if (channels <= 0) return(nspectra);
+
+     for (i = 0; i < nspectra; i++) {
+        nvals = sfParseMca(sf->scanbuffer + offsets[i], to,
+                           buffer + i * channels, channels);
+        if (nvals < channels)
+            memset(buffer + i * channels + nvals, 0,
+                   sizeof(double) * (channels - nvals));
+     }
+     return(nspectra);
+}
+
+
+/*
+ * Parses a single spectrum starting at ptr. The spectrum ends at the
+ * first newline which is not preceded by the continuation character.
+ * Tokens are read as in SfGetMca: they are separated by spaces,
+ * tabulations, continuation characters or newlines and only the
+ * characters which can be part of a number are kept.
+ * At most channels values are written in the buffer, if any, and the
+ * number of values written (or found if buffer is NULL) is returned.
+ */
+static long
+sfParseMca( char *ptr, char *to, double *buffer, long channels )
+{
+     char      strval[100];
+     long      vals = 0;
+     int       i = 0;
+
+     for ( ; ptr < to; ptr++) {
+        if (*ptr == ' ' || *ptr == '\t' || *ptr == '\r' ||
+                *ptr == MCA_CONT || *ptr == '\n') {
+            if (i) {
+                if (buffer != (double *)NULL) {
+                    strval[i] = '\0';
+                    buffer[vals] = sfAtof(strval);
+                }
+                i = 0;
+                vals++;
+                if (buffer != (double *)NULL && vals >= channels) break;
+            }
+            if (*ptr == '\n' && *(ptr-1) != MCA_CONT) break;
+        } else if (sfisnumber(*ptr)) {
+            if (i < (int) sizeof(strval) - 1) strval[i++] = *ptr;
+        }
+     }
+     if (i && ptr >= to && (buffer == (double *)NULL || vals < channels)) {
+        if (buffer != (double *)NULL) {
+            strval[i] = '\0';
+            buffer[vals] = sfAtof(strval);
+        }
+        vals++;
+     }
+     return(vals);
+}
@@ -37,7 +37,9 @@ ctypedef _SpecFile SpecFileHandle
 cdef extern from "SpecFileCython.h":
     # sfinit
     SpecFileHandle* SfOpen(char*, int*)
+    SpecFileHandle* SfOpenIndexed(char*, char*, int*)
     int SfClose(SpecFileHandle*)
+    long SfRefresh(SpecFileHandle*, int*)
     char* SfError(int)
     
     # sfindex
@@ -51,6 +53,8 @@ cdef extern from "SpecFileCython.h":
     int SfData(SpecFileHandle*, long, double***, long**, int*)
     long SfDataLine(SpecFileHandle*, long, long, double**, int*)
     long SfDataColByName(SpecFileHandle*, long, char*, double**, int*)
+    long SfDataShape(SpecFileHandle*, long, long*, int*)
+    long SfDataFill(SpecFileHandle*, long, double*, float*, long, long, int*)
     
     # sfheader
     #char* SfTitle(SpecFileHandle*, long, int*)
@@ -74,4 +78,6 @@ cdef extern from "SpecFileCython.h":
     long SfNoMca(SpecFileHandle*, long, int*)
     int  SfGetMca(SpecFileHandle*, long, long , double**, int*)
     long SfMcaCalib(SpecFileHandle*, long, double**, int*)
+    long SfMcaOffsets(SpecFileHandle*, long, long**, int*)
+    long SfMcaFill(SpecFileHandle*, long, long*, long, double*, long, int*)
 
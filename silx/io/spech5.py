@@ -190,7 +190,9 @@ import numpy
 import re
 import io
 import h5py
+import collections
 
+import silx
 from silx import version as silx_version
 from .specfile import SpecFile
 from . import commonh5
@@ -436,15 +438,12 @@ def _demultiplex_mca(scan, analyser_index):
     """
     number_of_analysers = _get_number_of_mca_analysers(scan)
     number_of_spectra = len(scan.mca)
+    mca_indices = numpy.arange(analyser_index, number_of_spectra,
+                               number_of_analysers)
     number_of_spectra_per_analyser = number_of_spectra // number_of_analysers
-    len_spectrum = len(scan.mca[analyser_index])
-
-    mca_array = numpy.empty((number_of_spectra_per_analyser, len_spectrum))
-
-    for i in range(number_of_spectra_per_analyser):
-        mca_array[i, :] = scan.mca[analyser_index + i * number_of_analysers]
-
-    return mca_array
+    # an incomplete last point is ignored
+    mca_indices = mca_indices[:number_of_spectra_per_analyser]
+    return scan.mca.get_spectra(mca_indices)
 
 
 # Node classes
@@ -550,15 +549,27 @@ class SpecH5(commonh5.File, SpecH5Group):
     which implements most of its API.
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, max_loaded_scans=None):
         """
         :param filename: Path to SpecFile in filesystem
         :type filename: str
+        :param int max_loaded_scans: Maximum number of scan groups whose
+            content is kept in memory. The content of the least recently
+            used scan is released when this number is exceeded, and created
+            again if it is accessed again. If None,
+            `silx.config.DEFAULT_IO_MAX_LOADED_SCANS` is used.
         """
         if isinstance(filename, io.IOBase):
             # see https://github.com/silx-kit/silx/issues/858
             filename = filename.name
 
+        if max_loaded_scans is None:
+            max_loaded_scans = silx.config.DEFAULT_IO_MAX_LOADED_SCANS
+        if max_loaded_scans < 1:
+            raise ValueError("At least one scan must be kept in memory")
+        self.__max_loaded_scans = max_loaded_scans
+        self.__loaded_scans = collections.OrderedDict()
+
         self._sf = SpecFile(filename)
 
         attrs = {"NX_class": to_h5py_utf8("NXroot"),
@@ -568,26 +579,108 @@ class SpecH5(commonh5.File, SpecH5Group):
                  "creator": to_h5py_utf8("silx spech5 %s" % silx_version)}
         commonh5.File.__init__(self, filename, attrs=attrs)
 
-        for scan_key in self._sf.keys():
-            scan = self._sf[scan_key]
-            scan_group = ScanGroup(scan_key, parent=self, scan=scan)
+        # scan groups only read their scan when their content is accessed
+        for scan_index, scan_key in enumerate(self._sf.keys()):
+            scan_group = ScanGroup(scan_key, parent=self, scan_index=scan_index)
             self.add_node(scan_group)
 
+    def _use_scan(self, scan_group):
+        """Mark the content of a scan group as recently used, and release
+        the content of the least recently used scan groups if there are too
+        many of them.
+
+        :param ScanGroup scan_group: A scan group whose content is loaded
+        """
+        name = scan_group.basename
+        if self.__loaded_scans.pop(name, None) is scan_group:
+            self.__loaded_scans[name] = scan_group
+            return
+        while len(self.__loaded_scans) >= self.__max_loaded_scans:
+            _, older = self.__loaded_scans.popitem(last=False)
+            older._unload()
+        self.__loaded_scans[name] = scan_group
+
+    def refresh(self):
+        """Update the tree with the content appended to the SpecFile since
+        it was opened or last refreshed.
+
+        Only the appended bytes are parsed. The groups of modified scans
+        (usually the last one, which was still running) are created again
+        and groups are added for new scans. Nodes previously retrieved
+        from this tree are not updated.
+
+        :return: Names of the scan groups which were modified, added
+            or removed (e.g. ``["3.1", "4.1"]``)
+        :rtype: list of str
+        """
+        old_keys = list(self.keys())
+        indices = self._sf.refresh()
+        if not indices and len(self._sf) == len(old_keys):
+            return []
+
+        first = indices[0] if indices else len(self._sf)
+        removed_keys = old_keys[first:]
+        for scan_key in removed_keys:
+            self.__loaded_scans.pop(scan_key, None)
+            self.remove_node(scan_key)
+
+        changed = []
+        keys = self._sf.keys()
+        for scan_index in indices:
+            scan_key = keys[scan_index]
+            self.__loaded_scans.pop(scan_key, None)
+            self.add_node(ScanGroup(scan_key, parent=self, scan_index=scan_index))
+            changed.append(scan_key)
+        changed += [key for key in removed_keys if key not in self]
+        return changed
+
     def close(self):
+        self.__loaded_scans.clear()
         self._sf.close()
         self._sf = None
 
 
-class ScanGroup(commonh5.Group, SpecH5Group):
-    def __init__(self, scan_key, parent, scan):
+class ScanGroup(commonh5.LazyLoadableGroup, SpecH5Group):
+    def __init__(self, scan_key, parent, scan=None, scan_index=None):
         """
 
+        The content of the group is created on first access. If the scan is
+        provided by its index, it can be released by the parent
+        :class:`SpecH5` and created again later.
+
         :param parent: parent Group
         :param str scan_key: Scan key (e.g. "1.1")
         :param scan: specfile.Scan object
+        :param int scan_index: 0-based index of the scan in the SpecFile of
+            the parent, used if scan is not provided
         """
-        commonh5.Group.__init__(self, scan_key, parent=parent,
-                                attrs={"NX_class": to_h5py_utf8("NXentry")})
+        commonh5.LazyLoadableGroup.__init__(
+            self, scan_key, parent=parent,
+            attrs={"NX_class": to_h5py_utf8("NXentry")})
+        if scan is None and scan_index is None:
+            raise ValueError("Either scan or scan_index must be provided")
+        self._scan = scan
+        self._scan_index = scan_index
+
+    def _get_items(self):
+        items = commonh5.LazyLoadableGroup._get_items(self)
+        parent = self.parent
+        if isinstance(parent, SpecH5):
+            parent._use_scan(self)
+        return items
+
+    def _unload(self):
+        commonh5.LazyLoadableGroup._unload(self)
+        if self._scan_index is not None:
+            # the Scan caches its data
+            self._scan = None
+
+    def _create_child(self):
+        scan = self._scan
+        if scan is None:
+            scan = self.parent._sf[self._scan_index]
+            self._scan = scan
+        scan_key = self.basename
 
         # take title in #S after stripping away scan number and spaces
         s_hdr_line = scan.scan_header_dict["S"]
@@ -776,25 +869,22 @@ class McaDataDataset(SpecH5LazyNodeDataset):
         return self.shape[0]
 
     def __getitem__(self, item):
-        # optimization for fetching a single spectrum if data not already loaded
+        # optimization for fetching some spectra if data not already loaded:
+        # only the selected spectra are parsed
         if not self._is_initialized:
-            if isinstance(item, six.integer_types):
-                if item < 0:
-                    # negative indexing
-                    item += len(self)
-                return self._scan.mca[self._analyser_index +
-                                      item * self._num_analysers]
-            # accessing a slice or element of a single spectrum [i, j:k]
-            try:
-                spectrum_idx, channel_idx_or_slice = item
-                assert isinstance(spectrum_idx, six.integer_types)
-            except (ValueError, TypeError, AssertionError):
-                pass
-            else:
-                if spectrum_idx < 0:
-                    item += len(self)
-                idx = self._analyser_index + spectrum_idx * self._num_analysers
-                return self._scan.mca[idx][channel_idx_or_slice]
+            selection = item if isinstance(item, tuple) else (item, )
+            points = None
+            if (len(selection) > 0 and selection[0] is not Ellipsis and
+                    selection[0] is not None):
+                points = numpy.arange(len(self))[selection[0]]
+            if points is not None and numpy.ndim(points) <= 1:
+                mca_indices = (self._analyser_index +
+                               numpy.atleast_1d(points) * self._num_analysers)
+                spectra = self._scan.mca.get_spectra(mca_indices,
+                                                     self.shape[1])
+                if numpy.ndim(points) == 0:
+                    return spectra[0][selection[1:]]
+                return spectra[(slice(None), ) + selection[1:]]
 
         return super(McaDataDataset, self).__getitem__(item)
 
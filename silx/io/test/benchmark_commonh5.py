@@ -0,0 +1,95 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of the path resolution of commonh5 trees"""
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "23/05/2018"
+
+
+import logging
+import time
+import unittest
+
+import numpy
+
+from silx.io import commonh5
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkCommonH5Lookup(unittest.TestCase):
+    """Benchmark of absolute path lookups in a commonh5 tree, with and without
+    soft links, as a function of the depth of the target"""
+
+    DEPTHS = 1, 4, 16, 64
+    """Depth of the benchmarked datasets"""
+
+    NB_LOOKUPS = 100000
+    """Number of lookups per depth"""
+
+    def create_tree(self, depth):
+        h5 = commonh5.File(name="benchmark", mode="w")
+        path = "/" + "/".join("group%d" % i for i in range(depth))
+        group = h5.create_group(path)
+        group.create_dataset("data", data=numpy.arange(10))
+        h5["link"] = commonh5.SoftLink(None, path=path)
+        return h5, path + "/data"
+
+    def time_lookups(self, h5, path):
+        start = time.time()
+        for _ in range(self.NB_LOOKUPS):
+            h5[path]
+        return time.time() - start
+
+    def test_benchmark_lookup(self):
+        for depth in self.DEPTHS:
+            h5, path = self.create_tree(depth)
+
+            duration_first = self.time_lookups(h5, path)
+            duration_link = self.time_lookups(h5, "/link/data")
+
+            _logger.info(
+                "depth %d: %d lookups in %.3fs (%.2fus each), "
+                "through a link %.3fs (%.2fus each)",
+                depth, self.NB_LOOKUPS,
+                duration_first, duration_first / self.NB_LOOKUPS * 1e6,
+                duration_link, duration_link / self.NB_LOOKUPS * 1e6)
+
+            self.assertIs(h5[path], h5[path])
+            self.assertEqual(h5["/link/data"].name, path)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            BenchmarkCommonH5Lookup))
+    return test_suite
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    unittest.main(defaultTest="suite")
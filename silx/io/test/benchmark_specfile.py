@@ -0,0 +1,114 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of the reading of SpecFile data"""
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "23/05/2018"
+
+
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+import numpy
+
+from silx.io.specfile import SpecFile
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkSpecFileData(unittest.TestCase):
+    """Benchmark of :meth:`SpecFile.data` against the reading of the data
+    column by column, as previously done to build SpecH5 measurements"""
+
+    SHAPES = (1000, 10), (10000, 50), (100000, 200)
+    """Number of points and number of counters of the benchmarked scans"""
+
+    def setUp(self):
+        self.files = []
+
+    def tearDown(self):
+        for filename in self.files:
+            os.unlink(filename)
+
+    def create_specfile(self, npoints, ncounters):
+        data = numpy.random.random((npoints, ncounters)) * 1000.
+        labels = ["counter%d" % i for i in range(ncounters)]
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        self.files.append(filename)
+        with open(filename, "w") as f:
+            f.write("#F %s\n\n" % filename)
+            f.write("#S 1 ascan benchmark\n#N %d\n" % ncounters)
+            f.write("#L %s\n" % "  ".join(labels))
+            numpy.savetxt(f, data, fmt="%.6g")
+        return filename, labels
+
+    def test_benchmark_data(self):
+        for npoints, ncounters in self.SHAPES:
+            filename, labels = self.create_specfile(npoints, ncounters)
+            sf = SpecFile(filename)
+
+            start = time.time()
+            columns = [sf.data_column_by_name(0, label) for label in labels]
+            duration_columns = time.time() - start
+
+            start = time.time()
+            data = sf.data(0)
+            duration_data = time.time() - start
+
+            start = time.time()
+            data32 = sf.data(0, dtype=numpy.float32)
+            duration_data32 = time.time() - start
+
+            sf.close()
+
+            _logger.info(
+                "%d points x %d counters: by column %.3fs, "
+                "data %.3fs (x%.1f), float32 data %.3fs (x%.1f)",
+                npoints, ncounters, duration_columns,
+                duration_data, duration_columns / duration_data,
+                duration_data32, duration_columns / duration_data32)
+
+            numpy.testing.assert_array_equal(numpy.array(columns).T, data)
+            self.assertEqual(data32.dtype, numpy.float32)
+            numpy.testing.assert_array_equal(data.astype(numpy.float32),
+                                             data32)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            BenchmarkSpecFileData))
+    return test_suite
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    unittest.main(defaultTest="suite")
@@ -292,6 +292,43 @@ class TestSpecificCommonH5(unittest.TestCase):
         group["b"] = commonh5.SoftLink(None, path="/" + self.id() + "/a")
         self.assertEqual(group["b"].dtype.kind, "i")
 
+    def test_path_cache(self):
+        f = commonh5.File(name="Foo", mode="w")
+        data = f.create_group("a/b/c").create_dataset("data", data=numpy.array([1]))
+        self.assertIs(f["/a/b/c/data"], data)
+        self.assertIs(f["/a/b/c/data"], data)
+        self.assertIs(f["a"]["b/c/data"], data)
+        self.assertIn("a/b/c/data", f)
+
+    def test_path_cache_link(self):
+        f = commonh5.File(name="Foo", mode="w")
+        f.create_group("a/b").create_dataset("data", data=numpy.array([1]))
+        f["link"] = commonh5.SoftLink(None, path="/a/b")
+        group = f["/link"]
+        self.assertIsInstance(group, commonh5.Group)
+        self.assertIs(f["link"], group)
+        self.assertIs(f["/link/data"], f["/a/b/data"])
+        self.assertIsInstance(f.get("link", getlink=True), commonh5.SoftLink)
+
+    def test_path_cache_replace(self):
+        f = commonh5.File(name="Foo", mode="w")
+        f.create_group("a/b").create_dataset("data", data=numpy.array([1]))
+        old = f["/a/b/data"]
+        f["a/b"].add_node(commonh5.Dataset("data", data=numpy.array([2])))
+        new = f["/a/b/data"]
+        self.assertIsNot(new, old)
+        self.assertEqual(new[0], 2)
+
+    def test_path_cache_remove(self):
+        f = commonh5.File(name="Foo", mode="w")
+        group = f.create_group("a/b")
+        group.create_dataset("data", data=numpy.array([1]))
+        self.assertIn("/a/b/data", f)
+        f["a"].remove_node("b")
+        self.assertNotIn("/a/b/data", f)
+        self.assertIsNone(group.parent)
+        self.assertRaises(KeyError, f.__getitem__, "/a/b/data")
+
 
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
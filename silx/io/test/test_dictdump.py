@@ -45,7 +45,7 @@ from silx.utils.testutils import TestLogging
 
 from ..configdict import ConfigDict
 from ..dictdump import dicttoh5, dicttojson, dump
-from ..dictdump import h5todict, load
+from ..dictdump import h5todict, load, LazyH5Dict
 from ..dictdump import logger as dictdump_logger
 
 
@@ -136,6 +136,37 @@ class TestH5ToDict(unittest.TestCase):
         self.assertIn("coordinates", ddict["Grenoble"])
         self.assertIn("area", ddict["Grenoble"])
 
+    def testLazy(self):
+        with h5todict(self.h5_fname, path="/Europe", lazy=True) as ddict:
+            grenoble = ddict["France"]["Grenoble"]
+            self.assertIsInstance(grenoble, LazyH5Dict)
+            self.assertFalse(grenoble.is_loaded("inhabitants"))
+            self.assertEqual(grenoble["inhabitants"], 160215)
+            self.assertTrue(grenoble.is_loaded("inhabitants"))
+            france = ddict.todict()["France"]
+            self.assertIsInstance(france, dict)
+            self.assertEqual(france["Grenoble"]["area"], b"18.44 km2")
+            numpy.testing.assert_array_equal(
+                france["Grenoble"]["coordinates"], [45.1830, 5.7196])
+        # loaded datasets are still available
+        self.assertEqual(grenoble["inhabitants"], 160215)
+
+    def testLazyProxy(self):
+        with h5py.File(self.h5_fname, "r") as h5f:
+            ddict = h5todict(h5f, lazy=True, proxy_min_size=2,
+                             exclude_names=["ourcoing"])
+            grenoble = ddict["Europe"]["France"]["Grenoble"]
+            self.assertNotIn("Tourcoing", ddict["Europe"]["France"])
+            coordinates = grenoble["coordinates"]
+            self.assertIsInstance(coordinates, h5py.Dataset)
+            self.assertAlmostEqual(coordinates[1], 5.7196)
+            self.assertFalse(grenoble.is_loaded("coordinates"))
+            self.assertEqual(grenoble["inhabitants"], 160215)
+
+    def testProxyNotLazy(self):
+        self.assertRaises(ValueError, h5todict, self.h5_fname,
+                          proxy_min_size=2)
+
 
 class TestDictToJson(unittest.TestCase):
     def setUp(self):
@@ -573,6 +573,18 @@ class TestFabioH5WithFileSeries(unittest.TestCase):
         h5_image = fabioh5.File(file_series=file_series)
         self._testH5Image(h5_image)
 
+    def testSynchronousHeaders(self):
+        h5_image = fabioh5.File(file_series=self.edf_filenames, header_workers=0)
+        self._testH5Image(h5_image)
+
+    def testBackgroundHeaders(self):
+        h5_image = fabioh5.File(file_series=self.edf_filenames, header_workers=3)
+        self._testH5Image(h5_image)
+
+    def testHeaderOnly(self):
+        fabio_header = fabioh5._read_header(self.edf_filenames[3])
+        self.assertEqual(fabio_header.header["image_id"], "3")
+
     def testFrameDataCache(self):
         file_series = fabioh5._FileSeries(self.edf_filenames)
         reader = fabioh5.FabioReader(file_series=file_series)
@@ -580,6 +592,194 @@ class TestFabioH5WithFileSeries(unittest.TestCase):
         self.assertEqual(frameData.dtype.kind, "i")
         self.assertEqual(frameData.shape, (10, 3, 2))
 
+    def testFrameDataSlicing(self):
+        file_series = fabioh5._FileSeries(self.edf_filenames)
+        reader = fabioh5.FabioReader(file_series=file_series)
+        frameData = _TestableFrameData("foo", reader)
+        self.assertEqual(frameData[-1][0, 0], 9)
+        self.assertEqual(list(frameData[2:5, 0, 0]), [2, 3, 4])
+        self.assertEqual(list(frameData[[7, 1], 0, 0]), [7, 1])
+        self.assertEqual(frameData[..., 0].shape, (10, 3))
+
+    def testFrameLocation(self):
+        file_series = fabioh5._FileSeries(self.edf_filenames)
+        reader = fabioh5.FabioReader(file_series=file_series)
+        frameData = _TestableFrameData("foo", reader)
+        self.assertEqual(frameData.get_frame_location(4),
+                         (self.edf_filenames[4], 0))
+        self.assertRaises(IndexError, frameData.get_frame_location, 10)
+        frame = fabio.open(self.edf_filenames[4]).data
+        normalized = frameData.normalize_frame(frame[:2])
+        self.assertEqual(normalized.shape, (3, 2))
+        self.assertEqual(list(normalized[:, 0]), [4, 12, 0])
+
+
+class TestFrameData(unittest.TestCase):
+    """Test frame by frame access of multi-frame images"""
+
+    @classmethod
+    def setUpClass(cls):
+        if fabio is None:
+            raise unittest.SkipTest("fabio is needed")
+        if h5py is None:
+            raise unittest.SkipTest("h5py is needed")
+
+        cls.data = numpy.arange(6 * 3 * 4, dtype=numpy.int32)
+        cls.data.shape = 6, 3, 4
+        fabio_image = None
+        for frame in cls.data:
+            if fabio_image is None:
+                fabio_image = fabio.edfimage.EdfImage(data=frame)
+            else:
+                fabio_image.appendFrame(data=frame)
+        cls.fabio_image = fabio_image
+
+    def setUp(self):
+        self.reader = fabioh5.FabioReader(fabio_image=self.fabio_image)
+        self.frame_data = _TestableFrameData("data", self.reader)
+
+    def test_shape(self):
+        self.assertEqual(self.frame_data.shape, self.data.shape)
+        self.assertEqual(self.frame_data.dtype, self.data.dtype)
+        self.assertEqual(len(self.frame_data), len(self.data))
+        self.assertEqual(self.frame_data.size, self.data.size)
+
+    def test_selections(self):
+        selections = [
+            0, -1, (2, 1), (3, 1, 2),
+            slice(1, 4), slice(None, None, -2), (slice(1, 5), 0),
+            (slice(1, 5), slice(None), 2), Ellipsis, (Ellipsis, 1),
+            (1, Ellipsis), (Ellipsis, 0, 1, 2), tuple(),
+            [4, 0, 2], numpy.array([1, 1]),
+            numpy.array([True, False, True, False, False, True]),
+            (slice(None), [0, 2]), ([0, 5], Ellipsis, 3),
+            slice(4, 2), self.data > 5, self.data[:, :, 0] % 2 == 0,
+        ]
+        for selection in selections:
+            expected = self.data[selection]
+            result = self.frame_data[selection]
+            numpy.testing.assert_array_equal(result, expected,
+                                             err_msg=str(selection))
+            self.assertEqual(numpy.shape(result), numpy.shape(expected))
+
+    def test_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.frame_data[6]
+
+    def test_returned_copy(self):
+        result = self.frame_data[0]
+        result[...] = -1
+        self.assertEqual(self.frame_data[0, 0, 0], 0)
+
+    def test_cache_size(self):
+        frame_size = self.data[0].nbytes
+        self.reader.set_frame_cache_size(2 * frame_size)
+        self.frame_data[0:6]
+        self.assertEqual(self.reader.get_frame_cache_size(), 2 * frame_size)
+        numpy.testing.assert_array_equal(self.frame_data[1:5], self.data[1:5])
+
+
+class TestFrameCache(unittest.TestCase):
+
+    def test_lru(self):
+        cache = fabioh5._FrameCache(max_size=30)
+        cache.set(0, numpy.zeros(10, dtype=numpy.uint8))
+        cache.set(1, numpy.zeros(10, dtype=numpy.uint8))
+        cache.set(2, numpy.zeros(10, dtype=numpy.uint8))
+        self.assertEqual(cache.size(), 30)
+        # 0 becomes the most recently used
+        self.assertIsNotNone(cache.get(0))
+        cache.set(3, numpy.zeros(10, dtype=numpy.uint8))
+        self.assertNotIn(1, cache)
+        self.assertIn(0, cache)
+        self.assertEqual(cache.size(), 30)
+
+    def test_too_big(self):
+        cache = fabioh5._FrameCache(max_size=10)
+        cache.set(0, numpy.zeros(20, dtype=numpy.uint8))
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(0))
+
+    def test_shrink(self):
+        cache = fabioh5._FrameCache(max_size=30)
+        for i in range(3):
+            cache.set(i, numpy.zeros(10, dtype=numpy.uint8))
+        cache.set_max_size(15)
+        self.assertEqual(len(cache), 1)
+        self.assertIn(2, cache)
+
+
+class TestFabioH5Mmap(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if fabio is None:
+            raise unittest.SkipTest("fabio is needed")
+        if h5py is None:
+            raise unittest.SkipTest("h5py is needed")
+
+        cls.tmp_directory = tempfile.mkdtemp()
+        cls.data = numpy.arange(5 * 3 * 4, dtype=numpy.uint16).reshape(5, 3, 4)
+
+        cls.single_filename = os.path.join(cls.tmp_directory, "single.edf")
+        fabio.edfimage.EdfImage(data=cls.data[0]).write(cls.single_filename)
+
+        cls.multi_filename = os.path.join(cls.tmp_directory, "multi.edf")
+        fabio_image = fabio.edfimage.EdfImage(data=cls.data[0])
+        for frame in cls.data[1:]:
+            fabio_image.append_frame(data=frame)
+        fabio_image.write(cls.multi_filename)
+
+        cls.series_filenames = []
+        for i, frame in enumerate(cls.data):
+            filename = os.path.join(cls.tmp_directory, "series_%d.edf" % i)
+            fabio.edfimage.EdfImage(data=frame).write(filename)
+            cls.series_filenames.append(filename)
+
+        cls.gz_filename = os.path.join(cls.tmp_directory, "single.edf.gz")
+        fabio.edfimage.EdfImage(data=cls.data[0]).write(cls.gz_filename)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_directory)
+
+    def testSingleFrame(self):
+        h5_image = fabioh5.File(self.single_filename, mmap=True)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        self.assertIsInstance(dataset.value, numpy.memmap)
+        numpy.testing.assert_array_equal(dataset[()], self.data[0])
+        h5_image.close()
+
+    def testMultiFrames(self):
+        h5_image = fabioh5.File(self.multi_filename, mmap=True)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        numpy.testing.assert_array_equal(dataset[2], self.data[2])
+        self.assertFalse(dataset.value.flags.owndata)
+        self.assertFalse(dataset.value.flags.writeable)
+        numpy.testing.assert_array_equal(dataset[()], self.data)
+        numpy.testing.assert_array_equal(dataset[1:4, 2], self.data[1:4, 2])
+
+        # Compare with the frames read by fabio
+        fabio_image = fabio.open(self.multi_filename)
+        for index in range(fabio_image.nframes):
+            numpy.testing.assert_array_equal(
+                dataset[index], fabio_image.getframe(index).data)
+        h5_image.close()
+
+    def testFileSeries(self):
+        h5_image = fabioh5.File(file_series=self.series_filenames, mmap=True)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        numpy.testing.assert_array_equal(dataset[3], self.data[3])
+        numpy.testing.assert_array_equal(dataset[()], self.data)
+        h5_image.close()
+
+    def testCompressedFile(self):
+        h5_image = fabioh5.File(self.gz_filename, mmap=True)
+        dataset = h5_image["/scan_0/instrument/detector_0/data"]
+        self.assertNotIsInstance(dataset.value, numpy.memmap)
+        numpy.testing.assert_array_equal(dataset[()], self.data[0])
+        h5_image.close()
+
 
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
@@ -588,6 +788,9 @@ def suite():
     test_suite.addTest(loadTests(TestFabioH5MultiFrames))
     test_suite.addTest(loadTests(TestFabioH5WithEdf))
     test_suite.addTest(loadTests(TestFabioH5WithFileSeries))
+    test_suite.addTest(loadTests(TestFrameData))
+    test_suite.addTest(loadTests(TestFrameCache))
+    test_suite.addTest(loadTests(TestFabioH5Mmap))
     return test_suite
 
 
@@ -194,6 +194,31 @@ class TestNXdata(unittest.TestCase):
                         nxdata.is_valid_nxdata(self.h5f[group][subgroup]),
                         "%s/%s not found to be a valid NXdata group" % (group, subgroup))
 
+    def testValidityMany(self):
+        groups = [self.h5f[group][subgroup]
+                  for group in self.h5f for subgroup in self.h5f[group]]
+        groups.append(self.h5f["scalars"])
+        expected = [True] * (len(groups) - 1) + [False]
+        self.assertEqual(nxdata.is_valid_nxdata_many(groups), expected)
+        self.assertEqual(nxdata.is_valid_nxdata_many(groups, workers=4),
+                         expected)
+        issues = nxdata.get_nxdata_issues_many(groups, use_cache=False)
+        self.assertEqual(issues[:-1], [[]] * (len(groups) - 1))
+        self.assertTrue(issues[-1])
+
+    def testGetDefaultMany(self):
+        entry = self.h5f.create_group("entry")
+        entry.attrs["NX_class"] = "NXentry"
+        entry.attrs["default"] = "data"
+        entry["data"] = self.h5f["images/2D_regular_image"]
+        groups = [entry, self.h5f["scalars/0D_scalar"], self.h5f["scalars"]]
+
+        defaults = nxdata.get_default_many(groups, workers=2)
+        self.assertEqual(defaults[0].signal_dataset_name,
+                         nxdata.get_default(entry).signal_dataset_name)
+        self.assertTrue(defaults[1].signal_is_0d)
+        self.assertIsNone(defaults[2])
+
     def testScalars(self):
         nxd = nxdata.NXdata(self.h5f["scalars/0D_scalar"])
         self.assertTrue(nxd.signal_is_0d)
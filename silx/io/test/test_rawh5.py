@@ -84,6 +84,36 @@ class TestNumpyFile(unittest.TestCase):
         self.assertIn("a/b/c", h5)
         self.assertIn("a/b/e", h5)
 
+    def testNumpyFileMmap(self):
+        filename = "%s/%s.npy" % (self.tmpDirectory, self.id())
+        c = numpy.asfortranarray(numpy.random.rand(5, 7))
+        numpy.save(filename, c)
+        h5 = rawh5.NumpyFile(filename, mmap=True)
+        self.assertIsInstance(h5["data"].value, numpy.memmap)
+        numpy.testing.assert_array_equal(h5["data"][()], c)
+        numpy.testing.assert_array_equal(h5["data"][2:4, 1], c[2:4, 1])
+
+    def testNumpyZFileMmap(self):
+        filename = "%s/%s.npz" % (self.tmpDirectory, self.id())
+        a = numpy.array(u"aaaaa")
+        b = numpy.arange(10).reshape(2, 5)
+        data = {'a': a, 'b': b, 'd/e': numpy.zeros(0)}
+        numpy.savez(filename, **data)
+        h5 = rawh5.NumpyFile(filename, mmap=True)
+        self.assertIsInstance(h5["a"].value, numpy.memmap)
+        self.assertIsInstance(h5["b"].value, numpy.memmap)
+        self.assertNotIsInstance(h5["d/e"].value, numpy.memmap)
+        for key, value in data.items():
+            numpy.testing.assert_array_equal(h5[key][()], value)
+
+    def testNumpyZCompressedFileMmap(self):
+        filename = "%s/%s.npz" % (self.tmpDirectory, self.id())
+        b = numpy.arange(10)
+        numpy.savez_compressed(filename, b=b)
+        h5 = rawh5.NumpyFile(filename, mmap=True)
+        self.assertNotIsInstance(h5["b"].value, numpy.memmap)
+        numpy.testing.assert_array_equal(h5["b"][()], b)
+
 
 def suite():
     test_suite = unittest.TestSuite()
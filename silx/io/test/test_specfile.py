@@ -292,6 +292,24 @@ class TestSpecFile(unittest.TestCase):
         self.assertEqual(self.scan1.data.shape, (3, 4))
         self.assertAlmostEqual(numpy.sum(self.scan1.data), 113.631)
 
+    def test_data_dtype(self):
+        data = self.sf.data(0)
+        self.assertEqual(data.dtype, numpy.float64)
+        data32 = self.sf.data(0, dtype=numpy.float32)
+        self.assertEqual(data32.dtype, numpy.float32)
+        numpy.testing.assert_array_equal(data32, data.astype(numpy.float32))
+        with self.assertRaises(ValueError):
+            self.sf.data(0, dtype=numpy.int32)
+
+    def test_data_same_as_columns(self):
+        for scan_index in range(len(self.sf)):
+            data = self.sf.data(scan_index)
+            labels = self.sf[scan_index].labels[:data.shape[1]]
+            for column, label in enumerate(labels):
+                numpy.testing.assert_array_equal(
+                    data[:, column],
+                    self.sf.data_column_by_name(scan_index, label))
+
     def test_data_column_by_name(self):
         self.assertAlmostEqual(self.scan25.data_column_by_name("col2")[1],
                                1.2)
@@ -354,6 +372,17 @@ class TestSpecFile(unittest.TestCase):
         self.assertEqual(line_count, 3)
         self.assertAlmostEqual(total_sum, 36.8)
 
+    def test_mca_get_spectra(self):
+        spectra = self.scan1_2.mca.get_spectra([2, 0])
+        self.assertEqual(spectra.shape, (2, len(self.scan1_2.mca[2])))
+        numpy.testing.assert_array_equal(spectra[0], self.scan1_2.mca[2])
+        numpy.testing.assert_array_equal(spectra[1],
+                                         self.scan1_2.mca[0][:spectra.shape[1]])
+        numpy.testing.assert_array_equal(
+            self.scan1_2.mca.get_spectra([-1]), [self.scan1_2.mca[-1]])
+        self.assertEqual(self.scan1_2.mca.get_spectra([]).shape[0], 0)
+        self.assertRaises(IndexError, self.scan1_2.mca.get_spectra, [3])
+
     def test_mca_header(self):
         self.assertEqual(self.scan1.mca_header_dict, {})
         self.assertEqual(len(self.scan1_2.mca_header_dict), 4)
@@ -378,6 +407,232 @@ class TestSpecFile(unittest.TestCase):
         self.assertEqual(col1.shape, (0, ))
 
 
+class TestSFIndexCache(unittest.TestCase):
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp(text=False)
+        os.write(fd, sftext[:1361].encode("ascii"))
+        os.close(fd)
+        self.index_name = self.fname + specfile.INDEX_FILE_SUFFIX
+
+    def tearDown(self):
+        for name in [self.fname, self.index_name]:
+            if os.path.exists(name):
+                os.unlink(name)
+
+    def _append(self, text):
+        with open(self.fname, "ab") as f:
+            f.write(text.encode("ascii"))
+        # make sure the modification is visible with a 1s mtime resolution
+        stat = os.stat(self.fname)
+        os.utime(self.fname, (stat.st_atime, stat.st_mtime + 2))
+
+    def _assertSameAsWithoutIndex(self, sf):
+        reference = SpecFile(self.fname)
+        self.assertEqual(sf.keys(), reference.keys())
+        for key in reference.keys():
+            self.assertEqual(sf[key].header, reference[key].header)
+            numpy.testing.assert_array_equal(sf[key].data, reference[key].data)
+        reference.close()
+
+    def test_create(self):
+        sf = SpecFile(self.fname, index_cache=True)
+        self.assertTrue(os.path.exists(self.index_name))
+        self.assertEqual(sf.keys(), ["1.1", "25.1", "26.1"])
+        self._assertSameAsWithoutIndex(sf)
+        sf.close()
+
+    def test_custom_path(self):
+        index_name = self.fname + ".custom"
+        try:
+            sf = SpecFile(self.fname, index_cache=index_name)
+            sf.close()
+            self.assertTrue(os.path.exists(index_name))
+            self.assertFalse(os.path.exists(self.index_name))
+            sf = SpecFile(self.fname, index_cache=index_name)
+            self._assertSameAsWithoutIndex(sf)
+            sf.close()
+        finally:
+            os.unlink(index_name)
+
+    def test_reuse(self):
+        SpecFile(self.fname, index_cache=True).close()
+        # Same size and same modification time: the index is trusted
+        stat = os.stat(self.fname)
+        with open(self.fname, "r+b") as f:
+            f.seek(sftext.index("#S 25"))
+            f.write(b"#C 25")
+        os.utime(self.fname, (stat.st_atime, stat.st_mtime))
+        sf = SpecFile(self.fname, index_cache=True)
+        self.assertEqual(len(sf), 3)
+        sf.close()
+        # Without index the file is scanned
+        sf = SpecFile(self.fname)
+        self.assertEqual(len(sf), 2)
+        sf.close()
+
+    def test_append(self):
+        SpecFile(self.fname, index_cache=True).close()
+        self._append("1.0 2.0 3.0\n" + sftext[1361:])
+        sf = SpecFile(self.fname, index_cache=True)
+        self.assertEqual(sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+        self._assertSameAsWithoutIndex(sf)
+        sf.close()
+        # The updated index is reused
+        sf = SpecFile(self.fname, index_cache=True)
+        self.assertEqual(sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+        self._assertSameAsWithoutIndex(sf)
+        sf.close()
+
+    def test_rewritten(self):
+        SpecFile(self.fname, index_cache=True).close()
+        with open(self.fname, "wb") as f:
+            f.write(sftext[370:923].encode("ascii"))
+        sf = SpecFile(self.fname, index_cache=True)
+        self.assertEqual(len(sf), 1)
+        self._assertSameAsWithoutIndex(sf)
+        sf.close()
+
+    def test_corrupted_index(self):
+        with open(self.index_name, "wb") as f:
+            f.write(b"foobar")
+        sf = SpecFile(self.fname, index_cache=True)
+        self._assertSameAsWithoutIndex(sf)
+        sf.close()
+
+
+
+class TestSFRefresh(unittest.TestCase):
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp(text=False)
+        os.write(fd, sftext[:1361].encode("ascii"))
+        os.close(fd)
+        self.sf = SpecFile(self.fname)
+
+    def tearDown(self):
+        self.sf.close()
+        os.unlink(self.fname)
+
+    def _append(self, text):
+        with open(self.fname, "ab") as f:
+            f.write(text.encode("ascii"))
+
+    def _assertSameAsReopened(self):
+        reference = SpecFile(self.fname)
+        self.assertEqual(self.sf.keys(), reference.keys())
+        for key in reference.keys():
+            self.assertEqual(self.sf[key].header, reference[key].header)
+            numpy.testing.assert_array_equal(self.sf[key].data,
+                                             reference[key].data)
+        reference.close()
+
+    def test_unchanged(self):
+        self.assertEqual(self.sf.refresh(), [])
+        self.assertEqual(len(self.sf), 3)
+
+    def test_running_scan(self):
+        self.assertEqual(self.sf[2].data.size, 0)
+        self._append("1.0 2.0 3.0\n")
+        self.assertEqual(self.sf.refresh(), [2])
+        self.assertEqual(self.sf[2].data.shape, (3, 1))
+        self._append("4.0 5.0 6.0\n")
+        self.assertEqual(self.sf.refresh(), [2])
+        self.assertEqual(self.sf[2].data.shape, (3, 2))
+        self._assertSameAsReopened()
+
+    def test_new_scans(self):
+        self._append(sftext[1361:])
+        self.assertEqual(self.sf.refresh(), [3])
+        self.assertEqual(self.sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+        self._assertSameAsReopened()
+
+    def test_new_file_header(self):
+        # The file header is written before the first scan of the new file
+        split = sftext.index("#S 1 aaaaaa")
+        self._append(sftext[1361:split])
+        self.sf.refresh()
+        self.assertEqual(len(self.sf), 3)
+        self._assertSameAsReopened()
+        self._append(sftext[split:])
+        self.assertEqual(self.sf.refresh(), [3])
+        self.assertEqual(self.sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+        self._assertSameAsReopened()
+
+    def test_truncated(self):
+        with open(self.fname, "wb") as f:
+            f.write(sftext[370:923].encode("ascii"))
+        self.assertEqual(self.sf.refresh(), [0])
+        self.assertEqual(len(self.sf), 1)
+        self._assertSameAsReopened()
+
+    def test_index_cache(self):
+        self.sf.close()
+        self.sf = SpecFile(self.fname, index_cache=True)
+        index_name = self.fname + specfile.INDEX_FILE_SUFFIX
+        try:
+            self._append("1.0 2.0 3.0\n" + sftext[1361:])
+            self.assertEqual(self.sf.refresh(), [2, 3])
+            sf = SpecFile(self.fname, index_cache=True)
+            self.assertEqual(sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+            sf.close()
+        finally:
+            os.unlink(index_name)
+
+    def test_index_cache_new_file_header(self):
+        self.sf.close()
+        split = sftext.index("#S 1 aaaaaa")
+        self._append(sftext[1361:split])
+        self.sf = SpecFile(self.fname, index_cache=True)
+        index_name = self.fname + specfile.INDEX_FILE_SUFFIX
+        try:
+            self._append(sftext[split:])
+            # The index file ending with a file header is updated
+            sf = SpecFile(self.fname, index_cache=True)
+            self.assertEqual(sf.keys(), ["1.1", "25.1", "26.1", "1.2"])
+            sf.close()
+            self.assertEqual(self.sf.refresh(), [3])
+            self._assertSameAsReopened()
+        finally:
+            os.unlink(index_name)
+
+
+class TestSFDataParsing(unittest.TestCase):
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp(text=False)
+        os.write(fd, b"""#F /tmp/sf.dat
+
+#S 1 parsing
+#N 2
+#L a  b
+1.5  2
+-0  1E3
+#C comment between data lines
+@A 1 2 \\
+3 4
+1 2 3
+3.25e-3\t-1.23456789012345678
+1e400 0.000000000000000000000000001
+4 5""")
+        os.close(fd)
+        self.sf = SpecFile(self.fname)
+
+    def tearDown(self):
+        self.sf.close()
+        os.unlink(self.fname)
+
+    def test_values(self):
+        data = self.sf.data(0)
+        expected = numpy.array([[1.5, 2.],
+                                [-0., 1000.],
+                                [3.25e-3, -1.23456789012345678],
+                                [float("inf"), 1e-27]])
+        numpy.testing.assert_array_equal(data, expected)
+        self.assertTrue(numpy.signbit(data[1, 0]))
+
+    def test_same_as_columns(self):
+        data = self.sf.data(0)
+        numpy.testing.assert_array_equal(
+            data[:, 0], self.sf.data_column_by_name(0, "a"))
+
 class TestSFLocale(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -417,6 +672,12 @@ def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecFile))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSFIndexCache))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSFRefresh))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSFDataParsing))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSFLocale))
     return test_suite
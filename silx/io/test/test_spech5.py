@@ -462,6 +462,19 @@ class TestSpecH5(unittest.TestCase):
         # attrs
         self.assertEqual(mca_0_data.attrs, {"interpretation": "spectrum"})
 
+    def testMcaDataSelection(self):
+        reference = SpecH5(self.fname)
+        expected = reference["/1.2/measurement/mca_0/data"][()]
+        reference.close()
+
+        data = self.sfh5["/1.2/instrument/mca_0/data"]
+        self.assertTrue(array_equal(data[1], expected[1]))
+        self.assertTrue(array_equal(data[-1, 1:], expected[-1, 1:]))
+        self.assertTrue(array_equal(data[1:], expected[1:]))
+        self.assertTrue(array_equal(data[[0, 2], 0], expected[[0, 2], 0]))
+        self.assertEqual(data[::-1].shape, expected.shape)
+        self.assertFalse(data._is_initialized)
+
     def testMotorPosition(self):
         positioners_group = self.sfh5["/1.1/instrument/positioners"]
         # MRTSlit DOWN position is defined in #P0 san header line
@@ -862,6 +875,90 @@ class TestSpecH5SlashInLabels(unittest.TestCase):
                       self.sfh5["1.1/instrument/positioners"])
 
 
+class TestSpecH5Refresh(unittest.TestCase):
+    def setUp(self):
+        fd, self.fname = tempfile.mkstemp()
+        end = sftext.index("1.2 2.3 3.4")
+        os.write(fd, sftext[:end].encode('ascii'))
+        os.close(fd)
+        self.sfh5 = SpecH5(self.fname)
+
+    def tearDown(self):
+        self.sfh5.close()
+        os.unlink(self.fname)
+
+    def _append(self, text):
+        with open(self.fname, "ab") as f:
+            f.write(text.encode('ascii'))
+
+    def testUnchanged(self):
+        self.assertEqual(self.sfh5.refresh(), [])
+        self.assertEqual(list(self.sfh5.keys()), ["1.1"])
+
+    def testRefresh(self):
+        self.assertEqual(self.sfh5["/1.1/measurement/3rd_col"].shape, (3, ))
+
+        start = sftext.index("1.2 2.3 3.4")
+        end = sftext.index("#S 1 aaaaaa")
+        self._append(sftext[start:end])
+        self.assertEqual(self.sfh5.refresh(), ["1.1", "25.1"])
+        self.assertEqual(self.sfh5["/1.1/measurement/3rd_col"].shape, (4, ))
+        self.assertIn("/25.1/measurement/col2", self.sfh5)
+
+        self._append(sftext[end:])
+        self.assertEqual(self.sfh5.refresh(), ["1.2", "1000.1", "1001.1"])
+
+        reference = SpecH5(self.fname)
+        self.assertEqual(list(self.sfh5.keys()), list(reference.keys()))
+        self.assertEqual(self.sfh5["/1.2/instrument/mca_0/data"].shape,
+                         reference["/1.2/instrument/mca_0/data"].shape)
+        reference.close()
+
+    def testTruncated(self):
+        with open(self.fname, "wb") as f:
+            f.write(sftext[:sftext.index("#S 1  ascan")].encode('ascii'))
+        self.assertEqual(self.sfh5.refresh(), ["1.1"])
+        self.assertEqual(len(self.sfh5), 0)
+
+
+class TestSpecH5LazyScans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.fname = tempfile.mkstemp()
+        os.write(fd, sftext.encode('ascii'))
+        os.close(fd)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.unlink(cls.fname)
+
+    def setUp(self):
+        self.sfh5 = SpecH5(self.fname, max_loaded_scans=2)
+
+    def tearDown(self):
+        self.sfh5.close()
+
+    def testNotLoaded(self):
+        for scan_group in self.sfh5.values():
+            self.assertIsNone(scan_group._scan)
+
+    def testEviction(self):
+        scan_group = self.sfh5["1.1"]
+        title = self.sfh5["/1.1/title"]
+        self.assertIsNotNone(scan_group._scan)
+        self.sfh5["/25.1/title"]
+        self.sfh5["/1.2/title"]
+        self.assertIsNone(scan_group._scan)
+        self.assertIsNotNone(self.sfh5["1.2"]._scan)
+
+        # released content is created again
+        self.assertEqual(self.sfh5["/1.1/title"][()], title[()])
+        self.assertIsNotNone(scan_group._scan)
+
+    def testInvalidSize(self):
+        self.assertRaises(ValueError, SpecH5, self.fname, max_loaded_scans=0)
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTest(
@@ -874,6 +971,10 @@ def suite():
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5NoDataCols))
     test_suite.addTest(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5SlashInLabels))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5Refresh))
+    test_suite.addTest(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestSpecH5LazyScans))
     return test_suite
 
 
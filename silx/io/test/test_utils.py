@@ -311,6 +311,9 @@ class TestOpen(unittest.TestCase):
             fabiofile = fabio.edfimage.EdfImage(data, header)
             fabiofile.write(cls.edf_filename)
 
+        cls.npy_filename = os.path.join(directory, "test.npy")
+        numpy.save(cls.npy_filename, numpy.arange(10))
+
         cls.txt_filename = os.path.join(directory, "test.txt")
         f = io.open(cls.txt_filename, "w+t")
         f.write(u"Kikoo")
@@ -392,6 +395,21 @@ class TestOpen(unittest.TestCase):
             self.assertIsNotNone(f)
             self.assertEqual(f.h5py_class, h5py.File)
 
+    def testEdfMmap(self):
+        if h5py is None:
+            self.skipTest("H5py is missing")
+        if fabio is None:
+            self.skipTest("Fabio is missing")
+
+        with utils.open(self.edf_filename + "::/scan_0/instrument/detector_0/data", mmap=True) as f:
+            self.assertIsInstance(f.value, numpy.memmap)
+            self.assertEqual(list(f[1]), [50, 10])
+
+    def testNumpyMmap(self):
+        with utils.open(self.npy_filename, mmap=True) as f:
+            self.assertIsInstance(f["data"].value, numpy.memmap)
+            self.assertEqual(list(f["data"][2:4]), [2, 3])
+
     def testUnsupported(self):
         self.assertRaises(IOError, utils.open, self.txt_filename)
 
@@ -639,6 +657,45 @@ class TestGetData(unittest.TestCase):
         url = "silx:/foo/bar"
         self.assertRaises(IOError, utils.get_data, url)
 
+    def test_many(self):
+        urls = ["silx:%s?path=/1.1/measurement/y" % self.spec_filename]
+        if h5py is not None:
+            urls += ["silx:%s?path=/group/group/array2d&slice=1" % self.h5_filename,
+                     "silx:%s?/group/group/scalar" % self.h5_filename,
+                     "silx:%s?path=/group/group/array2d&slice=0" % self.h5_filename]
+        if fabio is not None:
+            urls += ["fabio:%s?slice=1" % self.edf_multiframe_filename,
+                     "fabio:%s" % self.edf_filename]
+        urls += urls[:1]
+        data = utils.get_data_many(urls)
+        self.assertEqual(len(data), len(urls))
+        for url, result in zip(urls, data):
+            numpy.testing.assert_array_equal(result, utils.get_data(url))
+
+    def test_many_pool(self):
+        if h5py is None:
+            self.skipTest("H5py is missing")
+        urls = ["silx:%s?path=/group/group/array2d&slice=1" % self.h5_filename,
+                "silx:%s?path=/1.1/measurement/y" % self.spec_filename,
+                "silx:%s?/group/group/scalar" % self.h5_filename]
+        with utils.FilePool(max_size=1) as pool:
+            data = utils.get_data_many(urls, pool=pool)
+            self.assertEqual(len(pool), 1)
+            self.assertIn(("silx", self.spec_filename), pool)
+            self.assertEqual(data[2], 50)
+            data = utils.get_data_many(urls[1:2], pool=pool)
+            self.assertEqual(len(pool), 1)
+            numpy.testing.assert_allclose(data[0], [1.1], rtol=1e-6)
+        self.assertEqual(len(pool), 0)
+
+    def test_many_errors(self):
+        urls = ["silx:%s?path=/1.1/measurement/y" % self.spec_filename,
+                "silx:/foo/bar"]
+        self.assertRaises(IOError, utils.get_data_many, urls)
+        urls = ["silx:%s?path=/1.1/measurement/foo" % self.spec_filename]
+        self.assertRaises(ValueError, utils.get_data_many, urls)
+        self.assertRaises(ValueError, utils.get_data_many, ["foo:/foo/bar"])
+
 
 def suite():
     loadTests = unittest.defaultTestLoader.loadTestsFromTestCase
@@ -431,7 +431,7 @@ def h5ls(h5group, lvl=0):
     return h5repr
 
 
-def _open_local_file(filename):
+def _open_local_file(filename, mmap=False):
     """
     Load a file as an `h5py.File`-like object.
 
@@ -444,6 +444,8 @@ def _open_local_file(filename):
     The file is opened in read-only mode.
 
     :param str filename: A filename
+    :param bool mmap: If True, memory map the data of the formats which
+        support it (see :func:`open`)
     :raises: IOError if the file can't be loaded as an h5py.File like object
     :rtype: h5py.File
     """
@@ -457,7 +459,7 @@ def _open_local_file(filename):
         if extension in [".npz", ".npy"]:
             try:
                 from . import rawh5
-                return rawh5.NumpyFile(filename)
+                return rawh5.NumpyFile(filename, mmap=mmap)
             except (IOError, ValueError) as e:
                 debugging_info.append((sys.exc_info(),
                                       "File '%s' can't be read as a numpy file." % filename))
@@ -468,7 +470,7 @@ def _open_local_file(filename):
 
         try:
             from . import fabioh5
-            return fabioh5.File(filename)
+            return fabioh5.File(filename, mmap=mmap)
         except ImportError:
             debugging_info.append((sys.exc_info(), "fabioh5 can't be loaded."))
         except Exception:
@@ -536,7 +538,7 @@ class _MainNode(Proxy):
         self.__file = None
 
 
-def open(filename):  # pylint:disable=redefined-builtin
+def open(filename, mmap=False):  # pylint:disable=redefined-builtin
     """
     Open a file as an `h5py`-like object.
 
@@ -552,8 +554,21 @@ def open(filename):  # pylint:disable=redefined-builtin
 
     The file is opened in read-only mode.
 
+    With `mmap=True`, the datasets of uncompressed fixed-offset formats are
+    backed by read-only `numpy.memmap`, so opening the file is immediate and
+    slicing only reads the touched pages:
+    - 'npy' files, and arrays saved without compression in 'npz' files
+      (`numpy.savez`, not `numpy.savez_compressed`)
+    - EDF frames stored uncompressed, in native byte order, in the EDF
+      file itself. A multi-frame EDF file is mapped as a single cube when
+      its frames have the same shape and type and are regularly spaced.
+
+    Other formats and arrays containing Python objects are read as usual.
+
     :param str filename: A filename which can containt an HDF5 path by using
         `::` separator.
+    :param bool mmap: If True, memory map the data of the formats which
+        support it.
     :raises: IOError if the file can't be loaded or path can't be found
     :rtype: h5py-like node
     """
@@ -563,7 +578,7 @@ def open(filename):  # pylint:disable=redefined-builtin
         # That's a local file
         if not url.is_valid():
             raise IOError("URL '%s' is not valid" % filename)
-        h5_file = _open_local_file(url.file_path())
+        h5_file = _open_local_file(url.file_path(), mmap=mmap)
     elif url.scheme() in ["fabio"]:
         raise IOError("URL '%s' containing fabio scheme is not supported" % filename)
     else:
@@ -774,6 +789,26 @@ def get_data(url):
         :meth:`fabio.open` or :meth:`silx.io.open`. In this last case more
         informations are displayed in debug mode.
     """
+    url = _check_url(url)
+    if url.scheme() == "silx":
+        with open(url.file_path()) as h5:
+            data = _get_data_from_h5(h5, url)
+    else:
+        fabio_file = _open_fabio(url.file_path())
+        data = _get_data_from_fabio(fabio_file, url)
+        # There is no explicit close
+        fabio_file = None
+    return data
+
+
+def _check_url(url):
+    """Check that an URL can be read by :func:`get_data`.
+
+    :param Union[str,silx.io.url.DataUrl] url: A data URL
+    :rtype: silx.io.url.DataUrl
+    :raises ValueError: If the URL is not valid
+    :raises IOError: If the file is not found
+    """
     if not isinstance(url, silx.io.url.DataUrl):
         url = silx.io.url.DataUrl(url)
 
@@ -783,52 +818,212 @@ def get_data(url):
     if not os.path.exists(url.file_path()):
         raise IOError("File '%s' not found" % url.file_path())
 
-    if url.scheme() == "silx":
-        data_path = url.data_path()
-        data_slice = url.data_slice()
-
-        with open(url.file_path()) as h5:
-            if data_path not in h5:
-                raise ValueError("Data path from URL '%s' not found" % url.path())
-            data = h5[data_path]
+    if url.scheme() not in ["silx", "fabio"]:
+        raise ValueError("Scheme '%s' not supported" % url.scheme())
+    return url
 
-            if not silx.io.is_dataset(data):
-                raise ValueError("Data path from URL '%s' is not a dataset" % url.path())
 
-            if data_slice is not None:
-                data = data[data_slice]
-            else:
-                # works for scalar and array
-                data = data[()]
-
-    elif url.scheme() == "fabio":
-        import fabio
-        data_slice = url.data_slice()
-        if data_slice is None:
-            data_slice = (0, )
-        if data_slice is None or len(data_slice) != 1:
-            raise ValueError("Fabio slice expect a single frame, but %s found" % data_slice)
-        index = data_slice[0]
-        if not isinstance(index, int):
-            raise ValueError("Fabio slice expect a single integer, but %s found" % data_slice)
+def _get_data_from_h5(h5, url):
+    """Returns the data pointed by a `silx` URL from an opened file.
 
-        try:
-            fabio_file = fabio.open(url.file_path())
-        except Exception:
-            logger.debug("Error while opening %s with fabio", url.file_path(), exc_info=True)
-            raise IOError("Error while opening %s with fabio (use debug for more information)" % url.path())
+    :param h5: h5py-like file opened with :func:`open`
+    :param silx.io.url.DataUrl url: A data URL
+    :rtype: Union[numpy.ndarray, numpy.generic]
+    """
+    data_path = url.data_path()
+    data_slice = url.data_slice()
 
-        if fabio_file.nframes == 1:
-            if index != 0:
-                raise ValueError("Only a single frame available. Slice %s out of range" % index)
-            data = fabio_file.data
-        else:
-            data = fabio_file.getframe(index).data
+    if data_path not in h5:
+        raise ValueError("Data path from URL '%s' not found" % url.path())
+    data = h5[data_path]
 
-        # There is no explicit close
-        fabio_file = None
+    if not silx.io.is_dataset(data):
+        raise ValueError("Data path from URL '%s' is not a dataset" % url.path())
 
+    if data_slice is not None:
+        data = data[data_slice]
     else:
-        raise ValueError("Scheme '%s' not supported" % url.scheme())
+        # works for scalar and array
+        data = data[()]
+    return data
+
 
+def _open_fabio(file_path):
+    """Open a file with :meth:`fabio.open`.
+
+    :param str file_path: A file name
+    :rtype: fabio.fabioimage.FabioImage
+    :raises IOError: If fabio can't open the file
+    """
+    import fabio
+    try:
+        return fabio.open(file_path)
+    except Exception:
+        logger.debug("Error while opening %s with fabio", file_path, exc_info=True)
+        raise IOError("Error while opening %s with fabio (use debug for more information)" % file_path)
+
+
+def _get_data_from_fabio(fabio_file, url):
+    """Returns the frame pointed by a `fabio` URL from an opened file.
+
+    :param fabio.fabioimage.FabioImage fabio_file: Image opened with
+        :meth:`fabio.open`
+    :param silx.io.url.DataUrl url: A data URL
+    :rtype: numpy.ndarray
+    """
+    data_slice = url.data_slice()
+    if data_slice is None:
+        data_slice = (0, )
+    if data_slice is None or len(data_slice) != 1:
+        raise ValueError("Fabio slice expect a single frame, but %s found" % data_slice)
+    index = data_slice[0]
+    if not isinstance(index, int):
+        raise ValueError("Fabio slice expect a single integer, but %s found" % data_slice)
+
+    if fabio_file.nframes == 1:
+        if index != 0:
+            raise ValueError("Only a single frame available. Slice %s out of range" % index)
+        data = fabio_file.data
+    else:
+        data = fabio_file.getframe(index).data
     return data
+
+
+class FilePool(object):
+    """Pool of opened files, bounded in size.
+
+    When the pool is full, opening a new file closes the least recently used
+    one. Files are opened with :func:`open` for the `silx` scheme and with
+    :meth:`fabio.open` for the `fabio` scheme.
+
+    It can be used as a context manager, which closes all the files at the
+    exit.
+
+    :param int max_size: Maximum number of opened files. If None,
+        `silx.config.DEFAULT_IO_MAX_OPEN_FILES` is used.
+    """
+
+    def __init__(self, max_size=None):
+        if max_size is None:
+            max_size = silx.config.DEFAULT_IO_MAX_OPEN_FILES
+        if max_size < 1:
+            raise ValueError("The pool must contain at least one file")
+        self.__max_size = max_size
+        self.__files = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.__files)
+
+    def __contains__(self, key):
+        return key in self.__files
+
+    def get(self, file_path, scheme="silx"):
+        """Returns an opened file, opening it if it is not in the pool.
+
+        :param str file_path: A file name
+        :param str scheme: "silx" or "fabio"
+        :rtype: Union[h5py-like file,fabio.fabioimage.FabioImage]
+        """
+        key = scheme, file_path
+        handle = self.__files.pop(key, None)
+        if handle is None:
+            while len(self.__files) >= self.__max_size:
+                _, older = self.__files.popitem(last=False)
+                self.__close_handle(older)
+            if scheme == "silx":
+                handle = open(file_path)
+            elif scheme == "fabio":
+                handle = _open_fabio(file_path)
+            else:
+                raise ValueError("Scheme '%s' not supported" % scheme)
+        self.__files[key] = handle
+        return handle
+
+    def __close_handle(self, handle):
+        close = getattr(handle, "close", None)
+        if close is not None:
+            close()
+
+    def close(self):
+        """Close all the files of the pool"""
+        while self.__files:
+            _, handle = self.__files.popitem(last=False)
+            self.__close_handle(handle)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _url_sort_key(url):
+    """Returns a key sorting the URLs of a same file in reading order."""
+    data_slice = url.data_slice()
+    start = 0
+    if data_slice:
+        first = data_slice[0]
+        if isinstance(first, int):
+            start = first
+        elif isinstance(first, slice) and first.start is not None:
+            start = first.start
+    return url.data_path() or "", start
+
+
+def get_data_many(urls, pool=None):
+    """Returns the data of many URLs, like :func:`get_data`.
+
+    The URLs are grouped by file, so that each file is opened once, and the
+    data of a file are read in the order of the data paths and of the
+    slices. The results are returned in the order of the request.
+
+    Example:
+
+    >>> urls = ["silx:/users/foo/scans.dat::/%d.1/measurement/mca_0/data" % i
+    ...         for i in range(1, 1000)]
+    >>> data = silx.io.get_data_many(urls)
+
+    .. seealso:: :func:`get_data`, :class:`FilePool`
+
+    :param List[Union[str,silx.io.url.DataUrl]] urls: Data URLs
+    :param FilePool pool: A pool of opened files, which can be reused between
+        calls. If None, a pool is created and closed at the end of the call.
+    :rtype: List[Union[numpy.ndarray, numpy.generic]]
+    :raises ImportError: If the mandatory library to read a file is not
+        available.
+    :raises ValueError: If an URL is not valid or do not match the data
+    :raises IOError: If a file is not found or can't be opened
+    """
+    urls = [_check_url(url) for url in urls]
+
+    # group the requests by file, in order of first appearance
+    groups = collections.OrderedDict()
+    for index, url in enumerate(urls):
+        key = url.scheme(), url.file_path()
+        groups.setdefault(key, []).append(index)
+
+    if pool is None:
+        with FilePool() as pool:
+            return _read_url_groups(urls, groups, pool)
+    return _read_url_groups(urls, groups, pool)
+
+
+def _read_url_groups(urls, groups, pool):
+    """Read URLs grouped by file.
+
+    :param List[silx.io.url.DataUrl] urls: Data URLs
+    :param collections.OrderedDict groups: Indices of the URLs per
+        *(scheme, file_path)*
+    :param FilePool pool: Pool of opened files
+    :rtype: List
+    """
+    results = [None] * len(urls)
+    for (scheme, file_path), indices in groups.items():
+        handle = pool.get(file_path, scheme)
+        indices = sorted(indices, key=lambda i: _url_sort_key(urls[i]))
+        for index in indices:
+            if scheme == "silx":
+                results[index] = _get_data_from_h5(handle, urls[index])
+            else:
+                results[index] = _get_data_from_fabio(handle, urls[index])
+    return results
@@ -32,8 +32,8 @@ See silx documentation: http://www.silx.org/doc/silx/latest/
 
 __authors__ = ["D. Naudet", "V.A. Sole", "P. Knobel"]
 __license__ = "MIT"
-__date__ = "11/05/2017"
+__date__ = "01/06/2018"
 
 from .histogram import Histogramnd  # noqa
 from .histogram import HistogramndLut  # noqa
-from .medianfilter import medfilt, medfilt1d, medfilt2d
+from .medianfilter import medfilt, medfilt1d, medfilt2d, medfilt3d
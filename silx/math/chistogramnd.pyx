@@ -42,7 +42,8 @@ def chistogramnd(sample,
                  last_bin_closed=False,
                  histo=None,
                  weighted_histo=None,
-                 wh_dtype=None):
+                 wh_dtype=None,
+                 n_threads=1):
     """Computes the multidimensional histogram of some data.
 
     :param sample:
@@ -144,6 +145,19 @@ def chistogramnd(sample,
         *weights*. Allowed values are : `numpu.double` and `numpy.float32`.
     :type wh_dtype: *optional*, numpy data type
 
+    :param n_threads:
+        Number of threads used to compute the histogram. Each thread bins
+        its own range of the sample into a partial histogram, the partial
+        histograms are then added together.
+        If 0 (or less), all the available cores are used.
+        Has no effect if silx was built without OpenMP support.
+        Results with integer weights are identical whatever the number
+        of threads, floating point weighted histograms may differ
+        slightly because the summation order changes.
+
+        .. versionadded:: 0.9
+    :type n_threads: *optional*, int
+
     :return: Histogram (bin counts, always returned), weighted histogram of
         the sample (or *None* if weights is *None*) and bin edges for each
         dimension.
@@ -343,7 +357,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       n_threads=n_threads)
 
             elif weights_type == np.float32:
 
@@ -358,7 +373,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      n_threads=n_threads)
 
             elif weights_type == np.int32:
 
@@ -373,7 +389,8 @@ def chistogramnd(sample,
                                                         bin_edges_c,
                                                         option_flags,
                                                         weight_min=weight_min,
-                                                        weight_max=weight_max)
+                                                        weight_max=weight_max,
+                                                        n_threads=n_threads)
 
             else:
                 raise_unsupported_type()
@@ -394,7 +411,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      n_threads=n_threads)
 
             elif weights_type == np.float32:
 
@@ -409,7 +427,8 @@ def chistogramnd(sample,
                                                      bin_edges_c,
                                                      option_flags,
                                                      weight_min=weight_min,
-                                                     weight_max=weight_max)
+                                                     weight_max=weight_max,
+                                                     n_threads=n_threads)
 
             elif weights_type == np.int32:
 
@@ -424,7 +443,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       n_threads=n_threads)
 
             else:
                 raise_unsupported_type()
@@ -445,7 +465,8 @@ def chistogramnd(sample,
                                                         bin_edges_c,
                                                         option_flags,
                                                         weight_min=weight_min,
-                                                        weight_max=weight_max)
+                                                        weight_max=weight_max,
+                                                        n_threads=n_threads)
 
             elif weights_type == np.float32:
 
@@ -460,7 +481,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       n_threads=n_threads)
 
             elif weights_type == np.int32:
 
@@ -475,7 +497,8 @@ def chistogramnd(sample,
                                                          bin_edges_c,
                                                          option_flags,
                                                          weight_min=weight_min,
-                                                         weight_max=weight_max)
+                                                         weight_max=weight_max,
+                                                         n_threads=n_threads)
 
             else:
                 raise_unsupported_type()
@@ -502,7 +525,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      n_threads=n_threads)
 
             elif weights_type == np.float32:
 
@@ -517,7 +541,8 @@ def chistogramnd(sample,
                                                      bin_edges_c,
                                                      option_flags,
                                                      weight_min=weight_min,
-                                                     weight_max=weight_max)
+                                                     weight_max=weight_max,
+                                                     n_threads=n_threads)
 
             elif weights_type == np.int32:
 
@@ -532,7 +557,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       n_threads=n_threads)
 
             else:
                 raise_unsupported_type()
@@ -553,7 +579,8 @@ def chistogramnd(sample,
                                                      bin_edges_c,
                                                      option_flags,
                                                      weight_min=weight_min,
-                                                     weight_max=weight_max)
+                                                     weight_max=weight_max,
+                                                     n_threads=n_threads)
 
             elif weights_type == np.float32:
 
@@ -568,7 +595,8 @@ def chistogramnd(sample,
                                                     bin_edges_c,
                                                     option_flags,
                                                     weight_min=weight_min,
-                                                    weight_max=weight_max)
+                                                    weight_max=weight_max,
+                                                    n_threads=n_threads)
 
             elif weights_type == np.int32:
 
@@ -583,7 +611,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      n_threads=n_threads)
 
             else:
                 raise_unsupported_type()
@@ -604,7 +633,8 @@ def chistogramnd(sample,
                                                        bin_edges_c,
                                                        option_flags,
                                                        weight_min=weight_min,
-                                                       weight_max=weight_max)
+                                                       weight_max=weight_max,
+                                                       n_threads=n_threads)
 
             elif weights_type == np.float32:
 
@@ -619,7 +649,8 @@ def chistogramnd(sample,
                                                       bin_edges_c,
                                                       option_flags,
                                                       weight_min=weight_min,
-                                                      weight_max=weight_max)
+                                                      weight_max=weight_max,
+                                                      n_threads=n_threads)
 
             elif weights_type == np.int32:
 
@@ -634,7 +665,8 @@ def chistogramnd(sample,
                                                         bin_edges_c,
                                                         option_flags,
                                                         weight_min=weight_min,
-                                                        weight_max=weight_max)
+                                                        weight_max=weight_max,
+                                                        n_threads=n_threads)
 
             else:
                 raise_unsupported_type()
@@ -683,20 +715,25 @@ cdef int _histogramnd_double_double_double(double[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            double weight_min,
-                                           double weight_max) nogil:
+                                           double weight_max,
+                                           int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_double_double(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_double_double(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max,
+                                                            n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -714,20 +751,25 @@ cdef int _histogramnd_double_float_double(double[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           float weight_min,
-                                          float weight_max) nogil:
+                                          float weight_max,
+                                          int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_float_double(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_float_double(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max,
+                                                           n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -745,20 +787,25 @@ cdef int _histogramnd_double_int32_t_double(double[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             cnumpy.int32_t weight_min,
-                                            cnumpy.int32_t weight_max) nogil:
-
-    return histogramnd_c.histogramnd_double_int32_t_double(&sample[0],
-                                                           &weights[0],
-                                                           n_dims,
-                                                           n_elem,
-                                                           &histo_range[0],
-                                                           &n_bins[0],
-                                                           &histo[0],
-                                                           &cumul[0],
-                                                           &bin_edges[0],
-                                                           option_flags,
-                                                           weight_min,
-                                                           weight_max)
+                                            cnumpy.int32_t weight_max,
+                                            int n_threads):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_int32_t_double(&sample[0],
+                                                             &weights[0],
+                                                             n_dims,
+                                                             n_elem,
+                                                             &histo_range[0],
+                                                             &n_bins[0],
+                                                             &histo[0],
+                                                             &cumul[0],
+                                                             &bin_edges[0],
+                                                             option_flags,
+                                                             weight_min,
+                                                             weight_max,
+                                                             n_threads)
+    return rc
 
 
 # =====================
@@ -781,20 +828,25 @@ cdef int _histogramnd_float_double_double(float[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           double weight_min,
-                                          double weight_max) nogil:
+                                          double weight_max,
+                                          int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_double_double(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_double_double(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max,
+                                                           n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -812,20 +864,25 @@ cdef int _histogramnd_float_float_double(float[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          float weight_min,
-                                         float weight_max) nogil:
+                                         float weight_max,
+                                         int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_float_double(&sample[0],
-                                                        &weights[0],
-                                                        n_dims,
-                                                        n_elem,
-                                                        &histo_range[0],
-                                                        &n_bins[0],
-                                                        &histo[0],
-                                                        &cumul[0],
-                                                        &bin_edges[0],
-                                                        option_flags,
-                                                        weight_min,
-                                                        weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_float_double(&sample[0],
+                                                          &weights[0],
+                                                          n_dims,
+                                                          n_elem,
+                                                          &histo_range[0],
+                                                          &n_bins[0],
+                                                          &histo[0],
+                                                          &cumul[0],
+                                                          &bin_edges[0],
+                                                          option_flags,
+                                                          weight_min,
+                                                          weight_max,
+                                                          n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -843,20 +900,25 @@ cdef int _histogramnd_float_int32_t_double(float[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            cnumpy.int32_t weight_min,
-                                           cnumpy.int32_t weight_max) nogil:
+                                           cnumpy.int32_t weight_max,
+                                           int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_int32_t_double(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_int32_t_double(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max,
+                                                            n_threads)
+    return rc
 
 
 # =====================
@@ -879,20 +941,25 @@ cdef int _histogramnd_int32_t_double_double(cnumpy.int32_t[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             double weight_min,
-                                            double weight_max) nogil:
-
-    return histogramnd_c.histogramnd_int32_t_double_double(&sample[0],
-                                                           &weights[0],
-                                                           n_dims,
-                                                           n_elem,
-                                                           &histo_range[0],
-                                                           &n_bins[0],
-                                                           &histo[0],
-                                                           &cumul[0],
-                                                           &bin_edges[0],
-                                                           option_flags,
-                                                           weight_min,
-                                                           weight_max)
+                                            double weight_max,
+                                            int n_threads):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_double_double(&sample[0],
+                                                             &weights[0],
+                                                             n_dims,
+                                                             n_elem,
+                                                             &histo_range[0],
+                                                             &n_bins[0],
+                                                             &histo[0],
+                                                             &cumul[0],
+                                                             &bin_edges[0],
+                                                             option_flags,
+                                                             weight_min,
+                                                             weight_max,
+                                                             n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -910,20 +977,25 @@ cdef int _histogramnd_int32_t_float_double(cnumpy.int32_t[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            float weight_min,
-                                           float weight_max) nogil:
+                                           float weight_max,
+                                           int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_int32_t_float_double(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_float_double(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max,
+                                                            n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -941,20 +1013,25 @@ cdef int _histogramnd_int32_t_int32_t_double(cnumpy.int32_t[:] sample,
                                              double[:] bin_edges,
                                              int option_flags,
                                              cnumpy.int32_t weight_min,
-                                             cnumpy.int32_t weight_max) nogil:
-
-    return histogramnd_c.histogramnd_int32_t_int32_t_double(&sample[0],
-                                                            &weights[0],
-                                                            n_dims,
-                                                            n_elem,
-                                                            &histo_range[0],
-                                                            &n_bins[0],
-                                                            &histo[0],
-                                                            &cumul[0],
-                                                            &bin_edges[0],
-                                                            option_flags,
-                                                            weight_min,
-                                                            weight_max)
+                                             cnumpy.int32_t weight_max,
+                                             int n_threads):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_int32_t_double(&sample[0],
+                                                              &weights[0],
+                                                              n_dims,
+                                                              n_elem,
+                                                              &histo_range[0],
+                                                              &n_bins[0],
+                                                              &histo[0],
+                                                              &cumul[0],
+                                                              &bin_edges[0],
+                                                              option_flags,
+                                                              weight_min,
+                                                              weight_max,
+                                                              n_threads)
+    return rc
 
 
 # =====================
@@ -977,20 +1054,25 @@ cdef int _histogramnd_double_double_float(double[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           double weight_min,
-                                          double weight_max) nogil:
+                                          double weight_max,
+                                          int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_double_float(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_double_float(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max,
+                                                           n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1008,20 +1090,25 @@ cdef int _histogramnd_double_float_float(double[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          float weight_min,
-                                         float weight_max) nogil:
+                                         float weight_max,
+                                         int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_float_float(&sample[0],
-                                                        &weights[0],
-                                                        n_dims,
-                                                        n_elem,
-                                                        &histo_range[0],
-                                                        &n_bins[0],
-                                                        &histo[0],
-                                                        &cumul[0],
-                                                        &bin_edges[0],
-                                                        option_flags,
-                                                        weight_min,
-                                                        weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_float_float(&sample[0],
+                                                          &weights[0],
+                                                          n_dims,
+                                                          n_elem,
+                                                          &histo_range[0],
+                                                          &n_bins[0],
+                                                          &histo[0],
+                                                          &cumul[0],
+                                                          &bin_edges[0],
+                                                          option_flags,
+                                                          weight_min,
+                                                          weight_max,
+                                                          n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1039,20 +1126,25 @@ cdef int _histogramnd_double_int32_t_float(double[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            cnumpy.int32_t weight_min,
-                                           cnumpy.int32_t weight_max) nogil:
+                                           cnumpy.int32_t weight_max,
+                                           int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_double_int32_t_float(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_double_int32_t_float(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max,
+                                                            n_threads)
+    return rc
 
 
 # =====================
@@ -1075,20 +1167,25 @@ cdef int _histogramnd_float_double_float(float[:] sample,
                                          double[:] bin_edges,
                                          int option_flags,
                                          double weight_min,
-                                         double weight_max) nogil:
+                                         double weight_max,
+                                         int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_double_float(&sample[0],
-                                                        &weights[0],
-                                                        n_dims,
-                                                        n_elem,
-                                                        &histo_range[0],
-                                                        &n_bins[0],
-                                                        &histo[0],
-                                                        &cumul[0],
-                                                        &bin_edges[0],
-                                                        option_flags,
-                                                        weight_min,
-                                                        weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_double_float(&sample[0],
+                                                          &weights[0],
+                                                          n_dims,
+                                                          n_elem,
+                                                          &histo_range[0],
+                                                          &n_bins[0],
+                                                          &histo[0],
+                                                          &cumul[0],
+                                                          &bin_edges[0],
+                                                          option_flags,
+                                                          weight_min,
+                                                          weight_max,
+                                                          n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1106,20 +1203,25 @@ cdef int _histogramnd_float_float_float(float[:] sample,
                                         double[:] bin_edges,
                                         int option_flags,
                                         float weight_min,
-                                        float weight_max) nogil:
+                                        float weight_max,
+                                        int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_float_float(&sample[0],
-                                                       &weights[0],
-                                                       n_dims,
-                                                       n_elem,
-                                                       &histo_range[0],
-                                                       &n_bins[0],
-                                                       &histo[0],
-                                                       &cumul[0],
-                                                       &bin_edges[0],
-                                                       option_flags,
-                                                       weight_min,
-                                                       weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_float_float(&sample[0],
+                                                         &weights[0],
+                                                         n_dims,
+                                                         n_elem,
+                                                         &histo_range[0],
+                                                         &n_bins[0],
+                                                         &histo[0],
+                                                         &cumul[0],
+                                                         &bin_edges[0],
+                                                         option_flags,
+                                                         weight_min,
+                                                         weight_max,
+                                                         n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1137,20 +1239,25 @@ cdef int _histogramnd_float_int32_t_float(float[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           cnumpy.int32_t weight_min,
-                                          cnumpy.int32_t weight_max) nogil:
+                                          cnumpy.int32_t weight_max,
+                                          int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_float_int32_t_float(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_float_int32_t_float(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max,
+                                                           n_threads)
+    return rc
 
 
 # =====================
@@ -1173,20 +1280,25 @@ cdef int _histogramnd_int32_t_double_float(cnumpy.int32_t[:] sample,
                                            double[:] bin_edges,
                                            int option_flags,
                                            double weight_min,
-                                           double weight_max) nogil:
+                                           double weight_max,
+                                           int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_int32_t_double_float(&sample[0],
-                                                          &weights[0],
-                                                          n_dims,
-                                                          n_elem,
-                                                          &histo_range[0],
-                                                          &n_bins[0],
-                                                          &histo[0],
-                                                          &cumul[0],
-                                                          &bin_edges[0],
-                                                          option_flags,
-                                                          weight_min,
-                                                          weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_double_float(&sample[0],
+                                                            &weights[0],
+                                                            n_dims,
+                                                            n_elem,
+                                                            &histo_range[0],
+                                                            &n_bins[0],
+                                                            &histo[0],
+                                                            &cumul[0],
+                                                            &bin_edges[0],
+                                                            option_flags,
+                                                            weight_min,
+                                                            weight_max,
+                                                            n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1204,20 +1316,25 @@ cdef int _histogramnd_int32_t_float_float(cnumpy.int32_t[:] sample,
                                           double[:] bin_edges,
                                           int option_flags,
                                           float weight_min,
-                                          float weight_max) nogil:
+                                          float weight_max,
+                                          int n_threads):
+    cdef int rc
 
-    return histogramnd_c.histogramnd_int32_t_float_float(&sample[0],
-                                                         &weights[0],
-                                                         n_dims,
-                                                         n_elem,
-                                                         &histo_range[0],
-                                                         &n_bins[0],
-                                                         &histo[0],
-                                                         &cumul[0],
-                                                         &bin_edges[0],
-                                                         option_flags,
-                                                         weight_min,
-                                                         weight_max)
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_float_float(&sample[0],
+                                                           &weights[0],
+                                                           n_dims,
+                                                           n_elem,
+                                                           &histo_range[0],
+                                                           &n_bins[0],
+                                                           &histo[0],
+                                                           &cumul[0],
+                                                           &bin_edges[0],
+                                                           option_flags,
+                                                           weight_min,
+                                                           weight_max,
+                                                           n_threads)
+    return rc
 
 
 @cython.wraparound(False)
@@ -1235,17 +1352,22 @@ cdef int _histogramnd_int32_t_int32_t_float(cnumpy.int32_t[:] sample,
                                             double[:] bin_edges,
                                             int option_flags,
                                             cnumpy.int32_t weight_min,
-                                            cnumpy.int32_t weight_max) nogil:
-
-    return histogramnd_c.histogramnd_int32_t_int32_t_float(&sample[0],
-                                                           &weights[0],
-                                                           n_dims,
-                                                           n_elem,
-                                                           &histo_range[0],
-                                                           &n_bins[0],
-                                                           &histo[0],
-                                                           &cumul[0],
-                                                           &bin_edges[0],
-                                                           option_flags,
-                                                           weight_min,
-                                                           weight_max)
+                                            cnumpy.int32_t weight_max,
+                                            int n_threads):
+    cdef int rc
+
+    with nogil:
+        rc = histogramnd_c.histogramnd_int32_t_int32_t_float(&sample[0],
+                                                             &weights[0],
+                                                             n_dims,
+                                                             n_elem,
+                                                             &histo_range[0],
+                                                             &n_bins[0],
+                                                             &histo[0],
+                                                             &cumul[0],
+                                                             &bin_edges[0],
+                                                             option_flags,
+                                                             weight_min,
+                                                             weight_max,
+                                                             n_threads)
+    return rc
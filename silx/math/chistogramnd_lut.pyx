@@ -29,6 +29,7 @@ __date__ = "15/05/2016"
 
 cimport numpy as cnumpy  # noqa
 cimport cython
+from cython.parallel import prange
 import numpy as np
 
 ctypedef fused sample_t:
@@ -54,6 +55,10 @@ ctypedef fused lut_t:
     cnumpy.int32_t
     cnumpy.int16_t
 
+ctypedef fused index_t:
+    cnumpy.int64_t
+    cnumpy.int32_t
+
 
 def histogramnd_get_lut(sample,
                         histo_range,
@@ -324,6 +329,157 @@ def histogramnd_from_lut(weights,
 # =====================
 
 
+def histogramnd_from_csr_lut(weights,
+                             indptr,
+                             indices,
+                             histo=None,
+                             weighted_histo=None,
+                             dtype=None,
+                             weight_min=None,
+                             weight_max=None):
+    """Computes the histograms of a stack of weights sharing the same LUT.
+
+    The LUT is given in compressed sparse row (CSR) format: the samples
+    falling in bin *i* are ``indices[indptr[i]:indptr[i + 1]]``.
+    The frames of the stack are histogrammed in parallel.
+
+    :param weights: A (n_frames, n_samples) array of weights
+    :param indptr: A (n_bins + 1) array of offsets in *indices*
+    :param indices: Indices of the samples, sorted by bin
+    :param histo: A (n_frames, n_bins) C-contiguous :class:`numpy.uint32`
+        array to which the bin counts are added.
+    :param weighted_histo: A (n_frames, n_bins) C-contiguous array to which
+        the sum of weights are added.
+    :param dtype: Type of the weighted histogram if *weighted_histo* is
+        not provided. Defaults to the type of the weights.
+    :param weight_min: Filters out the weights lower than this value.
+    :param weight_max: Filters out the weights higher than this value.
+    :return: The histograms and weighted histograms, as (n_frames, n_bins)
+        arrays.
+    :rtype: tuple : (:class:`numpy.array`, :class:`numpy.array`)
+    """
+    if weights.ndim != 2:
+        raise ValueError('<weights> must be a 2D array of shape '
+                         '(n_frames, n_samples).')
+
+    n_frames, n_elems = weights.shape
+    n_bins = indptr.size - 1
+
+    if indptr[-1] != indices.size:
+        raise ValueError('<indptr> and <indices> do not match.')
+    if indices.size > 0 and (indices.min() < 0 or indices.max() >= n_elems):
+        raise ValueError('The LUT and weights arrays must have the same '
+                         'number of elements.')
+
+    if histo is None:
+        histo = np.zeros((n_frames, n_bins), dtype=np.uint32)
+    elif histo.dtype != np.uint32:
+        raise ValueError('Provided <histo> array doesn\'t have '
+                         'the expected type '
+                         ': should be {0} instead of {1}.'
+                         ''.format(np.uint32, histo.dtype))
+
+    if weighted_histo is None:
+        if dtype is None:
+            dtype = weights.dtype
+        weighted_histo = np.zeros((n_frames, n_bins), dtype=dtype)
+    elif dtype is not None and weighted_histo.dtype != dtype:
+        raise ValueError('Provided <dtype> and <weighted_histo>\'s dtype'
+                         ' do not match.')
+
+    for array in (histo, weighted_histo):
+        if array.size != n_frames * n_bins:
+            raise ValueError('The histogram arrays must have '
+                             '{0} elements.'.format(n_frames * n_bins))
+        if (not array.flags['C_CONTIGUOUS'] or
+                not array.dtype.isnative):
+            raise ValueError('The histogram arrays must be C-contiguous and '
+                             'in native byte order.')
+
+    w_dtype = weights.dtype.newbyteorder('N')
+    w_c = np.ascontiguousarray(weights, dtype=w_dtype)
+    indptr_c = np.ascontiguousarray(indptr, dtype=indices.dtype.newbyteorder('N'))
+    indices_c = np.ascontiguousarray(indices, dtype=indices.dtype.newbyteorder('N'))
+
+    if weight_min is None:
+        weight_min = 0
+        filt_min_weights = False
+    else:
+        filt_min_weights = True
+
+    if weight_max is None:
+        weight_max = 0
+        filt_max_weights = False
+    else:
+        filt_max_weights = True
+
+    try:
+        _histogramnd_from_csr_lut_fused(w_c,
+                                        indptr_c,
+                                        indices_c,
+                                        histo.reshape((n_frames, n_bins)),
+                                        weighted_histo.reshape((n_frames, n_bins)),
+                                        filt_min_weights,
+                                        w_dtype.type(weight_min),
+                                        filt_max_weights,
+                                        w_dtype.type(weight_max))
+    except TypeError:
+        raise TypeError('Case not supported - weights:{0} '
+                        'and histo:{1}.'
+                        ''.format(weights.dtype, weighted_histo.dtype))
+
+    return histo, weighted_histo
+
+
+# =====================
+# =====================
+
+
+@cython.wraparound(False)
+@cython.boundscheck(False)
+@cython.initializedcheck(False)
+@cython.nonecheck(False)
+@cython.cdivision(True)
+def _histogramnd_from_csr_lut_fused(weights_t[:, ::1] i_weights,
+                                    index_t[::1] i_indptr,
+                                    index_t[::1] i_indices,
+                                    cnumpy.uint32_t[:, ::1] o_histo,
+                                    cumul_t[:, ::1] o_weighted_histo,
+                                    bint i_filt_min_weights,
+                                    weights_t i_weight_min,
+                                    bint i_filt_max_weights,
+                                    weights_t i_weight_max):
+    cdef:
+        Py_ssize_t frame, bin_idx, i
+        Py_ssize_t n_frames = i_weights.shape[0]
+        Py_ssize_t n_bins = i_indptr.shape[0] - 1
+        weights_t value
+        cumul_t cumul
+        cnumpy.uint32_t count
+
+    # one frame per thread, so that each thread writes its own rows
+    with nogil:
+        for frame in prange(n_frames, schedule='static'):
+            for bin_idx in range(n_bins):
+                count = 0
+                cumul = 0
+                for i in range(i_indptr[bin_idx], i_indptr[bin_idx + 1]):
+                    value = i_weights[frame, i_indices[i]]
+                    if i_filt_min_weights and value < i_weight_min:
+                        continue
+                    if i_filt_max_weights and value > i_weight_max:
+                        continue
+                    count = count + 1
+                    cumul = cumul + <cumul_t>value
+                o_histo[frame, bin_idx] = o_histo[frame, bin_idx] + count
+                o_weighted_histo[frame, bin_idx] = (
+                    o_weighted_histo[frame, bin_idx] + cumul)
+
+
+# =====================
+# =====================
+
+
 @cython.wraparound(False)
 @cython.boundscheck(False)
 @cython.initializedcheck(False)
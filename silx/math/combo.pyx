@@ -26,6 +26,12 @@
 
 For now it provides min/max (and optionally positive min) and indices
 of first occurrences (i.e., argmin/argmax) in a single pass.
+It can also compute the sum, mean and standard deviation in the same pass.
+It also provides approximate percentiles computed from histograms
+(e.g., to autoscale colormaps while ignoring outliers).
+
+The data is processed by chunks in parallel (if compiled with OpenMP).
+Non-contiguous arrays are read in place, without being copied.
 """
 
 __authors__ = ["T. Vincent"]
@@ -33,6 +39,8 @@ __license__ = "MIT"
 __date__ = "24/04/2018"
 
 cimport cython
+from cython.parallel import prange
+from libc.math cimport sqrt
 from math_compatibility cimport isnan, isfinite, INFINITY
 
 
@@ -63,11 +71,25 @@ ctypedef fused _floating:
     long double
 
 
+# Number of elements processed at once by a thread.
+# The result does not depend on the number of threads since the data is always
+# split the same way and the chunks are reduced in order.
+cdef Py_ssize_t _CHUNK_SIZE = 2 ** 16
+
+# Maximum number of blocks histogrammed in parallel by percentile.
+# As for min_max, the result does not depend on the number of threads.
+cdef Py_ssize_t _MAX_BLOCKS = 64
+
+# Maximum number of bins of all the refined histograms of percentile
+cdef Py_ssize_t _MAX_REFINED_BINS = 2 ** 24
+
+
 class _MinMaxResult(object):
     """Object storing result from :func:`min_max`"""
 
     def __init__(self, minimum, min_pos, maximum,
-                 argmin, argmin_pos, argmax):
+                 argmin, argmin_pos, argmax,
+                 count=None, sum_=None, mean=None, std=None):
         self._minimum = minimum
         self._min_positive = min_pos
         self._maximum = maximum
@@ -76,6 +98,11 @@ class _MinMaxResult(object):
         self._argmin_positive = argmin_pos
         self._argmax = argmax
 
+        self._count = count
+        self._sum = sum_
+        self._mean = mean
+        self._std = std
+
     minimum = property(
         lambda self: self._minimum,
         doc="Minimum value of the array")
@@ -103,6 +130,28 @@ class _MinMaxResult(object):
         It is None if no value is strictly positive.
         It is the index of the first occurrence.""")
 
+    count = property(
+        lambda self: self._count,
+        doc="""Number of values used to compute the statistics
+
+        NaNs (and infinite values if *finite* is True) are not counted.
+        It is None if statistics were not computed.""")
+    sum = property(
+        lambda self: self._sum,
+        doc="""Sum of the values
+
+        It is None if statistics were not computed.""")
+    mean = property(
+        lambda self: self._mean,
+        doc="""Mean of the values
+
+        It is None if statistics were not computed or if count is 0.""")
+    std = property(
+        lambda self: self._std,
+        doc="""Standard deviation of the values (population, i.e., ddof=0)
+
+        It is None if statistics were not computed or if count is 0.""")
+
     def __getitem__(self, key):
         if key == 0:
             return self.minimum
@@ -115,155 +164,488 @@ class _MinMaxResult(object):
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _min_max(_number[::1] data, bint min_positive=False):
-    """:func:`min_max` implementation including infinite values
+@cython.cdivision(True)
+cdef inline bint _is_valid(_number value, bint finite) nogil:
+    """Returns False for values ignored by :func:`min_max`"""
+    if _number in _floating:
+        if finite:
+            return isfinite(value)
+        else:
+            return not isnan(value)
+    else:
+        return True
 
-    See :func:`min_max` for documentation.
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef int _chunk_min_max(_number[:, :] data,
+                         Py_ssize_t begin,
+                         Py_ssize_t end,
+                         bint min_positive,
+                         bint finite,
+                         bint stats,
+                         Py_ssize_t *argmin,
+                         Py_ssize_t *argmin_pos,
+                         Py_ssize_t *argmax,
+                         Py_ssize_t *count,
+                         double *mean,
+                         double *m2) nogil:
+    """Reduces the elements begin to end (excluded) of the flattened data.
+
+    Indices are -1 when there is no valid value.
+    Mean and m2 (sum of squared differences from the mean) are computed
+    from the data shifted by its first valid value.
+
+    It returns 0: not using void avoids exception checks requiring the GIL.
     """
     cdef:
-        _number value, minimum, min_pos, maximum
-        unsigned int length
-        unsigned int index = 0
-        unsigned int min_index = 0
-        unsigned int min_pos_index = 0
-        unsigned int max_index = 0
+        _number value
+        _number minimum = 0
+        _number min_pos = 0
+        _number maximum = 0
+        Py_ssize_t n_columns = data.shape[1]
+        Py_ssize_t stride = data.strides[1]
+        char *row_data
+        Py_ssize_t row, column, first_column, last_column
+        Py_ssize_t index
+        Py_ssize_t min_index = -1
+        Py_ssize_t min_pos_index = -1
+        Py_ssize_t max_index = -1
+        Py_ssize_t n = 0
+        double shift = 0.
+        double delta
+        double sum_delta = 0.
+        double sum_delta2 = 0.
+
+    argmin[0] = -1
+    argmin_pos[0] = -1
+    argmax[0] = -1
+    count[0] = 0
+    mean[0] = 0.
+    m2[0] = 0.
+
+    # Look for the first valid value
+    for index in range(begin, end):
+        value = data[index // n_columns, index % n_columns]
+        if _is_valid(value, finite):
+            break
+    else:
+        return 0
+
+    minimum = value
+    min_index = index
+    maximum = value
+    max_index = index
+    shift = <double> value
+
+    row = index // n_columns
+    first_column = index % n_columns
+    while row * n_columns < end:
+        last_column = n_columns
+        if end - row * n_columns < n_columns:
+            last_column = end - row * n_columns
+
+        row_data = <char *> &data[row, 0]
+        for column in range(first_column, last_column):
+            # The stride is not always a multiple of the item size
+            value = (<_number *> (row_data + column * stride))[0]
+            if not _is_valid(value, finite):
+                continue
+
+            if value < minimum:
+                minimum = value
+                min_index = row * n_columns + column
+            elif value > maximum:
+                maximum = value
+                max_index = row * n_columns + column
+
+            if min_positive and value > 0:
+                if min_pos_index < 0 or value < min_pos:
+                    min_pos = value
+                    min_pos_index = row * n_columns + column
 
-    length = len(data)
+            if stats:
+                delta = <double> value - shift
+                sum_delta += delta
+                sum_delta2 += delta * delta
 
-    if length == 0:
-        raise ValueError('Zero-size array')
+            n += 1
 
-    with nogil:
-        # Init starting values
-        value = data[0]
-        minimum = value
-        maximum = value
-        if min_positive and value > 0:
-            min_pos = value
-        else:
-            min_pos = 0
-
-        if _number in _floating:
-            # For floating, loop until first not NaN value
-            for index in range(length):
-                value = data[index]
-                if not isnan(value):
-                    minimum = value
-                    min_index = index
-                    maximum = value
-                    max_index = index
-                    break
-
-        if not min_positive:
-            for index in range(index, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
-                elif value < minimum:
-                    minimum = value
-                    min_index = index
+        row += 1
+        first_column = 0
 
-        else:
-            # Loop until min_pos is defined
-            for index in range(index, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
-                elif value < minimum:
-                    minimum = value
-                    min_index = index
-
-                if value > 0:
-                    min_pos = value
-                    min_pos_index = index
-                    break
-
-            # Loop until the end
-            for index in range(index + 1, length):
-                value = data[index]
-                if value > maximum:
-                    maximum = value
-                    max_index = index
-                else:
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
-
-                    if 0 < value < min_pos:
-                        min_pos = value
-                        min_pos_index = index
-
-    return _MinMaxResult(minimum,
-                         min_pos if min_pos > 0 else None,
-                         maximum,
-                         min_index,
-                         min_pos_index if min_pos > 0 else None,
-                         max_index)
+    argmin[0] = min_index
+    argmin_pos[0] = min_pos_index
+    argmax[0] = max_index
+    count[0] = n
+    if stats:
+        mean[0] = shift + sum_delta / n
+        m2[0] = sum_delta2 - sum_delta * sum_delta / n
+        if m2[0] < 0.:
+            m2[0] = 0.
+    return 0
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef int _chunk_histogram(_number[:, :] data,
+                          Py_ssize_t begin,
+                          Py_ssize_t end,
+                          bint positive,
+                          double minimum,
+                          double scale,
+                          Py_ssize_t n_bins,
+                          Py_ssize_t *slots,
+                          Py_ssize_t *histo) nogil:
+    """Histograms the finite elements begin to end (excluded) of the
+    flattened data.
+
+    The bin of a value is the integer part of (value - minimum) * scale,
+    clipped to n_bins - 1.
+    If slots is NULL, histo is the histogram with n_bins bins.
+    Otherwise, the values falling in a bin for which slots is positive are
+    histogrammed within this bin with n_bins bins in
+    histo[slots[bin] * n_bins:(slots[bin] + 1) * n_bins].
+
+    It returns 0: not using void avoids exception checks requiring the GIL.
+    """
+    cdef:
+        _number value
+        Py_ssize_t n_columns = data.shape[1]
+        Py_ssize_t stride = data.strides[1]
+        char *row_data
+        Py_ssize_t row = begin // n_columns
+        Py_ssize_t first_column = begin % n_columns
+        Py_ssize_t column, last_column
+        Py_ssize_t index, sub_index
+        double position
+
+    while row * n_columns < end:
+        last_column = n_columns
+        if end - row * n_columns < n_columns:
+            last_column = end - row * n_columns
+
+        row_data = <char *> &data[row, 0]
+        for column in range(first_column, last_column):
+            # The stride is not always a multiple of the item size
+            value = (<_number *> (row_data + column * stride))[0]
+            if not _is_valid(value, True) or (positive and value <= 0):
+                continue
+
+            position = (<double> value - minimum) * scale
+            if position < 0.:
+                continue
+            index = <Py_ssize_t> position
+            if index >= n_bins:
+                index = n_bins - 1
+
+            if slots == NULL:
+                histo[index] += 1
+            elif slots[index] >= 0:
+                sub_index = <Py_ssize_t> ((position - index) * n_bins)
+                if sub_index >= n_bins:
+                    sub_index = n_bins - 1
+                histo[slots[index] * n_bins + sub_index] += 1
+
+        row += 1
+        first_column = 0
+    return 0
 
 
 @cython.initializedcheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def _finite_min_max(_floating[::1] data, bint min_positive=False):
-    """:func:`min_max` implementation for floats skipping infinite values
+@cython.cdivision(True)
+def _min_max(_number[:, :] data,
+             bint min_positive=False,
+             bint finite=False,
+             bint stats=False,
+             int n_threads=0):
+    """:func:`min_max` implementation
 
     See :func:`min_max` for documentation.
+
+    :param data: 2D array, reduced as if it was flattened
     """
     cdef:
-        _floating value, minimum, min_pos, maximum
-        unsigned int length
-        unsigned int index = 0
-        unsigned int min_index = 0
-        unsigned int min_pos_index = 0
-        unsigned int max_index = 0
-
-    length = len(data)
+        _number value
+        _number minimum = 0
+        _number min_pos = 0
+        _number maximum = 0
+        Py_ssize_t n_columns = data.shape[1]
+        Py_ssize_t length = data.shape[0] * data.shape[1]
+        Py_ssize_t n_chunks, chunk, index
+        Py_ssize_t min_index = -1
+        Py_ssize_t min_pos_index = -1
+        Py_ssize_t max_index = -1
+        Py_ssize_t count = 0
+        double mean = 0.
+        double m2 = 0.
+        double delta
+        Py_ssize_t[::1] argmins, argmin_poss, argmaxs, counts
+        double[::1] means, m2s
 
     if length == 0:
         raise ValueError('Zero-size array')
 
+    n_chunks = (length + _CHUNK_SIZE - 1) // _CHUNK_SIZE
+
+    argmins = numpy.empty(n_chunks, dtype=numpy.intp)
+    argmin_poss = numpy.empty(n_chunks, dtype=numpy.intp)
+    argmaxs = numpy.empty(n_chunks, dtype=numpy.intp)
+    counts = numpy.empty(n_chunks, dtype=numpy.intp)
+    means = numpy.empty(n_chunks, dtype=numpy.float64)
+    m2s = numpy.empty(n_chunks, dtype=numpy.float64)
+
     with nogil:
-        minimum = INFINITY
-        maximum = -INFINITY
-        min_pos = INFINITY
-
-        if not min_positive:
-            for index in range(length):
-                value = data[index]
-                if isfinite(value):
-                    if value > maximum:
-                        maximum = value
-                        max_index = index
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
+        if n_chunks == 1 or n_threads == 1:
+            for chunk in range(n_chunks):
+                _chunk_min_max(data,
+                               chunk * _CHUNK_SIZE,
+                               min(length, (chunk + 1) * _CHUNK_SIZE),
+                               min_positive, finite, stats,
+                               &argmins[chunk], &argmin_poss[chunk],
+                               &argmaxs[chunk], &counts[chunk],
+                               &means[chunk], &m2s[chunk])
+        elif n_threads > 1:
+            for chunk in prange(n_chunks, num_threads=n_threads):
+                _chunk_min_max(data,
+                               chunk * _CHUNK_SIZE,
+                               min(length, (chunk + 1) * _CHUNK_SIZE),
+                               min_positive, finite, stats,
+                               &argmins[chunk], &argmin_poss[chunk],
+                               &argmaxs[chunk], &counts[chunk],
+                               &means[chunk], &m2s[chunk])
+        else:
+            for chunk in prange(n_chunks):
+                _chunk_min_max(data,
+                               chunk * _CHUNK_SIZE,
+                               min(length, (chunk + 1) * _CHUNK_SIZE),
+                               min_positive, finite, stats,
+                               &argmins[chunk], &argmin_poss[chunk],
+                               &argmaxs[chunk], &counts[chunk],
+                               &means[chunk], &m2s[chunk])
+
+        # Reduce chunks in order to keep the first occurrences
+        for chunk in range(n_chunks):
+            if counts[chunk] == 0:
+                continue
+
+            index = argmins[chunk]
+            value = data[index // n_columns, index % n_columns]
+            if min_index < 0 or value < minimum:
+                minimum = value
+                min_index = index
+
+            index = argmaxs[chunk]
+            value = data[index // n_columns, index % n_columns]
+            if max_index < 0 or value > maximum:
+                maximum = value
+                max_index = index
+
+            index = argmin_poss[chunk]
+            if index >= 0:
+                value = data[index // n_columns, index % n_columns]
+                if min_pos_index < 0 or value < min_pos:
+                    min_pos = value
+                    min_pos_index = index
+
+            if stats:
+                # Parallel algorithm of Chan et al.
+                delta = means[chunk] - mean
+                mean += delta * counts[chunk] / (count + counts[chunk])
+                m2 += (m2s[chunk] +
+                       delta * delta * count * counts[chunk] /
+                       (count + counts[chunk]))
+            count += counts[chunk]
+
+    if count == 0:
+        if finite:
+            # No finite value
+            result = [None] * 6
+        else:
+            # Only NaNs
+            value = data[0, 0]
+            result = [value, None, value, 0, None, 0]
+    else:
+        result = [minimum,
+                  min_pos if min_pos_index >= 0 else None,
+                  maximum,
+                  min_index,
+                  min_pos_index if min_pos_index >= 0 else None,
+                  max_index]
+
+    if stats:
+        if count == 0:
+            result += [0, 0., None, None]
+        else:
+            result += [count, mean * count, mean, sqrt(m2 / count)]
 
+    return _MinMaxResult(*result)
+
+
+@cython.initializedcheck(False)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _histogram_blocks(_number[:, :] data,
+                      bint positive,
+                      double minimum,
+                      double scale,
+                      Py_ssize_t n_bins,
+                      Py_ssize_t[::1] slots,
+                      Py_ssize_t[:, ::1] histos,
+                      int n_threads=0):
+    """Fills histos with the histograms of contiguous blocks of data.
+
+    See :func:`_chunk_histogram`, there is one block per row of histos.
+
+    :param data: 2D array, histogrammed as if it was flattened
+    :param slots: Refined bins, None for the histogram of the range
+    """
+    cdef:
+        Py_ssize_t length = data.shape[0] * data.shape[1]
+        Py_ssize_t n_blocks = histos.shape[0]
+        Py_ssize_t block
+        Py_ssize_t *slots_ptr = NULL
+
+    if slots is not None:
+        slots_ptr = &slots[0]
+
+    with nogil:
+        if n_threads > 0:
+            for block in prange(n_blocks, num_threads=n_threads):
+                _chunk_histogram(data,
+                                 block * length // n_blocks,
+                                 (block + 1) * length // n_blocks,
+                                 positive, minimum, scale, n_bins,
+                                 slots_ptr, &histos[block, 0])
         else:
-            for index in range(index, length):
-                value = data[index]
-                if isfinite(value):
-                    if value > maximum:
-                        maximum = value
-                        max_index = index
-                    if value < minimum:
-                        minimum = value
-                        min_index = index
-
-                    if 0. < value < min_pos:
-                        min_pos = value
-                        min_pos_index = index
-
-    return _MinMaxResult(minimum if isfinite(minimum) else None,
-                         min_pos if isfinite(min_pos) else None,
-                         maximum if isfinite(maximum) else None,
-                         min_index if isfinite(minimum) else None,
-                         min_pos_index if isfinite(min_pos) else None,
-                         max_index if isfinite(maximum) else None)
-
-
-def min_max(data not None, bint min_positive=False, bint finite=False):
+            for block in prange(n_blocks):
+                _chunk_histogram(data,
+                                 block * length // n_blocks,
+                                 (block + 1) * length // n_blocks,
+                                 positive, minimum, scale, n_bins,
+                                 slots_ptr, &histos[block, 0])
+
+
+def _percentile(data, q, bint positive, Py_ssize_t n_bins, int n_threads):
+    """:func:`percentile` implementation
+
+    See :func:`percentile` for documentation.
+
+    :param numpy.ndarray data: 2D array, processed as if it was flattened
+    :param numpy.ndarray q: 1D array of percentiles in [0, 100]
+    :rtype: numpy.ndarray
+    """
+    # Data range
+    result = _min_max(data, positive, True, False, n_threads)
+    minimum = result.min_positive if positive else result.minimum
+    if minimum is None:  # No finite (and strictly positive) value
+        return numpy.full(len(q), numpy.nan)
+    minimum = float(minimum)
+    maximum = float(result.maximum)
+    if minimum == maximum:
+        return numpy.full(len(q), minimum)
+    scale = n_bins / (maximum - minimum)
+
+    # Histogram of the range, blocks do not depend on the number of threads
+    length = data.shape[0] * data.shape[1]
+    n_blocks = min(_MAX_BLOCKS, (length + _CHUNK_SIZE - 1) // _CHUNK_SIZE)
+    histos = numpy.zeros((n_blocks, n_bins), dtype=numpy.intp)
+    _histogram_blocks(data, positive, minimum, scale, n_bins,
+                      None, histos, n_threads)
+    histo = histos.sum(axis=0)
+    cumul = numpy.cumsum(histo)
+    count = cumul[-1]
+
+    # Ranks surrounding the percentiles in the sorted data
+    ranks = q / 100. * (count - 1)
+    lower_ranks = numpy.floor(ranks).astype(numpy.intp)
+    upper_ranks = numpy.minimum(lower_ranks + 1, count - 1)
+    all_ranks = numpy.concatenate((lower_ranks, upper_ranks))
+    bins = numpy.searchsorted(cumul, all_ranks, side='right')
+
+    # Refine the bins containing those ranks
+    refined_bins, bins_slot = numpy.unique(bins, return_inverse=True)
+    slots = numpy.full(n_bins, -1, dtype=numpy.intp)
+    slots[refined_bins] = numpy.arange(len(refined_bins))
+    n_blocks = max(1, min(
+        n_blocks, _MAX_REFINED_BINS // (len(refined_bins) * n_bins)))
+    histos = numpy.zeros((n_blocks, len(refined_bins) * n_bins),
+                         dtype=numpy.intp)
+    _histogram_blocks(data, positive, minimum, scale, n_bins,
+                      slots, histos, n_threads)
+    sub_histos = histos.sum(axis=0).reshape(len(refined_bins), n_bins)
+    sub_cumuls = numpy.cumsum(sub_histos, axis=1)
+
+    # Locate ranks in refined bins
+    sub_ranks = all_ranks - (cumul[bins] - histo[bins])
+    sub_cumuls = sub_cumuls[bins_slot]
+    sub_bins = numpy.array([numpy.searchsorted(cumul_, rank, side='right')
+                            for cumul_, rank in zip(sub_cumuls, sub_ranks)],
+                           dtype=numpy.intp)
+    sub_bins = numpy.minimum(sub_bins, n_bins - 1)
+    sub_counts = sub_histos[bins_slot, sub_bins]
+    ranks_in_bin = sub_ranks - (sub_cumuls[numpy.arange(len(sub_bins)),
+                                           sub_bins] - sub_counts)
+
+    # Values are spread uniformly within their refined bin
+    positions = (bins + (sub_bins + (ranks_in_bin + 0.5) /
+                         numpy.maximum(sub_counts, 1)) / n_bins)
+    values = numpy.clip(minimum + positions / scale, minimum, maximum)
+
+    lower_values = values[:len(q)]
+    upper_values = values[len(q):]
+    return lower_values + (ranks - lower_ranks) * (upper_values - lower_values)
+
+
+def _as_native_array(data):
+    """Returns data as an array of a native supported type.
+
+    Non-native bytes order is converted to native and
+    16-bits floating-point to 32-bits floating-point.
+
+    :param data: Array-like dataset
+    :rtype: numpy.ndarray
+    """
+    data = numpy.asarray(data)
+    native_endian_dtype = data.dtype.newbyteorder('N')
+    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
+        # Use native float32 instead of float16
+        native_endian_dtype = numpy.dtype("=f4")
+    if data.dtype != native_endian_dtype:
+        data = data.astype(native_endian_dtype)
+    return data
+
+
+def _as_2d_view(data):
+    """Returns data as a 2D array whose flattening is the same as data, if
+    possible without copying it.
+
+    :param numpy.ndarray data:
+    :rtype: numpy.ndarray
+    """
+    if data.ndim == 0:
+        return data.reshape(1, 1)
+    if data.ndim == 1:
+        return data.reshape(1, -1)
+
+    view = data.view()
+    try:
+        # Setting the shape raises an exception rather than copying
+        view.shape = -1, data.shape[-1]
+    except AttributeError:
+        view = numpy.ascontiguousarray(data).reshape(-1, data.shape[-1])
+    return view
+
+
+def min_max(data not None, bint min_positive=False, bint finite=False,
+            bint stats=False, int n_threads=0):
     """Returns min, max and optionally strictly positive min of data.
 
     It also computes the indices of first occurrence of min/max.
@@ -276,6 +658,10 @@ def min_max(data not None, bint min_positive=False, bint finite=False):
     floating-point or integers. For input using 16-bits floating-point,
     the result is returned as 32-bits floating-point.
 
+    The data is processed by chunks in parallel. Non-contiguous arrays
+    (e.g., slices) are read in place: they are copied only if they cannot be
+    seen as a 2D array (e.g., some transposed 3D arrays).
+
     Examples:
 
     >>> import numpy
@@ -301,6 +687,12 @@ def min_max(data not None, bint min_positive=False, bint finite=False):
     >>> result.min_positive, result.argmin_positive  # Computed
     1, 1
 
+    Getting the sum, mean and standard deviation in the same pass:
+
+    >>> result = min_max(data, stats=True)
+    >>> result.sum, result.mean, result.std
+    45.0, 4.5, 2.8722813232690143
+
     If *finite* is True, min/max information is computed only from finite data.
     Then, all result fields (include minimum and maximum) can be None
     when all data is infinity or NaN.
@@ -310,20 +702,74 @@ def min_max(data not None, bint min_positive=False, bint finite=False):
                               Default: False.
     :param bool finite: True to compute min/max from finite data only
                         Default: False.
+    :param bool stats: True to also compute count, sum, mean and std,
+                       using the same values as min/max (i.e., ignoring
+                       NaNs, and infinite values if *finite* is True).
+                       They are computed with double precision.
+                       Default: False.
+    :param int n_threads: Number of threads to use,
+                          0 (the default) to use all available cores.
     :returns: An object with minimum, maximum and min_positive attributes
               and the indices of first occurrence in the flattened data:
               argmin, argmax and argmin_positive attributes.
               If all data is <= 0 or min_positive argument is False, then
               min_positive and argmin_positive are None.
+              If stats is True, it also has count, sum, mean and std
+              attributes.
     :raises: ValueError if data is empty
     """
-    data = numpy.array(data, copy=False)
-    native_endian_dtype = data.dtype.newbyteorder('N')
-    if native_endian_dtype.kind == 'f' and native_endian_dtype.itemsize == 2:
-        # Use native float32 instead of float16
-        native_endian_dtype = "=f4"
-    data = numpy.ascontiguousarray(data, dtype=native_endian_dtype).ravel()
-    if finite and data.dtype.kind == 'f':
-        return _finite_min_max(data, min_positive)
-    else:
-        return _min_max(data, min_positive)
+    data = _as_native_array(data)
+    if data.size == 0:
+        raise ValueError('Zero-size array')
+    return _min_max(_as_2d_view(data), min_positive, finite, stats, n_threads)
+
+
+def percentile(data not None, q, bint positive=False, int n_bins=4096,
+               int n_threads=0):
+    """Returns approximate percentiles of the finite values of data.
+
+    Percentiles are estimated from a histogram of the data range with
+    n_bins bins, whose bins containing the requested percentiles are
+    refined with n_bins sub-bins in a second pass.
+    Values are interpolated between the closest ranks as
+    :func:`numpy.percentile` (with linear interpolation), assuming values are
+    uniformly distributed within a sub-bin.
+    As a result, the error compared to :func:`numpy.percentile` of the same
+    finite values is at most (max - min) / n_bins**2.
+
+    This uses at most 3 passes over the data (one for :func:`min_max`),
+    processed by blocks in parallel, without sorting or copying it.
+    The result does not depend on the number of threads.
+
+    Examples:
+
+    >>> import numpy
+    >>> data = numpy.random.random(1000000)
+    >>> low, high = percentile(data, (1, 99))
+    >>> median = percentile(data, 50)
+
+    :param data: Array-like dataset
+    :param q: Percentile or sequence of percentiles in [0, 100]
+    :param bool positive: True to only take strictly positive values
+                          into account (e.g., for a log scale)
+    :param int n_bins: Number of bins of the histograms (at least 1)
+    :param int n_threads: Number of threads to use,
+                          0 (the default) to use all available cores.
+    :returns: A float if q is a scalar, a numpy.ndarray of float otherwise.
+              NaN if there is no finite (and strictly positive) value.
+    :raises: ValueError if data is empty, q or n_bins are out of range
+    """
+    data = _as_native_array(data)
+    if data.size == 0:
+        raise ValueError('Zero-size array')
+    if n_bins < 1:
+        raise ValueError('n_bins must be at least 1')
+    q_array = numpy.array(q, dtype=numpy.float64, ndmin=1).ravel()
+    if numpy.any(numpy.logical_not(
+            numpy.logical_and(q_array >= 0., q_array <= 100.))):
+        raise ValueError('Percentiles must be in the range [0, 100]')
+
+    result = _percentile(_as_2d_view(data), q_array, positive, n_bins, n_threads)
+    if numpy.ndim(q) == 0:
+        return float(result[0])
+    return result.reshape(numpy.shape(q))
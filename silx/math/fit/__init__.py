@@ -27,7 +27,7 @@ __license__ = "MIT"
 __date__ = "22/06/2016"
 
 
-from .leastsq import leastsq, chisq_alpha_beta
+from .leastsq import leastsq, leastsq_stack, chisq_alpha_beta
 from .leastsq import \
     CFREE, CPOSITIVE, CQUOTED, CFIXED, \
     CFACTOR, CDELTA, CSUM
@@ -35,5 +35,5 @@ from .leastsq import \
 from .functions import *
 from .filters import *
 from .peaks import peak_search, guess_fwhm
-from .fitmanager import FitManager
+from .fitmanager import FitManager, fit_many
 from .fittheory import FitTheory
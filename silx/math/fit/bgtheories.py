@@ -133,6 +133,33 @@ def _convert_anchors_to_indices(x):
     return anchors_indices
 
 
+def no_bg(x, y0):
+    """Null background"""
+    return numpy.zeros_like(x)
+
+
+def constant_bg(x, y0, c):
+    """Constant background"""
+    return c * numpy.ones_like(x)
+
+
+def linear_bg(x, y0, a, b):
+    """Linear background ``a + b * x``"""
+    return a + b * x
+
+
+def constant_bg_derivative(x, pars, index):
+    """Derivative of :func:`constant_bg`"""
+    return numpy.ones_like(x, dtype=numpy.float64)
+
+
+def linear_bg_derivative(x, pars, index):
+    """Derivative of :func:`linear_bg`"""
+    if index == 0:
+        return numpy.ones_like(x, dtype=numpy.float64)
+    return numpy.array(x, dtype=numpy.float64)
+
+
 def strip_bg(x, y0, width, niter):
     """Extract and return the strip bg from y0.
 
@@ -245,6 +272,11 @@ def snip_bg(x, y0, width):
     return background
 
 
+def estimate_constant(x, y):
+    """Estimate the constant background as the minimum of a y signal."""
+    return [min(y)], [[0, 0, 0]]
+
+
 def estimate_linear(x, y):
     """
     Estimate the linear parameters (constant, slope) of a y signal.
@@ -311,6 +343,12 @@ def poly(x, y, *pars):
     return p(x)
 
 
+def poly_derivative(x, pars, index):
+    """Derivative of :func:`poly` with respect to the coefficient
+    ``pars[index]``"""
+    return numpy.array(x, dtype=numpy.float64) ** (len(pars) - 1 - index)
+
+
 def estimate_poly(x, y, deg=2):
     """Estimate polynomial coefficients.
 
@@ -364,23 +402,27 @@ THEORY = OrderedDict(
         (('No Background',
           FitTheory(
                 description="No background function",
-                function=lambda x, y0: numpy.zeros_like(x),
+                function=no_bg,
                 parameters=[],
                 is_background=True)),
          ('Constant',
           FitTheory(
                 description='Constant background',
-                function=lambda x, y0, c: c * numpy.ones_like(x),
+                function=constant_bg,
                 parameters=['Constant', ],
-                estimate=lambda x, y: ([min(y)], [[0, 0, 0]]),
+                estimate=estimate_constant,
+                derivative=constant_bg_derivative,
+                derivative_own_parameters=True,
                 is_background=True)),
          ('Linear',
           FitTheory(
                 description="Linear background, parameters 'Constant' and"
                             " 'Slope'",
-                function=lambda x, y0, a, b: a + b * x,
+                function=linear_bg,
                 parameters=['Constant', 'Slope'],
                 estimate=estimate_linear,
+                derivative=linear_bg_derivative,
+                derivative_own_parameters=True,
                 configure=configure,
                 is_background=True)),
          ('Strip',
@@ -408,6 +450,8 @@ THEORY = OrderedDict(
                 function=poly,
                 parameters=['a', 'b', 'c'],
                 estimate=estimate_quadratic_poly,
+                derivative=poly_derivative,
+                derivative_own_parameters=True,
                 configure=configure,
                 is_background=True)),
          ('Degree 3 Polynomial',
@@ -418,6 +462,8 @@ THEORY = OrderedDict(
                 function=poly,
                 parameters=['a', 'b', 'c', 'd'],
                 estimate=estimate_cubic_poly,
+                derivative=poly_derivative,
+                derivative_own_parameters=True,
                 configure=configure,
                 is_background=True)),
          ('Degree 4 Polynomial',
@@ -427,6 +473,8 @@ THEORY = OrderedDict(
                 function=poly,
                 parameters=['a', 'b', 'c', 'd', 'e'],
                 estimate=estimate_quartic_poly,
+                derivative=poly_derivative,
+                derivative_own_parameters=True,
                 configure=configure,
                 is_background=True)),
          ('Degree 5 Polynomial',
@@ -436,5 +484,7 @@ THEORY = OrderedDict(
                 function=poly,
                 parameters=['a', 'b', 'c', 'd', 'e', 'f'],
                 estimate=estimate_quintic_poly,
+                derivative=poly_derivative,
+                derivative_own_parameters=True,
                 configure=configure,
                 is_background=True))))
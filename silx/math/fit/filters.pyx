@@ -32,6 +32,10 @@ Index of background extraction functions:
     - :func:`snip2d`
     - :func:`snip3d`
 
+Stacks of spectra, such as the spectra of a map, can be processed in
+parallel, and in place, with :func:`strip_stack`, :func:`snip1d_stack`
+and :func:`smooth1d_stack`.
+
 Smoothing functions:
 --------------------
 
@@ -39,6 +43,7 @@ Smoothing functions:
     - :func:`smooth1d`
     - :func:`smooth2d`
     - :func:`smooth3d`
+    - :func:`smooth1d_stack`
 
 API documentation:
 -------------------
@@ -47,7 +52,7 @@ API documentation:
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "15/05/2017"
+__date__ = "01/06/2018"
 
 import logging
 import numpy
@@ -55,9 +60,50 @@ import numpy
 _logger = logging.getLogger(__name__)
 
 cimport cython
+from cython.parallel import prange
 cimport filters_wrapper
 
 
+# Number of spectra processed at once by a thread in the *_stack functions.
+# Spectra are filtered independently, so the result does not depend on the
+# number of threads.
+cdef long _CHUNK_SPECTRA = 64
+
+
+def _as_stack(data, bint inplace):
+    """Returns data as a C-contiguous numpy.float64 array.
+
+    :param data: Array of spectra along the last dimension
+    :param bool inplace: True to return data itself, False for a copy
+    :return: The array and a 2D view of it with one spectrum per row
+    :raises ValueError: If inplace is True and data is not a writable
+        C-contiguous numpy.float64 array
+    """
+    if inplace:
+        if (not isinstance(data, numpy.ndarray) or
+                data.dtype != numpy.float64 or
+                not data.flags['C_CONTIGUOUS'] or
+                not data.flags['WRITEABLE']):
+            raise ValueError("In-place filtering requires a writable " +
+                             "C-contiguous numpy.float64 array")
+        array = data
+    else:
+        if not hasattr(data, "__len__"):
+            raise TypeError("data must be a sequence (list, tuple) " +
+                            "or a numpy array")
+        array = numpy.array(data,
+                            copy=True,
+                            dtype=numpy.float64,
+                            order='C')
+    if array.ndim == 0:
+        raise TypeError("data must be a sequence (list, tuple) " +
+                        "or a numpy array")
+
+    if array.size == 0:
+        return array, None
+    return array, array.reshape(-1, array.shape[-1])
+
+
 def strip(data, w=1, niterations=1000, factor=1.0, anchors=None):
     """Extract background from data using the strip algorithm, as explained at
     http://pymca.sourceforge.net/stripbackground.html.
@@ -124,6 +170,82 @@ def strip(data, w=1, niterations=1000, factor=1.0, anchors=None):
     return numpy.asarray(output).reshape(data_shape)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def strip_stack(data, w=1, niterations=1000, factor=1.0, anchors=None,
+                bint inplace=False, int n_threads=0):
+    """Extract background from each spectrum of a stack using the strip
+    algorithm. See :func:`strip`.
+
+    The spectra are processed in parallel.
+
+    :param data: Array of spectra, with channels along the last dimension
+        and any number of leading dimensions (e.g., the rows and columns of
+        a map of spectra).
+    :type data: numpy.ndarray
+    :param w: Strip width
+    :param niterations: number of iterations
+    :param factor: scaling factor applied to the average of ``y(i-w)`` and
+        ``y(i+w)`` before comparing to ``y(i)``
+    :param anchors: Array of anchors, channel indices that will not be
+          modified during the stripping procedure, in all spectra.
+    :param bool inplace: True to write the result in data rather than in a
+        new array, which avoids doubling the memory used.
+        data must then be a C-contiguous numpy.float64 array.
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
+    :return: Data with peaks stripped away, with the same shape as data
+        (data itself if inplace is True)
+    :rtype: numpy.ndarray
+    """
+    cdef:
+        double[:, ::1] stack
+        long[::1] anchors_c
+        long* anchors_ptr
+        long len_anchors
+        long n_spectra, n_channels, n_chunks, chunk
+        double c_factor = factor
+        long c_niterations = niterations
+        int c_w = w
+
+    result, stack_array = _as_stack(data, inplace)
+    if stack_array is None:
+        return result
+    stack = stack_array
+
+    if anchors is not None and len(anchors):
+        anchors_c = numpy.array(anchors,
+                                copy=False,
+                                dtype=numpy.int_,
+                                order='C')
+        len_anchors = anchors_c.size
+    else:
+        anchors_c = numpy.empty(shape=(1,),
+                                dtype=numpy.int_)
+        len_anchors = 0
+    anchors_ptr = &anchors_c[0]
+
+    n_spectra = stack.shape[0]
+    n_channels = stack.shape[1]
+    n_chunks = (n_spectra + _CHUNK_SPECTRA - 1) // _CHUNK_SPECTRA
+
+    with nogil:
+        if n_threads > 0:
+            for chunk in prange(n_chunks, num_threads=n_threads):
+                filters_wrapper.strip_multiple(
+                    &stack[chunk * _CHUNK_SPECTRA, 0], n_channels,
+                    c_factor, c_niterations, c_w, anchors_ptr, len_anchors,
+                    min(_CHUNK_SPECTRA, n_spectra - chunk * _CHUNK_SPECTRA))
+        else:
+            for chunk in prange(n_chunks):
+                filters_wrapper.strip_multiple(
+                    &stack[chunk * _CHUNK_SPECTRA, 0], n_channels,
+                    c_factor, c_niterations, c_w, anchors_ptr, len_anchors,
+                    min(_CHUNK_SPECTRA, n_spectra - chunk * _CHUNK_SPECTRA))
+
+    return result
+
+
 def snip1d(data, snip_width):
     """Estimate the baseline (background) of a 1D data vector by clipping peaks.
 
@@ -168,7 +290,57 @@ def snip1d(data, snip_width):
     return numpy.asarray(data_c).reshape(data_shape)
 
 
-def snip2d(data, snip_width):
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def snip1d_stack(data, int snip_width, bint inplace=False, int n_threads=0):
+    """Estimate the baseline (background) of each spectrum of a stack by
+    clipping peaks. See :func:`snip1d`.
+
+    The spectra are processed in parallel.
+
+    :param data: Array of spectra, with channels along the last dimension
+        and any number of leading dimensions (e.g., the rows and columns of
+        a map of spectra).
+    :type data: numpy.ndarray
+    :param int snip_width: Width of the snip operator, in number of samples.
+    :param bool inplace: True to write the result in data rather than in a
+        new array, which avoids doubling the memory used.
+        data must then be a C-contiguous numpy.float64 array.
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
+    :return: Baselines of the spectra, with the same shape as data
+        (data itself if inplace is True)
+    :rtype: numpy.ndarray
+    """
+    cdef:
+        double[:, ::1] stack
+        long n_spectra, n_channels, n_chunks, chunk
+
+    result, stack_array = _as_stack(data, inplace)
+    if stack_array is None:
+        return result
+    stack = stack_array
+
+    n_spectra = stack.shape[0]
+    n_channels = stack.shape[1]
+    n_chunks = (n_spectra + _CHUNK_SPECTRA - 1) // _CHUNK_SPECTRA
+
+    with nogil:
+        if n_threads > 0:
+            for chunk in prange(n_chunks, num_threads=n_threads):
+                filters_wrapper.snip1d_multiple(
+                    &stack[chunk * _CHUNK_SPECTRA, 0], n_channels, snip_width,
+                    min(_CHUNK_SPECTRA, n_spectra - chunk * _CHUNK_SPECTRA))
+        else:
+            for chunk in prange(n_chunks):
+                filters_wrapper.snip1d_multiple(
+                    &stack[chunk * _CHUNK_SPECTRA, 0], n_channels, snip_width,
+                    min(_CHUNK_SPECTRA, n_spectra - chunk * _CHUNK_SPECTRA))
+
+    return result
+
+
+def snip2d(data, snip_width, int n_threads=0):
     """Estimate the baseline (background) of a 2D data signal by clipping peaks.
 
     Implementation of the algorithm SNIP in 2D described in
@@ -181,11 +353,16 @@ def snip2d(data, snip_width):
         snip operator will result in a smoother result (lower frequency peaks
         will be clipped), and a longer computation time.
     :type width: int
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
     :return: Baseline of the input array, as an array of the same shape.
     :rtype: numpy.ndarray
     """
     cdef:
         double[::1] data_c
+        double* data_ptr
+        int nrows, ncolumns
+        int c_snip_width = snip_width
 
     if not isinstance(data, numpy.ndarray):
         if not hasattr(data, "__len__") or not hasattr(data[0], "__len__"):
@@ -208,12 +385,15 @@ def snip2d(data, snip_width):
                           dtype=numpy.float64,
                           order='C').reshape(-1)
 
-    filters_wrapper.snip2d(&data_c[0], nrows, ncolumns, snip_width)
+    data_ptr = &data_c[0]
+    with nogil:
+        filters_wrapper.snip2d(data_ptr, nrows, ncolumns, c_snip_width,
+                               n_threads)
 
     return numpy.asarray(data_c).reshape(data_shape)
 
 
-def snip3d(data, snip_width):
+def snip3d(data, snip_width, int n_threads=0):
     """Estimate the baseline (background) of a 3D data signal by clipping peaks.
 
     Implementation of the algorithm SNIP in 2D described in
@@ -226,12 +406,17 @@ def snip3d(data, snip_width):
         snip operator will result in a smoother result (lower frequency peaks
         will be clipped), and a longer computation time.
     :type width: int
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
 
     :return: Baseline of the input array, as an array of the same shape.
     :rtype: numpy.ndarray
     """
     cdef:
         double[::1] data_c
+        double* data_ptr
+        int nx, ny, nz
+        int c_snip_width = snip_width
 
     if not isinstance(data, numpy.ndarray):
         if not hasattr(data, "__len__") or not hasattr(data[0], "__len__") or\
@@ -257,7 +442,10 @@ def snip3d(data, snip_width):
                           dtype=numpy.float64,
                           order='C').reshape(-1)
 
-    filters_wrapper.snip3d(&data_c[0], nx, ny, nz, snip_width)
+    data_ptr = &data_c[0]
+    with nogil:
+        filters_wrapper.snip3d(data_ptr, nx, ny, nz, c_snip_width,
+                               n_threads)
 
     return numpy.asarray(data_c).reshape(data_shape)
 
@@ -331,6 +519,56 @@ def smooth1d(data):
     return numpy.asarray(data_c).reshape(data_shape)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def smooth1d_stack(data, bint inplace=False, int n_threads=0):
+    """Apply :func:`smooth1d` to each spectrum of a stack.
+
+    The spectra are processed in parallel.
+
+    :param data: Array of spectra, with channels along the last dimension
+        and any number of leading dimensions (e.g., the rows and columns of
+        a map of spectra).
+    :type data: numpy.ndarray
+    :param bool inplace: True to write the result in data rather than in a
+        new array, which avoids doubling the memory used.
+        data must then be a C-contiguous numpy.float64 array.
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
+    :return: Smoothed spectra, with the same shape as data
+        (data itself if inplace is True)
+    :rtype: numpy.ndarray(dtype=numpy.float64)
+    """
+    cdef:
+        double[:, ::1] stack
+        long n_spectra, n_channels, n_chunks, chunk
+
+    result, stack_array = _as_stack(data, inplace)
+    if stack_array is None:
+        return result
+    stack = stack_array
+
+    n_spectra = stack.shape[0]
+    n_channels = stack.shape[1]
+    n_chunks = (n_spectra + _CHUNK_SPECTRA - 1) // _CHUNK_SPECTRA
+
+    with nogil:
+        if n_threads > 0:
+            for chunk in prange(n_chunks, num_threads=n_threads):
+                filters_wrapper.smooth1d_rows(
+                    &stack[chunk * _CHUNK_SPECTRA, 0],
+                    min(_CHUNK_SPECTRA, n_spectra - chunk * _CHUNK_SPECTRA),
+                    n_channels)
+        else:
+            for chunk in prange(n_chunks):
+                filters_wrapper.smooth1d_rows(
+                    &stack[chunk * _CHUNK_SPECTRA, 0],
+                    min(_CHUNK_SPECTRA, n_spectra - chunk * _CHUNK_SPECTRA),
+                    n_channels)
+
+    return result
+
+
 def smooth2d(data):
     """Simple smoothing for 2D data:
     :func:`smooth1d` is applied succesively along both axis
@@ -26,18 +26,22 @@
 
 /* Background functions */
 void snip1d(double *data, int size, int width);
-//void snip1d_multiple(double *data, int n_channels, int snip_width, int n_spectra);
-void snip2d(double *data, int nrows, int ncolumns, int width);
-void snip3d(double *data, int nx, int ny, int nz, int width);
+void snip1d_multiple(double *data, int n_channels, int snip_width, int n_spectra);
+void snip2d(double *data, int nrows, int ncolumns, int width, int n_threads);
+void snip3d(double *data, int nx, int ny, int nz, int width, int n_threads);
 
 int strip(double* input, long len_input, double c, long niter, int deltai,
           long* anchors, long len_anchors, double* output);
+int strip_multiple(double* data, long len_input, double c, long niter,
+                   int deltai, long* anchors, long len_anchors,
+                   long n_spectra);
 
 /* Smoothing functions */
 
 int SavitskyGolay(double* input, long len_input, int npoints, double* output);
 
 void smooth1d(double *data, int size);
+void smooth1d_rows(double *data, long nrows, long ncols);
 void smooth2d(double *data, int size0, int size1);
 void smooth3d(double *data, int size0, int size1, int size2);
 
@@ -122,7 +122,7 @@ void snip1d_multiple(double *data, int n_channels, int snip_width, int n_spectra
 	int i;
 	int j;
 	int p;
-	int offset;
+	long offset;
 	double *w;
 
 	i = (int) (0.5 * snip_width);
@@ -132,7 +132,7 @@ void snip1d_multiple(double *data, int n_channels, int snip_width, int n_spectra
 
 	for (j=0; j < n_spectra; j++)
 	{
-		offset = j * n_channels;
+		offset = (long) j * n_channels;
 		for (p = snip_width; p > 0; p--)
 		{
 			for (i=p; i<(n_channels - p); i++)
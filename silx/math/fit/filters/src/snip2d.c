@@ -33,13 +33,18 @@
 #include <stdlib.h>
 #include <string.h>
 #include <math.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 #define MIN(x, y) (((x) < (y)) ? (x) : (y))
 #define MAX(x, y) (((x) > (y)) ? (x) : (y))
 
 void lls(double *data, int size);
 void lls_inv(double *data, int size);
 
-void snip2d(double *data, int nrows, int ncolumns, int width)
+/* The rows of each iteration are processed in parallel with n_threads
+   threads (0 to use all available cores). */
+void snip2d(double *data, int nrows, int ncolumns, int width, int n_threads)
 {
 	int i, j;
 	int p;
@@ -55,8 +60,18 @@ void snip2d(double *data, int nrows, int ncolumns, int width)
 	size = nrows * ncolumns;
 	w = (double *) malloc(size * sizeof(double));
 
+#ifdef _OPENMP
+	if (n_threads <= 0)
+	{
+		n_threads = omp_get_max_threads();
+	}
+#endif
+
 	for (p=width; p > 0; p--)
 	{
+#ifdef _OPENMP
+		#pragma omp parallel for num_threads(n_threads) private(j, P1, P2, P3, P4, S1, S2, S3, S4, dhelp, iminuspxncolumns, ixncolumns, ipluspxncolumns)
+#endif
 		for (i=p; i<(nrows-p); i++)
 		{
 			iminuspxncolumns = (i-p) * ncolumns;
@@ -83,6 +98,9 @@ void snip2d(double *data, int nrows, int ncolumns, int width)
 				w[ixncolumns + j] = MIN(data[ixncolumns + j], 0.5 * (S1+S2+S3+S4) + 0.25 * (P1+P2+P3+P4));
 			}
 		}
+#ifdef _OPENMP
+		#pragma omp parallel for num_threads(n_threads) private(j, ixncolumns)
+#endif
 		for (i=p; i<(nrows-p); i++)
 		{
 			ixncolumns = i * ncolumns;
@@ -34,17 +34,22 @@
 #include <stdlib.h>
 #include <string.h>
 #include <math.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 #define MIN(x, y) (((x) < (y)) ? (x) : (y))
 #define MAX(x, y) (((x) > (y)) ? (x) : (y))
 
 void lls(double *data, int size);
 void lls_inv(double *data, int size);
 
-void snip3d(double *data, int nx, int ny, int nz, int width)
+/* The planes of each iteration are processed in parallel with n_threads
+   threads (0 to use all available cores). */
+void snip3d(double *data, int nx, int ny, int nz, int width, int n_threads)
 {
 	int i, j, k;
 	int p;
-	int size;
+	long size;
 	double *w;
 	double P1, P2, P3, P4, P5, P6, P7, P8;
 	double R1, R2, R3, R4, R5, R6;
@@ -57,16 +62,26 @@ void snip3d(double *data, int nx, int ny, int nz, int width)
 	long jplus;
 	long jmin;
 
-	size = nx * ny * nz;
+	size = (long) nx * ny * nz;
 	w = (double *) malloc(size * sizeof(double));
 
+#ifdef _OPENMP
+	if (n_threads <= 0)
+	{
+		n_threads = omp_get_max_threads();
+	}
+#endif
+
 	for (p=width; p > 0; p--)
 	{
+#ifdef _OPENMP
+		#pragma omp parallel for num_threads(n_threads) private(j, k, P1, P2, P3, P4, P5, P6, P7, P8, R1, R2, R3, R4, R5, R6, S1, S2, S3, S4, S5, S6, S7, S8, S9, S10, S11, S12, dhelp, ioffset, iplus, imin, joffset, jplus, jmin)
+#endif
 		for (i=p; i<(nx-p); i++)
 		{
-			ioffset = i * ny * nz;
-			iplus = (i + p) * ny * nz;
-			imin =  (i - p) * ny * nz;
+			ioffset = (long) i * ny * nz;
+			iplus = (long) (i + p) * ny * nz;
+			imin =  (long) (i - p) * ny * nz;
 			for (j=p; j<(ny-p); j++)
 			{
 				joffset = j * nz;
@@ -84,10 +99,10 @@ void snip3d(double *data, int nx, int ny, int nz, int width)
 					P8 = data[iplus + jmin  + k+p];  /* P8 = data[i+p][j-p][k+p] */
 
 					S1 = data[iplus   + joffset + k-p]; /* S1  = data[i+p][j][k-p] */
-					S2 = data[ioffset + jmin    + k-p]; /* S2  = data[i][j+p][k-p] */
+					S2 = data[ioffset + jplus   + k-p]; /* S2  = data[i][j+p][k-p] */
 					S3 = data[imin    + joffset + k-p]; /* S3  = data[i-p][j][k-p] */
 					S4 = data[ioffset + jmin    + k-p]; /* S4  = data[i][j-p][k-p] */
-					S5 = data[imin    + joffset + k+p]; /* S5  = data[i-p][j][k+p] */
+					S5 = data[iplus   + joffset + k+p]; /* S5  = data[i+p][j][k+p] */
 					S6 = data[ioffset + jplus   + k+p]; /* S6  = data[i][j+p][k+p] */
 					S7 = data[imin    + joffset + k+p]; /* S7  = data[i-p][j][k+p] */
 					S8 = data[ioffset + jmin    + k+p]; /* S8  = data[i][j-p][k+p] */
@@ -169,13 +184,16 @@ void snip3d(double *data, int nx, int ny, int nz, int width)
 				}
 			}
 		}
+#ifdef _OPENMP
+		#pragma omp parallel for num_threads(n_threads) private(j, k, ioffset, joffset)
+#endif
 		for (i=p; i<(nx-p); i++)
 		{
-			ioffset = i * ny * nz;
+			ioffset = (long) i * ny * nz;
 			for (j=p; j<(ny-p); j++)
 			{
 				joffset = j * nz;
-				for (k=p; k<(nz-p); j++)
+				for (k=p; k<(nz-p); k++)
 				{
 					data[ioffset + joffset + k] = w[ioffset + joffset + k];
 				}
@@ -35,6 +35,7 @@
 */
 
 #include <string.h>
+#include <stdlib.h>
 
 #include <stdio.h>
 
@@ -116,3 +117,38 @@ int strip(double* input, long len_input,
     }
     return(0);
 }
+
+/*  strip_multiple(double* data, long len_input, double c, long niter,
+                   int deltai, long* anchors, long len_anchors, long n_spectra)
+
+    Apply strip in place to n_spectra contiguous spectra of len_input
+    channels.
+
+    Parameters: as for strip, except:
+
+        - data: Input data array of n_spectra * len_input values. It is
+          replaced by the stripped spectra.
+        - n_spectra: Number of spectra in data
+
+    Returns the status of strip, or -2 if the memory allocation failed.
+*/
+int strip_multiple(double* data, long len_input,
+                   double c, long niter, int deltai,
+                   long* anchors, long len_anchors,
+                   long n_spectra)
+{
+    long spectrum_index;
+    int status = 0;
+    double *output;
+
+    output = (double *) malloc(len_input * sizeof(double));
+    if (output == NULL) return(-2);
+
+    for (spectrum_index = 0; spectrum_index < n_spectra; spectrum_index++) {
+        /* at the end of strip, input holds the same values as output */
+        status = strip(data + spectrum_index * len_input, len_input,
+                       c, niter, deltai, anchors, len_anchors, output);
+    }
+    free(output);
+    return(status);
+}
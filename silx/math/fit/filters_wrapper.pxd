@@ -24,7 +24,7 @@
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
-__date__ = "22/06/2016"
+__date__ = "01/06/2018"
 
 cimport cython
 
@@ -33,16 +33,23 @@ cdef extern from "filters.h":
                 int size,
                 int width)
 
+    void snip1d_multiple(double *data,
+                         int n_channels,
+                         int snip_width,
+                         int n_spectra) nogil
+
     void snip2d(double *data,
                 int nrows,
                 int ncolumns,
-                int width)
+                int width,
+                int n_threads) nogil
 
     void snip3d(double *data,
                 int nx,
                 int ny,
                 int nz,
-                int width)
+                int width,
+                int n_threads) nogil
 
     int strip(double* input,
               long len_input,
@@ -53,6 +60,15 @@ cdef extern from "filters.h":
               long len_anchors,
               double* output)
 
+    int strip_multiple(double* data,
+                       long len_input,
+                       double c,
+                       long niter,
+                       int deltai,
+                       long* anchors,
+                       long len_anchors,
+                       long n_spectra) nogil
+
     int SavitskyGolay(double* input,
                       long len_input,
                       int npoints,
@@ -61,6 +77,10 @@ cdef extern from "filters.h":
     void smooth1d(double *data,
                   int size)
 
+    void smooth1d_rows(double *data,
+                       long nrows,
+                       long ncols) nogil
+
     void smooth2d(double *data,
                   int size0,
                   int size1)
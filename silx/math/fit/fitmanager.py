@@ -38,9 +38,13 @@ This module deals with:
     - handling of custom  derivative functions that can be passed as a
       parameter to  :func:`silx.math.fit.leastsq`
     - providing different background models
+    - fitting the same model to many spectra (e.g., the spectra of a map)
+      with :func:`fit_many`
 
 """
 from collections import OrderedDict
+import copy
+import functools
 import logging
 import numpy
 from numpy.linalg.linalg import LinAlgError
@@ -48,9 +52,10 @@ import os
 import sys
 
 from .filters import strip, smooth1d
-from .leastsq import leastsq
+from .leastsq import leastsq, _parse_constraints, CFACTOR, CDELTA, CSUM
 from .fittheory import FitTheory
 from . import bgtheories
+from silx.third_party import concurrent_futures
 
 
 __authors__ = ["V.A. Sole", "P. Knobel"]
@@ -128,6 +133,12 @@ class FitManager(object):
               signature is described in the documentation of
               :func:`silx.math.fit.leastsq.leastsq`
               (``model_deriv(xdata, parameters, index)``).
+              *parameters* holds all the fit parameters, background
+              parameters first, unless *"derivative_own_parameters"* is set.
+            - *"derivative_own_parameters"* (optional) is a flag telling
+              that the derivative function only takes the parameters of
+              the theory, with an index relative to them
+              (see :meth:`fitderivative`).
             - *"description"* is a description string
         """
 
@@ -824,6 +835,17 @@ class FitManager(object):
 
         ywork = self.ydata
 
+        theory = self.theories[self.selectedtheory]
+        model_deriv = theory.derivative
+        if model_deriv is not None and theory.derivative_own_parameters:
+            # derivative of bg + actual model function, taking into
+            # account the parameters depending on other parameters
+            constraints, _ = _parse_constraints(param_constraints,
+                                                len(param_constraints))
+            links = [(i, int(cons[1]), cons[0], cons[2])
+                     for i, cons in enumerate(constraints)
+                     if cons[0] in (CFACTOR, CDELTA, CSUM)]
+            model_deriv = functools.partial(self.fitderivative, links=links)
 
         try:
             params, covariance_matrix, infodict = leastsq(
@@ -831,11 +853,12 @@ class FitManager(object):
                     self.xdata, ywork, param_val,
                     sigma=self.sigmay,
                     constraints=param_constraints,
-                    model_deriv=self.theories[self.selectedtheory].derivative,
+                    model_deriv=model_deriv,
                     full_output=True, left_derivative=True)
         except LinAlgError:
             self.state = 'Fit failed'
-            callback(data={'status': self.state})
+            if callback is not None:
+                callback(data={'status': self.state})
             raise
 
         sigmas = infodict['uncertainties']
@@ -886,6 +909,82 @@ class FitManager(object):
 
         return result
 
+    def fitderivative(self, x, pars, index, links=()):
+        """Derivative of :meth:`fitfunction` with respect to one parameter.
+
+        This is used by :meth:`runfit` for theories with the
+        :attr:`silx.math.fit.fittheory.FitTheory.derivative_own_parameters`
+        flag set.
+        The derivative with respect to a peak function parameter is provided
+        by the derivative function of the selected theory, called with
+        the peak function parameters only.
+        The derivative with respect to a background parameter is provided
+        by the derivative function of the selected background theory, if
+        it has this flag set too, or else computed numerically.
+
+        :param x: Independent variable where the derivative is calculated.
+        :param pars: Sequence of all fit parameters, background parameters
+            first.
+        :param int index: Index of the parameter with respect to which
+            the derivative is calculated.
+        :param links: Sequence of ``(index, master_index, code, value)``
+            describing the parameters that depend on another parameter
+            through a FACTOR, DELTA or SUM constraint (numerical codes
+            of :mod:`silx.math.fit.leastsq`). Their contribution is added
+            to the derivative with respect to their master parameter.
+        :return: Derivative of the fit function with ``x`` as input.
+        """
+        pars = numpy.array(pars, dtype=numpy.float64)
+        for i, master, code, value in links:
+            if code == CFACTOR:
+                pars[i] = value * pars[master]
+            elif code == CDELTA:
+                pars[i] = value + pars[master]
+            elif code == CSUM:
+                pars[i] = value - pars[master]
+
+        result = self._partial_derivative(x, pars, index)
+        for i, master, code, value in links:
+            if master != index:
+                continue
+            if code == CFACTOR:
+                factor = value
+            elif code == CDELTA:
+                factor = 1.0
+            else:
+                factor = -1.0
+            result = result + factor * self._partial_derivative(x, pars, i)
+        return result
+
+    def _partial_derivative(self, x, pars, index):
+        """Partial derivative of :meth:`fitfunction` with respect to
+        parameter ``index``, all parameters being independent.
+        """
+        if self.selectedbg is not None:
+            nb_bg_pars = len(self.bgtheories[self.selectedbg].parameters)
+        else:
+            nb_bg_pars = 0
+
+        if index >= nb_bg_pars:
+            derivative = self.theories[self.selectedtheory].derivative
+            return derivative(x, pars[nb_bg_pars:], index - nb_bg_pars)
+
+        bgtheory = self.bgtheories[self.selectedbg]
+        if bgtheory.derivative is not None and \
+                bgtheory.derivative_own_parameters:
+            return bgtheory.derivative(x, pars[0:nb_bg_pars], index)
+
+        # background parameter: central finite difference
+        bgfun = bgtheory.function
+        delta = (pars[index] + (pars[index] == 0)) * \
+            numpy.sqrt(numpy.finfo(numpy.float64).eps)
+        pars_plus = numpy.array(pars[0:nb_bg_pars], copy=True)
+        pars_plus[index] += delta
+        pars_minus = numpy.array(pars[0:nb_bg_pars], copy=True)
+        pars_minus[index] -= delta
+        return (bgfun(x, self.ydata, *pars_plus) -
+                bgfun(x, self.ydata, *pars_minus)) / (2.0 * delta)
+
     def estimate_bkg(self, x, y):
         """Estimate background parameters using the function defined in
         the current fit configuration.
@@ -1014,6 +1113,185 @@ class FitManager(object):
                                pymca_legacy=True))
 
 
+def _fit_spectra(fitmanager, config, estimation, x, y, sigmay, warm_start):
+    """Fit spectra one after the other with an estimated :class:`FitManager`.
+
+    Each fit starts from the estimation of the fit manager or, if
+    warm_start is True, from the result of the previous successful fit.
+
+    :param FitManager fitmanager: Fit manager on which :meth:`estimate`
+        was called
+    :param dict config: Configuration to apply to the fit manager
+    :param estimation: Initial parameters
+    :param x: Abscissa common to all spectra or None
+    :param numpy.ndarray y: 2D array of spectra
+    :param sigmay: 2D array of uncertainties or None
+    :param bool warm_start: Whether to start from the previous result
+    :return: parameters, uncertainties, reduced chi-square, iterations
+        (NaN and 0 for failed fits)
+    :rtype: List[numpy.ndarray]
+    """
+    # Apply the configuration to module-level theories of the worker
+    fitmanager.configure(**config)
+
+    parameters = numpy.full((len(y), len(estimation)), numpy.nan)
+    uncertainties = numpy.full((len(y), len(estimation)), numpy.nan)
+    chisq = numpy.full((len(y),), numpy.nan)
+    niter = numpy.zeros((len(y),), dtype=numpy.int32)
+
+    previous = None
+    for index in range(len(y)):
+        fitmanager.setdata(x, y[index],
+                           sigmay=None if sigmay is None else sigmay[index])
+        initial = previous if previous is not None else estimation
+        for param, value in zip(fitmanager.fit_results, initial):
+            param['estimation'] = value
+
+        try:
+            params, sigmas, infodict = fitmanager.runfit()
+        except LinAlgError:
+            _logger.debug("Fit of spectrum %d failed", index)
+            previous = None
+            continue
+
+        parameters[index] = params
+        uncertainties[index] = sigmas
+        chisq[index] = infodict['reduced_chisq']
+        niter[index] = infodict['niter']
+        if warm_start:
+            previous = params
+
+    return parameters, uncertainties, chisq, niter
+
+
+def fit_many(theory, x, y, sigmay=None, bgtheory='No Background',
+             config=None, reference=None, warm_start=True,
+             chunk_size=256, jobs=1, threads=False):
+    """Fit the same model to many spectra.
+
+    The estimation is performed once, on a reference spectrum (the mean
+    of all spectra by default), with the estimation function of the theory.
+    It defines the parameters and constraints shared by all fits.
+    The spectra are then fitted by chunks of ``chunk_size`` consecutive
+    spectra, possibly in parallel.
+    Within a chunk, each fit starts from the result of the previous
+    spectrum (its neighbour in the map) if ``warm_start`` is True,
+    else from the estimation.
+    The result depends on ``chunk_size`` but not on ``jobs``.
+
+    Example:
+
+    >>> from silx.math.fit import fit_many
+    >>> x = numpy.arange(100.)
+    >>> heights = numpy.random.random((64, 64)) + 1.
+    >>> y = heights[..., numpy.newaxis] * numpy.exp(-(x - 50.)**2 / 50.)
+    >>> parameters, uncertainties, infodict = fit_many('Gaussians', x, y)
+    >>> parameters.shape
+    (64, 64, 3)
+
+    :param theory: Name of a theory of :mod:`silx.math.fit.fittheories`
+        or a :class:`FitTheory`
+    :param x: Abscissa common to all spectra.
+        If ``None``, ``numpy.arange(y.shape[-1])`` is used.
+    :param y: Array of spectra, the last dimension being the spectrum
+        (e.g., ``(rows, columns, channels)`` for a map)
+    :param sigmay: Uncertainties, either of the same shape as ``y``
+        or of the shape of one spectrum. See :class:`FitManager`.
+    :param bgtheory: Name of a theory of :mod:`silx.math.fit.bgtheories`
+        or a background :class:`FitTheory`
+    :param dict config: Configuration passed to :meth:`FitManager.configure`
+        (e.g., ``{'WeightFlag': True}``).
+    :param reference: Spectrum used for the estimation.
+        Default: mean of all spectra.
+    :param bool warm_start: True to start each fit from the result of
+        the previous spectrum of the chunk
+    :param int chunk_size: Number of spectra fitted in a row by a worker
+    :param int jobs: Number of workers fitting chunks in parallel
+    :param bool threads: If True, use a pool of threads instead of
+        processes. Processes require the theory functions to be picklable
+        (e.g., module-level functions), threads require them to be
+        thread-safe and are useful only if they release the GIL.
+    :return: Tuple ``(parameters, uncertainties, infodict)``:
+        parameters and uncertainties arrays of shape
+        ``y.shape[:-1] + (number of parameters,)``, NaN for failed fits.
+        *infodict* is a dictionary with the following keys:
+
+        - ``'parameter_names'``: List of the names of the parameters
+        - ``'estimation'``: Estimated parameters of the reference spectrum
+        - ``'reduced_chisq'``: Reduced chi-square array
+          of shape ``y.shape[:-1]``
+        - ``'niter'``: Number of iterations array of shape ``y.shape[:-1]``
+
+    :raise: LinAlgError if the estimation fails
+    """
+    y = numpy.asarray(y)
+    if y.ndim == 0 or y.size == 0:
+        raise ValueError("y must be a non-empty array of spectra")
+    map_shape = y.shape[:-1]
+    y = y.reshape(-1, y.shape[-1])
+    if sigmay is not None:
+        sigmay = numpy.broadcast_to(sigmay, map_shape + y.shape[-1:])
+        sigmay = sigmay.reshape(y.shape)
+    if config is None:
+        config = {}
+    if reference is None:
+        reference = numpy.mean(y, axis=0)
+
+    fitmanager = FitManager(weight_flag=config.get('WeightFlag', False))
+    if isinstance(theory, FitTheory):
+        fitmanager.addtheory('Custom', theory)
+        theory = 'Custom'
+    else:
+        from . import fittheories
+        fitmanager.loadtheories(fittheories)
+    if isinstance(bgtheory, FitTheory):
+        fitmanager.addbgtheory('Custom', bgtheory)
+        bgtheory = 'Custom'
+    fitmanager.settheory(theory)
+    fitmanager.setbackground(bgtheory)
+    fitmanager.configure(**config)
+
+    fitmanager.setdata(x, reference)
+    estimation = numpy.array(fitmanager.estimate(), dtype=numpy.float64)
+
+    chunks = [(index, min(index + chunk_size, len(y)))
+              for index in range(0, len(y), chunk_size)]
+    args = [(x, y[begin:end], None if sigmay is None else sigmay[begin:end])
+            for begin, end in chunks]
+
+    if jobs <= 1:
+        results = [_fit_spectra(fitmanager, config, estimation,
+                                x_, y_, sigmay_, warm_start)
+                   for x_, y_, sigmay_ in args]
+    else:
+        if threads:
+            executor_class = concurrent_futures.ThreadPoolExecutor
+        else:
+            executor_class = concurrent_futures.ProcessPoolExecutor
+        with executor_class(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    _fit_spectra,
+                    # Threads do not share the state of the fit manager
+                    copy.deepcopy(fitmanager) if threads else fitmanager,
+                    config, estimation, x_, y_, sigmay_, warm_start)
+                for x_, y_, sigmay_ in args]
+            results = [future.result() for future in futures]
+
+    parameters, uncertainties, chisq, niter = [
+        numpy.concatenate(arrays) for arrays in zip(*results)]
+    n_params = len(fitmanager.fit_results)
+    infodict = {
+        'parameter_names': [param['name'] for param in fitmanager.fit_results],
+        'estimation': estimation,
+        'reduced_chisq': chisq.reshape(map_shape),
+        'niter': niter.reshape(map_shape),
+    }
+    return (parameters.reshape(map_shape + (n_params,)),
+            uncertainties.reshape(map_shape + (n_params,)),
+            infodict)
+
+
 def test():
     from .functions import sum_gauss
     from . import fittheories
@@ -198,6 +198,21 @@ class FitTheories(object):
                                        gaussian_term=g_term, st_term=st_term,
                                        lt_term=lt_term, step_term=step_term)
 
+    def ahypermet_derivative(self, x, pars, index):
+        """
+        Wrapping of :func:`silx.math.fit.functions.sum_ahypermet_derivative`,
+        with the terms activated according to
+        `self.config['HypermetTails']` as in :meth:`ahypermet`.
+        """
+        g_term = self.config['HypermetTails'] & 1
+        st_term = (self.config['HypermetTails'] >> 1) & 1
+        lt_term = (self.config['HypermetTails'] >> 2) & 1
+        step_term = (self.config['HypermetTails'] >> 3) & 1
+        return functions.sum_ahypermet_derivative(
+            x, pars, index,
+            gaussian_term=g_term, st_term=st_term,
+            lt_term=lt_term, step_term=step_term)
+
     def poly(self, x, *pars):
         """Order n polynomial.
         The order of the polynomial is defined by the number of
@@ -1216,75 +1231,99 @@ THEORY = OrderedDict((
                   function=functions.sum_gauss,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_height_position_fwhm,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_gauss_derivative,
+                  derivative_own_parameters=True)),
     ('Lorentz',
         FitTheory(description='Lorentzian functions',
                   function=functions.sum_lorentz,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_height_position_fwhm,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_lorentz_derivative,
+                  derivative_own_parameters=True)),
     ('Area Gaussians',
         FitTheory(description='Gaussian functions (area)',
                   function=functions.sum_agauss,
                   parameters=('Area', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_agauss,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_agauss_derivative,
+                  derivative_own_parameters=True)),
     ('Area Lorentz',
         FitTheory(description='Lorentzian functions (area)',
                   function=functions.sum_alorentz,
                   parameters=('Area', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_alorentz,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_alorentz_derivative,
+                  derivative_own_parameters=True)),
     ('Pseudo-Voigt Line',
         FitTheory(description='Pseudo-Voigt functions',
                   function=functions.sum_pvoigt,
                   parameters=('Height', 'Position', 'FWHM', 'Eta'),
                   estimate=fitfuns.estimate_pvoigt,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_pvoigt_derivative,
+                  derivative_own_parameters=True)),
     ('Area Pseudo-Voigt',
         FitTheory(description='Pseudo-Voigt functions (area)',
                   function=functions.sum_apvoigt,
                   parameters=('Area', 'Position', 'FWHM', 'Eta'),
                   estimate=fitfuns.estimate_apvoigt,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_apvoigt_derivative,
+                  derivative_own_parameters=True)),
     ('Split Gaussian',
         FitTheory(description='Asymmetric gaussian functions',
                   function=functions.sum_splitgauss,
                   parameters=('Height', 'Position', 'LowFWHM',
                               'HighFWHM'),
                   estimate=fitfuns.estimate_splitgauss,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_splitgauss_derivative,
+                  derivative_own_parameters=True)),
     ('Split Lorentz',
         FitTheory(description='Asymmetric lorentzian functions',
                   function=functions.sum_splitlorentz,
                   parameters=('Height', 'Position', 'LowFWHM', 'HighFWHM'),
                   estimate=fitfuns.estimate_splitgauss,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_splitlorentz_derivative,
+                  derivative_own_parameters=True)),
     ('Split Pseudo-Voigt',
         FitTheory(description='Asymmetric pseudo-Voigt functions',
                   function=functions.sum_splitpvoigt,
                   parameters=('Height', 'Position', 'LowFWHM',
                               'HighFWHM', 'Eta'),
                   estimate=fitfuns.estimate_splitpvoigt,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_splitpvoigt_derivative,
+                  derivative_own_parameters=True)),
     ('Step Down',
         FitTheory(description='Step down function',
                   function=functions.sum_stepdown,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_stepdown,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_stepdown_derivative,
+                  derivative_own_parameters=True)),
     ('Step Up',
         FitTheory(description='Step up function',
                   function=functions.sum_stepup,
                   parameters=('Height', 'Position', 'FWHM'),
                   estimate=fitfuns.estimate_stepup,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_stepup_derivative,
+                  derivative_own_parameters=True)),
     ('Slit',
         FitTheory(description='Slit function',
                   function=functions.sum_slit,
                   parameters=('Height', 'Position', 'FWHM', 'BeamFWHM'),
                   estimate=fitfuns.estimate_slit,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=functions.sum_slit_derivative,
+                  derivative_own_parameters=True)),
     ('Atan',
         FitTheory(description='Arctan step up function',
                   function=functions.atan_stepup,
@@ -1297,7 +1336,9 @@ THEORY = OrderedDict((
                   parameters=('G_Area', 'Position', 'FWHM', 'ST_Area',
                               'ST_Slope', 'LT_Area', 'LT_Slope', 'Step_H'),
                   estimate=fitfuns.estimate_ahypermet,
-                  configure=fitfuns.configure)),
+                  configure=fitfuns.configure,
+                  derivative=fitfuns.ahypermet_derivative,
+                  derivative_own_parameters=True)),
     # ('Periodic Gaussians',
     #     FitTheory(description='Periodic gaussian functions',
     #               function=functions.periodic_gauss,
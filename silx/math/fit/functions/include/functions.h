@@ -26,6 +26,7 @@
 
 /* Helper functions */
 int test_params(int len_params, int len_params_one_function, char* fun_name, char* param_names);
+int test_index(int len_params, int index, char* fun_name);
 double myerfc(double x);
 double myerf(double x);
 int erfc_array(double* x, int len_x, double* y);
@@ -65,4 +66,22 @@ int sum_slit(double* x, int len_x, double* pslit, int len_pslit, double* y);
 int sum_ahypermet(double* x, int len_x, double* phypermet, int len_phypermet, double* y, int tail_flags);
 int sum_fastahypermet(double* x, int len_x, double* phypermet, int len_phypermet, double* y, int tail_flags);
 
+int sum_gauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss, int index, double* y);
+int sum_agauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss, int index, double* y);
+int sum_splitgauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss, int index, double* y);
+
+int sum_apvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt, int index, double* y);
+int sum_pvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt, int index, double* y);
+int sum_splitpvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt, int index, double* y);
+
+int sum_lorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz, int index, double* y);
+int sum_alorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz, int index, double* y);
+int sum_splitlorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz, int index, double* y);
+
+int sum_stepdown_derivative(double* x, int len_x, double* pdstep, int len_pdstep, int index, double* y);
+int sum_stepup_derivative(double* x, int len_x, double* pustep, int len_pustep, int index, double* y);
+int sum_slit_derivative(double* x, int len_x, double* pslit, int len_pslit, int index, double* y);
+
+int sum_ahypermet_derivative(double* x, int len_x, double* phypermet, int len_phypermet, int index, double* y, int tail_flags);
+
 #endif /* #define FITFUNCTIONS_H */
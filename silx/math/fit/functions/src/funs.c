@@ -72,6 +72,22 @@ int test_params(int len_params,
     return(0);
 }
 
+/*  test_index
+    Check that *index* designates one of the *len_params* parameters of
+    a function, for the derivative functions.
+*/
+int test_index(int len_params,
+               int index,
+               char* fun_name)
+{
+    if ((index < 0) || (index >= len_params)) {
+        printf("[%s]Error: Parameter index %d out of range [0, %d[\n",
+               fun_name, index, len_params);
+        return(1);
+    }
+    return(0);
+}
+
 /* Complementary error function for a single value*/
 double myerfc(double x)
 {
@@ -1234,6 +1250,901 @@ int sum_fastahypermet(double* x, int len_x, double* phypermet, int len_phypermet
     return(0);
 }
 
+/*  sum_gauss_derivative
+    Derivative of sum_gauss with respect to one of its parameters.
+
+    Only the gaussian the parameter belongs to contributes to the
+    derivative, so the cost does not depend on the number of gaussians.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pgauss: Array of gaussian parameters, as for sum_gauss:
+          (height1, centroid1, fwhm1, height2, centroid2, fwhm2,...)
+        - len_pgauss: Number of elements in the pgauss array. Must be
+          a multiple of 3.
+        - index: Index in pgauss of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_gauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss,
+                         int index, double* y)
+{
+    int i, j;
+    double dhelp, g, sigma;
+    double height, centroid, fwhm;
+
+    if (test_params(len_pgauss, 3, "sum_gauss_derivative", "height, centroid, fwhm") ||
+        test_index(len_pgauss, index, "sum_gauss_derivative")) {
+        return(1);
+    }
+
+    i = index / 3;
+    height = pgauss[3*i];
+    centroid = pgauss[3*i+1];
+    fwhm = pgauss[3*i+2];
+
+    sigma = fwhm / (2.0 * sqrt(2.0 * LOG2));
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid) / sigma;
+        if (dhelp <= 20) {
+            g = exp(-0.5 * dhelp * dhelp);
+            switch (index % 3) {
+                case 0:
+                    y[j] = g;
+                    break;
+                case 1:
+                    y[j] = height * g * dhelp / sigma;
+                    break;
+                case 2:
+                    y[j] = height * g * dhelp * dhelp / fwhm;
+                    break;
+            }
+        }
+    }
+    return(0);
+}
+
+/*  sum_agauss_derivative
+    Derivative of sum_agauss with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pgauss: Array of gaussian parameters, as for sum_agauss:
+          (area1, centroid1, fwhm1, area2, centroid2, fwhm2,...)
+        - len_pgauss: Number of elements in the pgauss array. Must be
+          a multiple of 3.
+        - index: Index in pgauss of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_agauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss,
+                          int index, double* y)
+{
+    int i, j;
+    double dhelp, g, sigma, height;
+    double area, centroid, fwhm;
+
+    if (test_params(len_pgauss, 3, "sum_agauss_derivative", "area, centroid, fwhm") ||
+        test_index(len_pgauss, index, "sum_agauss_derivative")) {
+        return(1);
+    }
+
+    i = index / 3;
+    area = pgauss[3*i];
+    centroid = pgauss[3*i+1];
+    fwhm = pgauss[3*i+2];
+
+    sigma = fwhm / (2.0 * sqrt(2.0 * LOG2));
+    height = area / (sigma * sqrt(2.0 * M_PI));
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid) / sigma;
+        if (dhelp <= 35) {
+            g = exp(-0.5 * dhelp * dhelp);
+            switch (index % 3) {
+                case 0:
+                    y[j] = g / (sigma * sqrt(2.0 * M_PI));
+                    break;
+                case 1:
+                    y[j] = height * g * dhelp / sigma;
+                    break;
+                case 2:
+                    y[j] = height * g * (dhelp * dhelp - 1.0) / fwhm;
+                    break;
+            }
+        }
+    }
+    return(0);
+}
+
+/*  sum_splitgauss_derivative
+    Derivative of sum_splitgauss with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pgauss: Array of gaussian parameters, as for sum_splitgauss:
+          (height1, centroid1, fwhm11, fwhm21, height2, centroid2, fwhm12, fwhm22,...)
+        - len_pgauss: Number of elements in the pgauss array. Must be
+          a multiple of 4.
+        - index: Index in pgauss of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_splitgauss_derivative(double* x, int len_x, double* pgauss, int len_pgauss,
+                              int index, double* y)
+{
+    int i, j, side;
+    double dhelp, g, inv_two_sqrt_two_log2, sigma;
+    double height, centroid, fwhm1, fwhm2;
+
+    if (test_params(len_pgauss, 4, "sum_splitgauss_derivative", "height, centroid, fwhm1, fwhm2") ||
+        test_index(len_pgauss, index, "sum_splitgauss_derivative")) {
+        return(1);
+    }
+
+    i = index / 4;
+    height = pgauss[4*i];
+    centroid = pgauss[4*i+1];
+    fwhm1 = pgauss[4*i+2];
+    fwhm2 = pgauss[4*i+3];
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid);
+        /* side is the index of the fwhm parameter in use at x[j] */
+        side = (dhelp > 0) ? 3 : 2;
+        sigma = ((side == 3) ? fwhm2 : fwhm1) * inv_two_sqrt_two_log2;
+        dhelp = dhelp / sigma;
+        if (dhelp <= 20) {
+            g = exp(-0.5 * dhelp * dhelp);
+            switch (index % 4) {
+                case 0:
+                    y[j] = g;
+                    break;
+                case 1:
+                    y[j] = height * g * dhelp / sigma;
+                    break;
+                default:
+                    if (index % 4 == side) {
+                        y[j] = height * g * dhelp * dhelp * inv_two_sqrt_two_log2 / sigma;
+                    }
+                    break;
+            }
+        }
+    }
+    return(0);
+}
+
+/*  sum_apvoigt_derivative
+    Derivative of sum_apvoigt with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pvoigt: Array of pseudo-Voigt parameters, as for sum_apvoigt:
+          (area1, centroid1, fwhm1, eta1, area2, centroid2, fwhm2, eta2,...)
+        - len_pvoigt: Number of elements in the pvoigt array. Must be
+          a multiple of 4.
+        - index: Index in pvoigt of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_apvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt,
+                           int index, double* y)
+{
+    int i, j;
+    double lhelp, lden, ghelp, g, sigma, lheight, gheight;
+    double area, centroid, fwhm, eta;
+
+    if (test_params(len_pvoigt, 4, "sum_apvoigt_derivative", "area, centroid, fwhm, eta") ||
+        test_index(len_pvoigt, index, "sum_apvoigt_derivative")) {
+        return(1);
+    }
+
+    i = index / 4;
+    area = pvoigt[4*i];
+    centroid = pvoigt[4*i+1];
+    fwhm = pvoigt[4*i+2];
+    eta = pvoigt[4*i+3];
+
+    sigma = fwhm / (2.0 * sqrt(2.0 * LOG2));
+    lheight = area / (0.5 * M_PI * fwhm);
+    gheight = area / (sigma * sqrt(2.0 * M_PI));
+
+    for (j=0; j<len_x;  j++) {
+        /*  Lorentzian term */
+        lhelp = (x[j] - centroid) / (0.5 * fwhm);
+        lden = 1.0 + (lhelp * lhelp);
+        /* Gaussian term */
+        ghelp = (x[j] - centroid) / sigma;
+        g = (ghelp <= 35) ? exp(-0.5 * ghelp * ghelp) : 0.;
+
+        switch (index % 4) {
+            case 0:
+                y[j] = eta / (0.5 * M_PI * fwhm * lden) +
+                       (1.0 - eta) * g / (sigma * sqrt(2.0 * M_PI));
+                break;
+            case 1:
+                y[j] = eta * 4.0 * lheight * lhelp / (fwhm * lden * lden) +
+                       (1.0 - eta) * gheight * g * ghelp / sigma;
+                break;
+            case 2:
+                y[j] = eta * lheight * (2.0 * lhelp * lhelp / lden - 1.0) / (fwhm * lden) +
+                       (1.0 - eta) * gheight * g * (ghelp * ghelp - 1.0) / fwhm;
+                break;
+            case 3:
+                y[j] = lheight / lden - gheight * g;
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_pvoigt_derivative
+    Derivative of sum_pvoigt with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pvoigt: Array of pseudo-Voigt parameters, as for sum_pvoigt:
+          (height1, centroid1, fwhm1, eta1, height2, centroid2, fwhm2, eta2,...)
+        - len_pvoigt: Number of elements in the pvoigt array. Must be
+          a multiple of 4.
+        - index: Index in pvoigt of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_pvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt,
+                          int index, double* y)
+{
+    int i, j;
+    double lhelp, lden, ghelp, g, sigma;
+    double height, centroid, fwhm, eta;
+
+    if (test_params(len_pvoigt, 4, "sum_pvoigt_derivative", "height, centroid, fwhm, eta") ||
+        test_index(len_pvoigt, index, "sum_pvoigt_derivative")) {
+        return(1);
+    }
+
+    i = index / 4;
+    height = pvoigt[4*i];
+    centroid = pvoigt[4*i+1];
+    fwhm = pvoigt[4*i+2];
+    eta = pvoigt[4*i+3];
+
+    sigma = fwhm / (2.0 * sqrt(2.0 * LOG2));
+
+    for (j=0; j<len_x;  j++) {
+        /*  Lorentzian term */
+        lhelp = (x[j] - centroid) / (0.5 * fwhm);
+        lden = 1.0 + (lhelp * lhelp);
+        /* Gaussian term */
+        ghelp = (x[j] - centroid) / sigma;
+        g = (ghelp <= 35) ? exp(-0.5 * ghelp * ghelp) : 0.;
+
+        switch (index % 4) {
+            case 0:
+                y[j] = eta / lden + (1.0 - eta) * g;
+                break;
+            case 1:
+                y[j] = height * (eta * 4.0 * lhelp / (fwhm * lden * lden) +
+                                 (1.0 - eta) * g * ghelp / sigma);
+                break;
+            case 2:
+                y[j] = height * (eta * 2.0 * lhelp * lhelp / (fwhm * lden * lden) +
+                                 (1.0 - eta) * g * ghelp * ghelp / fwhm);
+                break;
+            case 3:
+                y[j] = height * (1.0 / lden - g);
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_splitpvoigt_derivative
+    Derivative of sum_splitpvoigt with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pvoigt: Array of pseudo-Voigt parameters, as for sum_splitpvoigt:
+          (height1, centroid1, fwhm11, fwhm21, eta1, ...)
+        - len_pvoigt: Number of elements in the pvoigt array. Must be
+          a multiple of 5.
+        - index: Index in pvoigt of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_splitpvoigt_derivative(double* x, int len_x, double* pvoigt, int len_pvoigt,
+                               int index, double* y)
+{
+    int i, j, side;
+    double x_minus_centroid, lhelp, lden, ghelp, g, fwhm, sigma, inv_two_sqrt_two_log2;
+    double height, centroid, fwhm1, fwhm2, eta;
+
+    if (test_params(len_pvoigt, 5, "sum_splitpvoigt_derivative", "height, centroid, fwhm1, fwhm2, eta") ||
+        test_index(len_pvoigt, index, "sum_splitpvoigt_derivative")) {
+        return(1);
+    }
+
+    i = index / 5;
+    height = pvoigt[5*i];
+    centroid = pvoigt[5*i+1];
+    fwhm1 = pvoigt[5*i+2];
+    fwhm2 = pvoigt[5*i+3];
+    eta = pvoigt[5*i+4];
+
+    inv_two_sqrt_two_log2 = 1.0 / (2.0 * sqrt(2.0 * LOG2));
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        x_minus_centroid = (x[j] - centroid);
+        /* side is the index of the fwhm parameter in use at x[j] */
+        side = (x_minus_centroid > 0) ? 3 : 2;
+        fwhm = (side == 3) ? fwhm2 : fwhm1;
+        sigma = fwhm * inv_two_sqrt_two_log2;
+        /*  Lorentzian term */
+        lhelp = x_minus_centroid / (0.5 * fwhm);
+        lden = 1.0 + (lhelp * lhelp);
+        /* Gaussian term */
+        ghelp = x_minus_centroid / sigma;
+        g = (ghelp <= 35) ? exp(-0.5 * ghelp * ghelp) : 0.;
+
+        switch (index % 5) {
+            case 0:
+                y[j] = eta / lden + (1.0 - eta) * g;
+                break;
+            case 1:
+                y[j] = height * (eta * 4.0 * lhelp / (fwhm * lden * lden) +
+                                 (1.0 - eta) * g * ghelp / sigma);
+                break;
+            case 4:
+                y[j] = height * (1.0 / lden - g);
+                break;
+            default:
+                if (index % 5 == side) {
+                    y[j] = height * (eta * 2.0 * lhelp * lhelp / (fwhm * lden * lden) +
+                                     (1.0 - eta) * g * ghelp * ghelp / fwhm);
+                }
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_lorentz_derivative
+    Derivative of sum_lorentz with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - plorentz: Array of lorentz parameters, as for sum_lorentz:
+          (height1, centroid1, fwhm1, ...)
+        - len_plorentz: Number of elements in the plorentz array. Must be
+          a multiple of 3.
+        - index: Index in plorentz of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_lorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz,
+                           int index, double* y)
+{
+    int i, j;
+    double dhelp, den;
+    double height, centroid, fwhm;
+
+    if (test_params(len_plorentz, 3, "sum_lorentz_derivative", "height, centroid, fwhm") ||
+        test_index(len_plorentz, index, "sum_lorentz_derivative")) {
+        return(1);
+    }
+
+    i = index / 3;
+    height = plorentz[3*i];
+    centroid = plorentz[3*i+1];
+    fwhm = plorentz[3*i+2];
+
+    for (j=0; j<len_x;  j++) {
+        dhelp = (x[j] - centroid) / (0.5 * fwhm);
+        den = 1.0 + (dhelp * dhelp);
+        switch (index % 3) {
+            case 0:
+                y[j] = 1.0 / den;
+                break;
+            case 1:
+                y[j] = height * 4.0 * dhelp / (fwhm * den * den);
+                break;
+            case 2:
+                y[j] = height * 2.0 * dhelp * dhelp / (fwhm * den * den);
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_alorentz_derivative
+    Derivative of sum_alorentz with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - plorentz: Array of lorentz parameters, as for sum_alorentz:
+          (area1, centroid1, fwhm1, ...)
+        - len_plorentz: Number of elements in the plorentz array. Must be
+          a multiple of 3.
+        - index: Index in plorentz of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_alorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz,
+                            int index, double* y)
+{
+    int i, j;
+    double dhelp, den, height;
+    double area, centroid, fwhm;
+
+    if (test_params(len_plorentz, 3, "sum_alorentz_derivative", "area, centroid, fwhm") ||
+        test_index(len_plorentz, index, "sum_alorentz_derivative")) {
+        return(1);
+    }
+
+    i = index / 3;
+    area = plorentz[3*i];
+    centroid = plorentz[3*i+1];
+    fwhm = plorentz[3*i+2];
+
+    height = area / (0.5 * M_PI * fwhm);
+
+    for (j=0; j<len_x;  j++) {
+        dhelp = (x[j] - centroid) / (0.5 * fwhm);
+        den = 1.0 + (dhelp * dhelp);
+        switch (index % 3) {
+            case 0:
+                y[j] = 1.0 / (0.5 * M_PI * fwhm * den);
+                break;
+            case 1:
+                y[j] = height * 4.0 * dhelp / (fwhm * den * den);
+                break;
+            case 2:
+                y[j] = height * (2.0 * dhelp * dhelp / den - 1.0) / (fwhm * den);
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_splitlorentz_derivative
+    Derivative of sum_splitlorentz with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - plorentz: Array of lorentz parameters, as for sum_splitlorentz:
+          (height1, centroid1, fwhm11, fwhm21 ...)
+        - len_plorentz: Number of elements in the plorentz array. Must be
+          a multiple of 4.
+        - index: Index in plorentz of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_splitlorentz_derivative(double* x, int len_x, double* plorentz, int len_plorentz,
+                                int index, double* y)
+{
+    int i, j, side;
+    double dhelp, den, fwhm;
+    double height, centroid, fwhm1, fwhm2;
+
+    if (test_params(len_plorentz, 4, "sum_splitlorentz_derivative", "height, centroid, fwhm1, fwhm2") ||
+        test_index(len_plorentz, index, "sum_splitlorentz_derivative")) {
+        return(1);
+    }
+
+    i = index / 4;
+    height = plorentz[4*i];
+    centroid = plorentz[4*i+1];
+    fwhm1 = plorentz[4*i+2];
+    fwhm2 = plorentz[4*i+3];
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        dhelp = (x[j] - centroid);
+        /* side is the index of the fwhm parameter in use at x[j] */
+        side = (dhelp > 0) ? 3 : 2;
+        fwhm = (side == 3) ? fwhm2 : fwhm1;
+        dhelp = dhelp / (0.5 * fwhm);
+        den = 1.0 + (dhelp * dhelp);
+        switch (index % 4) {
+            case 0:
+                y[j] = 1.0 / den;
+                break;
+            case 1:
+                y[j] = height * 4.0 * dhelp / (fwhm * den * den);
+                break;
+            default:
+                if (index % 4 == side) {
+                    y[j] = height * 2.0 * dhelp * dhelp / (fwhm * den * den);
+                }
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_stepdown_derivative
+    Derivative of sum_stepdown with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pdstep: Array of stepdown parameters, as for sum_stepdown:
+          (height1, centroid1, fwhm1, ...)
+        - len_pdstep: Number of elements in the pdstep array. Must be
+          a multiple of 3.
+        - index: Index in pdstep of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_stepdown_derivative(double* x, int len_x, double* pdstep, int len_pdstep,
+                            int index, double* y)
+{
+    int i, j;
+    double dhelp, width, sqrtPI;
+    double height, centroid, fwhm;
+
+    if (test_params(len_pdstep, 3, "sum_stepdown_derivative", "height, centroid, fwhm") ||
+        test_index(len_pdstep, index, "sum_stepdown_derivative")) {
+        return(1);
+    }
+
+    i = index / 3;
+    height = pdstep[3*i];
+    centroid = pdstep[3*i+1];
+    fwhm = pdstep[3*i+2];
+
+    width = fwhm * sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+    sqrtPI = sqrt(M_PI);
+
+    for (j=0; j<len_x;  j++) {
+        dhelp = (x[j] - centroid) / width;
+        switch (index % 3) {
+            case 0:
+                y[j] = 0.5 * erfc(dhelp);
+                break;
+            case 1:
+                y[j] = height * exp(-dhelp * dhelp) / (sqrtPI * width);
+                break;
+            case 2:
+                y[j] = height * dhelp * exp(-dhelp * dhelp) / (sqrtPI * fwhm);
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_stepup_derivative
+    Derivative of sum_stepup with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pustep: Array of stepup parameters, as for sum_stepup:
+          (height1, centroid1, fwhm1, ...)
+        - len_pustep: Number of elements in the pustep array. Must be
+          a multiple of 3.
+        - index: Index in pustep of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_stepup_derivative(double* x, int len_x, double* pustep, int len_pustep,
+                          int index, double* y)
+{
+    int i, j;
+    double dhelp, width, sqrtPI;
+    double height, centroid, fwhm;
+
+    if (test_params(len_pustep, 3, "sum_stepup_derivative", "height, centroid, fwhm") ||
+        test_index(len_pustep, index, "sum_stepup_derivative")) {
+        return(1);
+    }
+
+    i = index / 3;
+    height = pustep[3*i];
+    centroid = pustep[3*i+1];
+    fwhm = pustep[3*i+2];
+
+    width = fwhm * sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+    sqrtPI = sqrt(M_PI);
+
+    for (j=0; j<len_x;  j++) {
+        dhelp = (x[j] - centroid) / width;
+        switch (index % 3) {
+            case 0:
+                y[j] = 0.5 * (1.0 + erf(dhelp));
+                break;
+            case 1:
+                y[j] = -height * exp(-dhelp * dhelp) / (sqrtPI * width);
+                break;
+            case 2:
+                y[j] = -height * dhelp * exp(-dhelp * dhelp) / (sqrtPI * fwhm);
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  sum_slit_derivative
+    Derivative of sum_slit with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - pslit: Array of slit parameters, as for sum_slit:
+          (height1, centroid1, fwhm1, beamfwhm1 ...)
+        - len_pslit: Number of elements in the pslit array. Must be
+          a multiple of 4.
+        - index: Index in pslit of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+*/
+int sum_slit_derivative(double* x, int len_x, double* pslit, int len_pslit,
+                        int index, double* y)
+{
+    int i, j;
+    double dhelp1, dhelp2, width, two_over_sqrtPI;
+    double rise, fall, drise, dfall;
+    double height, position, fwhm, beamfwhm;
+
+    if (test_params(len_pslit, 4, "sum_slit_derivative", "height, centroid, fwhm, beamfwhm") ||
+        test_index(len_pslit, index, "sum_slit_derivative")) {
+        return(1);
+    }
+
+    i = index / 4;
+    height = pslit[4*i];
+    position = pslit[4*i+1];
+    fwhm = pslit[4*i+2];
+    beamfwhm = pslit[4*i+3];
+
+    width = beamfwhm * sqrt(2.0) / (2.0 * sqrt(2.0 * LOG2));
+    two_over_sqrtPI = 2.0 / sqrt(M_PI);
+
+    for (j=0; j<len_x;  j++) {
+        dhelp1 = (x[j] - (position - 0.5 * fwhm)) / width;
+        dhelp2 = (x[j] - (position + 0.5 * fwhm)) / width;
+        /* the slit is 0.25 * height * rise * fall */
+        rise = 1.0 + erf(dhelp1);
+        fall = erfc(dhelp2);
+        /* derivatives of rise and fall with respect to dhelp1 and dhelp2 */
+        drise = two_over_sqrtPI * exp(-dhelp1 * dhelp1);
+        dfall = -two_over_sqrtPI * exp(-dhelp2 * dhelp2);
+        switch (index % 4) {
+            case 0:
+                y[j] = 0.25 * rise * fall;
+                break;
+            case 1:
+                y[j] = -0.25 * height * (drise * fall + rise * dfall) / width;
+                break;
+            case 2:
+                y[j] = 0.125 * height * (drise * fall - rise * dfall) / width;
+                break;
+            case 3:
+                y[j] = -0.25 * height * (drise * fall * dhelp1 + rise * dfall * dhelp2) / beamfwhm;
+                break;
+        }
+    }
+    return(0);
+}
+
+/*  hypermet_tail_derivative
+    Derivative of one of the tail terms of the hypermet function,
+    (area * area_r / slope_r) * 0.5 * erfc(u) * exp(v), with
+    u = x_minus_position / (sigma * sqrt(2)) + sigma / (sqrt(2) * slope_r)
+    v = 0.5 * (sigma / slope_r)**2 + x_minus_position / slope_r
+
+    *which* selects the parameter: 0 for area, 1 for position, 2 for fwhm,
+    3 for area_r and 4 for slope_r.
+*/
+static double hypermet_tail_derivative(double x_minus_position, double area,
+                                       double sigma, double fwhm,
+                                       double area_r, double slope_r,
+                                       int which)
+{
+    double sigma_sqrt2, u, v, e, k, tail;
+
+    sigma_sqrt2 = sigma * 1.4142135623730950488;
+    u = (x_minus_position / sigma_sqrt2) + 0.5 * sigma_sqrt2 / slope_r;
+    v = 0.5 * (sigma / slope_r) * (sigma / slope_r) + (x_minus_position / slope_r);
+    e = 0.5 * erfc(u) * exp(v);
+    /* derivative of 0.5 * erfc(u) * exp(v) with respect to u,
+       using v - u**2 = -0.5 * (x_minus_position / sigma)**2 */
+    k = -exp(-0.5 * (x_minus_position / sigma) * (x_minus_position / sigma)) / sqrt(M_PI);
+    tail = area * area_r / slope_r;
+
+    switch (which) {
+        case 0:
+            return area_r * e / slope_r;
+        case 1:
+            return tail * (-k / sigma_sqrt2 - e / slope_r);
+        case 2:
+            return tail * (k * (1.0 / slope_r - x_minus_position / (sigma * sigma)) / 1.4142135623730950488 +
+                           e * sigma / (slope_r * slope_r)) * sigma / fwhm;
+        case 3:
+            return area * e / slope_r;
+        case 4:
+            return -tail * e / slope_r +
+                   tail * (-k * sigma / (1.4142135623730950488 * slope_r * slope_r) -
+                           e * (sigma * sigma / (slope_r * slope_r * slope_r) +
+                                x_minus_position / (slope_r * slope_r)));
+    }
+    return 0.;
+}
+
+/*  sum_ahypermet_derivative
+    Derivative of sum_ahypermet with respect to one of its parameters.
+
+    Parameters:
+    -----------
+
+        - x: Independant variable where the derivative is calculated.
+        - len_x: Number of elements in the x array.
+        - phypermet: Array of hypermet parameters, as for sum_ahypermet:
+          *(area1, position1, fwhm1, st_area_r1, st_slope_r1, lt_area_r1,
+          lt_slope_r1, step_height_r1, ...)*
+        - len_phypermet: Number of elements in the phypermet array. Must be
+          a multiple of 8.
+        - index: Index in phypermet of the parameter with respect to which
+          the derivative is calculated.
+        - y: Output array. Must have memory allocated for the same number
+          of elements as x (len_x).
+        - tail_flags: Binary flags to activate various terms of the
+          function, as for sum_ahypermet.
+*/
+int sum_ahypermet_derivative(double* x, int len_x, double* phypermet, int len_phypermet,
+                             int index, double* y, int tail_flags)
+{
+    int i, j, which;
+    int g_term_flag, st_term_flag, lt_term_flag, step_term_flag;
+    double c2, g, step, sigma, height, sigma_sqrt2, sqrt2PI, x_minus_position, epsilon;
+    double area, position, fwhm, st_area_r, st_slope_r, lt_area_r, lt_slope_r, step_height_r;
+
+    if (test_params(len_phypermet, 8, "sum_ahypermet_derivative",
+                    "height, centroid, fwhm, st_area_r, st_slope_r, lt_area_r, lt_slope_r, step_height_r") ||
+        test_index(len_phypermet, index, "sum_ahypermet_derivative")) {
+        return(1);
+    }
+
+    g_term_flag    = tail_flags & 1;
+    st_term_flag   = (tail_flags>>1) & 1;
+    lt_term_flag   = (tail_flags>>2) & 1;
+    step_term_flag = (tail_flags>>3) & 1;
+
+    /* define epsilon to compare floating point values with 0. */
+    epsilon = 0.00000000001;
+    sqrt2PI= sqrt(2.0 * M_PI);
+
+    i = index / 8;
+    which = index % 8;
+    area = phypermet[8*i];
+    position = phypermet[8*i+1];
+    fwhm = phypermet[8*i+2];
+    st_area_r = phypermet[8*i+3];
+    st_slope_r =  phypermet[8*i+4];
+    lt_area_r = phypermet[8*i+5];
+    lt_slope_r = phypermet[8*i+6];
+    step_height_r = phypermet[8*i+7];
+
+    sigma = fwhm / (2.0 * sqrt(2.0 * LOG2));
+    /* Prevent division by 0 */
+    if (sigma == 0) {
+        printf("fwhm must not be equal to 0");
+        return(1);
+    }
+    height = area / (sigma * sqrt2PI);
+    sigma_sqrt2 = sigma * 1.4142135623730950488;
+
+    for (j=0; j<len_x;  j++) {
+        y[j] = 0.;
+        x_minus_position = x[j] - position;
+        c2 = (0.5 * x_minus_position * x_minus_position) / (sigma * sigma);
+        g = exp(-c2);
+
+        /* gaussian term */
+        if (g_term_flag) {
+            switch (which) {
+                case 0:
+                    y[j] += g / (sigma * sqrt2PI);
+                    break;
+                case 1:
+                    y[j] += height * g * x_minus_position / (sigma * sigma);
+                    break;
+                case 2:
+                    y[j] += height * g * (2.0 * c2 - 1.0) / fwhm;
+                    break;
+            }
+        }
+
+        /* st term */
+        if (st_term_flag && (fabs(st_slope_r) > epsilon) &&
+            which <= 4) {
+            y[j] += hypermet_tail_derivative(x_minus_position, area, sigma, fwhm,
+                                             st_area_r, st_slope_r, which);
+        }
+
+        /* lt term */
+        if (lt_term_flag && (fabs(lt_slope_r) > epsilon) &&
+            (which <= 2 || which == 5 || which == 6)) {
+            y[j] += hypermet_tail_derivative(x_minus_position, area, sigma, fwhm,
+                                             lt_area_r, lt_slope_r,
+                                             (which <= 2) ? which : which - 2);
+        }
+
+        /* step term */
+        if (step_term_flag) {
+            step = 0.5 * erfc(x_minus_position / sigma_sqrt2);
+            switch (which) {
+                case 0:
+                    y[j] += step_height_r * step / (sigma * sqrt2PI);
+                    break;
+                case 1:
+                    y[j] += step_height_r * height * g / (sigma * sqrt2PI);
+                    break;
+                case 2:
+                    y[j] += step_height_r * height *
+                            (g * x_minus_position / (sigma * sqrt2PI) - step) / fwhm;
+                    break;
+                case 7:
+                    y[j] += height * step;
+                    break;
+            }
+        }
+    }
+    return(0);
+}
+
 void pileup(double* x, long len_x, double* ret, int input2, double zero, double gain)
 {
     //int    input2=0;
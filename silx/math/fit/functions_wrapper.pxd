@@ -153,6 +153,98 @@ cdef extern from "functions.h":
                           double* y,
                           int tail_flags)
 
+    int sum_gauss_derivative(double* x,
+                             int len_x,
+                             double* pgauss,
+                             int len_pgauss,
+                             int index,
+                             double* y)
+
+    int sum_agauss_derivative(double* x,
+                              int len_x,
+                              double* pgauss,
+                              int len_pgauss,
+                              int index,
+                              double* y)
+
+    int sum_splitgauss_derivative(double* x,
+                                  int len_x,
+                                  double* pgauss,
+                                  int len_pgauss,
+                                  int index,
+                                  double* y)
+
+    int sum_apvoigt_derivative(double* x,
+                               int len_x,
+                               double* pvoigt,
+                               int len_pvoigt,
+                               int index,
+                               double* y)
+
+    int sum_pvoigt_derivative(double* x,
+                              int len_x,
+                              double* pvoigt,
+                              int len_pvoigt,
+                              int index,
+                              double* y)
+
+    int sum_splitpvoigt_derivative(double* x,
+                                   int len_x,
+                                   double* pvoigt,
+                                   int len_pvoigt,
+                                   int index,
+                                   double* y)
+
+    int sum_lorentz_derivative(double* x,
+                               int len_x,
+                               double* plorentz,
+                               int len_plorentz,
+                               int index,
+                               double* y)
+
+    int sum_alorentz_derivative(double* x,
+                                int len_x,
+                                double* plorentz,
+                                int len_plorentz,
+                                int index,
+                                double* y)
+
+    int sum_splitlorentz_derivative(double* x,
+                                    int len_x,
+                                    double* plorentz,
+                                    int len_plorentz,
+                                    int index,
+                                    double* y)
+
+    int sum_stepdown_derivative(double* x,
+                                int len_x,
+                                double* pdstep,
+                                int len_pdstep,
+                                int index,
+                                double* y)
+
+    int sum_stepup_derivative(double* x,
+                              int len_x,
+                              double* pustep,
+                              int len_pustep,
+                              int index,
+                              double* y)
+
+    int sum_slit_derivative(double* x,
+                            int len_x,
+                            double* pslit,
+                            int len_pslit,
+                            int index,
+                            double* y)
+
+    int sum_ahypermet_derivative(double* x,
+                                 int len_x,
+                                 double* phypermet,
+                                 int len_phypermet,
+                                 int index,
+                                 double* y,
+                                 int tail_flags)
+
     long seek(long begin_index,
               long end_index,
               long nsamples,
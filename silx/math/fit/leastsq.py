@@ -294,41 +294,7 @@ def leastsq(model, xdata, ydata, p0, sigma=None,
         epsfcn = max(epsfcn, numpy.finfo(numpy.float).eps)
 
     # check if constraints have been passed as text
-    constrained_fit = False
-    if constraints is not None:
-        # make sure we work with a list of lists
-        input_constraints = constraints
-        tmp_constraints = [None] * len(input_constraints)
-        for i in range(nparameters):
-            tmp_constraints[i] = list(input_constraints[i])
-        constraints = tmp_constraints
-        for i in range(nparameters):
-            if hasattr(constraints[i][0], "upper"):
-                txt = constraints[i][0].upper()
-                if txt == "FREE":
-                    constraints[i][0] = CFREE
-                elif txt == "POSITIVE":
-                    constraints[i][0] = CPOSITIVE
-                elif txt == "QUOTED":
-                    constraints[i][0] = CQUOTED
-                elif txt == "FIXED":
-                    constraints[i][0] = CFIXED
-                elif txt == "FACTOR":
-                    constraints[i][0] = CFACTOR
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt == "DELTA":
-                    constraints[i][0] = CDELTA
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt == "SUM":
-                    constraints[i][0] = CSUM
-                    constraints[i][1] = int(constraints[i][1])
-                elif txt in ["IGNORED", "IGNORE"]:
-                    constraints[i][0] = CIGNORED
-                else:
-                    #I should raise an exception
-                    raise ValueError("Unknown constraint %s" % constraints[i][0])
-            if constraints[i][0] > 0:
-                constrained_fit = True
+    constraints, constrained_fit = _parse_constraints(constraints, nparameters)
     if constrained_fit:
         if full_output is None:
             _logger.info("Recommended to set full_output to True when using constraints")
@@ -739,6 +705,660 @@ def chisq_alpha_beta(model, parameters, x, y, weight, constraints=None,
         return chisq, alpha, beta
 
 
+def leastsq_stack(model, xdata, ydata, p0, sigma=None,
+                  constraints=None, model_deriv=None, epsfcn=None,
+                  deltachi=None, full_output=None,
+                  check_finite=True,
+                  left_derivative=False,
+                  max_iter=100,
+                  vectorized=True):
+    """
+    Fit the same model to a stack of same-shaped problems with the
+    Levenberg-Marquardt algorithm of :func:`leastsq`.
+
+    All the problems are processed at once: the model is evaluated on the
+    whole ``(n_problems, n_points)`` stack, the curvature matrices are built
+    with broadcasted operations and solved with a batched
+    :func:`numpy.linalg.solve`. Each problem keeps its own damping factor
+    and convergence state, so the result of each problem is the one
+    :func:`leastsq` would give (up to rounding errors).
+
+    :param model: callable
+        The model function, f(x, ...).
+        If ``vectorized`` is True, it is called once for many problems with
+        each parameter given as an array of shape ``(n, 1)`` and it must
+        return an array that broadcasts to ``(n, n_points)``
+        (e.g., ``lambda x, a, b: a * numpy.exp(-b * x)``).
+        If ``vectorized`` is False, it is called once per problem as
+        in :func:`leastsq`.
+
+    :param xdata: The independent variable where the data is measured:
+        either an M-length sequence shared by all problems or
+        a ``(n_problems, M)`` array.
+
+    :param ydata: ``(n_problems, M)`` array of dependent data
+
+    :param p0: Initial guess for the parameters, either a N-length sequence
+        shared by all problems or a ``(n_problems, N)`` array.
+
+    :param sigma: None, M-length sequence or ``(n_problems, M)`` array of
+        uncertainties in ydata. See :func:`leastsq`.
+
+    :param constraints: None or 2D sequence of dimension (n_parameters, 3)
+        shared by all problems. See :func:`leastsq`.
+
+    :param model_deriv:
+        None (default) or function providing the derivatives of the fitting
+        function respect to the fitted parameters.
+        It will be called as model_deriv(xdata, parameters, index).
+        If ``vectorized`` is True, parameters is an array of shape
+        ``(n_parameters, n, 1)`` (i.e., ``parameters[i]`` is a column
+        of values of the i-th parameter) and the result must broadcast to
+        ``(n, n_points)``.
+        Else, it is called for each problem as in :func:`leastsq`.
+
+    :param epsfcn: float. See :func:`leastsq`.
+
+    :param deltachi: float. See :func:`leastsq`.
+
+    :param full_output: bool, optional
+        non-zero to return all optional outputs.
+
+    :param check_finite: bool, optional
+        If True, check that the input arrays do not contain nans of infs,
+        and raise a ValueError if they do. Setting this parameter to
+        False will ignore input data points containing nans.
+        Default is True.
+
+    :param left_derivative: See :func:`leastsq`.
+
+    :param max_iter: Maximum number of iterations (default is 100)
+
+    :param bool vectorized: Whether model and model_deriv accept stacked
+        parameters (default: True). See ``model``.
+
+    :return: Returns a tuple of length 2 (or 3 if full_ouput is True) with
+        the content:
+
+         ``popt``: ``(n_problems, N)`` array
+           Optimal values of the parameters for each problem.
+           NaN for the problems that failed because of a singular matrix.
+         ``pcov``: ``(n_problems, N, N)`` array
+           Covariance of the parameters of each problem,
+           computed as in :func:`leastsq`.
+         ``infodict``: dict
+           a dictionary of optional outputs with the keys of the dictionary
+           returned by :func:`leastsq`, with a value per problem
+           (``nfev`` being the number of evaluations of the stack), and:
+
+            ``success``
+                Boolean array, False for the problems that failed because of
+                a singular matrix.
+    """
+    function_call_counter = 0
+    if deltachi is None:
+        deltachi = 0.001
+    if epsfcn is None:
+        epsfcn = numpy.finfo(numpy.float64).eps
+    else:
+        epsfcn = max(epsfcn, numpy.finfo(numpy.float64).eps)
+
+    ydata = numpy.array(ydata, dtype=numpy.float64, ndmin=2)
+    if ydata.ndim != 2:
+        raise ValueError("ydata must be a 2D array")
+    n_problems, n_points = ydata.shape
+    xdata = numpy.asarray(xdata)
+    if xdata.ndim == 2 and xdata.shape[0] != n_problems:
+        raise ValueError("xdata must be 1D or have one row per problem")
+    parameters = numpy.array(
+        numpy.broadcast_to(numpy.asarray(p0, dtype=numpy.float64),
+                           (n_problems, numpy.shape(p0)[-1])))
+    nparameters = parameters.shape[1]
+    if sigma is None:
+        sigma = numpy.ones(ydata.shape, dtype=numpy.float64)
+    else:
+        sigma = numpy.array(numpy.broadcast_to(sigma, ydata.shape),
+                            dtype=numpy.float64)
+
+    if check_finite:
+        xdata = numpy.asarray_chkfinite(xdata)
+        ydata = numpy.asarray_chkfinite(ydata)
+        sigma = numpy.asarray_chkfinite(sigma)
+        n_valid = numpy.full((n_problems,), n_points)
+    else:
+        # NaN data points do not contribute to the chi square
+        valid = numpy.logical_and(numpy.isfinite(ydata),
+                                  numpy.isfinite(sigma))
+        ydata[~valid] = 0.
+        sigma[~valid] = numpy.inf
+        n_valid = numpy.sum(valid, axis=1)
+    weight = 1.0 / (sigma + numpy.equal(sigma, 0))
+    weight = weight * weight
+
+    constraints, constrained_fit = _parse_constraints(constraints, nparameters)
+    if constrained_fit:
+        if full_output is None:
+            _logger.info("Recommended to set full_output to True when using constraints")
+    free_index, noigno = _get_free_parameters(constraints, nparameters)
+
+    # Quoted parameters outside their boundaries are kept constant
+    active = _get_active_parameters(parameters, constraints, free_index)
+
+    stack = _ModelStack(model, model_deriv, xdata, n_points, noigno,
+                        vectorized)
+
+    # Levenberg-Marquardt algorithm with one state per problem
+    fittedpar = parameters.copy()
+    flambda = numpy.full((n_problems,), 0.001)
+    iiter = numpy.full((n_problems,), max_iter)
+    iteration_counter = numpy.zeros((n_problems,), dtype=numpy.int64)
+    success = numpy.ones((n_problems,), dtype=bool)
+    chisq0 = numpy.zeros((n_problems,))
+    alpha0 = numpy.zeros((n_problems, len(free_index), len(free_index)))
+    beta = numpy.zeros((n_problems, len(free_index)))
+
+    last_evaluation = stack.evaluate(
+        _get_parameters_stack(fittedpar, constraints))
+
+    running = numpy.nonzero(iiter > 0)[0]
+    while running.size:
+        iteration_counter[running] += 1
+        chisq0[running], alpha0[running], beta[running] = _chisq_alpha_beta_stack(
+            stack, fittedpar[running], running, ydata[running],
+            weight[running], last_evaluation[running], constraints,
+            free_index, active[running], epsfcn, left_derivative)
+
+        searching = running
+        while searching.size:
+            alpha = alpha0[searching] * (
+                1.0 + flambda[searching, numpy.newaxis, numpy.newaxis] *
+                numpy.identity(len(free_index)))
+            deltapar, solved = _solve_stack(alpha, beta[searching])
+            success[searching[~solved]] = False
+            iiter[searching[~solved]] = 0
+            searching, deltapar = searching[solved], deltapar[solved]
+            if searching.size == 0:
+                break
+
+            newpar = _update_parameters_stack(
+                fittedpar[searching], deltapar, constraints,
+                free_index, active[searching])
+            yfit = stack.evaluate(newpar, searching)
+            chisq = numpy.sum(weight[searching] * (ydata[searching] - yfit)**2,
+                              axis=1)
+            absdeltachi = chisq0[searching] - chisq
+
+            rejected = absdeltachi < 0
+            flambda[searching[rejected]] *= 10.0
+            stopped = searching[numpy.logical_and(
+                rejected, flambda[searching] > 1000)]
+            iiter[stopped] = 0
+
+            accepted = ~rejected
+            improved = searching[accepted]
+            fittedpar[improved] = newpar[accepted]
+            lastdeltachi = 100 * (absdeltachi[accepted] /
+                                  (chisq[accepted] + (chisq[accepted] == 0)))
+            converged = numpy.logical_and(
+                iteration_counter[improved] >= 2,
+                numpy.logical_or(lastdeltachi < deltachi,
+                                 absdeltachi[accepted] < numpy.sqrt(epsfcn)))
+            iiter[improved[converged]] = 0
+            chisq0[improved] = chisq[accepted]
+            flambda[improved] /= 10.0
+            last_evaluation[improved] = yfit[accepted]
+
+            iiter[searching] -= 1
+            searching = searching[numpy.logical_and(
+                rejected, flambda[searching] <= 1000)]
+
+        running = running[iiter[running] > 0]
+    function_call_counter = stack.function_calls
+
+    # this is the covariance matrix of the actually fitted parameters
+    cov0, inverted = _inv_stack(alpha0)
+    success &= inverted
+    fittedpar[~success] = numpy.nan
+    chisq0[~success] = numpy.nan
+    if constraints is None:
+        cov = cov0
+    else:
+        # yet another call needed with all the parameters being free except
+        # those that are FIXED and that will be assigned a 100 % uncertainty.
+        new_constraints = copy.deepcopy(constraints)
+        for idx in range(nparameters):
+            if constraints[idx][0] not in [CFIXED, CIGNORED]:
+                new_constraints[idx] = [CFREE, 0, 0]
+        new_free_index, _ = _get_free_parameters(new_constraints, nparameters)
+        valid_problems = numpy.nonzero(success)[0]
+        cov = numpy.full((n_problems, nparameters, nparameters), numpy.nan)
+        if new_free_index and valid_problems.size:
+            _, alpha, _ = _chisq_alpha_beta_stack(
+                stack, fittedpar[valid_problems], valid_problems,
+                ydata[valid_problems], weight[valid_problems],
+                last_evaluation[valid_problems], new_constraints,
+                new_free_index,
+                numpy.ones((valid_problems.size, len(new_free_index)),
+                           dtype=bool),
+                epsfcn, left_derivative)
+            free_cov, _ = _inv_stack(alpha)
+            full_cov = numpy.zeros((valid_problems.size,
+                                    nparameters, nparameters))
+            full_cov[:, numpy.array(new_free_index)[:, numpy.newaxis],
+                     new_free_index] = free_cov
+            for idx in range(nparameters):
+                if idx not in new_free_index:
+                    values = fittedpar[valid_problems, idx]
+                    full_cov[:, idx, idx] = values * values
+            cov[valid_problems] = full_cov
+        function_call_counter = stack.function_calls
+
+    if not full_output:
+        return fittedpar, cov
+    else:
+        diagonal = numpy.diagonal(cov0, axis1=1, axis2=2)
+        sigma0 = numpy.sqrt(abs(diagonal))
+        sigmapar = _get_sigma_parameters_stack(fittedpar, sigma0, constraints,
+                                               free_index, active)
+        ddict = {}
+        ddict["chisq"] = chisq0
+        ddict["reduced_chisq"] = chisq0 / (n_valid - numpy.sum(active, axis=1))
+        ddict["covariance"] = cov0
+        ddict["uncertainties"] = sigmapar
+        ddict["fvec"] = last_evaluation
+        ddict["nfev"] = function_call_counter
+        ddict["niter"] = iteration_counter
+        ddict["success"] = success
+        return fittedpar, cov, ddict
+
+
+class _ModelStack(object):
+    """Evaluate a model and its derivatives on stacked parameters.
+
+    :param model: Model function, see :func:`leastsq_stack`
+    :param model_deriv: Derivative function or None
+    :param numpy.ndarray xdata: 1D shared or 2D per problem abscissa
+    :param int n_points: Number of data points of each problem
+    :param noigno: Indices of the parameters passed to the model
+    :param bool vectorized: Whether model and model_deriv accept stacked
+        parameters
+    """
+
+    def __init__(self, model, model_deriv, xdata, n_points, noigno,
+                 vectorized):
+        self.model = model
+        self.model_deriv = model_deriv
+        self.xdata = xdata
+        self.n_points = n_points
+        self.noigno = noigno
+        self.vectorized = vectorized
+        self.function_calls = 0
+
+    def _x(self, problems):
+        """Returns the abscissa of the given problems"""
+        if self.xdata.ndim == 2:
+            return self.xdata if problems is None else self.xdata[problems]
+        return self.xdata
+
+    def evaluate(self, parameters, problems=None):
+        """Returns the model evaluated for each row of parameters.
+
+        :param numpy.ndarray parameters: (n, n_parameters) array
+        :param problems: Indices of the problems or None for all problems
+        :rtype: numpy.ndarray of shape (n, n_points)
+        """
+        parameters = parameters[:, self.noigno]
+        x = self._x(problems)
+        self.function_calls += 1
+        if self.vectorized:
+            result = self.model(
+                x, *[parameters[:, i:i+1] for i in range(parameters.shape[1])])
+            return numpy.array(
+                numpy.broadcast_to(result, (len(parameters), self.n_points)),
+                dtype=numpy.float64)
+        else:
+            result = numpy.empty((len(parameters), self.n_points))
+            for index, params in enumerate(parameters):
+                result[index] = numpy.ravel(
+                    self.model(x if x.ndim == 1 else x[index], *params))
+            return result
+
+    def derivative(self, parameters, index, problems):
+        """Returns model_deriv for each row of parameters.
+
+        :param numpy.ndarray parameters: (n, n_parameters) array
+        :param int index: Index of the parameter
+        :param problems: Indices of the problems
+        :rtype: numpy.ndarray of shape (n, n_points)
+        """
+        x = self._x(problems)
+        if self.vectorized:
+            result = self.model_deriv(
+                x, parameters.T[:, :, numpy.newaxis], index)
+            return numpy.array(
+                numpy.broadcast_to(result, (len(parameters), self.n_points)),
+                dtype=numpy.float64)
+        else:
+            result = numpy.empty((len(parameters), self.n_points))
+            for row, params in enumerate(parameters):
+                result[row] = numpy.ravel(self.model_deriv(
+                    x if x.ndim == 1 else x[row], params, index))
+            return result
+
+
+def _chisq_alpha_beta_stack(stack, parameters, problems, y, weight, yfit,
+                            constraints, free_index, active, epsfcn,
+                            left_derivative):
+    """
+    Stacked version of :func:`chisq_alpha_beta`.
+
+    :param _ModelStack stack:
+    :param numpy.ndarray parameters: (n, n_parameters) parameters
+    :param numpy.ndarray problems: Indices of the n problems
+    :param numpy.ndarray y: (n, n_points) data
+    :param numpy.ndarray weight: (n, n_points) weights
+    :param numpy.ndarray yfit: (n, n_points) model evaluated at parameters
+    :param constraints: Parsed constraints or None
+    :param free_index: Indices of the free parameters
+    :param numpy.ndarray active: (n, n_free) False for parameters kept
+        constant
+    :return: Tuple (chisq, alpha, beta) of shapes (n,), (n, n_free, n_free)
+        and (n, n_free)
+    """
+    n_free = len(free_index)
+    fitparam, derivfactor = _get_fit_parameters_stack(
+        parameters, constraints, free_index, active)
+    pwork = parameters.copy()
+    pwork[:, free_index] = fitparam
+
+    deriv = numpy.empty((len(parameters), n_free, y.shape[1]))
+    delta = (fitparam + numpy.equal(fitparam, 0.0)) * numpy.sqrt(epsfcn)
+    for i in range(n_free):
+        if stack.model_deriv is None:
+            pwork[:, free_index[i]] = fitparam[:, i] + delta[:, i]
+            f1 = stack.evaluate(_get_parameters_stack(pwork, constraints),
+                                problems)
+            if left_derivative:
+                pwork[:, free_index[i]] = fitparam[:, i] - delta[:, i]
+                f2 = stack.evaluate(_get_parameters_stack(pwork, constraints),
+                                    problems)
+                deriv[:, i] = (f1 - f2) / (2.0 * delta[:, i:i+1])
+            else:
+                deriv[:, i] = (f1 - yfit) / delta[:, i:i+1]
+            pwork[:, free_index[i]] = fitparam[:, i]
+        else:
+            deriv[:, i] = stack.derivative(pwork, free_index[i], problems)
+    deriv *= derivfactor[:, :, numpy.newaxis]
+
+    deltay = y - yfit
+    help0 = weight * deltay
+    beta = numpy.einsum('kp,kip->ki', help0, deriv)
+    alpha = numpy.einsum('kip,kjp->kij', deriv * weight[:, numpy.newaxis], deriv)
+    chisq = numpy.sum(help0 * deltay, axis=1)
+
+    # Parameters kept constant are not updated
+    inactive = ~active
+    if numpy.any(inactive):
+        rows, columns = numpy.nonzero(inactive)
+        alpha[rows, columns, :] = 0.
+        alpha[rows, :, columns] = 0.
+        alpha[rows, columns, columns] = 1.
+        beta[rows, columns] = 0.
+    return chisq, alpha, beta
+
+
+def _get_free_parameters(constraints, nparameters):
+    """
+    Returns the indices of the fitted parameters and of the not ignored ones.
+
+    :param constraints: Parsed constraints or None
+    :param int nparameters: Number of parameters
+    :return: Tuple (free_index, noigno) of lists
+    :raise: ValueError if no parameter is free
+    """
+    if constraints is None:
+        free_index = list(range(nparameters))
+        noigno = list(range(nparameters))
+    else:
+        free_index = []
+        noigno = []
+        for i in range(nparameters):
+            if constraints[i][0] != CIGNORED:
+                noigno.append(i)
+            if constraints[i][0] in (CFREE, CPOSITIVE):
+                free_index.append(i)
+            elif constraints[i][0] == CQUOTED:
+                if abs(constraints[i][2] - constraints[i][1]) > 0:
+                    free_index.append(i)
+    if not free_index:
+        raise ValueError("No free parameters to fit")
+    return free_index, noigno
+
+
+def _get_quoted_range(constraint):
+    """Returns (A, B) center and half-width of a CQUOTED constraint"""
+    pmax = max(constraint[1], constraint[2])
+    pmin = min(constraint[1], constraint[2])
+    return 0.5 * (pmax + pmin), 0.5 * (pmax - pmin)
+
+
+def _get_active_parameters(parameters, constraints, free_index):
+    """
+    Returns a (n, n_free) boolean array, False for quoted parameters outside
+    their boundaries which are kept at their starting value.
+    """
+    active = numpy.ones((len(parameters), len(free_index)), dtype=bool)
+    if constraints is not None:
+        for i, index in enumerate(free_index):
+            if constraints[index][0] == CQUOTED:
+                A, B = _get_quoted_range(constraints[index])
+                active[:, i] = abs(parameters[:, index] - A) <= B
+    if not numpy.all(active):
+        _logger.warning("Quoted parameters outside boundaries in %d problems "
+                        "will be kept at their starting value",
+                        numpy.sum(numpy.any(~active, axis=1)))
+    return active
+
+
+def _get_fit_parameters_stack(parameters, constraints, free_index, active):
+    """
+    Returns the actually fitted parameters and the derivative factors of
+    the constraints as (n, n_free) arrays.
+    """
+    fitparam = parameters[:, free_index]
+    derivfactor = numpy.ones(fitparam.shape)
+    if constraints is not None:
+        for i, index in enumerate(free_index):
+            if constraints[index][0] == CPOSITIVE:
+                fitparam[:, i] = abs(fitparam[:, i])
+            elif constraints[index][0] == CQUOTED:
+                A, B = _get_quoted_range(constraints[index])
+                ratio = numpy.clip((fitparam[:, i] - A) / B, -1., 1.)
+                derivfactor[:, i] = numpy.where(
+                    active[:, i], B * numpy.cos(numpy.arcsin(ratio)), 0.)
+    return fitparam, derivfactor
+
+
+def _update_parameters_stack(parameters, deltapar, constraints, free_index,
+                             active):
+    """
+    Returns parameters updated with deltapar, applying constraints.
+    """
+    fitparam, _ = _get_fit_parameters_stack(
+        parameters, constraints, free_index, active)
+    newpar = parameters.copy()
+    newpar[:, free_index] = fitparam + deltapar
+    if constraints is not None:
+        for i, index in enumerate(free_index):
+            if constraints[index][0] == CQUOTED:
+                A, B = _get_quoted_range(constraints[index])
+                ratio = numpy.clip((fitparam[:, i] - A) / B, -1., 1.)
+                newpar[:, index] = numpy.where(
+                    active[:, i],
+                    A + B * numpy.sin(numpy.arcsin(ratio) + deltapar[:, i]),
+                    fitparam[:, i])
+    return _get_parameters_stack(newpar, constraints)
+
+
+def _get_parameters_stack(parameters, constraints):
+    """
+    Stacked version of :func:`_get_parameters`.
+
+    :param numpy.ndarray parameters: (n, n_parameters) array
+    :param constraints: Parsed constraints or None
+    :rtype: numpy.ndarray
+    """
+    newparam = numpy.array(parameters, dtype=numpy.float64)
+    if constraints is None:
+        return newparam
+    for i in range(len(constraints)):
+        if constraints[i][0] == CPOSITIVE:
+            newparam[:, i] = abs(newparam[:, i])
+    for i in range(len(constraints)):
+        if constraints[i][0] == CFACTOR:
+            newparam[:, i] = constraints[i][2] * newparam[:, int(constraints[i][1])]
+        elif constraints[i][0] == CDELTA:
+            newparam[:, i] = constraints[i][2] + newparam[:, int(constraints[i][1])]
+        elif constraints[i][0] == CIGNORED:
+            newparam[:, i] = 0
+        elif constraints[i][0] == CSUM:
+            newparam[:, i] = constraints[i][2] - newparam[:, int(constraints[i][1])]
+    return newparam
+
+
+def _get_sigma_parameters_stack(parameters, sigma0, constraints, free_index,
+                                active):
+    """
+    Stacked version of :func:`_get_sigma_parameters`.
+
+    :param numpy.ndarray parameters: (n, n_parameters) fitted parameters
+    :param numpy.ndarray sigma0: (n, n_free) uncertainties of the actually
+        fitted parameters
+    :param constraints: Parsed constraints or None
+    :param free_index: Indices of the free parameters
+    :param numpy.ndarray active: (n, n_free) False for parameters kept
+        constant
+    """
+    if constraints is None:
+        return sigma0
+    sigma_par = numpy.zeros(parameters.shape, numpy.float64)
+    for i, index in enumerate(free_index):
+        if constraints[index][0] in (CFREE, CPOSITIVE):
+            sigma_par[:, index] = sigma0[:, i]
+        elif constraints[index][0] == CQUOTED:
+            A, B = _get_quoted_range(constraints[index])
+            sigma_par[:, index] = numpy.where(
+                active[:, i],
+                abs(B * numpy.cos(parameters[:, index]) * sigma0[:, i]),
+                parameters[:, index])
+    for i in range(len(constraints)):
+        code = constraints[i][0]
+        if code == CQUOTED and i not in free_index:
+            sigma_par[:, i] = parameters[:, i]
+        elif abs(code) == CFIXED:
+            sigma_par[:, i] = parameters[:, i]
+    for i in range(len(constraints)):
+        if constraints[i][0] == CFACTOR:
+            sigma_par[:, i] = constraints[i][2] * sigma_par[:, int(constraints[i][1])]
+        elif constraints[i][0] in (CDELTA, CSUM):
+            sigma_par[:, i] = sigma_par[:, int(constraints[i][1])]
+    return sigma_par
+
+
+def _solve_stack(alpha, beta):
+    """
+    Solve the stacked systems ``alpha x = beta``.
+
+    :param numpy.ndarray alpha: (n, m, m) matrices
+    :param numpy.ndarray beta: (n, m) vectors
+    :return: Tuple (x, solved), solved being False for singular matrices
+    """
+    solved = numpy.all(numpy.isfinite(alpha), axis=(1, 2))
+    result = numpy.zeros(beta.shape)
+    try:
+        result[solved] = numpy.linalg.solve(
+            alpha[solved], beta[solved][..., numpy.newaxis])[..., 0]
+    except LinAlgError:
+        # Find the singular matrices one by one
+        for index in numpy.nonzero(solved)[0]:
+            try:
+                result[index] = numpy.linalg.solve(alpha[index], beta[index])
+            except LinAlgError:
+                solved[index] = False
+    return result, solved
+
+
+def _inv_stack(alpha):
+    """
+    Invert stacked matrices.
+
+    :param numpy.ndarray alpha: (n, m, m) matrices
+    :return: Tuple (inverse, inverted), inverse being NaN and inverted
+        False for singular matrices
+    """
+    inverted = numpy.all(numpy.isfinite(alpha), axis=(1, 2))
+    result = numpy.full(alpha.shape, numpy.nan)
+    try:
+        result[inverted] = inv(alpha[inverted])
+    except LinAlgError:
+        for index in numpy.nonzero(inverted)[0]:
+            try:
+                result[index] = inv(alpha[index])
+            except LinAlgError:
+                inverted[index] = False
+    return result, inverted
+
+
+def _parse_constraints(constraints, nparameters):
+    """
+    Convert constraints to a list of lists with numerical codes.
+
+    :param constraints: None or 2D sequence of constraints as described in
+        :func:`leastsq`, where codes can also be given as text
+        (e.g., "FREE", "POSITIVE", ...)
+    :param int nparameters: Number of parameters
+    :return: Tuple (constraints, constrained_fit), constrained_fit being True
+        if at least one parameter is not free
+    """
+    constrained_fit = False
+    if constraints is None:
+        return None, constrained_fit
+    # make sure we work with a list of lists
+    input_constraints = constraints
+    tmp_constraints = [None] * len(input_constraints)
+    for i in range(nparameters):
+        tmp_constraints[i] = list(input_constraints[i])
+    constraints = tmp_constraints
+    for i in range(nparameters):
+        if hasattr(constraints[i][0], "upper"):
+            txt = constraints[i][0].upper()
+            if txt == "FREE":
+                constraints[i][0] = CFREE
+            elif txt == "POSITIVE":
+                constraints[i][0] = CPOSITIVE
+            elif txt == "QUOTED":
+                constraints[i][0] = CQUOTED
+            elif txt == "FIXED":
+                constraints[i][0] = CFIXED
+            elif txt == "FACTOR":
+                constraints[i][0] = CFACTOR
+                constraints[i][1] = int(constraints[i][1])
+            elif txt == "DELTA":
+                constraints[i][0] = CDELTA
+                constraints[i][1] = int(constraints[i][1])
+            elif txt == "SUM":
+                constraints[i][0] = CSUM
+                constraints[i][1] = int(constraints[i][1])
+            elif txt in ["IGNORED", "IGNORE"]:
+                constraints[i][0] = CIGNORED
+            else:
+                #I should raise an exception
+                raise ValueError("Unknown constraint %s" % constraints[i][0])
+        if constraints[i][0] > 0:
+            constrained_fit = True
+    return constraints, constrained_fit
+
+
 def _get_parameters(parameters, constraints):
     """
     Apply constraints to input parameters.
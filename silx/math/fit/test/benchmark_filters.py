@@ -0,0 +1,129 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmark of the filters of stacks of spectra and of the 2D/3D snip"""
+
+from __future__ import division
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "01/06/2018"
+
+
+import logging
+import time
+import unittest
+
+import numpy
+
+from silx.math.fit import filters
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkStacks(unittest.TestCase):
+    """Benchmark the *_stack filters against a loop of 1D filters"""
+
+    N_SPECTRA = 1000
+    N_CHANNELS = 4096
+
+    FILTERS = (
+        ('snip1d', filters.snip1d, filters.snip1d_stack,
+         {'snip_width': 30}),
+        ('strip', filters.strip, filters.strip_stack,
+         {'w': 4, 'niterations': 1000}),
+        ('smooth1d', filters.smooth1d, filters.smooth1d_stack, {}),
+    )
+
+    def test_benchmark_stacks(self):
+        channels = numpy.arange(self.N_CHANNELS)
+        spectrum = 100. + 1000. * numpy.exp(
+            -0.5 * ((channels - self.N_CHANNELS / 3) / 10.) ** 2)
+        spectra = numpy.random.poisson(
+            spectrum, (self.N_SPECTRA, self.N_CHANNELS)).astype(numpy.float64)
+
+        for name, filter1d, filter_stack, kwargs in self.FILTERS:
+            start = time.time()
+            ref = numpy.array([filter1d(s, **kwargs) for s in spectra])
+            ref_duration = time.time() - start
+
+            start = time.time()
+            result = filter_stack(spectra, n_threads=1, **kwargs)
+            serial_duration = time.time() - start
+
+            data = spectra.copy()
+            start = time.time()
+            filter_stack(data, inplace=True, **kwargs)
+            duration = time.time() - start
+
+            self.assertTrue(numpy.array_equal(result, ref))
+            self.assertTrue(numpy.array_equal(data, ref))
+
+            _logger.info(
+                '%s of %d spectra: loop %.3fs, 1 thread %.3fs, '
+                'all threads in place %.3fs, x%.2f',
+                name, self.N_SPECTRA, ref_duration, serial_duration,
+                duration, ref_duration / duration)
+
+
+class BenchmarkSnipNd(unittest.TestCase):
+    """Benchmark snip2d and snip3d with 1 thread and all threads"""
+
+    SHAPES = (2048, 2048), (256, 256, 256)
+
+    SNIP_WIDTH = 10
+
+    def test_benchmark_snip(self):
+        for shape in self.SHAPES:
+            data = numpy.random.poisson(100., shape).astype(numpy.float64)
+            snip = filters.snip2d if len(shape) == 2 else filters.snip3d
+
+            start = time.time()
+            ref = snip(data, self.SNIP_WIDTH, n_threads=1)
+            ref_duration = time.time() - start
+
+            start = time.time()
+            result = snip(data, self.SNIP_WIDTH)
+            duration = time.time() - start
+
+            self.assertTrue(numpy.array_equal(result, ref))
+
+            _logger.info(
+                'snip of shape %s: 1 thread %.3fs, all threads %.3fs, x%.2f',
+                shape, ref_duration, duration, ref_duration / duration)
+
+            del data
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    for test in (BenchmarkStacks, BenchmarkSnipNd):
+        test_suite.addTests(
+            unittest.defaultTestLoader.loadTestsFromTestCase(test))
+    return test_suite
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    unittest.main(defaultTest='suite')
@@ -0,0 +1,131 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of FitManager fits with analytical derivatives against
+fits with numerical derivatives"""
+
+from __future__ import division
+
+__authors__ = ["P. Knobel"]
+__license__ = "MIT"
+__date__ = "01/06/2018"
+
+
+import copy
+import logging
+import time
+import unittest
+
+import numpy
+
+from silx.math.fit import fitmanager
+from silx.math.fit import fittheories
+from silx.math.fit import functions
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkDerivatives(unittest.TestCase):
+    """Benchmark of multi-peak fits with and without the analytical
+    derivatives of the fit theories"""
+
+    N_POINTS = 2048
+
+    X_STEP = 0.01
+    """Abscissa step, keeping the hypermet tails within float range"""
+
+    THEORIES = (
+        ('Gaussians', functions.sum_gauss, (1000., 0., 0.15), (5, 30)),
+        ('Area Pseudo-Voigt', functions.sum_apvoigt, (200., 0., 0.15, 0.3),
+         (5, 30)),
+        # Fits of many hypermets need tighter constraints to converge
+        ('Hypermet', functions.sum_ahypermet,
+         (100000., 0., 0.15, 0.05, 0.7, 0.02, 20., 0.002), (5,)),
+    )
+    """Theory name, function, parameters of one peak (the position is
+    set by the benchmark) and numbers of peaks in the spectrum"""
+
+    def _fit(self, x, y, theory_name, initial, derivative, repeat=3):
+        """Returns (reduced chi-square, duration of one fit)"""
+        fit = fitmanager.FitManager(x=x, y=y, weight_flag=True)
+        fit.loadtheories(fittheories)
+        theory = copy.copy(fit.theories[theory_name])
+        # Start from known parameters rather than from the peak search,
+        # with all parameters positive
+        constraints = numpy.zeros((len(initial), 3), numpy.float64)
+        constraints[:, 0] = fittheories.CPOSITIVE
+        theory.estimate = lambda x, y: (initial, constraints)
+        if not derivative:
+            theory.derivative = None
+        fit.addtheory(theory_name, theory)
+        fit.settheory(theory_name)
+        fit.setbackground('Constant')
+        fit.estimate()
+
+        start = time.time()
+        for _ in range(repeat):
+            _params, _sigmas, infodict = fit.runfit()
+        return infodict['reduced_chisq'], (time.time() - start) / repeat
+
+    def test_benchmark_derivatives(self):
+        x = numpy.arange(self.N_POINTS, dtype=numpy.float64) * self.X_STEP
+        random_state = numpy.random.RandomState(0)
+        for theory_name, function, peak, n_peaks_list in self.THEORIES:
+            for n_peaks in n_peaks_list:
+                positions = numpy.linspace(x[0], x[-1], n_peaks + 2)[1:-1]
+                params = numpy.tile(peak, n_peaks)
+                params[1::len(peak)] = positions
+                y = random_state.poisson(
+                    function(x, *params) + 10.).astype(numpy.float64)
+                initial = params * random_state.uniform(
+                    0.95, 1.05, len(params))
+                initial[1::len(peak)] = positions + random_state.uniform(
+                    -3 * self.X_STEP, 3 * self.X_STEP, n_peaks)
+
+                result, duration = self._fit(
+                    x, y, theory_name, initial, True)
+                ref, ref_duration = self._fit(
+                    x, y, theory_name, initial, False)
+
+                _logger.info(
+                    '%s, %d peaks: analytical %.1f fits/s, '
+                    'numerical %.1f fits/s, x%.2f, '
+                    'reduced chisq %g (numerical %g)',
+                    theory_name, n_peaks, 1. / duration, 1. / ref_duration,
+                    ref_duration / duration, result, ref)
+
+                # Fits may stop at slightly different points
+                self.assertLess(result, 1.01 * ref)
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(
+        BenchmarkDerivatives))
+    return test_suite
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    unittest.main(defaultTest='suite')
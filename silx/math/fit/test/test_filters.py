@@ -122,7 +122,78 @@ class TestSmooth(unittest.TestCase):
                                        expected_smooth[i, j])
 
 
-test_cases = (TestSmooth,)
+class TestStacks(unittest.TestCase):
+    """Test the filters of stacks of spectra against the 1D filters"""
+    def setUp(self):
+        x = numpy.arange(500)
+        spectrum = functions.sum_gauss(x, 1000, 100, 10, 500, 300, 20) + 50
+        # map of 2 x 3 spectra
+        self.spectra = numpy.array(
+            [[add_relative_noise(spectrum, 5.) for _ in range(3)]
+             for _ in range(2)])
+
+    def _check_stack(self, filter1d, filter_stack, **kwargs):
+        expected = numpy.array([[filter1d(spectrum, **kwargs)
+                                 for spectrum in row]
+                                for row in self.spectra])
+
+        for n_threads in (0, 1, 2):
+            result = filter_stack(self.spectra, n_threads=n_threads, **kwargs)
+            self.assertEqual(result.shape, self.spectra.shape)
+            self.assertTrue(numpy.array_equal(result, expected))
+
+        data = self.spectra.copy()
+        result = filter_stack(data, inplace=True, **kwargs)
+        self.assertIs(result, data)
+        self.assertTrue(numpy.array_equal(data, expected))
+
+    def testSnip1dStack(self):
+        self._check_stack(filters.snip1d, filters.snip1d_stack,
+                          snip_width=40)
+
+    def testStripStack(self):
+        self._check_stack(filters.strip, filters.strip_stack,
+                          w=2, niterations=1000, anchors=[100, 400])
+
+    def testSmooth1dStack(self):
+        self._check_stack(filters.smooth1d, filters.smooth1d_stack)
+
+    def testInplaceWrongType(self):
+        with self.assertRaises(ValueError):
+            filters.snip1d_stack(self.spectra.astype(numpy.float32), 40,
+                                 inplace=True)
+        with self.assertRaises(ValueError):
+            filters.strip_stack(self.spectra[:, :, ::2], inplace=True)
+
+
+class TestSnip(unittest.TestCase):
+    """Test the 2D and 3D snip filters"""
+    def testSnip2dThreads(self):
+        image = numpy.random.poisson(100, (60, 70)).astype(numpy.float64)
+        image[20:30, 30:35] += 1000
+        expected = filters.snip2d(image, 10, n_threads=1)
+        self.assertTrue(numpy.all(expected <= image))
+        self.assertTrue(numpy.all(expected[20:30, 30:35] < 500))
+        for n_threads in (0, 2):
+            self.assertTrue(numpy.array_equal(
+                filters.snip2d(image, 10, n_threads=n_threads), expected))
+
+    def testSnip3d(self):
+        volume = numpy.random.poisson(100, (20, 25, 30)).astype(numpy.float64)
+        volume[8:12, 10:14, 12:16] += 2000
+        expected = filters.snip3d(volume, 5, n_threads=1)
+        self.assertTrue(numpy.all(expected <= volume))
+        self.assertTrue(numpy.all(expected[8:12, 10:14, 12:16] < 1000))
+        for n_threads in (0, 2):
+            self.assertTrue(numpy.array_equal(
+                filters.snip3d(volume, 5, n_threads=n_threads), expected))
+
+        # A flat background is not modified
+        flat = numpy.ones((15, 15, 15))
+        self.assertTrue(numpy.allclose(filters.snip3d(flat, 4), flat))
+
+
+test_cases = (TestSmooth, TestStacks, TestSnip)
 
 
 def suite():
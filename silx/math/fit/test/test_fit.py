@@ -372,7 +372,131 @@ class Test_leastsq(unittest.TestCase):
                                        parameters_estimate[i])
 
 
-test_cases = (Test_leastsq,)
+class Test_leastsq_stack(unittest.TestCase):
+    """
+    Unit tests of the leastsq_stack function.
+    """
+
+    def setUp(self):
+        def gauss(x, *params):
+            # Works with scalar as well as stacked (n, 1) parameters
+            result = params[0] + params[1] * x
+            for i in range(2, len(params), 3):
+                height, position, fwhm = params[i:(i+3)]
+                dummy = 2.3548200450309493 * (x - position) / fwhm
+                result = result + height * numpy.exp(-0.5 * dummy * dummy)
+            return result
+
+        self.gauss = gauss
+        self.x = numpy.arange(1000.)
+        self.parameters_actual = numpy.array([
+            [10.5, 0.02, 1000.0, 200., 150, 500, 700., 100],
+            [5., 0.01, 800.0, 210., 120, 600, 690., 110],
+            [15., 0.03, 1100.0, 190., 160, 400, 710., 90]])
+        random = numpy.random.RandomState(0)
+        self.y = numpy.array([gauss(self.x, *p)
+                              for p in self.parameters_actual])
+        self.y += random.normal(scale=1., size=self.y.shape)
+        self.parameters_estimate = [10., 0.02, 900.0, 205., 140,
+                                    500, 700., 100]
+
+    def tearDown(self):
+        self.gauss = None
+
+    def testLikeLeastsq(self):
+        """Test that each problem gets the result of leastsq"""
+        from silx.math.fit import leastsq, leastsq_stack
+        from silx.math.fit.leastsq import _get_parameters
+        from silx.math.fit.leastsq import \
+            CFREE, CPOSITIVE, CQUOTED, CFIXED, CFACTOR, CDELTA, CSUM
+
+        constraints_list = [
+            None,
+            [[CPOSITIVE, 0, 0]] * 8,
+            [[CFREE, 0, 0], [CFIXED, 0, 0], [CPOSITIVE, 0, 0],
+             [CQUOTED, 150, 250], [CFREE, 0, 0], [CFREE, 0, 0],
+             [CDELTA, 3, 495], [CFREE, 0, 0]],
+            [[CFREE, 0, 0]] * 6 + [[CSUM, 3, 905], [CFACTOR, 4, 0.7]],
+        ]
+        for constraints in constraints_list:
+            for sigma in [None, numpy.sqrt(abs(self.y)) + 1]:
+                # Initial parameters honouring the constraints
+                p0 = _get_parameters(self.parameters_estimate, constraints)
+
+                fittedpar, cov, infodict = leastsq_stack(
+                    self.gauss, self.x, self.y, p0, sigma=sigma,
+                    constraints=constraints, full_output=True)
+                self.assertTrue(numpy.all(infodict['success']))
+                for index, y in enumerate(self.y):
+                    ref = leastsq(
+                        self.gauss, self.x, y, p0,
+                        sigma=None if sigma is None else sigma[index],
+                        constraints=constraints, full_output=True)
+                    self.assertTrue(numpy.allclose(fittedpar[index], ref[0],
+                                                   rtol=1e-5, atol=1e-6))
+                    self.assertTrue(numpy.allclose(cov[index], ref[1],
+                                                   rtol=1e-4, atol=1e-8))
+                    self.assertTrue(numpy.allclose(
+                        infodict['uncertainties'][index],
+                        ref[2]['uncertainties'], rtol=1e-4))
+                    self.assertAlmostEqual(infodict['reduced_chisq'][index],
+                                           ref[2]['reduced_chisq'])
+                    self.assertEqual(infodict['niter'][index],
+                                     ref[2]['niter'])
+
+    def testNotVectorized(self):
+        """Test with a model called for each problem"""
+        from silx.math.fit import leastsq_stack
+
+        ref = leastsq_stack(self.gauss, self.x, self.y,
+                            self.parameters_estimate)
+        result = leastsq_stack(self.gauss, self.x, self.y,
+                               self.parameters_estimate, vectorized=False)
+        self.assertTrue(numpy.array_equal(result[0], ref[0]))
+        self.assertTrue(numpy.allclose(result[0], self.parameters_actual,
+                                       rtol=5e-2, atol=1e-2))
+
+    def testDataWithNaN(self):
+        """Test that NaN are ignored with check_finite=False"""
+        from silx.math.fit import leastsq, leastsq_stack
+
+        y = self.y.copy()
+        y[0, ::10] = numpy.nan
+        y[1, 5] = numpy.nan
+        with self.assertRaises(ValueError):
+            leastsq_stack(self.gauss, self.x, y, self.parameters_estimate)
+
+        fittedpar, _ = leastsq_stack(self.gauss, self.x, y,
+                                     self.parameters_estimate,
+                                     check_finite=False)
+        for index in range(len(y)):
+            ref, _ = leastsq(self.gauss, self.x, y[index],
+                             self.parameters_estimate, check_finite=False)
+            self.assertTrue(numpy.allclose(fittedpar[index], ref,
+                                           rtol=1e-5, atol=1e-6))
+
+    def testSingularMatrix(self):
+        """Test that a failing problem does not stop the others"""
+        from silx.math.fit import leastsq_stack
+
+        def linear(x, a, b, c):
+            return a + (b + c * 0 * x) * x
+
+        y = numpy.array([1. + 2. * self.x, 3. + 4. * self.x])
+        p0 = numpy.array([[0., 1., 1.], [0., 1., 1.]])
+        fittedpar, _, infodict = leastsq_stack(linear, self.x, y, p0,
+                                               full_output=True)
+        self.assertFalse(numpy.any(infodict['success']))
+        self.assertTrue(numpy.all(numpy.isnan(fittedpar)))
+
+        fittedpar, _, infodict = leastsq_stack(
+            linear, self.x, y, p0, constraints=[[0, 0, 0]] * 2 + [[3, 0, 0]],
+            full_output=True)
+        self.assertTrue(numpy.all(infodict['success']))
+        self.assertTrue(numpy.allclose(fittedpar[:, :2], [[1., 2.], [3., 4.]]))
+
+
+test_cases = (Test_leastsq, Test_leastsq_stack)
 
 def suite():
     loader = unittest.defaultTestLoader
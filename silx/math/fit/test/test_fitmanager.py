@@ -33,9 +33,11 @@ from silx.math.fit import fitmanager
 from silx.math.fit import fittheories
 from silx.math.fit import bgtheories
 from silx.math.fit.fittheory import FitTheory
-from silx.math.fit.functions import sum_gauss, sum_stepdown, sum_stepup
+from silx.math.fit.functions import sum_gauss, sum_stepdown, sum_stepup, \
+    sum_gauss_derivative
 
 from silx.test.utils import temp_dir
+from silx.utils.testutils import ParametricTestCase
 
 custom_function_definition = """
 import copy
@@ -380,6 +382,104 @@ class TestFitmanager(unittest.TestCase):
                 self.assertAlmostEqual(_order_of_magnitude(fit.fit_results[i+1]["estimation"]),
                                        _order_of_magnitude(p[i]))
 
+    def testDerivative(self):
+        """Test the analytical derivative of the fit function, with a
+        background and a FACTOR constraint"""
+        x = numpy.arange(500).astype(numpy.float)
+        p = [1000, 100., 30.0,
+             1500, 250., 30.0,
+             800, 400., 30.0]
+        y = sum_gauss(x, *p) + 13.
+
+        fit = fitmanager.FitManager()
+        fit.setdata(x=x, y=y)
+        fit.loadtheories(fittheories)
+        fit.settheory('Gaussians')
+        fit.setbackground('Linear')
+        fit.configure(SameFwhmFlag=True)
+        # the configuration of fittheories is shared
+        self.addCleanup(fit.configure, SameFwhmFlag=False)
+        fit.estimate()
+
+        codes = [param['code'] for param in fit.fit_results]
+        self.assertIn('FACTOR', codes)
+        links = [(i, int(param['cons1']), fittheories.CFACTOR, param['cons2'])
+                 for i, param in enumerate(fit.fit_results)
+                 if param['code'] == 'FACTOR']
+
+        pars = numpy.array([param['estimation'] for param in fit.fit_results])
+        for i, master_index, _code, factor in links:
+            pars[i] = factor * pars[master_index]
+        for index in range(len(pars)):
+            if index in [link[0] for link in links]:
+                continue  # Not a fitted parameter
+            delta = 1e-6 * max(abs(pars[index]), 1.)
+            pars_plus = pars.copy()
+            pars_plus[index] += delta
+            pars_minus = pars.copy()
+            pars_minus[index] -= delta
+            for i, master_index, _code, factor in links:
+                pars_plus[i] = factor * pars_plus[master_index]
+                pars_minus[i] = factor * pars_minus[master_index]
+            expected = (fit.fitfunction(x, *pars_plus) -
+                        fit.fitfunction(x, *pars_minus)) / (2 * delta)
+
+            result = fit.fitderivative(x, pars, index, links=links)
+
+            self.assertTrue(numpy.allclose(
+                result, expected, atol=1e-6 * numpy.abs(expected).max()),
+                "Derivative mismatch for parameter %d" % index)
+
+        # Same fit with numerical derivatives
+        params, sigmas, infodict = fit.runfit()
+        theory = fit.theories['Gaussians']
+        fit.addtheory('Gaussians numerical',
+                      FitTheory(function=theory.function,
+                                parameters=theory.parameters,
+                                estimate=theory.estimate,
+                                configure=theory.configure))
+        fit.settheory('Gaussians numerical')
+        fit.estimate()
+        ref_params, ref_sigmas, ref_infodict = fit.runfit()
+
+        self.assertTrue(numpy.allclose(params, ref_params, rtol=1e-5))
+        self.assertTrue(numpy.allclose(params[2:], p, rtol=1e-5))
+        # all FWHM are the same
+        self.assertAlmostEqual(params[4], params[7])
+        self.assertAlmostEqual(params[4], params[10])
+
+    def testCustomDerivative(self):
+        """Test that a user derivative is called with all the parameters"""
+        x = numpy.arange(200).astype(numpy.float)
+        p = [1000, 100., 30.0]
+        y = sum_gauss(x, *p) + 13.
+
+        calls = []
+
+        def derivative(xdata, parameters, index):
+            # background parameter first
+            calls.append(len(parameters))
+            if index == 0:
+                return numpy.ones_like(xdata)
+            return sum_gauss_derivative(xdata, parameters[1:], index - 1)
+
+        fit = fitmanager.FitManager()
+        fit.setdata(x=x, y=y)
+        fit.addtheory('Gaussian with derivative',
+                      function=sum_gauss,
+                      parameters=('Height', 'Position', 'FWHM'),
+                      estimate=fittheories.THEORY['Gaussians'].estimate,
+                      derivative=derivative)
+        fit.settheory('Gaussian with derivative')
+        fit.setbackground('Constant')
+        fit.estimate()
+        params, sigmas, infodict = fit.runfit()
+
+        self.assertTrue(len(calls) > 0)
+        self.assertEqual(set(calls), {4})
+        self.assertTrue(numpy.allclose(params, [13.] + p, rtol=1e-5))
+
+
 
 def quadratic(x, a, b, c):
     return a * x**2 + b * x + c
@@ -483,7 +583,72 @@ class TestPolynomials(unittest.TestCase):
                        places=4)
 
 
-test_cases = (TestFitmanager, TestPolynomials)
+class TestFitMany(ParametricTestCase):
+    """Tests of fit_many on a map of gaussian peaks"""
+
+    def setUp(self):
+        random = numpy.random.RandomState(0)
+        self.x = numpy.arange(100.)
+        self.heights = random.random_sample((5, 8)) + 1.
+        self.positions = random.random_sample((5, 8)) * 4. + 48.
+        self.y = 0.1 + self.heights[..., numpy.newaxis] * numpy.exp(
+            -(self.x - self.positions[..., numpy.newaxis])**2 / 50.)
+        self.y += random.normal(scale=0.001, size=self.y.shape)
+
+    def testFitMany(self):
+        """Test the parameters of each spectrum"""
+        parameters, uncertainties, infodict = fitmanager.fit_many(
+            'Gaussians', self.x, self.y, bgtheory='Constant', chunk_size=7)
+
+        self.assertEqual(parameters.shape, (5, 8, 4))
+        self.assertEqual(uncertainties.shape, (5, 8, 4))
+        self.assertEqual(infodict['parameter_names'],
+                         ['Constant', 'Height1', 'Position1', 'FWHM1'])
+        self.assertEqual(infodict['reduced_chisq'].shape, (5, 8))
+        self.assertEqual(infodict['niter'].shape, (5, 8))
+
+        numpy.testing.assert_allclose(parameters[..., 0], 0.1, atol=1e-3)
+        numpy.testing.assert_allclose(parameters[..., 1], self.heights,
+                                      rtol=1e-2)
+        numpy.testing.assert_allclose(parameters[..., 2], self.positions,
+                                      atol=1e-2)
+        fwhm = 2. * numpy.sqrt(2. * 25. * numpy.log(2.))
+        numpy.testing.assert_allclose(parameters[..., 3], fwhm, rtol=1e-2)
+
+    def testFitManyVsFitManager(self):
+        """Test fit_many without warm start against FitManager"""
+        reference = numpy.mean(self.y, axis=(0, 1))
+        parameters, _, _ = fitmanager.fit_many(
+            'Gaussians', self.x, self.y[0], reference=reference,
+            warm_start=False)
+
+        fit = fitmanager.FitManager()
+        fit.loadtheories(fittheories)
+        fit.settheory('Gaussians')
+        fit.setdata(x=self.x, y=reference)
+        estimation = fit.estimate()
+        for index, spectrum in enumerate(self.y[0]):
+            fit.setdata(x=self.x, y=spectrum)
+            for param, value in zip(fit.fit_results, estimation):
+                param['estimation'] = value
+            params, _, _ = fit.runfit()
+            self.assertTrue(numpy.array_equal(params, parameters[index]))
+
+    def testJobs(self):
+        """Test that the result does not depend on the number of workers"""
+        ref = fitmanager.fit_many(
+            'Gaussians', self.x, self.y, bgtheory='Linear', chunk_size=16)
+        for threads in (False, True):
+            with self.subTest(threads=threads):
+                result = fitmanager.fit_many(
+                    'Gaussians', self.x, self.y, bgtheory='Linear',
+                    chunk_size=16, jobs=2, threads=threads)
+                self.assertFalse(numpy.any(numpy.isnan(result[0])))
+                self.assertTrue(numpy.array_equal(result[0], ref[0]))
+                self.assertTrue(numpy.array_equal(result[1], ref[1]))
+
+
+test_cases = (TestFitmanager, TestPolynomials, TestFitMany)
 
 
 def suite():
@@ -30,6 +30,7 @@ import numpy
 import math
 
 from silx.math.fit import functions
+from silx.utils.testutils import ParametricTestCase
 
 __authors__ = ["P. Knobel"]
 __license__ = "MIT"
@@ -244,6 +245,85 @@ class Test_functions(unittest.TestCase):
                         1)
 
 
+class Test_derivatives(ParametricTestCase):
+    """
+    Unit tests of the analytical derivatives of multi-peak functions.
+    """
+    # x grid not including the peak positions, where split functions
+    # are not smooth
+    x = numpy.linspace(-20., 60., 401) + 0.01
+
+    # function name, parameters of 2 peaks
+    cases = (
+        ("gauss", (3., 10., 5., 2., 30., 8.)),
+        ("agauss", (30., 10., 5., 20., 30., 8.)),
+        ("splitgauss", (3., 10., 5., 9., 2., 30., 8., 4.)),
+        ("apvoigt", (30., 10., 5., 0.3, 20., 30., 8., 0.7)),
+        ("pvoigt", (3., 10., 5., 0.3, 2., 30., 8., 0.7)),
+        ("splitpvoigt", (3., 10., 5., 9., 0.3, 2., 30., 8., 4., 0.6)),
+        ("lorentz", (3., 10., 5., 2., 30., 8.)),
+        ("alorentz", (30., 10., 5., 20., 30., 8.)),
+        ("splitlorentz", (3., 10., 5., 9., 2., 30., 8., 4.)),
+        ("stepdown", (3., 10., 5., 2., 30., 8.)),
+        ("stepup", (3., 10., 5., 2., 30., 8.)),
+        ("slit", (3., 10., 15., 4., 2., 40., 8., 3.)),
+        ("ahypermet", (300., 10., 5., 0.05, 0.5, 0.02, 5., 0.001,
+                       200., 30., 6., 0.1, 1.1, 0.03, 9., 0.002)),
+    )
+
+    def testDerivatives(self):
+        """Compare analytical derivatives with numerical derivatives"""
+        for name, params in self.cases:
+            function = getattr(functions, "sum_" + name)
+            derivative = getattr(functions, "sum_" + name + "_derivative")
+            for index in range(len(params)):
+                with self.subTest(function=name, index=index):
+                    delta = 1e-6 * abs(params[index])
+                    params_plus = numpy.array(params)
+                    params_plus[index] += delta
+                    params_minus = numpy.array(params)
+                    params_minus[index] -= delta
+                    expected = (function(self.x, *params_plus) -
+                                function(self.x, *params_minus)) / (2 * delta)
+
+                    result = derivative(self.x, params, index)
+
+                    self.assertEqual(result.shape, self.x.shape)
+                    scale = numpy.abs(expected).max()
+                    self.assertTrue(numpy.allclose(result, expected,
+                                                   atol=1e-6 * scale))
+
+    def testHypermetTerms(self):
+        """Derivative of hypermet with some terms disabled"""
+        params = (300., 10., 5., 0.05, 0.5, 0.02, 5., 0.001)
+        terms = dict(gaussian_term=False, st_term=True,
+                     lt_term=False, step_term=True)
+        for index in range(len(params)):
+            delta = 1e-6 * abs(params[index])
+            params_plus = numpy.array(params)
+            params_plus[index] += delta
+            params_minus = numpy.array(params)
+            params_minus[index] -= delta
+            expected = (functions.sum_ahypermet(self.x, *params_plus, **terms) -
+                        functions.sum_ahypermet(self.x, *params_minus, **terms)) / (2 * delta)
+
+            result = functions.sum_ahypermet_derivative(
+                self.x, params, index, **terms)
+
+            scale = numpy.abs(expected).max()
+            self.assertTrue(numpy.allclose(result, expected,
+                                           atol=1e-6 * scale + 1e-12))
+
+    def testWrongIndex(self):
+        """Parameter index out of range"""
+        with self.assertRaises(IndexError):
+            functions.sum_gauss_derivative(self.x, (1., 2., 3.), 3)
+        with self.assertRaises(IndexError):
+            functions.sum_gauss_derivative(self.x, (1., 2., 3.), -1)
+        with self.assertRaises(IndexError):
+            functions.sum_gauss_derivative(self.x, (1., 2., 3., 4.), 0)
+
+
 def _numerical_derivative(f, x, params=[], delta_factor=0.0001):
     """Compute the numerical derivative of ``f`` for all values of ``x``.
 
@@ -258,7 +338,7 @@ def _numerical_derivative(f, x, params=[], delta_factor=0.0001):
 
     return (y_plus - y_minus) / (2 * deltax)
 
-test_cases = (Test_functions,)
+test_cases = (Test_functions, Test_derivatives)
 
 def suite():
     loader = unittest.defaultTestLoader
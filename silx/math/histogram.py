@@ -72,6 +72,12 @@ or even:
 
 >>> histo, w_histo, edges = histo_obj
 
+Histogramnd can also accumulate data which does not fit in memory, such as
+a HDF5 dataset, by reading it block by block:
+
+>>> histo_obj = Histogramnd(None, n_bins=n_bins, histo_range=ranges)
+>>> histo_obj.accumulate_chunks(h5file["sample"], weights=h5file["weights"])
+
 Accumulating histograms (LUT)
 -----------------------------
 In some situations we need to compute the weighted histogram of several
@@ -142,10 +148,140 @@ __authors__ = ["D. Naudet"]
 __license__ = "MIT"
 __date__ = "02/10/2017"
 
+import itertools
+
 import numpy as np
+from silx.third_party import concurrent_futures
+from silx.third_party import six
 from .chistogramnd import chistogramnd as _chistogramnd  # noqa
 from .chistogramnd_lut import histogramnd_get_lut as _histo_get_lut
 from .chistogramnd_lut import histogramnd_from_lut as _histo_from_lut
+from .chistogramnd_lut import histogramnd_from_csr_lut as _histo_from_csr_lut
+
+
+_CHUNK_SIZE = 2 ** 20
+"""Default number of samples read at once by
+:meth:`Histogramnd.accumulate_chunks`"""
+
+
+def _is_array_like(data):
+    """Returns True if data has a shape and can be sliced.
+
+    :rtype: bool
+    """
+    return hasattr(data, "shape") and hasattr(data, "__getitem__")
+
+
+def _iter_blocks(data, chunk_size):
+    """Yields consecutive blocks of rows of an array-like object, as
+    C-contiguous arrays.
+
+    :param data: numpy array, h5py-like dataset or any object with a shape
+        and supporting slicing along the first dimension
+    :param int chunk_size: Number of rows of each block
+    :rtype: Iterator[numpy.ndarray]
+    """
+    length = data.shape[0]
+    for start in range(0, length, chunk_size):
+        yield np.ascontiguousarray(data[start:start + chunk_size])
+
+
+def _iter_chunks(data, chunk_size):
+    """Yields the chunks of data, see :meth:`Histogramnd.accumulate_chunks`.
+
+    :param data: Array-like object, iterable of arrays or None
+    :param int chunk_size: Number of rows of each block of an array-like
+        object
+    :rtype: Iterator[Union[numpy.ndarray,None]]
+    """
+    if data is None:
+        return itertools.repeat(None)
+    if _is_array_like(data):
+        return _iter_blocks(data, chunk_size)
+    return iter(data)
+
+
+def _get_chunk_size(data, chunk_size):
+    """Returns the number of rows read at once from an array-like object.
+
+    By default, it is a multiple of the chunks of a HDF5 dataset close to
+    :data:`_CHUNK_SIZE` samples.
+
+    :param data: Array-like object, iterable of arrays or None
+    :param Union[int,None] chunk_size: Requested number of rows
+    :rtype: int
+    """
+    if chunk_size is not None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be strictly positive")
+        return int(chunk_size)
+    chunks = getattr(data, "chunks", None)
+    if chunks:
+        return max(1, _CHUNK_SIZE // chunks[0]) * chunks[0]
+    return _CHUNK_SIZE
+
+
+def _get_bin_edges(histo_range, n_bins):
+    """Returns the bin edges of each dimension of a regular grid.
+
+    :param histo_range: The (D, 2) histogram range
+    :param n_bins: The number of bins of each dimension
+    :rtype: tuple of numpy.ndarray
+    """
+    histo_range = np.array(histo_range, dtype=np.double).reshape(-1)
+    edges = []
+    for i_dim, dim_n_bins in enumerate(n_bins):
+        dim_edges = np.zeros(dim_n_bins + 1)
+        rng_min = histo_range[2 * i_dim]
+        rng_max = histo_range[2 * i_dim + 1]
+        dim_edges[:-1] = (rng_min + np.arange(dim_n_bins) *
+                          ((rng_max - rng_min) / dim_n_bins))
+        dim_edges[-1] = rng_max
+        edges.append(dim_edges)
+    return tuple(edges)
+
+
+def _lut_to_csr(lut, n_bins):
+    """Converts a LUT (the bin index of each sample, -1 if out of the
+    histogram) to a compressed sparse row (CSR) LUT.
+
+    :param numpy.ndarray lut: The bin index of each sample
+    :param int n_bins: The total number of bins
+    :return: indptr, indices: The samples falling in bin *i* are
+        ``indices[indptr[i]:indptr[i + 1]]``
+    :rtype: tuple of numpy.ndarray
+    """
+    index_dtype = np.int32 if lut.size < 2**31 else np.int64
+    valid = np.nonzero(lut >= 0)[0]
+    bins = lut[valid]
+    # stable sort keeps the samples of each bin in their original order
+    indices = valid[np.argsort(bins, kind='mergesort')].astype(index_dtype)
+    indptr = np.zeros(n_bins + 1, dtype=index_dtype)
+    indptr[1:] = np.cumsum(np.bincount(bins, minlength=n_bins))
+    return indptr, indices
+
+
+def _csr_to_lut(indptr, indices, n_samples):
+    """Converts a CSR LUT back to the bin index of each sample.
+
+    See :func:`_lut_to_csr`.
+
+    :param numpy.ndarray indptr:
+    :param numpy.ndarray indices:
+    :param int n_samples: Total number of samples
+    :rtype: numpy.ndarray
+    """
+    n_bins = indptr.size - 1
+    if n_bins < 2**15:
+        lut_dtype = np.int16
+    elif n_bins < 2**31:
+        lut_dtype = np.int32
+    else:
+        lut_dtype = np.int64
+    lut = np.full(n_samples, -1, dtype=lut_dtype)
+    lut[indices] = np.repeat(np.arange(n_bins, dtype=lut_dtype),
+                             np.diff(indptr))
+    return lut
 
 
 class Histogramnd(object):
@@ -161,7 +297,8 @@ class Histogramnd(object):
                  weight_min=None,
                  weight_max=None,
                  last_bin_closed=False,
-                 wh_dtype=None):
+                 wh_dtype=None,
+                 n_threads=1):
         """
         :param sample:
             The data to be histogrammed.
@@ -231,12 +368,18 @@ class Histogramnd(object):
             of type numpy.double. Allowed values are : `numpy.double` and
             `numpy.float32`
         :type wh_dtype: *optional*, numpy data type
+
+        :param n_threads: number of threads used to compute the histogram
+            (here and in :meth:`accumulate`). If 0, all the available cores
+            are used. See :func:`silx.math.chistogramnd.chistogramnd`.
+        :type n_threads: *optional*, int
         """
 
         self.__histo_range = histo_range
         self.__n_bins = n_bins
         self.__last_bin_closed = last_bin_closed
         self.__wh_dtype = wh_dtype
+        self.__n_threads = n_threads
 
         if sample is None:
             self.__data = [None, None, None]
@@ -248,7 +391,8 @@ class Histogramnd(object):
                                         weight_min=weight_min,
                                         weight_max=weight_max,
                                         last_bin_closed=self.__last_bin_closed,
-                                        wh_dtype=self.__wh_dtype)
+                                        wh_dtype=self.__wh_dtype,
+                                        n_threads=self.__n_threads)
 
     def __getitem__(self, key):
         """
@@ -325,12 +469,85 @@ class Histogramnd(object):
                                last_bin_closed=self.__last_bin_closed,
                                histo=self.__data[0],
                                weighted_histo=self.__data[1],
-                               wh_dtype=self.__wh_dtype)
+                               wh_dtype=self.__wh_dtype,
+                               n_threads=self.__n_threads)
         if self.__data[0] is None:
             self.__data = result
         elif self.__data[1] is None and result[1] is not None:
             self.__data = result
 
+    def accumulate_chunks(self,
+                          sample,
+                          weights=None,
+                          weight_min=None,
+                          weight_max=None,
+                          chunk_size=None,
+                          prefetch=False):
+        """
+        Computes the multidimensional histogram of some data read block by
+        block and accumulates it into the histogram held by this instance of
+        Histogramnd.
+
+        Only one block of sample (and weights) is in memory at a time, so
+        that the data do not need to fit in memory. The result is the same
+        as calling :meth:`accumulate` on the whole data.
+
+        :param sample:
+            The data to be histogrammed, as described in :meth:`accumulate`.
+            It can be a numpy array, a h5py-like dataset, or any object
+            with a shape which can be sliced along its first dimension.
+            It can also be an iterable of numpy arrays (e.g a generator),
+            which are histogrammed one after the other.
+        :param weights:
+            The weights associated with each sample, as described in
+            :meth:`accumulate`. It has the same form as sample: an
+            array-like object with as many elements as sample, or an
+            iterable of arrays matching the chunks of sample.
+        :type weights: *optional*
+        :param weight_min: See :meth:`accumulate`
+        :type weight_min: *optional*, scalar
+        :param weight_max: See :meth:`accumulate`
+        :type weight_max: *optional*, scalar
+        :param chunk_size: Number of samples read at once from array-like
+            objects. By default, it is a multiple of the chunks of a HDF5
+            dataset, close to one million samples.
+        :type chunk_size: *optional*, int
+        :param bool prefetch: If True, the next block is read by another
+            thread while the current block is histogrammed.
+        """
+        if weights is not None and _is_array_like(sample) != _is_array_like(weights):
+            raise ValueError("sample and weights must both be array-like "
+                             "objects or both be iterables of arrays")
+
+        sample_chunk_size = _get_chunk_size(sample, chunk_size)
+        chunks = six.moves.zip(_iter_chunks(sample, sample_chunk_size),
+                               _iter_chunks(weights, sample_chunk_size))
+
+        if not prefetch:
+            for sample_chunk, weights_chunk in chunks:
+                if len(sample_chunk) == 0:
+                    continue
+                self.accumulate(sample_chunk,
+                                weights=weights_chunk,
+                                weight_min=weight_min,
+                                weight_max=weight_max)
+            return
+
+        with concurrent_futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(next, chunks, None)
+            while True:
+                chunk = future.result()
+                if chunk is None:
+                    break
+                future = executor.submit(next, chunks, None)
+                sample_chunk, weights_chunk = chunk
+                if len(sample_chunk) == 0:
+                    continue
+                self.accumulate(sample_chunk,
+                                weights=weights_chunk,
+                                weight_min=weight_min,
+                                weight_max=weight_max)
+
     histo = property(lambda self: self[0])
     """ Histogram array, or None if this instance was initialized without
         <sample> and accumulate has not been called yet.
@@ -349,6 +566,8 @@ class Histogramnd(object):
     """ Bins edges, or None if this instance was initialized without
         <sample> and accumulate has not been called yet.
     """
+    n_threads = property(lambda self: self.__n_threads)
+    """ Number of threads used to compute the histogram. """
 
 
 class HistogramndLut(object):
@@ -356,6 +575,11 @@ class HistogramndLut(object):
     The HistogramndLut class allows you to bin data onto a regular grid.
     The use of HistogramndLut is interesting when several sets of data that
     share the same coordinates (*sample*) have to be mapped onto the same grid.
+
+    The LUT can be saved with :meth:`save` and reloaded with :meth:`load`
+    to rebin data acquired with the same geometry without computing it
+    again, and a whole stack of weights can be binned at once with
+    :meth:`apply_lut_stack`.
     """
 
     def __init__(self,
@@ -402,15 +626,20 @@ class HistogramndLut(object):
                                            histo_range,
                                            n_bins,
                                            last_bin_closed=last_bin_closed)
+        self.__init_from_lut(lut, histo.shape, histo_range, edges,
+                             last_bin_closed, dtype)
 
-        self.__n_bins = np.array(histo.shape)
+    def __init_from_lut(self, lut, shape, histo_range, edges,
+                        last_bin_closed, dtype):
+        self.__n_bins = np.array(shape)
         self.__histo_range = histo_range
         self.__lut = lut
+        self.__csr_lut = None
         self.__histo = None
         self.__weighted_histo = None
         self.__edges = edges
         self.__dtype = dtype
-        self.__shape = histo.shape
+        self.__shape = tuple(shape)
         self.__last_bin_closed = last_bin_closed
         self.clear()
 
@@ -428,6 +657,24 @@ class HistogramndLut(object):
         """
         return self.__lut.copy()
 
+    @property
+    def csr_lut(self):
+        """
+        The Lut in compressed sparse row (CSR) format, as a tuple of arrays
+        (*indptr*, *indices*): the indices of the samples falling in the
+        flattened bin *i* are ``indices[indptr[i]:indptr[i + 1]]``.
+        Samples out of the histogram are not stored.
+
+        The arrays are computed on first access.
+
+        .. note:: these are **references** to the arrays stored in this
+            HistogramndLut instance, they must not be modified.
+        """
+        if self.__csr_lut is None:
+            self.__csr_lut = _lut_to_csr(self.__lut,
+                                         int(np.prod(self.__shape)))
+        return self.__csr_lut
+
     def histo(self, copy=True):
         """
         Histogram (a copy of it), or None if `~accumulate` has not been called yet
@@ -589,5 +836,160 @@ class HistogramndLut(object):
         self.__dtype = w_histo.dtype
         return histo, w_histo
 
+    def apply_lut_stack(self,
+                        weights,
+                        histo=None,
+                        weighted_histo=None,
+                        weight_min=None,
+                        weight_max=None):
+        """
+        Computes the multidimensional histograms of a stack of data sharing
+        the coordinates provided at instantiation time (e.g : the frames of
+        a scan) and returns them (they are NOT added to the current
+        histogram stored by this instance).
+
+        The whole stack is binned in one pass over the :attr:`csr_lut`,
+        the frames being processed in parallel.
+
+        :param weights:
+            A (n_frames, ...) numpy array, each frame containing as many
+            elements as the number of samples provided at instantiation time.
+        :type weights: :class:`numpy.array`
+
+        :param histo:
+            Use this parameter if you want to pass your own
+            (n_frames, ...) C-contiguous histogram array. New values will
+            be added to this array. The returned array will then be this one.
+        :type histo: *optional*, :class:`numpy.array`
+
+        :param weighted_histo:
+            Use this parameter if you want to pass your own
+            (n_frames, ...) C-contiguous weighted histogram array. New
+            values will be added to this array. The returned array will
+            then be this one.
+        :type weighted_histo: *optional*, :class:`numpy.array`
+
+        :param weight_min: See :meth:`apply_lut`
+        :type weight_min: *optional*, scalar
+
+        :param weight_max: See :meth:`apply_lut`
+        :type weight_max: *optional*, scalar
+
+        :return: The histograms and weighted histograms of the frames, as
+            arrays of shape (n_frames,) + histogram shape
+        :rtype: tuple : (:class:`numpy.array`, :class:`numpy.array`)
+        """
+        weights = np.asarray(weights)
+        n_frames = len(weights)
+        if weights.size != n_frames * self.__lut.size:
+            raise ValueError('Each frame of <weights> must have as many '
+                             'elements as the LUT ({0}).'
+                             ''.format(self.__lut.size))
+        weights = weights.reshape((n_frames, self.__lut.size))
+
+        shape = (n_frames,) + self.__shape
+        for array in (histo, weighted_histo):
+            if array is not None and array.shape != shape:
+                raise ValueError('The histogram arrays must have a '
+                                 '{0} shape.'.format(shape))
+
+        indptr, indices = self.csr_lut
+        result = _histo_from_csr_lut(weights,
+                                     indptr,
+                                     indices,
+                                     histo=histo,
+                                     weighted_histo=weighted_histo,
+                                     dtype=self.__dtype,
+                                     weight_min=weight_min,
+                                     weight_max=weight_max)
+        if histo is None:
+            histo = result[0].reshape(shape)
+        if weighted_histo is None:
+            weighted_histo = result[1].reshape(shape)
+        self.__dtype = weighted_histo.dtype
+        return histo, weighted_histo
+
+    def save(self, filename):
+        """
+        Saves the Lut and the grid description to a file, so that it can be
+        reloaded with :meth:`load`.
+
+        The Lut is stored in CSR format (see :attr:`csr_lut`). The file is
+        a numpy *.npz* archive if *filename* ends with *.npz*, a HDF5 file
+        otherwise (this requires :mod:`h5py`).
+
+        :param str filename: Name of the file to write
+        """
+        indptr, indices = self.csr_lut
+        content = {'indptr': indptr,
+                   'indices': indices,
+                   'n_samples': self.__lut.size,
+                   'n_bins': self.__n_bins,
+                   'histo_range': np.array(self.__histo_range,
+                                           dtype=np.double),
+                   'last_bin_closed': bool(self.__last_bin_closed)}
+        if self.__dtype is not None:
+            content['dtype'] = np.dtype(self.__dtype).str
+
+        if filename.endswith('.npz'):
+            np.savez_compressed(filename, **content)
+        else:
+            import h5py
+            with h5py.File(filename, 'w') as h5f:
+                for name, value in content.items():
+                    if name in ('indptr', 'indices'):
+                        h5f.create_dataset(name, data=value,
+                                           compression='gzip')
+                    else:
+                        h5f[name] = value
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Creates a HistogramndLut from a file written by :meth:`save`.
+
+        :param str filename: Name of the *.npz* or HDF5 file to read
+        :rtype: HistogramndLut
+        """
+        if filename.endswith('.npz'):
+            with np.load(filename) as npz:
+                content = dict((name, npz[name]) for name in npz.files)
+        else:
+            import h5py
+            with h5py.File(filename, 'r') as h5f:
+                content = dict((name, h5f[name][()]) for name in h5f)
+
+        try:
+            indptr = content['indptr']
+            indices = content['indices']
+            n_samples = int(content['n_samples'])
+            n_bins = content['n_bins']
+            histo_range = content['histo_range']
+            last_bin_closed = bool(content['last_bin_closed'])
+        except KeyError as e:
+            raise ValueError('%s is not a HistogramndLut file, '
+                             '%s is missing' % (filename, e))
+        dtype = content.get('dtype')
+        if dtype is not None:
+            if isinstance(dtype, np.ndarray):
+                dtype = dtype.item()
+            if isinstance(dtype, six.binary_type):
+                dtype = dtype.decode('ascii')
+            dtype = np.dtype(str(dtype))
+
+        if indptr.size != np.prod(n_bins) + 1:
+            raise ValueError('%s: the LUT does not match the number of bins'
+                             % filename)
+
+        instance = cls.__new__(cls)
+        instance.__init_from_lut(_csr_to_lut(indptr, indices, n_samples),
+                                 tuple(int(n) for n in n_bins),
+                                 histo_range,
+                                 _get_bin_edges(histo_range, n_bins),
+                                 last_bin_closed,
+                                 dtype)
+        instance.__csr_lut = indptr, indices
+        return instance
+
 if __name__ == '__main__':
     pass
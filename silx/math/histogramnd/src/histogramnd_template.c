@@ -27,133 +27,67 @@
 #include <stdlib.h>
 #include <math.h>
 #include <stdarg.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#ifndef HISTO_MIN_ELEM_PER_THREAD
+/* Below this number of elements per thread, the cost of the partial
+ * histograms is not worth it. */
+#define HISTO_MIN_ELEM_PER_THREAD 65536
+#endif
 
 #ifdef HISTO_SAMPLE_T
 #ifdef HISTO_WEIGHT_T
 #ifdef HISTO_CUMUL_T
 
-int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+/* Bins the elements i_begin to i_end (excluded) of the sample.
+ */
+static void TEMPLATE(histogramnd_range, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
                         (HISTO_SAMPLE_T *i_sample,
                          HISTO_WEIGHT_T *i_weights,
                          int i_n_dim,
-                         int i_n_elem,
-                         double *i_bin_ranges,
+                         long i_begin,
+                         long i_end,
+                         double *g_min,
+                         double *g_max,
+                         double *range,
                          int *i_n_bins,
                          uint32_t *o_histo,
                          HISTO_CUMUL_T *o_cumul,
-                         double *o_bin_edges,
-                         int i_opt_flags,
+                         int filt_min_weight,
+                         int filt_max_weight,
+                         int last_bin_closed,
                          HISTO_WEIGHT_T i_weight_min,
                          HISTO_WEIGHT_T i_weight_max)
 {
-    /* some counters */
-    int i = 0, j = 0;
+    int i = 0;
+    long elem = 0;
     long elem_idx = 0;
-    
-    HISTO_WEIGHT_T * weight_ptr = 0;
+
     HISTO_SAMPLE_T elem_coord = 0.;
-    
+
     /* computed bin index (i_sample -> grid) */
     long bin_idx = 0;
-    
-    double * g_min = 0;
-    double * g_max = 0;
-    double * range = 0;
-    
-    /* ================================
-     * Parsing options, if any.
-     * ================================
-     */
-    
-    int filt_min_weight = 0;
-    int filt_max_weight = 0;
-    int last_bin_closed = 0;
-    
-    /* Testing the option flags */
-    if(i_opt_flags & HISTO_WEIGHT_MIN)
-    {
-        filt_min_weight = 1;
-    }
-        
-    if(i_opt_flags & HISTO_WEIGHT_MAX)
-    {
-        filt_max_weight = 1;
-    }
-        
-    if(i_opt_flags & HISTO_LAST_BIN_CLOSED)
-    {
-        last_bin_closed = 1;
-    }
-    
-    /* storing the min & max bin coordinates in their own arrays because
-     * i_bin_ranges = [[min0, max0], [min1, max1], ...]
-     * (mostly for the sake of clarity)
-     * (maybe faster access too?)
-     */
-    g_min = (double *) malloc(i_n_dim *sizeof(double));
-    g_max = (double *) malloc(i_n_dim * sizeof(double));
-    /* range used to convert from i_coords to bin indices in the grid */
-    range = (double *) malloc(i_n_dim * sizeof(double));
-            
-    if(!g_min || !g_max || !range)
-    {
-        free(g_min);
-        free(g_max);
-        free(range);
-        return HISTO_ERR_ALLOC;
-    }
-    
-    j = 0;
-    for(i=0; i<i_n_dim; i++)
-    {
-        g_min[i] = i_bin_ranges[i*2];
-        g_max[i] = i_bin_ranges[i*2+1];
-        range[i] = g_max[i]-g_min[i];
-        
-        for(bin_idx=0; bin_idx<i_n_bins[i]; j++, bin_idx++)
-        {
-            o_bin_edges[j] = g_min[i] +
-                            bin_idx * (range[i] / i_n_bins[i]);
-        }
-        o_bin_edges[j++] = g_max[i];
-    }
-    
-    weight_ptr = i_weights;
-    
-    if(!i_weights)
-    {
-        /* if weights are not provided there no point in trying to filter them
-         * (!! careful if you change this, some code below relies on it !!)
-         */
-        filt_min_weight = 0;
-        filt_max_weight = 0;
-        
-        /* If the weights array is not provided then there is no point
-         * updating the weighted histogram, only the bin counts (o_histo)
-         * will be filled.
-         * (!! careful if you change this, some code below relies on it !!)
-         */
-        o_cumul = 0;
-    }
-    
+
     /* tried to use pointers instead of indices here, but it didn't
      * seem any faster (probably because the compiler 
      * optimizes stuff anyway),
      * so i'm keeping the "indices" version, for the sake of clarity
     */
-    for(elem_idx=0;
-        elem_idx<i_n_elem*i_n_dim;
-        elem_idx+=i_n_dim, weight_ptr++)
+    for(elem=i_begin, elem_idx=i_begin*i_n_dim;
+        elem<i_end;
+        elem++, elem_idx+=i_n_dim)
     {
-        /* no testing the validity of weight_ptr here, because if it is NULL
+        /* no testing the validity of i_weights here, because if it is NULL
          * then filt_min_weight/filt_max_weight will be 0.
-         * (see code above)
+         * (see histogramnd)
          */
-        if(filt_min_weight && *weight_ptr<i_weight_min)
+        if(filt_min_weight && i_weights[elem]<i_weight_min)
         {
             continue;
         }
-        if(filt_max_weight && *weight_ptr>i_weight_max)
+        if(filt_max_weight && i_weights[elem]>i_weight_max)
         {
             continue;
         }
@@ -239,10 +173,202 @@ int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
             /* not testing the pointer since o_cumul is null if 
              * i_weights is null. 
              */
-            o_cumul[bin_idx] += (HISTO_CUMUL_T) *weight_ptr;
+            o_cumul[bin_idx] += (HISTO_CUMUL_T) i_weights[elem];
         }
         
-    } /* for(elem_idx=0; elem_idx<i_n_elem*i_n_dim; elem_idx+=i_n_dim) */
+    } /* for(elem=i_begin; elem<i_end; elem++) */
+}
+
+int TEMPLATE(histogramnd, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                        (HISTO_SAMPLE_T *i_sample,
+                         HISTO_WEIGHT_T *i_weights,
+                         int i_n_dim,
+                         int i_n_elem,
+                         double *i_bin_ranges,
+                         int *i_n_bins,
+                         uint32_t *o_histo,
+                         HISTO_CUMUL_T *o_cumul,
+                         double *o_bin_edges,
+                         int i_opt_flags,
+                         HISTO_WEIGHT_T i_weight_min,
+                         HISTO_WEIGHT_T i_weight_max,
+                         int i_n_threads)
+{
+    /* some counters */
+    int i = 0, j = 0;
+    long bin_idx = 0;
+    
+    double * g_min = 0;
+    double * g_max = 0;
+    double * range = 0;
+
+    /* threads and their partial histograms */
+    int n_threads = 1;
+#ifdef _OPENMP
+    long n_histo = 1;
+    uint32_t * p_histo = 0;
+    HISTO_CUMUL_T * p_cumul = 0;
+#endif
+    
+    /* ================================
+     * Parsing options, if any.
+     * ================================
+     */
+    
+    int filt_min_weight = 0;
+    int filt_max_weight = 0;
+    int last_bin_closed = 0;
+    
+    /* Testing the option flags */
+    if(i_opt_flags & HISTO_WEIGHT_MIN)
+    {
+        filt_min_weight = 1;
+    }
+        
+    if(i_opt_flags & HISTO_WEIGHT_MAX)
+    {
+        filt_max_weight = 1;
+    }
+        
+    if(i_opt_flags & HISTO_LAST_BIN_CLOSED)
+    {
+        last_bin_closed = 1;
+    }
+    
+    /* storing the min & max bin coordinates in their own arrays because
+     * i_bin_ranges = [[min0, max0], [min1, max1], ...]
+     * (mostly for the sake of clarity)
+     * (maybe faster access too?)
+     */
+    g_min = (double *) malloc(i_n_dim *sizeof(double));
+    g_max = (double *) malloc(i_n_dim * sizeof(double));
+    /* range used to convert from i_coords to bin indices in the grid */
+    range = (double *) malloc(i_n_dim * sizeof(double));
+            
+    if(!g_min || !g_max || !range)
+    {
+        free(g_min);
+        free(g_max);
+        free(range);
+        return HISTO_ERR_ALLOC;
+    }
+    
+    j = 0;
+    for(i=0; i<i_n_dim; i++)
+    {
+        g_min[i] = i_bin_ranges[i*2];
+        g_max[i] = i_bin_ranges[i*2+1];
+        range[i] = g_max[i]-g_min[i];
+        
+        for(bin_idx=0; bin_idx<i_n_bins[i]; j++, bin_idx++)
+        {
+            o_bin_edges[j] = g_min[i] +
+                            bin_idx * (range[i] / i_n_bins[i]);
+        }
+        o_bin_edges[j++] = g_max[i];
+    }
+    
+    if(!i_weights)
+    {
+        /* if weights are not provided there no point in trying to filter them
+         * (!! careful if you change this, some code below relies on it !!)
+         */
+        filt_min_weight = 0;
+        filt_max_weight = 0;
+        
+        /* If the weights array is not provided then there is no point
+         * updating the weighted histogram, only the bin counts (o_histo)
+         * will be filled.
+         * (!! careful if you change this, some code below relies on it !!)
+         */
+        o_cumul = 0;
+    }
+
+    /* ================================
+     * Each thread bins a range of the sample into its own histogram,
+     * the first thread into the output, the other ones into partial
+     * histograms which are then added to the output.
+     * ================================
+     */
+#ifdef _OPENMP
+    n_threads = i_n_threads > 0 ? i_n_threads : omp_get_max_threads();
+    if(n_threads > i_n_elem / HISTO_MIN_ELEM_PER_THREAD)
+    {
+        n_threads = i_n_elem / HISTO_MIN_ELEM_PER_THREAD;
+    }
+    if(n_threads > 1)
+    {
+        for(i=0; i<i_n_dim; i++)
+        {
+            n_histo *= i_n_bins[i];
+        }
+        if(o_histo)
+        {
+            p_histo = (uint32_t *) calloc((n_threads - 1) * n_histo,
+                                          sizeof(uint32_t));
+        }
+        if(o_cumul)
+        {
+            p_cumul = (HISTO_CUMUL_T *) calloc((n_threads - 1) * n_histo,
+                                               sizeof(HISTO_CUMUL_T));
+        }
+        if((o_histo && !p_histo) || (o_cumul && !p_cumul))
+        {
+            /* not enough memory for the partial histograms */
+            free(p_histo);
+            free(p_cumul);
+            p_histo = 0;
+            p_cumul = 0;
+            n_threads = 1;
+        }
+    }
+#endif
+
+    if(n_threads <= 1)
+    {
+        TEMPLATE(histogramnd_range, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+            (i_sample, i_weights, i_n_dim, 0, i_n_elem,
+             g_min, g_max, range, i_n_bins, o_histo, o_cumul,
+             filt_min_weight, filt_max_weight, last_bin_closed,
+             i_weight_min, i_weight_max);
+    }
+#ifdef _OPENMP
+    else
+    {
+        #pragma omp parallel for num_threads(n_threads) schedule(static, 1)
+        for(i=0; i<n_threads; i++)
+        {
+            TEMPLATE(histogramnd_range, HISTO_SAMPLE_T, HISTO_WEIGHT_T, HISTO_CUMUL_T)
+                (i_sample, i_weights, i_n_dim,
+                 ((long) i_n_elem * i) / n_threads,
+                 ((long) i_n_elem * (i + 1)) / n_threads,
+                 g_min, g_max, range, i_n_bins,
+                 (i == 0 || !o_histo) ? o_histo : p_histo + (i - 1) * n_histo,
+                 (i == 0 || !o_cumul) ? o_cumul : p_cumul + (i - 1) * n_histo,
+                 filt_min_weight, filt_max_weight, last_bin_closed,
+                 i_weight_min, i_weight_max);
+        }
+
+        #pragma omp parallel for num_threads(n_threads) private(i)
+        for(bin_idx=0; bin_idx<n_histo; bin_idx++)
+        {
+            for(i=1; i<n_threads; i++)
+            {
+                if(o_histo)
+                {
+                    o_histo[bin_idx] += p_histo[(i - 1) * n_histo + bin_idx];
+                }
+                if(o_cumul)
+                {
+                    o_cumul[bin_idx] += p_cumul[(i - 1) * n_histo + bin_idx];
+                }
+            }
+        }
+
+        free(p_histo);
+        free(p_cumul);
+    }
+#endif
     
     free(g_min);
     free(g_max);
@@ -23,7 +23,7 @@
 # ###########################################################################*/
 // __authors__ = ["H. Payno"]
 // __license__ = "MIT"
-// __date__ = "10/02/2017"
+// __date__ = "01/06/2018"
 
 #ifndef MEDIAN_FILTER
 #define MEDIAN_FILTER
@@ -31,8 +31,8 @@
 #include <vector>
 #include <assert.h>
 #include <algorithm>
-#include <signal.h>
-#include <iostream>
+#include <cstddef>
+#include <limits>
 #include <cmath>
 #include <cfloat>
 
@@ -54,43 +54,6 @@ enum MODE{
     CONSTANT=4,
 };
 
-// Simple function browsing a deque and registering the min and max values
-// and if those values are unique or not
-template<typename T>
-void getMinMax(std::vector<T>& v, T& min, T&max,
-    typename std::vector<T>::const_iterator end){
-    // init min and max values
-    typename std::vector<T>::const_iterator it = v.begin();
-    if (v.size() == 0){
-        raise(SIGINT);
-    }else{
-        min = max = *it;
-    }
-    it++;
-
-    // Browse all the deque
-    while(it!=end){
-        // check if repeated (should always be before min/max setting)
-        T value = *it;
-        if(value > max) max = value;
-        if(value < min) min = value;
-
-        it++;
-    }
-}
-
-
-// apply the median filter only on limited part of the vector
-// In case of even number of elements (either due to NaNs in the window
-// or for image borders in shrink mode):
-// the highest of the 2 central values is returned
-template<typename T>
-inline T median(std::vector<T>& v, int window_size) {
-    int pivot = window_size / 2;
-    std::nth_element(v.begin(), v.begin() + pivot, v.begin()+window_size);
-    return v[pivot];
-}
-
 
 // return the index into 0, (length_max - 1) in reflect mode
 inline int reflect(int index, int length_max){
@@ -126,144 +89,349 @@ inline int mirror(int index, int length_max){
     return res;
 }
 
-// Browse the column of pixel_x
+// return the index into 0, (length_max - 1) of the pixel to use for index,
+// or -1 if this is a pixel outside the image (shrink and constant modes)
+inline int map_index(int index, int length_max, MODE mode){
+    if(index >= 0 && index < length_max){
+        return index;
+    }
+    switch(mode){
+        case NEAREST:
+            return std::min(std::max(index, 0), length_max - 1);
+        case REFLECT:
+            return reflect(index, length_max);
+        case MIRROR:
+            // deal with dimensions of length 1 (e.g., 1d case)
+            return (length_max == 1) ? 0 : mirror(index, length_max);
+        default:
+            return -1;
+    }
+}
+
+
+// Sorted values of a sliding window.
+// The window is updated with one merge of the columns leaving and entering
+// the window, so an update costs O(window size) instead of the
+// O(window size * log(window size)) of a sort.
 template<typename T>
-void median_filter(
+class SortedWindow {
+public:
+    // The columns given to update must be sorted
+    static const bool sorted_columns = true;
+
+    SortedWindow(int capacity): values(capacity), buffer(capacity), size(0) {}
+
+    int count() const { return size; }
+
+    // Remove the values of removed and insert the values of added
+    void update(const T* removed, int n_removed, const T* added, int n_added){
+        int i = 0, j = 0, k = 0, n = 0;
+        while(i < size){
+            const T value = values[i];
+            if(j < n_removed && !(removed[j] < value)){
+                if(!(value < removed[j])){
+                    // Equal: this is a removed value
+                    i++;
+                    j++;
+                    continue;
+                }
+            }
+            while(k < n_added && added[k] < value){
+                buffer[n++] = added[k++];
+            }
+            buffer[n++] = value;
+            i++;
+        }
+        while(k < n_added){
+            buffer[n++] = added[k++];
+        }
+        values.swap(buffer);
+        size = n;
+    }
+
+    // In event of an even number of values, the highest of the 2 central
+    // values is returned
+    T median() { return values[size / 2]; }
+
+    bool is_extremum(T value) const {
+        return (value == values[0]) || (value == values[size - 1]);
+    }
+
+private:
+    std::vector<T> values;
+    std::vector<T> buffer;
+    int size;
+};
+
+
+// Histogram of the values of a sliding window of 16 bits integers.
+// The median is tracked from one position of the window to the next
+// (Huang's algorithm), using coarse bins of 256 values to move fast
+// through large gaps between the values.
+template<typename T>
+class HistogramWindow {
+public:
+    static const bool sorted_columns = false;
+
+    HistogramWindow(int capacity): fine(1 << 16, 0), coarse(1 << 8, 0),
+                                   size(0), med(0), below(0) {}
+
+    int count() const { return size; }
+
+    void update(const T* removed, int n_removed, const T* added, int n_added){
+        for(int i = 0; i < n_removed; i++){
+            int b = bin(removed[i]);
+            fine[b]--;
+            coarse[b >> 8]--;
+            if(b < med) below--;
+        }
+        for(int i = 0; i < n_added; i++){
+            int b = bin(added[i]);
+            fine[b]++;
+            coarse[b >> 8]++;
+            if(b < med) below++;
+        }
+        size += n_added - n_removed;
+    }
+
+    // In event of an even number of values, the highest of the 2 central
+    // values is returned
+    T median(){
+        const int rank = size / 2;
+        // below is the number of values in the bins lower than med
+        while(below > rank){
+            if(((med & 0xFF) == 0) && (below - coarse[(med >> 8) - 1] > rank)){
+                med -= 256;
+                below -= coarse[med >> 8];
+            }else{
+                med--;
+                below -= fine[med];
+            }
+        }
+        while(below + fine[med] <= rank){
+            if(((med & 0xFF) == 0) && (below + coarse[med >> 8] <= rank)){
+                below += coarse[med >> 8];
+                med += 256;
+            }else{
+                below += fine[med];
+                med++;
+            }
+        }
+        return static_cast<T>(med + std::numeric_limits<T>::min());
+    }
+
+    // value must be in the window
+    bool is_extremum(T value) const {
+        const int b = bin(value);
+        return is_empty(0, b) || is_empty(b + 1, 1 << 16);
+    }
+
+private:
+    static int bin(T value){
+        return static_cast<int>(value) - std::numeric_limits<T>::min();
+    }
+
+    // Returns true if there is no value in the bins [first, last)
+    bool is_empty(int first, int last) const {
+        int b = first;
+        while(b < last){
+            if(((b & 0xFF) == 0) && (b + 256 <= last)){
+                if(coarse[b >> 8] != 0) return false;
+                b += 256;
+            }else{
+                if(fine[b] != 0) return false;
+                b++;
+            }
+        }
+        return true;
+    }
+
+    std::vector<int> fine;
+    std::vector<int> coarse;
+    int size;
+    int med;
+    int below;
+};
+
+
+// Sliding window used for each type for large windows.
+// For small windows, SortedWindow is used for all types.
+template<typename T>
+struct LargeWindow { typedef SortedWindow<T> type; };
+
+template<>
+struct LargeWindow<short> { typedef HistogramWindow<short> type; };
+
+template<>
+struct LargeWindow<unsigned short> { typedef HistogramWindow<unsigned short> type; };
+
+// Minimum number of values in a window to use LargeWindow
+const int LARGE_WINDOW_SIZE = 25;
+
+
+// Apply the median filter to the rows [row_min, row_max] of a 3D image.
+// Rows are indexed as depth * height + height index.
+// Each row is processed with a window sliding along the x axis: moving
+// the window by one pixel removes one column of depth * height values and
+// inserts a new one.
+template<typename T, typename window_type>
+void median_filter_rows(
     const T* input,
     T* output,
-    int* kernel_dim,        // two values : 0:width, 1:height
-    int* image_dim,         // two values : 0:width, 1:height
-    int y_pixel,            // the x pixel to process
-    int x_pixel_range_min,
-    int x_pixel_range_max,
+    int* kernel_dim,        // three values : 0:depth, 1:height, 2:width
+    int* image_dim,         // three values : 0:depth, 1:height, 2:width
+    int row_min,            // the first row to process
+    int row_max,            // the last row to process
     bool conditional,
     int pMode,
     T cval) {
-    
+
     assert(kernel_dim[0] > 0);
     assert(kernel_dim[1] > 0);
-    assert(y_pixel >= 0);
+    assert(kernel_dim[2] > 0);
     assert(image_dim[0] > 0);
     assert(image_dim[1] > 0);
-    assert(y_pixel >= 0);
-    assert(y_pixel < image_dim[0]);
-    assert(x_pixel_range_max < image_dim[1]);
-    assert(x_pixel_range_min <= x_pixel_range_max);
+    assert(image_dim[2] > 0);
+    assert(row_min >= 0);
+    assert(row_max < image_dim[0] * image_dim[1]);
+    assert(row_min <= row_max);
     // kernel odd assertion
     assert((kernel_dim[0] - 1)%2 == 0);
     assert((kernel_dim[1] - 1)%2 == 0);
+    assert((kernel_dim[2] - 1)%2 == 0);
 
-    // # this should be move up to avoid calculation each time
-    int halfKernel_x = (kernel_dim[1] - 1) / 2;
-    int halfKernel_y = (kernel_dim[0] - 1) / 2;
+    const int halfKernel_z = (kernel_dim[0] - 1) / 2;
+    const int halfKernel_y = (kernel_dim[1] - 1) / 2;
+    const int halfKernel_x = (kernel_dim[2] - 1) / 2;
+    const int width = image_dim[2];
+    // Number of values in a column of the window
+    const int column_size = (2 * halfKernel_z + 1) * (2 * halfKernel_y + 1);
+    // The columns of the window are kept in a ring buffer until they
+    // leave the window, with one spare slot for the incoming column
+    const int nb_slots = 2 * halfKernel_x + 2;
 
     MODE mode = static_cast<MODE>(pMode);
 
-    // init buffer
-    std::vector<T> window_values(kernel_dim[0]*kernel_dim[1]);
+    window_type window(column_size * (2 * halfKernel_x + 1));
+    std::vector<T> columns(column_size * nb_slots);
+    std::vector<int> column_lengths(nb_slots, 0);
+    // Offsets of the rows of the window, -1 for rows outside the image
+    std::vector<std::ptrdiff_t> row_offsets(column_size);
 
-    bool not_horizontal_border = (y_pixel >= halfKernel_y && y_pixel < image_dim[0] - halfKernel_y);
+    for(int row=row_min; row <= row_max; row++){
+        const int z_pixel = row / image_dim[1];
+        const int y_pixel = row % image_dim[1];
 
-    for(int x_pixel=x_pixel_range_min; x_pixel <= x_pixel_range_max; x_pixel ++ ){
-        typename std::vector<T>::iterator it = window_values.begin();
-        // fill the vector
+        int index = 0;
+        for(int win_z=z_pixel-halfKernel_z; win_z<=z_pixel+halfKernel_z; win_z++){
+            const int index_z = map_index(win_z, image_dim[0], mode);
+            for(int win_y=y_pixel-halfKernel_y; win_y<=y_pixel+halfKernel_y; win_y++){
+                const int index_y = map_index(win_y, image_dim[1], mode);
+                if(index_z < 0 || index_y < 0){
+                    row_offsets[index] = -1;
+                }else{
+                    row_offsets[index] = (static_cast<std::ptrdiff_t>(index_z) * image_dim[1] + index_y) * width;
+                }
+                index++;
+            }
+        }
 
-        if (not_horizontal_border &&
-            x_pixel >= halfKernel_x && x_pixel < image_dim[1] - halfKernel_x) {
-            //This is not a border, just fill it
-            for(int win_y=y_pixel-halfKernel_y; win_y<= y_pixel+halfKernel_y; win_y++) {
-                for(int win_x = x_pixel-halfKernel_x; win_x <= x_pixel+halfKernel_x; win_x++){
-                    T value = input[win_y*image_dim[1] + win_x];
-                    if (value == value) {  // Ignore NaNs
-                        *it = value;
-                        ++it;
+        // Slide the window along the row, column win_x enters the window
+        // when processing pixel win_x - halfKernel_x
+        for(int win_x=-halfKernel_x; win_x < width + halfKernel_x; win_x++){
+            // fill the incoming column
+            const int slot = (win_x + halfKernel_x) % nb_slots;
+            T* column = &columns[slot * column_size];
+            int length = 0;
+            const int index_x = map_index(win_x, width, mode);
+            for(int i=0; i < column_size; i++){
+                T value = 0;
+                if(index_x < 0 || row_offsets[i] < 0){
+                    if(mode == SHRINK){
+                        continue;
                     }
+                    value = cval;
+                }else{
+                    value = input[row_offsets[i] + index_x];
                 }
+                if (value == value) {  // Ignore NaNs
+                    column[length] = value;
+                    length++;
+                }
+            }
+            if(window_type::sorted_columns){
+                std::sort(column, column + length);
             }
+            column_lengths[slot] = length;
 
-        } else { // This is a border, handle the special case
-            for(int win_y=y_pixel-halfKernel_y; win_y<= y_pixel+halfKernel_y; win_y++)
-            {
-                for(int win_x = x_pixel-halfKernel_x; win_x <= x_pixel+halfKernel_x; win_x++)
-                {
-                    T value = 0;
-                    int index_x = win_x;
-                    int index_y = win_y;
-
-                    switch(mode){
-                        case NEAREST:
-                            index_x = std::min(std::max(win_x, 0), image_dim[1] - 1);
-                            index_y = std::min(std::max(win_y, 0), image_dim[0] - 1);
-                            value = input[index_y*image_dim[1] + index_x];
-                            break;
-
-                        case REFLECT:
-                            index_x = reflect(win_x, image_dim[1]);
-                            index_y = reflect(win_y, image_dim[0]);
-                            value = input[index_y*image_dim[1] + index_x];
-                            break;
-
-                        case MIRROR:
-                            index_x = mirror(win_x, image_dim[1]);
-                            // deal with 1d case
-                            if(win_y == 0 && image_dim[0] == 1){
-                                index_y = 0;
-                            }else{
-                                index_y = mirror(win_y, image_dim[0]);
-                            }
-                            value = input[index_y*image_dim[1] + index_x];
-                            break;
-
-                        case SHRINK:
-                            if ((index_x < 0) || (index_x > image_dim[1] -1) ||
-                                (index_y < 0) || (index_y > image_dim[0] -1)) {
-                                continue;
-                            }
-                            value = input[index_y*image_dim[1] + index_x];
-                            break;
-                        case CONSTANT:
-                            if ((index_x < 0) || (index_x > image_dim[1] -1) ||
-                                (index_y < 0) || (index_y > image_dim[0] -1)) {
-                                value = cval;
-                            } else {
-                                value = input[index_y*image_dim[1] + index_x];
-                            }
-                            break;
-                    }
+            // remove the outgoing column, if any
+            const int x_pixel = win_x - halfKernel_x;
+            if(x_pixel > 0){
+                const int old_slot = (slot + 1) % nb_slots;
+                window.update(&columns[old_slot * column_size], column_lengths[old_slot],
+                              column, length);
+            }else{
+                window.update(column, 0, column, length);
+            }
 
-                    if (value == value) {  // Ignore NaNs
-                        *it = value;
-                        ++it;
-                    }
-                }
+            if(x_pixel < 0){
+                continue;  // window not full yet
             }
-        }
 
-        //window_size can be smaller than kernel size in shrink mode or if there is NaNs
-        int window_size = std::distance(window_values.begin(), it);
-
-        if (window_size == 0) {
-            // Window is empty, this is the case when all values are NaNs
-            output[image_dim[1]*y_pixel + x_pixel] = NAN;
-
-        } else {
-            // apply the median value if needed for this pixel
-            const T currentPixelValue = input[image_dim[1]*y_pixel + x_pixel];
-            if (conditional == true){
-                typename std::vector<T>::iterator window_end = window_values.begin() + window_size;
-                T min = 0;
-                T max = 0;
-                getMinMax(window_values, min, max, window_end);
+            const std::ptrdiff_t output_index = static_cast<std::ptrdiff_t>(row) * width + x_pixel;
+            //window size can be smaller than kernel size in shrink mode or if there is NaNs
+            if(window.count() == 0){
+                // Window is empty, this is the case when all values are NaNs
+                output[output_index] = NAN;
+            }else if(conditional == true){
                 // NaNs are propagated through unchanged
-                if ((currentPixelValue == max) || (currentPixelValue == min)){
-                    output[image_dim[1]*y_pixel + x_pixel] = median<T>(window_values, window_size);
+                const T currentPixelValue = input[output_index];
+                if(window.is_extremum(currentPixelValue)){
+                    output[output_index] = window.median();
                 }else{
-                    output[image_dim[1]*y_pixel + x_pixel] = currentPixelValue;
+                    output[output_index] = currentPixelValue;
                 }
             }else{
-                output[image_dim[1]*y_pixel + x_pixel] = median<T>(window_values, window_size);
+                output[output_index] = window.median();
             }
         }
+
+        // empty the window for the next row
+        for(int win_x=width - 1 - halfKernel_x; win_x < width + halfKernel_x; win_x++){
+            const int slot = (win_x + halfKernel_x) % nb_slots;
+            window.update(&columns[slot * column_size], column_lengths[slot],
+                          NULL, 0);
+        }
+    }
+}
+
+// Apply the median filter to the rows [row_min, row_max] of a 3D image,
+// see median_filter_rows.
+template<typename T>
+void median_filter(
+    const T* input,
+    T* output,
+    int* kernel_dim,        // three values : 0:depth, 1:height, 2:width
+    int* image_dim,         // three values : 0:depth, 1:height, 2:width
+    int row_min,            // the first row to process
+    int row_max,            // the last row to process
+    bool conditional,
+    int pMode,
+    T cval) {
+
+    int window_size = 1;
+    for(int i=0; i < 3; i++){
+        window_size *= 2 * ((kernel_dim[i] - 1) / 2) + 1;
+    }
+
+    if(window_size >= LARGE_WINDOW_SIZE){
+        median_filter_rows<T, typename LargeWindow<T>::type>(
+            input, output, kernel_dim, image_dim, row_min, row_max,
+            conditional, pMode, cval);
+    }else{
+        median_filter_rows<T, SortedWindow<T> >(
+            input, output, kernel_dim, image_dim, row_min, row_max,
+            conditional, pMode, cval);
     }
 }
 
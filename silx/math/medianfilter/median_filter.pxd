@@ -27,15 +27,14 @@ from libcpp cimport bool
 
 # pyx
 cdef extern from "median_filter.hpp":
-    cdef extern void median_filter[T](const T* image, 
+    cdef extern void median_filter[T](const T* image,
                                       T* output,
                                       int* kernel_dim,
                                       int* image_dim,
-                                      int x_pixel_range_min,
-                                      int x_pixel_range_max,
-                                      int y_pixel_range_min,
-                                      int y_pixel_range_max,
+                                      int row_min,
+                                      int row_max,
                                       bool conditional,
+                                      int mode,
                                       T cval) nogil;
 
     cdef extern int reflect(int index, int length_max);
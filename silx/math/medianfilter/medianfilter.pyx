@@ -22,12 +22,19 @@
 # THE SOFTWARE.
 #
 # ###########################################################################*/
-"""This module provides median filter function for 1D and 2D arrays.
+"""This module provides median filter function for 1D, 2D and 3D arrays.
+
+The median is computed with a window sliding along the last axis of the
+data: moving to the next pixel removes one column of values from the window
+and inserts a new one.
+The window is stored as a sorted array updated by merging the columns, or
+as an histogram of its values for 16 bits integers and large kernels.
+Rows of pixels are processed in parallel by tiles of consecutive rows.
 """
 
 __authors__ = ["H. Payno", "J. Kieffer"]
 __license__ = "MIT"
-__date__ = "02/05/2017"
+__date__ = "01/06/2018"
 
 
 from cython.parallel import prange
@@ -39,19 +46,32 @@ from libcpp cimport bool
 
 import numbers
 
-ctypedef unsigned long uint64
-ctypedef unsigned int uint32
-ctypedef unsigned short uint16
+
+ctypedef fused _number:
+    float
+    double
+    cnumpy.int64_t
+    cnumpy.uint64_t
+    cnumpy.int32_t
+    cnumpy.uint32_t
+    cnumpy.int16_t
+    cnumpy.uint16_t
 
 
 MODES = {'nearest': 0, 'reflect': 1, 'mirror': 2, 'shrink': 3, 'constant': 4}
 
+# Number of rows of pixels processed at once by a thread.
+# The window is reset for each row, so the result does not depend on the
+# number of threads.
+cdef int _TILE_HEIGHT = 16
+
 
 def medfilt1d(data,
               kernel_size=3,
               bool conditional=False,
               mode='nearest',
-              cval=0):
+              cval=0,
+              int n_threads=0):
     """Function computing the median filter of the given input.
 
     Behavior at boundaries: the algorithm is reducing the size of the
@@ -73,17 +93,20 @@ def medfilt1d(data,
     :param str mode: the algorithm used to determine how values at borders
         are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
     :param cval: Value used outside borders in 'constant' mode
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
 
     :returns: the array with the median value for each pixel.
     """
-    return medfilt(data, kernel_size, conditional, mode, cval)
+    return medfilt(data, kernel_size, conditional, mode, cval, n_threads)
 
 
 def medfilt2d(image,
               kernel_size=3,
               bool conditional=False,
               mode='nearest',
-              cval=0):
+              cval=0,
+              int n_threads=0):
     """Function computing the median filter of the given input.
     Behavior at boundaries: the algorithm is reducing the size of the
     window/kernel for pixels at boundaries (there is no mirroring).
@@ -105,17 +128,95 @@ def medfilt2d(image,
     :param str mode: the algorithm used to determine how values at borders
         are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
     :param cval: Value used outside borders in 'constant' mode
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
 
     :returns: the array with the median value for each pixel.
     """
-    return medfilt(image, kernel_size, conditional, mode, cval)
+    return medfilt(image, kernel_size, conditional, mode, cval, n_threads)
+
+
+def medfilt3d(volume,
+              kernel_size=3,
+              bool conditional=False,
+              mode='nearest',
+              cval=0,
+              int n_threads=0):
+    """Function computing the median filter of the given 3D input.
+
+    Not-a-Number (NaN) float values are ignored.
+    If the window only contains NaNs, it evaluates to NaN.
+
+    In event of an even number of valid values in the window (either
+    because of NaN values or on image border in shrink mode),
+    the highest of the 2 central sorted values is taken.
+
+    :param numpy.ndarray volume: the array for which we want to apply
+        the median filter. Should be 3d.
+    :param kernel_size: the dimension of the kernel.
+    :type kernel_size: An int or a tuple or a list of
+        (kernel_depth, kernel_height, kernel_width)
+    :param bool conditional: True if we want to apply a conditional median
+        filtering.
+    :param str mode: the algorithm used to determine how values at borders
+        are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
+    :param cval: Value used outside borders in 'constant' mode
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
+
+    :returns: the array with the median value for each voxel.
+    """
+    if volume.ndim != 3:
+        raise ValueError(
+            "Invalid data shape. Dimension of the array should be 3")
+    return medfilt(volume, kernel_size, conditional, mode, cval, n_threads)
+
+
+def medfilt2d_stack(images,
+                    kernel_size=3,
+                    bool conditional=False,
+                    mode='nearest',
+                    cval=0,
+                    int n_threads=0):
+    """Apply :func:`medfilt2d` to each image of a stack at once.
+
+    This is equivalent to calling :func:`medfilt2d` for each image, but
+    all the images are filtered in parallel.
+
+    :param numpy.ndarray images: the stack of images to filter,
+        with images along the first dimension. Should be 3d.
+    :param kernel_size: the dimension of the kernel.
+    :type kernel_size: An int or a tuple or a list of
+        (kernel_height, kernel_width)
+    :param bool conditional: True if we want to apply a conditional median
+        filtering.
+    :param str mode: the algorithm used to determine how values at borders
+        are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
+    :param cval: Value used outside borders in 'constant' mode
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
+
+    :returns: the stack of filtered images.
+    """
+    if images.ndim != 3:
+        raise ValueError(
+            "Invalid data shape. Dimension of the array should be 3")
+
+    if isinstance(kernel_size, numbers.Integral):
+        kernel_size = [kernel_size] * 2
+
+    assert len(kernel_size) == 2
+
+    return medfilt(images, [1] + list(kernel_size),
+                   conditional, mode, cval, n_threads)
 
 
 def medfilt(data,
             kernel_size=3,
             bool conditional=False,
             mode='nearest',
-            cval=0):
+            cval=0,
+            int n_threads=0):
     """Function computing the median filter of the given input.
     Behavior at boundaries: the algorithm is reducing the size of the
     window/kernel for pixels at boundaries (there is no mirroring).
@@ -128,15 +229,18 @@ def medfilt(data,
     the highest of the 2 central sorted values is taken.
 
     :param numpy.ndarray data: the array for which we want to apply
-        the median filter. Should be 1d or 2d.
+        the median filter. Should be 1d, 2d or 3d.
     :param kernel_size: the dimension of the kernel.
     :type kernel_size: For 1D should be an int for 2D should be a tuple or
-        a list of (kernel_height, kernel_width)
+        a list of (kernel_height, kernel_width) and for 3D of
+        (kernel_depth, kernel_height, kernel_width)
     :param bool conditional: True if we want to apply a conditional median
         filtering.
     :param str mode: the algorithm used to determine how values at borders
         are determined: 'nearest', 'reflect', 'mirror', 'shrink', 'constant'
     :param cval: Value used outside borders in 'constant' mode
+    :param int n_threads: Number of threads to use,
+        0 (the default) to use all available cores.
 
     :returns: the array with the median value for each pixel.
     """
@@ -144,9 +248,15 @@ def medfilt(data,
         err = 'Requested mode %s is unknown.' % mode
         raise ValueError(err)
 
-    if data.ndim > 2:
+    if data.ndim > 3:
         raise ValueError(
-            "Invalid data shape. Dimension of the array should be 1 or 2")
+            "Invalid data shape. Dimension of the array should be 1, 2 or 3")
+
+    if data.dtype not in (numpy.float64, numpy.float32,
+                          numpy.int64, numpy.uint64,
+                          numpy.int32, numpy.uint32,
+                          numpy.int16, numpy.uint16):
+        raise ValueError("%s type is not managed by the median filter" % data.dtype)
 
     # Handle case of scalar kernel size
     if isinstance(kernel_size, numbers.Integral):
@@ -154,48 +264,30 @@ def medfilt(data,
 
     assert len(kernel_size) == data.ndim
 
-    # Convert 1D arrays to 2D
-    reshaped = False
-    if len(data.shape) == 1:
-        data = data.reshape(1, data.shape[0])
-        kernel_size = [1, kernel_size[0]]
-        reshaped = True
-
-    # simple median filter apply into a 2D buffer
-    output_buffer = numpy.zeros_like(data)
+    # simple median filter apply into a 3D buffer
+    output_buffer = numpy.empty_like(data)
     check(data, output_buffer)
 
-    ker_dim = numpy.array(kernel_size, dtype=numpy.int32)
-
-    if data.dtype == numpy.float64:
-        medfilterfc = _median_filter_float64
-    elif data.dtype == numpy.float32:
-        medfilterfc = _median_filter_float32
-    elif data.dtype == numpy.int64:
-        medfilterfc = _median_filter_int64
-    elif data.dtype == numpy.uint64:
-        medfilterfc = _median_filter_uint64
-    elif data.dtype == numpy.int32:
-        medfilterfc = _median_filter_int32
-    elif data.dtype == numpy.uint32:
-        medfilterfc = _median_filter_uint32
-    elif data.dtype == numpy.int16:
-        medfilterfc = _median_filter_int16
-    elif data.dtype == numpy.uint16:
-        medfilterfc = _median_filter_uint16
-    else:
-        raise ValueError("%s type is not managed by the median filter" % data.dtype)
-
-    medfilterfc(input_buffer=data,
-                output_buffer=output_buffer,
-                kernel_size=ker_dim,
-                conditional=conditional,
-                mode=MODES[mode],
-                cval=cval)
-
-    if reshaped:
-        output_buffer.shape = -1  # Convert to 1D array
-
+    if data.size == 0:
+        return output_buffer
+
+    # Convert 1D and 2D arrays to 3D
+    shape = data.shape
+    padding = 3 - data.ndim
+    data = data.reshape((1,) * padding + shape)
+    output_buffer.shape = data.shape
+    ker_dim = numpy.array([1] * padding + list(kernel_size),
+                          dtype=numpy.int32)
+
+    _median_filter(input_buffer=data,
+                   output_buffer=output_buffer,
+                   kernel_size=ker_dim,
+                   conditional=conditional,
+                   mode=MODES[mode],
+                   cval=cval,
+                   n_threads=n_threads)
+
+    output_buffer.shape = shape
     return output_buffer
 
 
@@ -208,11 +300,11 @@ def check(input_buffer, output_buffer):
     if (output_buffer.flags['C_CONTIGUOUS'] is False):
         raise ValueError('<output_buffer> must be a C_CONTIGUOUS numpy array.')
 
-    if not (len(input_buffer.shape) <= 2):
-        raise ValueError('<input_buffer> dimension must mo higher than 2.')
+    if not (len(input_buffer.shape) <= 3):
+        raise ValueError('<input_buffer> dimension must mo higher than 3.')
 
-    if not (len(output_buffer.shape) <= 2):
-        raise ValueError('<output_buffer> dimension must mo higher than 2.')
+    if not (len(output_buffer.shape) <= 3):
+        raise ValueError('<output_buffer> dimension must mo higher than 3.')
 
     if not(input_buffer.dtype == output_buffer.dtype):
         raise ValueError('input buffer and output_buffer must be of the same type')
@@ -248,249 +340,87 @@ def mirror(int index, int length_max):
     return median_filter.mirror(index, length_max)
 
 
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_float32(float[:, ::1] input_buffer not None,
-                           float[:, ::1] output_buffer not None,
-                           cnumpy.int32_t[::1] kernel_size not None,
-                           bool conditional,
-                           int mode,
-                           float cval):
-
-    cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[float](<float*> & input_buffer[0,0], 
-                                               <float*> & output_buffer[0,0], 
-                                               <int*>& kernel_size[0],
-                                               <int*>buffer_shape,
-                                               y,
-                                               0,
-                                               image_dim,
-                                               conditional,
-                                               mode,
-                                               cval)
-
-
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_float64(double[:, ::1] input_buffer not None,
-                           double[:, ::1] output_buffer not None,
-                           cnumpy.int32_t[::1] kernel_size not None,
-                           bool conditional,
-                           int mode,
-                           double cval):
-
-    cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[double](<double*> & input_buffer[0, 0], 
-                                                <double*> & output_buffer[0, 0], 
-                                                <int*>&kernel_size[0],
-                                                <int*>buffer_shape,
-                                                y,
-                                                0,
-                                                image_dim,
-                                                conditional,
-                                                mode,
-                                                cval)
-
-
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_int64(cnumpy.int64_t[:, ::1] input_buffer not None,
-                         cnumpy.int64_t[:, ::1] output_buffer not None,
-                         cnumpy.int32_t[::1] kernel_size not None,
-                         bool conditional,
-                         int mode,
-                         cnumpy.int64_t cval):
-
-    cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[long](<long*> & input_buffer[0,0], 
-                                              <long*>  & output_buffer[0, 0], 
-                                              <int*>&kernel_size[0],
-                                              <int*>buffer_shape,
-                                              y,
-                                              0,
-                                              image_dim,
-                                              conditional,
-                                              mode,
-                                              cval)
-
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_uint64(cnumpy.uint64_t[:, ::1] input_buffer not None,
-                          cnumpy.uint64_t[:, ::1] output_buffer not None,
-                          cnumpy.int32_t[::1] kernel_size not None,
-                          bool conditional,
-                          int mode,
-                          cnumpy.uint64_t cval):
-
-    cdef: 
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[uint64](<uint64*> & input_buffer[0,0], 
-                                                <uint64*> & output_buffer[0, 0],
-                                                <int*>&kernel_size[0],
-                                                <int*>buffer_shape,
-                                                y,
-                                                0,
-                                                image_dim,
-                                                conditional,
-                                                mode,
-                                                cval)
-
-
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_int32(cnumpy.int32_t[:, ::1] input_buffer not None,
-                         cnumpy.int32_t[:, ::1] output_buffer not None,
-                         cnumpy.int32_t[::1] kernel_size not None,
-                         bool conditional,
-                         int mode,
-                         cnumpy.int32_t cval):
-
-    cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[int](<int*> & input_buffer[0,0], 
-                                             <int*>  & output_buffer[0, 0],
-                                             <int*>&kernel_size[0],
-                                             <int*>buffer_shape,
-                                             y,
-                                             0,
-                                             image_dim,
-                                             conditional,
-                                             mode,
-                                             cval)
+cdef int _median_filter_tile(_number* input_buffer,
+                             _number* output_buffer,
+                             cnumpy.int32_t* kernel_size,
+                             int* buffer_shape,
+                             int row_min,
+                             int row_max,
+                             bool conditional,
+                             int mode,
+                             _number cval) nogil:
+    """Apply the median filter to the rows [row_min, row_max] of a 3D buffer"""
+    median_filter.median_filter(input_buffer,
+                                output_buffer,
+                                <int*> kernel_size,
+                                buffer_shape,
+                                row_min,
+                                row_max,
+                                conditional,
+                                mode,
+                                cval)
+    return 0
 
 
 @cython.cdivision(True)
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.initializedcheck(False)
-def _median_filter_uint32(cnumpy.uint32_t[:, ::1] input_buffer not None,
-                          cnumpy.uint32_t[:, ::1] output_buffer not None,
-                          cnumpy.int32_t[::1] kernel_size not None,
-                          bool conditional,
-                          int mode,
-                          cnumpy.uint32_t cval):
-
-    cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[uint32](<uint32*> & input_buffer[0,0], 
-                                                <uint32*>  & output_buffer[0, 0],
-                                                <int*>&kernel_size[0],
-                                                <int*>buffer_shape,
-                                                y,
-                                                0,
-                                                image_dim,
-                                                conditional,
-                                                mode,
-                                                cval)
-
-
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_int16(cnumpy.int16_t[:, ::1] input_buffer not None,
-                         cnumpy.int16_t[:, ::1] output_buffer not None,
-                         cnumpy.int32_t[::1] kernel_size not None,
-                         bool conditional,
-                         int mode,
-                         cnumpy.int16_t cval):
-
-    cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape
-    buffer_shape[0] = input_buffer.shape[0]
-    buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[short](<short*> & input_buffer[0,0], 
-                                               <short*>  & output_buffer[0, 0],
-                                               <int*>&kernel_size[0],
-                                               <int*>buffer_shape,
-                                               y,
-                                               0,
-                                               image_dim,
-                                               conditional,
-                                               mode,
-                                               cval)
-
-
-@cython.cdivision(True)
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.initializedcheck(False)
-def _median_filter_uint16(
-      cnumpy.uint16_t[:, ::1] input_buffer not None,
-      cnumpy.uint16_t[:, ::1] output_buffer not None,
-      cnumpy.int32_t[::1] kernel_size not None,
-      bool conditional,
-      int mode,
-      cnumpy.uint16_t cval):
-
+def _median_filter(_number[:, :, ::1] input_buffer not None,
+                   _number[:, :, ::1] output_buffer not None,
+                   cnumpy.int32_t[::1] kernel_size not None,
+                   bool conditional,
+                   int mode,
+                   _number cval,
+                   int n_threads=0):
+    """Apply the median filter to a 3D buffer by tiles of rows.
+
+    :param int n_threads: Number of threads to use,
+        0 to use all available cores.
+    """
     cdef:
-        int y = 0
-        int image_dim = input_buffer.shape[1] - 1
-        int[2] buffer_shape, 
+        int tile = 0
+        int n_rows = input_buffer.shape[0] * input_buffer.shape[1]
+        int n_tiles = (n_rows + _TILE_HEIGHT - 1) // _TILE_HEIGHT
+        int[3] buffer_shape
     buffer_shape[0] = input_buffer.shape[0]
     buffer_shape[1] = input_buffer.shape[1]
-
-    for y in prange(input_buffer.shape[0], nogil=True):
-            median_filter.median_filter[uint16](<uint16*> & input_buffer[0, 0],
-                                                <uint16*> & output_buffer[0, 0],
-                                                <int*>&kernel_size[0],
-                                                <int*>buffer_shape,
-                                                y,
-                                                0,
-                                                image_dim,
-                                                conditional,
-                                                mode,
-                                                cval)
+    buffer_shape[2] = input_buffer.shape[2]
+
+    with nogil:
+        if n_tiles == 1 or n_threads == 1:
+            for tile in range(n_tiles):
+                _median_filter_tile(
+                    &input_buffer[0, 0, 0],
+                    &output_buffer[0, 0, 0],
+                    &kernel_size[0],
+                    buffer_shape,
+                    tile * _TILE_HEIGHT,
+                    min(n_rows, (tile + 1) * _TILE_HEIGHT) - 1,
+                    conditional,
+                    mode,
+                    cval)
+        elif n_threads > 1:
+            for tile in prange(n_tiles, num_threads=n_threads):
+                _median_filter_tile(
+                    &input_buffer[0, 0, 0],
+                    &output_buffer[0, 0, 0],
+                    &kernel_size[0],
+                    buffer_shape,
+                    tile * _TILE_HEIGHT,
+                    min(n_rows, (tile + 1) * _TILE_HEIGHT) - 1,
+                    conditional,
+                    mode,
+                    cval)
+        else:
+            for tile in prange(n_tiles):
+                _median_filter_tile(
+                    &input_buffer[0, 0, 0],
+                    &output_buffer[0, 0, 0],
+                    &kernel_size[0],
+                    buffer_shape,
+                    tile * _TILE_HEIGHT,
+                    min(n_rows, (tile + 1) * _TILE_HEIGHT) - 1,
+                    conditional,
+                    mode,
+                    cval)
@@ -25,11 +25,12 @@
 
 __authors__ = ["H. Payno"]
 __license__ = "MIT"
-__date__ = "17/01/2018"
+__date__ = "01/06/2018"
 
 import unittest
 import numpy
 from silx.math.medianfilter import medfilt2d, medfilt1d
+from silx.math.medianfilter import medfilt3d, medfilt2d_stack
 from silx.math.medianfilter.medianfilter import reflect, mirror
 from silx.math.medianfilter.medianfilter import MODES as silx_mf_modes
 from silx.utils.testutils import ParametricTestCase
@@ -647,6 +648,94 @@ class TestGeneralExecution(ParametricTestCase):
                     numpy.any(out_isnan[numpy.logical_not(nan_mask)]))
 
 
+class TestMedianFilter3D(ParametricTestCase):
+    """Test the median filter of volumes and stacks of images"""
+
+    # numpy.pad modes equivalent to the median filter modes
+    PAD_MODES = {'nearest': 'edge',
+                 'reflect': 'symmetric',
+                 'mirror': 'reflect',
+                 'constant': 'constant'}
+
+    @staticmethod
+    def _medfilt(data, kernel_size, mode):
+        """Median filter implemented with numpy"""
+        half = [size // 2 for size in kernel_size]
+        padded = numpy.pad(data, [(h, h) for h in half],
+                           mode=TestMedianFilter3D.PAD_MODES[mode])
+        windows = []
+        for dz in range(kernel_size[0]):
+            for dy in range(kernel_size[1]):
+                for dx in range(kernel_size[2]):
+                    windows.append(padded[dz:dz + data.shape[0],
+                                          dy:dy + data.shape[1],
+                                          dx:dx + data.shape[2]])
+        return numpy.median(numpy.array(windows), axis=0).astype(data.dtype)
+
+    def testVolume(self):
+        """Compare medfilt3d with a median filter implemented with numpy"""
+        volume = numpy.random.randint(0, 1000, (9, 12, 14))
+        for mode in self.PAD_MODES:
+            for dtype in (numpy.float32, numpy.int32, numpy.uint16):
+                for kernel_size in ((3, 3, 3), (1, 3, 5), (5, 1, 3)):
+                    with self.subTest(mode=mode, dtype=dtype,
+                                      kernel_size=kernel_size):
+                        data = volume.astype(dtype)
+                        result = medfilt3d(data, kernel_size, mode=mode)
+                        self.assertEqual(result.dtype, data.dtype)
+                        self.assertTrue(numpy.array_equal(
+                            result, self._medfilt(data, kernel_size, mode)))
+
+    def testStack(self):
+        """Test that medfilt2d_stack filters each image separately"""
+        images = numpy.random.random((4, 10, 13)).astype(numpy.float32)
+        images[1, 2:5, 3] = numpy.nan
+        for mode in silx_mf_modes:
+            for conditional in (False, True):
+                with self.subTest(mode=mode, conditional=conditional):
+                    result = medfilt2d_stack(images, (3, 5),
+                                             conditional=conditional,
+                                             mode=mode,
+                                             cval=0.5)
+                    for image, filtered in zip(images, result):
+                        expected = medfilt2d(image, (3, 5),
+                                             conditional=conditional,
+                                             mode=mode,
+                                             cval=0.5)
+                        numpy.testing.assert_array_equal(filtered, expected)
+
+    def testHistogramWindow(self):
+        """Test that 16 bits integers give the same result as float"""
+        data = numpy.random.randint(-30000, 30000, (20, 50))
+        data[5:15, 10:30] = 5  # Large gaps between values
+        for mode in silx_mf_modes:
+            for conditional in (False, True):
+                with self.subTest(mode=mode, conditional=conditional):
+                    result = medfilt2d(data.astype(numpy.int16), (7, 9),
+                                       conditional=conditional,
+                                       mode=mode)
+                    expected = medfilt2d(data.astype(numpy.float64), (7, 9),
+                                         conditional=conditional,
+                                         mode=mode)
+                    self.assertTrue(numpy.array_equal(result, expected))
+
+    def testThreads(self):
+        """Test that the result does not depend on the number of threads"""
+        volume = numpy.random.random((5, 40, 30))
+        expected = medfilt3d(volume, 5, n_threads=1)
+        for n_threads in (0, 2, 3):
+            with self.subTest(n_threads=n_threads):
+                result = medfilt3d(volume, 5, n_threads=n_threads)
+                self.assertTrue(numpy.array_equal(result, expected))
+
+    def testWrongDimension(self):
+        """Test errors for data of the wrong dimension"""
+        with self.assertRaises(ValueError):
+            medfilt3d(numpy.ones((10, 10)))
+        with self.assertRaises(ValueError):
+            medfilt2d_stack(numpy.ones((10, 10)))
+
+
 def _getScipyAndSilxCommonModes():
     """return the mode which are comparable between silx and scipy"""
     modes = silx_mf_modes.copy()
@@ -730,7 +819,8 @@ def suite():
                  TestMedianFilterReflect,
                  TestMedianFilterMirror,
                  TestMedianFilterShrink,
-                 TestMedianFilterConstant]:
+                 TestMedianFilterConstant,
+                 TestMedianFilter3D]:
         test_suite.addTest(
             unittest.defaultTestLoader.loadTestsFromTestCase(test))
     return test_suite
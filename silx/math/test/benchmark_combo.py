@@ -192,10 +192,47 @@ class BenchmarkMinMax(ParametricTestCase):
         pyplot.show()
 
 
+class BenchmarkPercentile(unittest.TestCase):
+    """Benchmark of percentile compared to numpy.percentile"""
+
+    SIZES = 10**6, 10**7, 10**8
+    """Number of samples"""
+
+    Q = 1, 99
+
+    N_BINS = 4096
+
+    def test_benchmark_numpy(self):
+        for size in self.SIZES:
+            data = numpy.random.normal(size=size).astype(numpy.float32)
+
+            start = time.time()
+            result = combo.percentile(data, self.Q, n_bins=self.N_BINS)
+            duration = time.time() - start
+
+            start = time.time()
+            ref = numpy.percentile(data, self.Q)
+            ref_duration = time.time() - start
+
+            error = numpy.abs(result - ref).max()
+            bound = (data.max() - data.min()) / self.N_BINS ** 2
+            self.assertLessEqual(error, bound)
+
+            _logger.info(
+                '10**%d samples: percentile %.3fs, numpy %.3fs, x%.2f, '
+                'error %g (bound %g)',
+                int(numpy.log10(size)), duration, ref_duration,
+                ref_duration / duration, error, bound)
+
+            del data
+
+
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTests(
         unittest.defaultTestLoader.loadTestsFromTestCase(BenchmarkMinMax))
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(BenchmarkPercentile))
     return test_suite
 
 
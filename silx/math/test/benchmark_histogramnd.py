@@ -0,0 +1,106 @@
+# coding: utf-8
+# /*##########################################################################
+# Copyright (C) 2018 European Synchrotron Radiation Facility
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ############################################################################*/
+"""Benchmarks of the multithreaded histogramnd"""
+
+from __future__ import division
+
+__authors__ = ["D. Naudet"]
+__license__ = "MIT"
+__date__ = "01/06/2018"
+
+
+import logging
+import multiprocessing
+import time
+import unittest
+
+import numpy
+
+from silx.math.chistogramnd import chistogramnd as histogramnd
+
+_logger = logging.getLogger(__name__)
+_logger.setLevel(logging.DEBUG)
+
+
+class BenchmarkHistogramndThreads(unittest.TestCase):
+    """Benchmark of histogramnd scaling with the number of threads"""
+
+    SIZE = 10**8
+    """Number of samples"""
+
+    NDIMS = 1, 2, 3
+
+    N_BINS = 100
+
+    def threads(self):
+        """Returns the numbers of threads to benchmark"""
+        cpu_count = multiprocessing.cpu_count()
+        n_threads = [1]
+        while n_threads[-1] * 2 <= cpu_count:
+            n_threads.append(n_threads[-1] * 2)
+        if n_threads[-1] != cpu_count:
+            n_threads.append(cpu_count)
+        return n_threads
+
+    def test_benchmark_threads(self):
+        for ndims in self.NDIMS:
+            shape = (self.SIZE,) if ndims == 1 else (self.SIZE, ndims)
+            sample = numpy.random.random(shape).astype(numpy.float32)
+            weights = numpy.random.random(self.SIZE).astype(numpy.float32)
+            histo_range = [[0., 1.]] * ndims
+
+            ref = None
+            for n_threads in self.threads():
+                start = time.time()
+                result = histogramnd(sample,
+                                     histo_range,
+                                     self.N_BINS,
+                                     weights=weights,
+                                     n_threads=n_threads)
+                duration = time.time() - start
+
+                if ref is None:
+                    ref, ref_duration = result, duration
+                else:
+                    self.assertTrue(numpy.array_equal(result[0], ref[0]))
+                    self.assertTrue(numpy.allclose(result[1], ref[1],
+                                                   rtol=1e-5))
+
+                _logger.info('%dD, 10**%d samples, %d thread(s): %.3fs x%.2f',
+                             ndims, int(numpy.log10(self.SIZE)), n_threads,
+                             duration, ref_duration / duration)
+
+            del sample, weights
+
+
+def suite():
+    test_suite = unittest.TestSuite()
+    test_suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(
+        BenchmarkHistogramndThreads))
+    return test_suite
+
+
+if __name__ == '__main__':
+    logging.basicConfig()
+    unittest.main(defaultTest='suite')
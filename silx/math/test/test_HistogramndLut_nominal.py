@@ -25,6 +25,9 @@
 Nominal tests of the HistogramndLut function.
 """
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
@@ -364,6 +367,99 @@ class _TestHistogramndLut_nominal(unittest.TestCase):
         self.assertEqual(instance.histo(), None)
         self.assertEqual(instance.weighted_histo(), None)
 
+    def test_nominal_apply_lut_stack(self):
+        """
+        """
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+
+        stack = np.array([self.weights, 2 * self.weights, -self.weights])
+        histo, w_histo = instance.apply_lut_stack(stack)
+
+        self.assertEqual(histo.shape, (3,) + tuple(self.n_bins))
+        self.assertEqual(w_histo.shape, (3,) + tuple(self.n_bins))
+        self.assertEqual(histo.dtype, np.uint32)
+        self.assertEqual(w_histo.dtype, np.float64)
+        for frame, weights in enumerate(stack):
+            expected_h, expected_c = instance.apply_lut(weights)
+            self.assertTrue(np.array_equal(histo[frame], expected_h))
+            self.assertTrue(np.allclose(w_histo[frame], expected_c))
+
+        # accumulating into the provided arrays, with weights filtering
+        histo_2, w_histo_2 = instance.apply_lut_stack(stack,
+                                                      histo=histo,
+                                                      weighted_histo=w_histo,
+                                                      weight_min=-299.9,
+                                                      weight_max=499.9)
+        self.assertIs(histo_2, histo)
+        self.assertIs(w_histo_2, w_histo)
+        expected_h, expected_c = instance.apply_lut(stack[0])
+        instance.apply_lut(stack[0], histo=expected_h,
+                           weighted_histo=expected_c,
+                           weight_min=-299.9, weight_max=499.9)
+        self.assertTrue(np.array_equal(histo[0], expected_h))
+        self.assertTrue(np.allclose(w_histo[0], expected_c))
+
+        self.assertRaises(ValueError, instance.apply_lut_stack,
+                          np.ones((3, len(self.weights) + 1)))
+
+    def test_csr_lut(self):
+        """
+        """
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins)
+        lut = instance.lut
+        indptr, indices = instance.csr_lut
+
+        self.assertEqual(len(indptr), np.prod(self.n_bins) + 1)
+        self.assertEqual(len(indices), np.count_nonzero(lut >= 0))
+        for bin_idx in range(len(indptr) - 1):
+            samples = indices[indptr[bin_idx]:indptr[bin_idx + 1]]
+            self.assertTrue(np.all(lut[samples] == bin_idx))
+
+    def test_save_load(self):
+        """
+        """
+        instance = HistogramndLut(self.sample,
+                                  self.histo_range,
+                                  self.n_bins,
+                                  last_bin_closed=True,
+                                  dtype=np.float32)
+        expected_h, expected_c = instance.apply_lut(self.weights)
+
+        filenames = ['lut.npz']
+        try:
+            import h5py  # noqa
+        except ImportError:
+            pass
+        else:
+            filenames.append('lut.h5')
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for filename in filenames:
+                filename = os.path.join(tmp_dir, filename)
+                instance.save(filename)
+                loaded = HistogramndLut.load(filename)
+
+                self.assertTrue(np.array_equal(loaded.lut, instance.lut))
+                self.assertTrue(np.array_equal(loaded.n_bins, self.n_bins))
+                self.assertTrue(np.array_equal(loaded.histo_range,
+                                               self.histo_range))
+                self.assertTrue(loaded.last_bin_closed)
+                for edges, expected in zip(loaded.bins_edges,
+                                           instance.bins_edges):
+                    self.assertTrue(np.array_equal(edges, expected))
+
+                histo, w_histo = loaded.apply_lut(self.weights)
+                self.assertEqual(w_histo.dtype, np.float32)
+                self.assertTrue(np.array_equal(histo, expected_h))
+                self.assertTrue(np.array_equal(w_histo, expected_c))
+        finally:
+            shutil.rmtree(tmp_dir)
+
     def test_nominal_accumulate_last_bin_closed(self):
         """
         """
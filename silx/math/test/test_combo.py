@@ -36,7 +36,7 @@ import numpy
 
 from silx.utils.testutils import ParametricTestCase
 
-from silx.math.combo import min_max
+from silx.math.combo import min_max, percentile
 
 
 class TestMinMax(ParametricTestCase):
@@ -205,11 +205,206 @@ class TestMinMax(ParametricTestCase):
                     data = numpy.array(data, dtype=dtype)
                     self._test_min_max(data, min_positive=True, finite=True)
 
+    def test_stats(self):
+        """Test min_max with stats=True"""
+        data = numpy.array((1., float('nan'), 3., float('inf'), -2.))
+        result = min_max(data, stats=True, finite=True)
+        self.assertEqual(result.count, 3)
+        self.assertAlmostEqual(result.sum, 2.)
+        self.assertAlmostEqual(result.mean, 2. / 3.)
+        self.assertAlmostEqual(result.std, numpy.std((1., 3., -2.)))
+
+        result = min_max(data)
+        self.assertIsNone(result.count)
+        self.assertIsNone(result.mean)
+
+        result = min_max((float('nan'),), stats=True)
+        self.assertEqual(result.count, 0)
+        self.assertIsNone(result.mean)
+        self.assertIsNone(result.std)
+
+        for dtype in ('float32', 'float64', 'int16', 'uint32'):
+            with self.subTest(dtype=dtype):
+                data = numpy.arange(100000, dtype=dtype) % 1000
+                result = min_max(data, stats=True)
+                self.assertEqual(result.count, data.size)
+                self.assertAlmostEqual(result.sum / data.sum(), 1.)
+                self.assertAlmostEqual(result.mean, numpy.mean(data, dtype=numpy.float64))
+                self.assertAlmostEqual(result.std, numpy.std(data, dtype=numpy.float64))
+
+    def test_non_contiguous(self):
+        """Test min_max with strided, transposed and multidimensional data"""
+        data = numpy.random.random((300, 400))
+        data[123, 321] = -1.
+        data[200, 10] = 2.
+        tests = {
+            '2D': data,
+            'slice': data[::3, 1::2],
+            'reversed': data[::-1],
+            'transposed': data.T,
+            '3D transposed': data.reshape(30, 10, 400).transpose(1, 0, 2)}
+
+        for name, array in tests.items():
+            with self.subTest(data=name):
+                result = min_max(array, min_positive=True, stats=True)
+                self.assertEqual(result.minimum, array.min())
+                self.assertEqual(result.argmin, numpy.argmin(array))
+                self.assertEqual(result.maximum, array.max())
+                self.assertEqual(result.argmax, numpy.argmax(array))
+                self.assertAlmostEqual(result.mean, array.mean())
+                self.assertAlmostEqual(result.std, array.std())
+
+    def test_structured_field(self):
+        """Test min_max with a stride which is not a multiple of the item
+        size"""
+        data = numpy.zeros(40, dtype=[('a', 'f8'), ('b', 'i4')])
+        data['a'] = numpy.arange(40)[::-1]
+        tests = {'1D': data['a'], '2D': data['a'].reshape(10, 4)}
+
+        for name, array in tests.items():
+            with self.subTest(data=name):
+                result = min_max(array, min_positive=True, stats=True)
+                self.assertEqual(result.minimum, array.min())
+                self.assertEqual(result.argmin, numpy.argmin(array))
+                self.assertEqual(result.min_positive, array[array > 0].min())
+                self.assertEqual(result.maximum, array.max())
+                self.assertEqual(result.argmax, numpy.argmax(array))
+                self.assertAlmostEqual(result.mean, array.mean())
+                self.assertAlmostEqual(result.std, array.std())
+
+    def test_n_threads(self):
+        """Test that the result does not depend on the number of threads"""
+        # Several chunks, min and max repeated in different chunks
+        data = numpy.random.randint(-1000, 1000, 1000000)
+        data[[1000, 500000, 999999]] = -1000
+        data[[200000, 300000]] = 1000
+
+        ref = min_max(data, min_positive=True, stats=True, n_threads=1)
+        self.assertEqual(ref.argmin, numpy.argmin(data))
+        self.assertEqual(ref.argmax, numpy.argmax(data))
+        for n_threads in (2, 3, 0):
+            with self.subTest(n_threads=n_threads):
+                result = min_max(data, min_positive=True, stats=True,
+                                 n_threads=n_threads)
+                for name in ('minimum', 'argmin', 'maximum', 'argmax',
+                             'min_positive', 'argmin_positive',
+                             'count', 'sum', 'mean', 'std'):
+                    self.assertEqual(getattr(result, name),
+                                     getattr(ref, name))
+
+
+class TestPercentile(ParametricTestCase):
+    """Tests of percentile function"""
+
+    Q = 0, 1, 25, 50, 73.3, 99, 100
+
+    def _check(self, data, q, n_bins=256, positive=False, **kwargs):
+        """Compare percentile with numpy.percentile within the error bound"""
+        result = percentile(data, q, positive=positive, n_bins=n_bins,
+                            **kwargs)
+        values = numpy.array(data, dtype=numpy.float64).ravel()
+        values = values[numpy.isfinite(values)]
+        if positive:
+            values = values[values > 0]
+        expected = numpy.percentile(values, q)
+        error = (values.max() - values.min()) / n_bins**2
+        self.assertTrue(numpy.all(numpy.abs(result - expected) <= error),
+                        msg="%s != %s (error bound %f)" % (
+                            result, expected, error))
+        return result
+
+    def test_different_datasets(self):
+        """Test percentile with different data types and shapes"""
+        rng = numpy.random.RandomState(0)
+        datasets = {
+            'normal float32': rng.normal(size=100000).astype(numpy.float32),
+            'exponential float64': rng.exponential(size=(100, 1000)),
+            'int': rng.randint(-1000, 1000, size=(300, 301)),
+            'uint8': rng.randint(0, 256, 1000).astype(numpy.uint8),
+            'non-contiguous': rng.random_sample((50, 40, 30))[:, ::2],
+            'big-endian': numpy.arange(1000, dtype='>f8'),
+            'float16': numpy.arange(100, dtype=numpy.float16),
+            'few values': numpy.array((3., 1.)),
+        }
+        for name, data in datasets.items():
+            with self.subTest(name=name):
+                self._check(data, self.Q)
+
+    def test_scalar(self):
+        """Test that a scalar q returns a float"""
+        result = self._check(numpy.arange(101), 10)
+        self.assertIsInstance(result, float)
+
+        result = percentile(numpy.arange(101), [[10, 90]])
+        self.assertEqual(result.shape, (1, 2))
+
+    def test_non_finite(self):
+        """Test that NaNs and infinities are ignored"""
+        data = numpy.arange(1000, dtype=numpy.float64)
+        data[::10] = numpy.nan
+        data[1::10] = numpy.inf
+        data[2::10] = - numpy.inf
+        self._check(data, self.Q)
+
+        result = percentile(numpy.array((numpy.nan, numpy.inf)), (1, 50))
+        self.assertTrue(numpy.all(numpy.isnan(result)))
+
+    def test_positive(self):
+        """Test percentile of strictly positive values"""
+        data = numpy.linspace(-10, 10, 10001)
+        self._check(data, self.Q, positive=True)
+
+        result = percentile(- numpy.arange(10), 50, positive=True)
+        self.assertTrue(numpy.isnan(result))
+
+    def test_structured_field(self):
+        """Test percentile with a stride which is not a multiple of the item
+        size"""
+        data = numpy.zeros(1000, dtype=[('a', 'f8'), ('b', 'i4')])
+        data['a'] = numpy.random.RandomState(2).random_sample(1000)
+        for array in (data['a'], data['a'].reshape(10, 100)):
+            with self.subTest(shape=array.shape):
+                self._check(array, self.Q)
+                self._check(array, self.Q, positive=True)
+
+    def test_constant(self):
+        """Test percentile of a constant array"""
+        self.assertEqual(percentile(numpy.ones(100) * 5, 12.5), 5.)
+
+    def test_n_bins(self):
+        """Test the error bound with different numbers of bins"""
+        data = numpy.random.RandomState(1).standard_cauchy(100000)
+        for n_bins in (1, 2, 17, 4096):
+            with self.subTest(n_bins=n_bins):
+                self._check(data, self.Q, n_bins=n_bins)
+
+    def test_n_threads(self):
+        """Test that the result does not depend on the number of threads"""
+        data = numpy.random.random(1000000)
+        ref = percentile(data, self.Q, n_threads=1)
+        for n_threads in (2, 3, 0):
+            with self.subTest(n_threads=n_threads):
+                result = percentile(data, self.Q, n_threads=n_threads)
+                self.assertTrue(numpy.array_equal(result, ref))
+
+    def test_errors(self):
+        """Test percentile arguments checks"""
+        with self.assertRaises(ValueError):
+            percentile(numpy.array([]), 50)
+        with self.assertRaises(ValueError):
+            percentile(numpy.arange(10), 101)
+        with self.assertRaises(ValueError):
+            percentile(numpy.arange(10), (-1, 50))
+        with self.assertRaises(ValueError):
+            percentile(numpy.arange(10), 50, n_bins=0)
+
 
 def suite():
     test_suite = unittest.TestSuite()
     test_suite.addTests(
         unittest.defaultTestLoader.loadTestsFromTestCase(TestMinMax))
+    test_suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(TestPercentile))
     return test_suite
 
 
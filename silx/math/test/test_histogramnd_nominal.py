@@ -173,6 +173,37 @@ class _Test_chistogramnd_nominal(unittest.TestCase):
         self.assertTrue(np.array_equal(histo, expected_h))
         self.assertTrue(np.allclose(cumul, expected_c))
 
+    def test_nominal_n_threads(self):
+        """
+        """
+        # large enough for the sample to be split between threads
+        n_repeat = 100000
+
+        expected_h_tpl = np.array([2, 1, 1, 1, 1]) * n_repeat
+        expected_c_tpl = np.array([-700.7, -0.5, 0.01, 300.3, 500.5]) * n_repeat
+
+        expected_h = np.zeros(shape=self.n_bins, dtype=np.double)
+        expected_c = np.zeros(shape=self.n_bins, dtype=np.double)
+
+        self.fill_histo(expected_h, expected_h_tpl, self.ndims-1)
+        self.fill_histo(expected_c, expected_c_tpl, self.ndims-1)
+
+        if self.ndims == 1:
+            sample = np.tile(self.sample, n_repeat)
+        else:
+            sample = np.tile(self.sample, (n_repeat, 1))
+        weights = np.tile(self.weights, n_repeat)
+
+        for n_threads in (1, 4, 0):
+            histo, cumul, bin_edges = histogramnd(sample,
+                                                  self.histo_range,
+                                                  self.n_bins,
+                                                  weights=weights,
+                                                  n_threads=n_threads)
+
+            self.assertTrue(np.array_equal(histo, expected_h))
+            self.assertTrue(np.allclose(cumul, expected_c))
+
     def test_nominal_uncontiguous_sample(self):
         """
         """
@@ -804,6 +835,38 @@ class _Test_Histogramnd_nominal(unittest.TestCase):
         self.assertTrue(np.array_equal(histo, expected_h))
         self.assertTrue(np.allclose(cumul, expected_c, rtol=10e-15))
 
+    def test_accumulate_chunks(self):
+        """
+        """
+        expected = Histogramnd(self.sample,
+                               self.histo_range,
+                               self.n_bins,
+                               weights=self.weights)
+
+        for prefetch in (False, True):
+            histo_inst = Histogramnd(None, self.histo_range, self.n_bins)
+            histo_inst.accumulate_chunks(self.sample,
+                                         weights=self.weights,
+                                         chunk_size=2,
+                                         prefetch=prefetch)
+            self.assertTrue(np.array_equal(histo_inst.histo, expected.histo))
+            self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                        expected.weighted_histo,
+                                        rtol=10e-15))
+
+        histo_inst = Histogramnd(None, self.histo_range, self.n_bins)
+        histo_inst.accumulate_chunks(
+            (self.sample[i:i + 4] for i in range(0, len(self.sample), 4)),
+            weights=(self.weights[i:i + 4]
+                     for i in range(0, len(self.weights), 4)))
+        self.assertTrue(np.array_equal(histo_inst.histo, expected.histo))
+        self.assertTrue(np.allclose(histo_inst.weighted_histo,
+                                    expected.weighted_histo,
+                                    rtol=10e-15))
+
+        self.assertRaises(ValueError, histo_inst.accumulate_chunks,
+                          self.sample, weights=iter([self.weights]))
+
     def test_accumulate_no_weights(self):
         """
         """